@@ -39,6 +39,7 @@ EXCLUDED_METHODS = {
     "create_session",
     "close_session",
     "as_username",
+    "as_sender",
     "validate_server_availability",
     "get_headers",
     "login",
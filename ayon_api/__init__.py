@@ -12,9 +12,22 @@ from .utils import (
     abort_web_action_event,
     SortOrder,
 )
+from .retries import RetryPolicy
+from .circuit_breaker import CircuitBreaker
+from .transports import Transport, RequestsTransport, HttpxTransport
+from .graphql import AdaptivePageSize, GraphQlBatch
+from .columns import EntityColumns
+from .profiling import QueryProfiler
+from .entity_cache import EntityCache
+from .cache_invalidation import CacheInvalidator
+from .hierarchy_store import HierarchyStore
+from .folder_path_index import FolderPathIndex
 from .server_api import (
     ServerAPI,
 )
+from .async_server_api import (
+    AsyncServerAPI,
+)
 
 from ._api import (
     GlobalServerAPI,
@@ -41,6 +54,33 @@ from ._api import (
     set_timeout,
     get_max_retries,
     set_max_retries,
+    get_retry_policy,
+    set_retry_policy,
+    get_circuit_breaker,
+    set_circuit_breaker,
+    is_single_flight_enabled,
+    set_single_flight_enabled,
+    get_transport,
+    set_transport,
+    get_request_compression_min_size,
+    set_request_compression_min_size,
+    get_graphql_prefetch,
+    set_graphql_prefetch,
+    get_graphql_page_size,
+    set_graphql_page_size,
+    get_graphql_chunk_size,
+    set_graphql_chunk_size,
+    is_graphql_persisted_queries_enabled,
+    set_graphql_persisted_queries_enabled,
+    get_entity_cache,
+    set_entity_cache,
+    get_hierarchy_store,
+    set_hierarchy_store,
+    is_folder_path_index_enabled,
+    set_folder_path_index_enabled,
+    get_folder_path_index,
+    reset_folder_path_index,
+    get_circuit_breaker_state,
     is_service_user,
     get_site_id,
     set_site_id,
@@ -51,6 +91,9 @@ from ._api import (
     set_sender,
     get_sender_type,
     set_sender_type,
+    get_connection_pool_info,
+    get_metrics,
+    profile_queries,
     get_info,
     get_server_version,
     get_server_version_tuple,
@@ -89,6 +132,8 @@ from ._api import (
     upload_reviewable,
     trigger_server_restart,
     query_graphql,
+    query_graphql_stream,
+    graphql_batch,
     get_graphql_schema,
     get_server_schema,
     get_schemas,
@@ -205,6 +250,7 @@ from ._api import (
     get_folders,
     get_folder_by_id,
     get_folder_by_path,
+    get_folder_ids_by_paths,
     get_folder_by_name,
     get_folder_ids_with_products,
     create_folder,
@@ -222,6 +268,7 @@ from ._api import (
     delete_task,
     get_rest_product,
     get_products,
+    get_products_columns,
     get_product_by_id,
     get_product_by_name,
     get_product_types,
@@ -232,6 +279,7 @@ from ._api import (
     delete_product,
     get_rest_version,
     get_versions,
+    get_versions_columns,
     get_version_by_id,
     get_version_by_name,
     get_hero_version_by_id,
@@ -334,6 +382,20 @@ __all__ = (
     "SortOrder",
 
     "ServerAPI",
+    "AsyncServerAPI",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "Transport",
+    "RequestsTransport",
+    "HttpxTransport",
+    "AdaptivePageSize",
+    "GraphQlBatch",
+    "EntityColumns",
+    "QueryProfiler",
+    "EntityCache",
+    "CacheInvalidator",
+    "HierarchyStore",
+    "FolderPathIndex",
 
     "GlobalServerAPI",
     "ServiceContext",
@@ -359,6 +421,33 @@ __all__ = (
     "set_timeout",
     "get_max_retries",
     "set_max_retries",
+    "get_retry_policy",
+    "set_retry_policy",
+    "get_circuit_breaker",
+    "set_circuit_breaker",
+    "is_single_flight_enabled",
+    "set_single_flight_enabled",
+    "get_transport",
+    "set_transport",
+    "get_request_compression_min_size",
+    "set_request_compression_min_size",
+    "get_graphql_prefetch",
+    "set_graphql_prefetch",
+    "get_graphql_page_size",
+    "set_graphql_page_size",
+    "get_graphql_chunk_size",
+    "set_graphql_chunk_size",
+    "is_graphql_persisted_queries_enabled",
+    "set_graphql_persisted_queries_enabled",
+    "get_entity_cache",
+    "set_entity_cache",
+    "get_hierarchy_store",
+    "set_hierarchy_store",
+    "is_folder_path_index_enabled",
+    "set_folder_path_index_enabled",
+    "get_folder_path_index",
+    "reset_folder_path_index",
+    "get_circuit_breaker_state",
     "is_service_user",
     "get_site_id",
     "set_site_id",
@@ -369,6 +458,9 @@ __all__ = (
     "set_sender",
     "get_sender_type",
     "set_sender_type",
+    "get_connection_pool_info",
+    "get_metrics",
+    "profile_queries",
     "get_info",
     "get_server_version",
     "get_server_version_tuple",
@@ -407,6 +499,8 @@ __all__ = (
     "upload_reviewable",
     "trigger_server_restart",
     "query_graphql",
+    "query_graphql_stream",
+    "graphql_batch",
     "get_graphql_schema",
     "get_server_schema",
     "get_schemas",
@@ -523,6 +617,7 @@ __all__ = (
     "get_folders",
     "get_folder_by_id",
     "get_folder_by_path",
+    "get_folder_ids_by_paths",
     "get_folder_by_name",
     "get_folder_ids_with_products",
     "create_folder",
@@ -540,6 +635,7 @@ __all__ = (
     "delete_task",
     "get_rest_product",
     "get_products",
+    "get_products_columns",
     "get_product_by_id",
     "get_product_by_name",
     "get_product_types",
@@ -550,6 +646,7 @@ __all__ = (
     "delete_product",
     "get_rest_version",
     "get_versions",
+    "get_versions_columns",
     "get_version_by_id",
     "get_version_by_name",
     "get_hero_version_by_id",
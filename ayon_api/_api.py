@@ -42,6 +42,15 @@ from .server_api import (
 
 if typing.TYPE_CHECKING:
     from typing import Union, Literal
+    from .retries import RetryPolicy
+    from .circuit_breaker import CircuitBreaker
+    from .transports import Transport
+    from .graphql import AdaptivePageSize, GraphQlBatch
+    from .metrics import ClientMetrics
+    from .entity_cache import EntityCache
+    from .hierarchy_store import HierarchyStore
+    from .folder_path_index import FolderPathIndex
+    from .columns import EntityColumns
     from .typing import (
         ServerVersion,
         ActivityType,
@@ -529,6 +538,439 @@ def set_max_retries(
     )
 
 
+def get_retry_policy() -> RetryPolicy:
+    """Current retry policy of requests.
+
+    Returns:
+        RetryPolicy: Rules and delays of request retries.
+
+    """
+    con = get_server_api_connection()
+    return con.get_retry_policy()
+
+
+def set_retry_policy(
+    retry_policy: Optional[RetryPolicy],
+):
+    """Change retry policy of requests.
+
+    Args:
+        retry_policy (Optional[RetryPolicy]): Rules and delays of request
+            retries. Default 'RetryPolicy' is used if 'None' is passed.
+
+    """
+    con = get_server_api_connection()
+    return con.set_retry_policy(
+        retry_policy=retry_policy,
+    )
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Circuit breaker of requests.
+
+    Returns:
+        CircuitBreaker: Circuit breaker used by the connection.
+
+    """
+    con = get_server_api_connection()
+    return con.get_circuit_breaker()
+
+
+def set_circuit_breaker(
+    circuit_breaker: Optional[CircuitBreaker],
+):
+    """Change circuit breaker of requests.
+
+    Args:
+        circuit_breaker (Optional[CircuitBreaker]): Circuit breaker.
+            Default 'CircuitBreaker' is used if 'None' is passed.
+
+    """
+    con = get_server_api_connection()
+    return con.set_circuit_breaker(
+        circuit_breaker=circuit_breaker,
+    )
+
+
+def is_single_flight_enabled() -> bool:
+    """Identical requests running at the same time are shared.
+
+    Returns:
+        bool: Single-flight de-duplication is enabled.
+
+    """
+    con = get_server_api_connection()
+    return con.is_single_flight_enabled()
+
+
+def set_single_flight_enabled(
+    enabled: bool,
+):
+    """Enable or disable sharing of identical requests.
+
+    When enabled, identical GET requests and read-only GraphQl queries
+        running at the same time (e.g. from multiple threads) share
+        one request to server. Requests are identical if they have the
+        same url, body and impersonated user. Each caller receives
+        its own copy of response data.
+
+    Args:
+        enabled (bool): Enable single-flight de-duplication.
+
+    """
+    con = get_server_api_connection()
+    return con.set_single_flight_enabled(
+        enabled=enabled,
+    )
+
+
+def get_transport() -> Optional[Transport]:
+    """Transport used to send requests.
+
+    Returns:
+        Optional[Transport]: Custom transport or 'None' if sessions
+            of 'requests' are used.
+
+    """
+    con = get_server_api_connection()
+    return con.get_transport()
+
+
+def set_transport(
+    transport: Optional[Transport],
+):
+    """Change transport used to send requests.
+
+    Previous transport is not closed, it is owned by the caller.
+
+    Args:
+        transport (Optional[Transport]): Transport, e.g.
+            'HttpxTransport' for HTTP/2. Sessions of 'requests' are
+            used if 'None' is passed.
+
+    """
+    con = get_server_api_connection()
+    return con.set_transport(
+        transport=transport,
+    )
+
+
+def get_request_compression_min_size() -> int:
+    """Minimum size of request body compressed using gzip.
+
+    Returns:
+        int: Size in bytes, '0' if compression is disabled.
+
+    """
+    con = get_server_api_connection()
+    return con.get_request_compression_min_size()
+
+
+def set_request_compression_min_size(
+    min_size: Optional[int],
+):
+    """Change minimum size of request body compressed using gzip.
+
+    Only big request bodies which are known to be highly repetitive are
+        compressed, i.e. batch operations and entity list items. Server
+        (or proxy in front of it) must accept gzip encoded bodies.
+
+    Args:
+        min_size (Optional[int]): Size in bytes, '0' disables
+            compression. Default value is used if 'None' is passed.
+
+    """
+    con = get_server_api_connection()
+    return con.set_request_compression_min_size(
+        min_size=min_size,
+    )
+
+
+def get_graphql_prefetch() -> int:
+    """Number of GraphQl pages fetched ahead.
+
+    Returns:
+        int: Maximum number of pages fetched ahead, '0' if prefetch
+            is disabled.
+
+    """
+    con = get_server_api_connection()
+    return con.get_graphql_prefetch()
+
+
+def set_graphql_prefetch(
+    prefetch: Optional[int],
+):
+    """Change number of GraphQl pages fetched ahead.
+
+    When enabled, 'get_*' generators (e.g. 'get_folders') request next
+        page in a background thread while caller handles current page.
+
+    Args:
+        prefetch (Optional[int]): Maximum number of pages fetched ahead,
+            '0' disables prefetch. Default value is used if 'None'
+            is passed.
+
+    """
+    con = get_server_api_connection()
+    return con.set_graphql_prefetch(
+        prefetch=prefetch,
+    )
+
+
+def get_graphql_page_size() -> Union[int, AdaptivePageSize]:
+    """Number of edges requested in single GraphQl page.
+
+    Used by queries which don't have own page size.
+
+    Returns:
+        Union[int, AdaptivePageSize]: Page size or adaptive page size.
+
+    """
+    con = get_server_api_connection()
+    return con.get_graphql_page_size()
+
+
+def set_graphql_page_size(
+    page_size: Optional[Union[int, AdaptivePageSize]],
+):
+    """Change number of edges requested in single GraphQl page.
+
+    Adaptive page size grows or shrinks page size of each query based
+        on duration and size of received pages.
+
+    Args:
+        page_size (Optional[Union[int, AdaptivePageSize]]): Page size,
+            or adaptive page size. Default value is used if 'None'
+            is passed.
+
+    """
+    con = get_server_api_connection()
+    return con.set_graphql_page_size(
+        page_size=page_size,
+    )
+
+
+def get_graphql_chunk_size() -> int:
+    """Maximum number of ids in single GraphQl id filter.
+
+    Returns:
+        int: Maximum number of ids, '0' if chunking is disabled.
+
+    """
+    con = get_server_api_connection()
+    return con.get_graphql_chunk_size()
+
+
+def set_graphql_chunk_size(
+    chunk_size: Optional[int],
+):
+    """Change maximum number of ids in single GraphQl id filter.
+
+    Bigger id filters of 'get_*' methods (e.g. 'version_ids' of
+        'get_representations') are split to chunks queried concurrently.
+
+    Args:
+        chunk_size (Optional[int]): Maximum number of ids, '0' disables
+            chunking. Default value is used if 'None' is passed.
+
+    """
+    con = get_server_api_connection()
+    return con.set_graphql_chunk_size(
+        chunk_size=chunk_size,
+    )
+
+
+def is_graphql_persisted_queries_enabled() -> bool:
+    """GraphQl queries are sent as persisted query hashes.
+
+    Returns:
+        bool: Persisted queries are enabled.
+
+    """
+    con = get_server_api_connection()
+    return con.is_graphql_persisted_queries_enabled()
+
+
+def set_graphql_persisted_queries_enabled(
+    enabled: bool,
+):
+    """Enable or disable persisted GraphQl queries.
+
+    When enabled, read-only GraphQl queries are sent as SHA-256 hash
+        of query text. Full query text is sent with the hash on first
+        use and when server does not know the hash (cache miss), server
+        then registers the query for next requests. Hashes registered
+        on server are kept per connection. Queries are sent with full
+        text if server does not support persisted queries.
+
+    Args:
+        enabled (bool): Enable persisted queries.
+
+    """
+    con = get_server_api_connection()
+    return con.set_graphql_persisted_queries_enabled(
+        enabled=enabled,
+    )
+
+
+def get_entity_cache() -> Optional[EntityCache]:
+    """Cache of entities queried by ids.
+
+    Returns:
+        Optional[EntityCache]: Entity cache or None if entities
+            are not cached.
+
+    """
+    con = get_server_api_connection()
+    return con.get_entity_cache()
+
+
+def set_entity_cache(
+    entity_cache: Optional[EntityCache],
+):
+    """Change cache of entities queried by ids.
+
+    Getters of folders, tasks, products, versions and representations
+        which filter only by ids use cached entities and query only
+        ids missing in cache. Cached entities are invalidated when
+        they are changed or deleted using this connection.
+
+    Args:
+        entity_cache (Optional[EntityCache]): Entity cache, caching
+            is disabled if 'None' is passed.
+
+    """
+    con = get_server_api_connection()
+    return con.set_entity_cache(
+        entity_cache=entity_cache,
+    )
+
+
+def get_hierarchy_store() -> Optional[HierarchyStore]:
+    """Local store of project folders and tasks.
+
+    Returns:
+        Optional[HierarchyStore]: Hierarchy store or None if folders
+            and tasks are always queried from server.
+
+    """
+    con = get_server_api_connection()
+    return con.get_hierarchy_store()
+
+
+def set_hierarchy_store(
+    hierarchy_store: Optional[HierarchyStore],
+):
+    """Change local store of project folders and tasks.
+
+    Getters of folders and tasks which filter only by ids, paths,
+        names, types or parents use entities from the store. Project
+        is synchronized with server when its entities were not
+        synchronized for 'max_age' of the store.
+
+    Args:
+        hierarchy_store (Optional[HierarchyStore]): Hierarchy store,
+            store is not used if 'None' is passed.
+
+    """
+    con = get_server_api_connection()
+    return con.set_hierarchy_store(
+        hierarchy_store=hierarchy_store,
+    )
+
+
+def is_folder_path_index_enabled() -> bool:
+    """Folder paths are resolved to ids using folder path index.
+
+    Returns:
+        bool: Folder path index is used by path based getters.
+
+    """
+    con = get_server_api_connection()
+    return con.is_folder_path_index_enabled()
+
+
+def set_folder_path_index_enabled(
+    enabled: bool,
+):
+    """Enable or disable usage of folder path index.
+
+    Path based getters, e.g. 'get_folder_by_path' or
+        'get_tasks_by_folder_paths', resolve folder ids using index
+        of project folder paths and query entities by ids. Paths missing
+        in index are queried from server.
+
+    Index is rebuilt after 'folder_path_index_max_age' seconds, or when
+        folders are changed using this connection. Changes of other
+        clients are not visible until then, unless 'CacheInvalidator'
+        is used. Active state of folders is not checked when index
+        is used.
+
+    Args:
+        enabled (bool): Use folder path index.
+
+    """
+    con = get_server_api_connection()
+    return con.set_folder_path_index_enabled(
+        enabled=enabled,
+    )
+
+
+def get_folder_path_index(
+    project_name: str,
+    refresh: bool = False,
+) -> FolderPathIndex:
+    """Index of folder paths of a project.
+
+    Index is built from single 'get_rest_folders' call and is reused
+        until it is older than 'folder_path_index_max_age'.
+
+    Args:
+        project_name (str): Project name.
+        refresh (bool): Rebuild index even if is not outdated.
+
+    Returns:
+        FolderPathIndex: Index of folder paths.
+
+    """
+    con = get_server_api_connection()
+    return con.get_folder_path_index(
+        project_name=project_name,
+        refresh=refresh,
+    )
+
+
+def reset_folder_path_index(
+    project_name: Optional[str] = None,
+):
+    """Remove folder path index so it is rebuilt on next use.
+
+    Args:
+        project_name (Optional[str]): Project name. Indexes of all
+            projects are removed if not passed.
+
+    """
+    con = get_server_api_connection()
+    return con.reset_folder_path_index(
+        project_name=project_name,
+    )
+
+
+def get_circuit_breaker_state() -> dict[str, Any]:
+    """State of circuit breaker usable for health checks.
+
+    Does not send any request to server.
+
+    Returns:
+        dict[str, Any]: State of circuit breaker, 'state' is one of
+            'closed', 'open' or 'half-open'.
+
+    """
+    con = get_server_api_connection()
+    return con.get_circuit_breaker_state()
+
+
 def is_service_user() -> bool:
     """Check if connection is using service API key.
 
@@ -676,6 +1118,58 @@ def set_sender_type(
     )
 
 
+def get_connection_pool_info() -> dict[str, Any]:
+    """Information about pooled connections to server.
+
+    Can be used to find out if connection pool is saturated, e.g. when
+        connection is used from more threads than is size of the pool.
+
+    Returns:
+        dict[str, Any]: Pool size, block mode and state of pool of each
+            host. Hosts are empty if session is not created.
+
+    """
+    con = get_server_api_connection()
+    return con.get_connection_pool_info()
+
+
+def get_metrics() -> ClientMetrics:
+    """Metrics and request hooks of the connection.
+
+    Metrics can be exported in Prometheus text format or as flat samples
+        for other exporters.
+
+    Returns:
+        ClientMetrics: Metrics of the connection.
+
+    """
+    con = get_server_api_connection()
+    return con.get_metrics()
+
+
+def profile_queries():
+    """Record profiles of GraphQl queries executed in the context.
+
+    Queries from all threads using the connection are recorded. Each
+        profile contains name of query, call site which started it,
+        size of compiled query, pages with their latency, parse time
+        and number of edges, and paths of nested edge fields which
+        needed follow-up queries.
+
+    Example:
+        >>> with con.profile_queries() as profiler:
+        ...     folders = list(con.get_folders(project_name))
+        >>> print(profiler.to_json(indent=4))
+
+    Returns:
+        Generator[QueryProfiler, None, None]: Profiler with recorded
+            queries, available also after the context ends.
+
+    """
+    con = get_server_api_connection()
+    return con.profile_queries()
+
+
 def get_info() -> dict[str, Any]:
     """Get information about current used api key.
 
@@ -1359,6 +1853,7 @@ def upload_file_from_stream(
     *,
     content_type: Optional[str] = None,
     filename: Optional[str] = None,
+    idempotent: Optional[bool] = None,
     **kwargs,
 ) -> requests.Response:
     """Upload file to server from bytes.
@@ -1376,6 +1871,9 @@ def upload_file_from_stream(
             be used to upload file.
         content_type (Optional[str]): MIME type of the file.
         filename (Optional[str]): Filename of file on server.
+        idempotent (Optional[bool]): Upload can be safely sent again
+            on failure. Decided by request type if not passed, POST
+            uploads which create new entities are not repeated.
         **kwargs (Any): Additional arguments that will be passed
             to request function.
 
@@ -1391,6 +1889,7 @@ def upload_file_from_stream(
         request_type=request_type,
         content_type=content_type,
         filename=filename,
+        idempotent=idempotent,
         **kwargs,
     )
 
@@ -1403,6 +1902,7 @@ def upload_file(
     *,
     content_type: Optional[str] = None,
     filename: Optional[str] = None,
+    idempotent: Optional[bool] = None,
     **kwargs,
 ) -> requests.Response:
     """Upload file to server.
@@ -1420,6 +1920,9 @@ def upload_file(
             be used to upload file.
         content_type (Optional[str]): MIME type of the file.
         filename (Optional[str]): Filename of file on server.
+        idempotent (Optional[bool]): Upload can be safely sent again
+            on failure. Decided by request type if not passed, POST
+            uploads which create new entities are not repeated.
         **kwargs (Any): Additional arguments that will be passed
             to request function.
 
@@ -1435,6 +1938,7 @@ def upload_file(
         request_type=request_type,
         content_type=content_type,
         filename=filename,
+        idempotent=idempotent,
         **kwargs,
     )
 
@@ -1512,6 +2016,54 @@ def query_graphql(
     )
 
 
+def query_graphql_stream(
+    query: str,
+    variables: Optional[dict[str, Any]] = None,
+    chunk_size: int = 65536,
+) -> Generator[bytes, None, None]:
+    """Execute GraphQl query and yield raw response as it is received.
+
+    Response is not loaded to memory at once, which allows to parse
+        the response incrementally (e.g. using 'ijson').
+
+    Args:
+        query (str): GraphQl query string.
+        variables (Optional[dict[str, Any]): Variables that can be
+            used in query.
+        chunk_size (int): Maximum size of yielded chunk in bytes.
+
+    Returns:
+        Generator[bytes, None, None]: Chunks of JSON response.
+
+    """
+    con = get_server_api_connection()
+    return con.query_graphql_stream(
+        query=query,
+        variables=variables,
+        chunk_size=chunk_size,
+    )
+
+
+def graphql_batch() -> GraphQlBatch:
+    """Query first pages of multiple GraphQl queries in single request.
+
+    Next pages of queries are queried separately once the batch is
+        sent.
+
+    Example:
+        >>> with con.graphql_batch() as batch:
+        ...     batch.add_query(folders_query)
+        ...     batch.add_query(tasks_query)
+        >>> output = batch.get_output(folders_query)
+
+    Returns:
+        GraphQlBatch: Batch of queries sent on exit of context.
+
+    """
+    con = get_server_api_connection()
+    return con.graphql_batch()
+
+
 def get_graphql_schema() -> dict[str, Any]:
     con = get_server_api_connection()
     return con.get_graphql_schema()
@@ -3884,6 +4436,19 @@ def enroll_event_job(
 def get_attributes_schema(
     use_cache: bool = True,
 ) -> AttributesSchemaDict:
+    """Get attributes schema of server.
+
+    Returned schema is a copy of cached schema. Use
+        'get_attributes_for_type' to get only attributes of an entity
+        type.
+
+    Args:
+        use_cache (bool): Use cached schema if was not invalidated.
+
+    Returns:
+        AttributesSchemaDict: Attributes schema.
+
+    """
     con = get_server_api_connection()
     return con.get_attributes_schema(
         use_cache=use_cache,
@@ -3902,6 +4467,12 @@ def reset_attributes_schema() -> None:
 
 
 def reset_attributes_cache() -> None:
+    """Reset attributes schema cache of the connection.
+
+    Can be used as topic callback of 'CacheInvalidator' to reset the
+        cache when attributes are changed by other client.
+
+    """
     con = get_server_api_connection()
     return con.reset_attributes_cache()
 
@@ -3909,6 +4480,12 @@ def reset_attributes_cache() -> None:
 def set_attributes_cache_timeout(
     timeout: int,
 ) -> None:
+    """Change time after which cached schema is validated with server.
+
+    Args:
+        timeout (int): Timeout in seconds.
+
+    """
     con = get_server_api_connection()
     return con.set_attributes_cache_timeout(
         timeout=timeout,
@@ -3971,6 +4548,10 @@ def get_attributes_for_type(
 ) -> dict[str, AttributeSchemaDataDict]:
     """Get attribute schemas available for an entity type.
 
+    Returned dictionary and attribute schemas in it are copies built
+        from cached index, values of attribute schemas (e.g. 'enum')
+        are shared with the cache and must not be modified.
+
     Example::
 
         ```
@@ -4001,8 +4582,8 @@ def get_attributes_for_type(
             received.
 
     Returns:
-        dict[str, dict[str, Any]]: Attribute schemas that are available
-            for entered entity type.
+        dict[str, dict[str, Any]]: Attribute schemas that are
+            available for entered entity type.
 
     """
     con = get_server_api_connection()
@@ -4950,6 +5531,31 @@ def get_folder_by_path(
     )
 
 
+def get_folder_ids_by_paths(
+    project_name: str,
+    folder_paths: Iterable[str],
+) -> dict[str, Optional[str]]:
+    """Get folder ids by folder paths.
+
+    Ids are resolved using folder path index if enabled, only paths
+        missing in the index are queried from server.
+
+    Args:
+        project_name (str): Project name.
+        folder_paths (Iterable[str]): Folder paths.
+
+    Returns:
+        dict[str, Optional[str]]: Folder ids by passed paths, id is
+            None if folder was not found.
+
+    """
+    con = get_server_api_connection()
+    return con.get_folder_ids_by_paths(
+        project_name=project_name,
+        folder_paths=folder_paths,
+    )
+
+
 def get_folder_by_name(
     project_name: str,
     folder_name: str,
@@ -5652,6 +6258,78 @@ def get_products(
     )
 
 
+def get_products_columns(
+    project_name: str,
+    product_ids: Optional[Iterable[str]] = None,
+    product_names: Optional[Iterable[str]] = None,
+    folder_ids: Optional[Iterable[str]] = None,
+    product_types: Optional[Iterable[str]] = None,
+    product_base_types: Optional[Iterable[str]] = None,
+    product_name_regex: Optional[str] = None,
+    product_path_regex: Optional[str] = None,
+    names_by_folder_ids: Optional[dict[str, Iterable[str]]] = None,
+    statuses: Optional[Iterable[str]] = None,
+    tags: Optional[Iterable[str]] = None,
+    active: Optional[bool] = True,
+    filters: Optional[AdvancedFilterDict] = None,
+    fields: Optional[Iterable[str]] = None,
+) -> EntityColumns:
+    """Get product entities stored as columns.
+
+    Products are added to columns while they're received from server,
+        so entity dictionaries are never held in memory all at once.
+        Useful for bulk scans of many products.
+
+    Args:
+        project_name (str): Name of project.
+        product_ids (Optional[Iterable[str]]): Task ids to filter.
+        product_names (Optional[Iterable[str]]): Task names used for
+            filtering.
+        folder_ids (Optional[Iterable[str]]): Ids of task parents.
+            Use 'None' if folder is direct child of project.
+        product_types (Optional[Iterable[str]]): Product types used for
+            filtering.
+        product_base_types (Optional[Iterable[str]]): Product base types
+            used for filtering.
+        product_name_regex (Optional[str]): Filter products by name regex.
+        product_path_regex (Optional[str]): Filter products by path regex.
+            Path starts with folder path and ends with product name.
+        names_by_folder_ids (Optional[dict[str, Iterable[str]]]): Product
+            name filtering by folder id.
+        statuses (Optional[Iterable[str]]): Product statuses used
+            for filtering.
+        tags (Optional[Iterable[str]]): Product tags used
+            for filtering.
+        active (Optional[bool]): Filter active/inactive products.
+            Both are returned if is set to None.
+        filters (Optional[AdvancedFilterDict]): Advanced filtering options.
+        fields (Optional[Iterable[str]]): Fields to be queried for
+            folder. All possible folder fields are returned
+            if 'None' is passed.
+
+    Returns:
+        EntityColumns: Compacted columns of queried products.
+
+    """
+    con = get_server_api_connection()
+    return con.get_products_columns(
+        project_name=project_name,
+        product_ids=product_ids,
+        product_names=product_names,
+        folder_ids=folder_ids,
+        product_types=product_types,
+        product_base_types=product_base_types,
+        product_name_regex=product_name_regex,
+        product_path_regex=product_path_regex,
+        names_by_folder_ids=names_by_folder_ids,
+        statuses=statuses,
+        tags=tags,
+        active=active,
+        filters=filters,
+        fields=fields,
+    )
+
+
 def get_product_by_id(
     project_name: str,
     product_id: str,
@@ -5986,6 +6664,75 @@ def get_versions(
     )
 
 
+def get_versions_columns(
+    project_name: str,
+    version_ids: Optional[Iterable[str]] = None,
+    product_ids: Optional[Iterable[str]] = None,
+    task_ids: Optional[Iterable[str]] = None,
+    versions: Optional[Iterable[str]] = None,
+    hero: bool = True,
+    standard: bool = True,
+    latest: Optional[bool] = None,
+    statuses: Optional[Iterable[str]] = None,
+    tags: Optional[Iterable[str]] = None,
+    active: Optional[bool] = True,
+    filters: Optional[AdvancedFilterDict] = None,
+    fields: Optional[Iterable[str]] = None,
+) -> EntityColumns:
+    """Get version entities stored as columns.
+
+    Versions are added to columns while they're received from server,
+        so entity dictionaries are never held in memory all at once.
+        Useful for bulk scans of many versions.
+
+    Args:
+        project_name (str): Name of project where to look for versions.
+        version_ids (Optional[Iterable[str]]): Version ids used for
+            version filtering.
+        product_ids (Optional[Iterable[str]]): Product ids used for
+            version filtering.
+        task_ids (Optional[Iterable[str]]): Task ids used for
+            version filtering.
+        versions (Optional[Iterable[int]]): Versions we're interested in.
+        hero (Optional[bool]): Skip hero versions when set to False.
+        standard (Optional[bool]): Skip standard (non-hero) when
+            set to False.
+        latest (Optional[bool]): Return only latest version of standard
+            versions. This can be combined only with 'standard' attribute
+            set to True.
+        statuses (Optional[Iterable[str]]): Representation statuses used
+            for filtering.
+        tags (Optional[Iterable[str]]): Representation tags used
+            for filtering.
+        active (Optional[bool]): Receive active/inactive entities.
+            Both are returned when 'None' is passed.
+        filters (Optional[AdvancedFilterDict]): Advanced filtering options.
+        fields (Optional[Iterable[str]]): Fields to be queried
+            for version. All possible folder fields are returned
+            if 'None' is passed.
+
+    Returns:
+        EntityColumns: Compacted columns of queried versions.
+
+    """
+    con = get_server_api_connection()
+    return con.get_versions_columns(
+        project_name=project_name,
+        version_ids=version_ids,
+        product_ids=product_ids,
+        task_ids=task_ids,
+        versions=versions,
+        hero=hero,
+        standard=standard,
+        latest=latest,
+        statuses=statuses,
+        tags=tags,
+        active=active,
+        filters=filters,
+        fields=fields,
+    )
+
+
 def get_version_by_id(
     project_name: str,
     version_id: str,
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import typing
 from typing import Optional, Iterable, Generator, Any, Literal
 
@@ -8,6 +7,7 @@ from ayon_api.utils import (
     SortOrder,
     prepare_list_filters,
 )
+from ayon_api.json_codec import json_loads
 from ayon_api.graphql_queries import activities_graphql_query
 
 from .base import BaseServerAPI
@@ -102,7 +102,7 @@ class ActivitiesAPI(BaseServerAPI):
             for activity in parsed_data["project"]["activities"]:
                 activity_data = activity.get("activityData")
                 if isinstance(activity_data, str):
-                    activity["activityData"] = json.loads(activity_data)
+                    activity["activityData"] = json_loads(activity_data)
                 yield activity
 
     def get_activity_by_id(
@@ -3,86 +3,127 @@ from __future__ import annotations
 import copy
 import time
 import typing
+import threading
 from typing import Optional
 
 from .base import BaseServerAPI
 
 if typing.TYPE_CHECKING:
     from ayon_api.typing import (
-        AttributeSchemaDict,
         AttributeSchemaDataDict,
         AttributesSchemaDict,
         AttributeScope,
     )
 
+# Lock used to create attributes cache of a connection
+_CACHE_CREATE_LOCK = threading.Lock()
+
+
 class _AttributesCache:
-    _schema = None
-    _last_fetch = 0
-    _timeout = 60
-    _attributes_by_type = {}
+    """Attributes schema of a server with precomputed indexes by scope.
+
+    Schema and indexes are not copied on access and must not be modified,
+        public getters of connection return copies. Schema and indexes
+        are replaced at once, so they always belong to the same schema.
+
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Only one thread requests the schema from server at a time
+        self.refresh_lock = threading.Lock()
+        self._schema: Optional[AttributesSchemaDict] = None
+        self._etag: Optional[str] = None
+        self._last_fetch = 0
+        self._timeout = 60
+        self._attributes_by_type: dict[
+            str, dict[str, AttributeSchemaDataDict]
+        ] = {}
+        self._fields_by_type: dict[str, frozenset[str]] = {}
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self._etag
 
     def reset_schema(self) -> None:
-        self._schema = None
-        self._last_fetch = 0
-        self._attributes_by_type = {}
+        with self._lock:
+            self._schema = None
+            self._etag = None
+            self._last_fetch = 0
+            self._attributes_by_type = {}
+            self._fields_by_type = {}
 
     def set_timeout(self, timeout: int) -> None:
         self._timeout = timeout
 
-    def get_schema(self) -> AttributesSchemaDict:
-        return copy.deepcopy(self._schema)
+    def get_schema(self) -> Optional[AttributesSchemaDict]:
+        return self._schema
 
-    def set_schema(self, schema: AttributesSchemaDict) -> None:
-        self._schema = schema
-        self._last_fetch = time.time()
+    def set_schema(
+        self, schema: AttributesSchemaDict, etag: Optional[str] = None
+    ) -> None:
+        attributes_by_type = {}
+        for attr in schema["attributes"]:
+            for scope in attr["scope"]:
+                attributes_by_type.setdefault(scope, {})[attr["name"]] = (
+                    attr["data"]
+                )
+
+        fields_by_type = {
+            scope: frozenset(f"attrib.{name}" for name in attributes)
+            for scope, attributes in attributes_by_type.items()
+        }
+        with self._lock:
+            self._attributes_by_type = attributes_by_type
+            self._fields_by_type = fields_by_type
+            self._schema = schema
+            self._etag = etag
+            self._last_fetch = time.time()
+
+    def mark_fresh(self) -> None:
+        """Cached schema was confirmed by server as not modified."""
+        with self._lock:
+            self._last_fetch = time.time()
 
     def is_valid(self) -> bool:
-        if self._schema is None:
-            return False
-        return time.time() - self._last_fetch < self._timeout
-
-    def invalidate(self) -> None:
-        if not self.is_valid():
-            self.reset_schema()
+        with self._lock:
+            if self._schema is None:
+                return False
+            return time.time() - self._last_fetch < self._timeout
 
     def get_attributes_for_type(
         self, entity_type: AttributeScope
-    ) -> list[AttributeSchemaDict]:
-        attributes = self._attributes_by_type.get(entity_type)
-        if attributes is not None:
-            return attributes
-
-        attributes_schema = self.get_schema()
-        if attributes_schema is None:
-            raise ValueError("Attributes schema is not cached.")
-
-        attributes = []
-        for attr in attributes_schema["attributes"]:
-            if entity_type not in attr["scope"]:
-                continue
-            attributes.append(attr)
-
-        self._attributes_by_type[entity_type] = attributes
-        return attributes
+    ) -> dict[str, AttributeSchemaDataDict]:
+        with self._lock:
+            return self._attributes_by_type.get(entity_type, {})
 
+    def get_fields_for_type(
+        self, entity_type: AttributeScope
+    ) -> frozenset[str]:
+        with self._lock:
+            return self._fields_by_type.get(entity_type, frozenset())
 
 
 class AttributesAPI(BaseServerAPI):
-    _attributes_cache = _AttributesCache()
+    _attributes_cache: Optional[_AttributesCache] = None
 
     def get_attributes_schema(
         self, use_cache: bool = True
     ) -> AttributesSchemaDict:
-        if not use_cache:
-            self._attributes_cache.reset_schema()
-        else:
-            self._attributes_cache.invalidate()
+        """Get attributes schema of server.
+
+        Returned schema is a copy of cached schema. Use
+            'get_attributes_for_type' to get only attributes of an entity
+            type.
 
-        if not self._attributes_cache.is_valid():
-            result = self.get("attributes")
-            result.raise_for_status()
-            self._attributes_cache.set_schema(result.data)
-        return self._attributes_cache.get_schema()
+        Args:
+            use_cache (bool): Use cached schema if was not invalidated.
+
+        Returns:
+            AttributesSchemaDict: Attributes schema.
+
+        """
+        attributes_cache = self._get_valid_attributes_cache(use_cache)
+        return copy.deepcopy(attributes_cache.get_schema())
 
     def reset_attributes_schema(self) -> None:
         """Reset attributes schema cache.
@@ -98,10 +139,23 @@ class AttributesAPI(BaseServerAPI):
         self.reset_attributes_cache()
 
     def reset_attributes_cache(self) -> None:
-        self._attributes_cache.reset_schema()
+        """Reset attributes schema cache of the connection.
+
+        Can be used as topic callback of 'CacheInvalidator' to reset the
+            cache when attributes are changed by other client.
+
+        """
+        if self._attributes_cache is not None:
+            self._attributes_cache.reset_schema()
 
     def set_attributes_cache_timeout(self, timeout: int) -> None:
-        self._attributes_cache.set_timeout(timeout)
+        """Change time after which cached schema is validated with server.
+
+        Args:
+            timeout (int): Timeout in seconds.
+
+        """
+        self._get_attributes_cache().set_timeout(timeout)
 
     def set_attribute_config(
         self,
@@ -137,7 +191,7 @@ class AttributesAPI(BaseServerAPI):
             f" {response.detail}"
         )
 
-        self.reset_attributes_schema()
+        self.reset_attributes_cache()
 
     def delete_attribute_config(self, attribute_name: str) -> None:
         """Remove attribute from server.
@@ -154,7 +208,7 @@ class AttributesAPI(BaseServerAPI):
             f" {response.detail}"
         )
 
-        self.reset_attributes_schema()
+        self.reset_attributes_cache()
 
     def remove_attribute_config(self, attribute_name: str) -> None:
         """Remove attribute from server.
@@ -172,6 +226,10 @@ class AttributesAPI(BaseServerAPI):
     ) -> dict[str, AttributeSchemaDataDict]:
         """Get attribute schemas available for an entity type.
 
+        Returned dictionary and attribute schemas in it are copies built
+            from cached index, values of attribute schemas (e.g. 'enum')
+            are shared with the cache and must not be modified.
+
         Example::
 
             ```
@@ -202,17 +260,16 @@ class AttributesAPI(BaseServerAPI):
                 received.
 
         Returns:
-            dict[str, dict[str, Any]]: Attribute schemas that are available
-                for entered entity type.
+            dict[str, dict[str, Any]]: Attribute schemas that are
+                available for entered entity type.
 
         """
-        # Make sure attributes are cached
-        self.get_attributes_schema()
+        attributes_cache = self._get_valid_attributes_cache()
         return {
-            attr["name"]: attr["data"]
-            for attr in self._attributes_cache.get_attributes_for_type(
+            name: dict(data)
+            for name, data in attributes_cache.get_attributes_for_type(
                 entity_type
-            )
+            ).items()
         }
 
     def get_attributes_fields_for_type(
@@ -232,8 +289,50 @@ class AttributesAPI(BaseServerAPI):
             " not be used for GraphQL queries. Use 'allAttrib' field instead"
             " of 'attrib'."
         )
-        attributes = self.get_attributes_for_type(entity_type)
-        return {
-            f"attrib.{attr}"
-            for attr in attributes
-        }
+        attributes_cache = self._get_valid_attributes_cache()
+        return set(attributes_cache.get_fields_for_type(entity_type))
+
+    def _get_attributes_cache(self) -> _AttributesCache:
+        if self._attributes_cache is None:
+            with _CACHE_CREATE_LOCK:
+                if self._attributes_cache is None:
+                    self._attributes_cache = _AttributesCache()
+        return self._attributes_cache
+
+    def _get_valid_attributes_cache(
+        self, use_cache: bool = True
+    ) -> _AttributesCache:
+        """Attributes cache with schema validated with server.
+
+        Expired schema is validated using 'ETag' received with the schema,
+            so it is received again only if was changed.
+
+        Args:
+            use_cache (bool): Receive schema even if cache is valid.
+
+        Returns:
+            _AttributesCache: Attributes cache.
+
+        """
+        attributes_cache = self._get_attributes_cache()
+        if use_cache and attributes_cache.is_valid():
+            return attributes_cache
+
+        with attributes_cache.refresh_lock:
+            # Schema may have been received by other thread in the meantime
+            if use_cache and attributes_cache.is_valid():
+                return attributes_cache
+
+            headers = self.get_headers()
+            etag = attributes_cache.etag if use_cache else None
+            if etag:
+                headers["If-None-Match"] = etag
+            response = self.raw_get("attributes", headers=headers)
+            if etag and response.status == 304:
+                attributes_cache.mark_fresh()
+            else:
+                response.raise_for_status()
+                attributes_cache.set_schema(
+                    response.data, response.headers.get("ETag")
+                )
+        return attributes_cache
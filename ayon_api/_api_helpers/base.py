@@ -2,13 +2,15 @@ from __future__ import annotations
 
 import logging
 import typing
-from typing import Optional, Any, Iterable, Union
+from typing import Optional, Any, Iterable, Union, Generator
 
 import requests
 
 from ayon_api.utils import TransferProgress, RequestType
 
 if typing.TYPE_CHECKING:
+    from ayon_api.graphql import GraphQlQuery
+    from ayon_api.folder_path_index import FolderPathIndex
     from ayon_api.typing import (
         AnyEntityDict,
         ServerVersion,
@@ -59,6 +61,11 @@ class BaseServerAPI:
     def delete(self, entrypoint: str, **kwargs):
         raise NotImplementedError()
 
+    def get_headers(
+        self, content_type: Optional[str] = None
+    ) -> dict[str, str]:
+        raise NotImplementedError()
+
     def raw_get(self, entrypoint: str, **kwargs):
         raise NotImplementedError()
 
@@ -120,6 +127,19 @@ class BaseServerAPI:
     ) -> Optional[AnyEntityDict]:
         raise NotImplementedError()
 
+    def is_folder_path_index_enabled(self) -> bool:
+        raise NotImplementedError()
+
+    def get_folder_path_index(
+        self, project_name: str, refresh: bool = False
+    ) -> FolderPathIndex:
+        raise NotImplementedError()
+
+    def reset_folder_path_index(
+        self, project_name: Optional[str] = None
+    ) -> None:
+        raise NotImplementedError()
+
     def get_project(
         self,
         project_name: str,
@@ -159,6 +179,25 @@ class BaseServerAPI:
     ) -> Optional[str]:
         raise NotImplementedError()
 
+    def _get_stored_entities(
+        self,
+        project_name: str,
+        entity_type: str,
+        fields: set[str],
+        graphql_filters: dict[str, Any],
+    ) -> Optional[list[dict[str, Any]]]:
+        raise NotImplementedError()
+
+    def _iter_graphql_entities(
+        self,
+        query: GraphQlQuery,
+        project_name: str,
+        entity_type: str,
+        fields: set[str],
+        ids_filter_key: str,
+    ) -> Generator[dict[str, Any], None, None]:
+        raise NotImplementedError()
+
     def _convert_entity_data(self, entity: AnyEntityDict):
         raise NotImplementedError()
 
@@ -144,9 +144,7 @@ class EventsAPI(BaseServerAPI):
             events_field = query.get_field_by_path("events")
             events_field.set_limit(limit)
 
-        for parsed_data in query.continuous_query(self):
-            for event in parsed_data["events"]:
-                yield event
+        yield from query.iter_edges(self)
 
     def update_event(
         self,
@@ -13,6 +13,7 @@ from ayon_api.utils import (
     NOT_SET,
 )
 from ayon_api.graphql_queries import folders_graphql_query
+from ayon_api.folder_path_index import normalize_folder_path
 
 from .base import BaseServerAPI
 
@@ -333,20 +334,27 @@ class FoldersAPI(BaseServerAPI):
 
         self._prepare_link_fields(fields)
 
-        query = folders_graphql_query(fields)
-        for attr, filter_value in graphql_filters.items():
-            query.set_variable_value(attr, filter_value)
+        folders = self._get_stored_entities(
+            project_name, "folder", fields, graphql_filters
+        )
+        if folders is None:
+            query = folders_graphql_query(fields)
+            for attr, filter_value in graphql_filters.items():
+                query.set_variable_value(attr, filter_value)
+
+            folders = self._iter_graphql_entities(
+                query, project_name, "folder", fields, "folderIds"
+            )
 
-        for parsed_data in query.continuous_query(self):
-            for folder in parsed_data["project"]["folders"]:
-                if active is not None and active is not folder["active"]:
-                    continue
+        for folder in folders:
+            if active is not None and active is not folder["active"]:
+                continue
 
-                self._convert_entity_data(folder)
+            self._convert_entity_data(folder)
 
-                if own_attributes:
-                    fill_own_attribs(folder)
-                yield folder
+            if own_attributes:
+                fill_own_attribs(folder)
+            yield folder
 
     def get_folder_by_id(
         self,
@@ -407,6 +415,25 @@ class FoldersAPI(BaseServerAPI):
                 if was not found.
 
         """
+        if self.is_folder_path_index_enabled():
+            index = self.get_folder_path_index(project_name)
+            folder_id = index.get_id(folder_path)
+            if folder_id is not None:
+                folder = self.get_folder_by_id(
+                    project_name,
+                    folder_id,
+                    fields=fields,
+                    own_attributes=own_attributes,
+                )
+                normalized_path = normalize_folder_path(folder_path)
+                if (
+                    folder is not None
+                    and folder.get("path", normalized_path) == normalized_path
+                ):
+                    return folder
+                # Folder was moved or removed by other client
+                self.reset_folder_path_index(project_name)
+
         folders = self.get_folders(
             project_name,
             folder_paths=[folder_path],
@@ -418,6 +445,55 @@ class FoldersAPI(BaseServerAPI):
             return folder
         return None
 
+    def get_folder_ids_by_paths(
+        self,
+        project_name: str,
+        folder_paths: Iterable[str],
+    ) -> dict[str, Optional[str]]:
+        """Get folder ids by folder paths.
+
+        Ids are resolved using folder path index if enabled, only paths
+            missing in the index are queried from server.
+
+        Args:
+            project_name (str): Project name.
+            folder_paths (Iterable[str]): Folder paths.
+
+        Returns:
+            dict[str, Optional[str]]: Folder ids by passed paths, id is
+                None if folder was not found.
+
+        """
+        output = {
+            folder_path: None
+            for folder_path in folder_paths
+        }
+        if not project_name or not output:
+            return output
+
+        if self.is_folder_path_index_enabled():
+            index = self.get_folder_path_index(project_name)
+            output.update(index.get_ids(output))
+
+        paths_by_normalized = {
+            normalize_folder_path(folder_path): folder_path
+            for folder_path, folder_id in output.items()
+            if folder_id is None
+        }
+        if not paths_by_normalized:
+            return output
+
+        for folder in self.get_folders(
+            project_name,
+            folder_paths=paths_by_normalized.keys(),
+            active=None,
+            fields={"id", "path"},
+        ):
+            folder_path = paths_by_normalized.get(folder["path"])
+            if folder_path is not None:
+                output[folder_path] = folder["id"]
+        return output
+
     def get_folder_by_name(
         self,
         project_name: str,
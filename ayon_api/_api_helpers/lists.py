@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import json
 import typing
 from typing import Optional, Iterable, Any, Generator
 
-from ayon_api.utils import NOT_SET, create_entity_id
+from ayon_api.utils import NOT_SET, create_entity_id, fill_attrib_defaults
+from ayon_api.json_codec import json_loads
 from ayon_api.graphql_queries import entity_lists_graphql_query
 
 from .base import BaseServerAPI
@@ -98,14 +98,13 @@ class ListsAPI(BaseServerAPI):
 
                 attributes = entity_list.get("attributes")
                 if isinstance(attributes, str):
-                    entity_list["attributes"] = json.loads(attributes)
+                    entity_list["attributes"] = json_loads(attributes)
 
                 self._convert_entity_data(entity_list)
 
                 attrib = entity_list.get("attrib")
                 if attrib is not None:
-                    for attrib_name, attrib_data in available_attribs.items():
-                        attrib.setdefault(attrib_name, attrib_data["default"])
+                    fill_attrib_defaults(attrib, available_attribs)
 
                 yield entity_list
 
@@ -394,10 +393,10 @@ class ListsAPI(BaseServerAPI):
             mode (EntityListItemMode): Mode of items update.
 
         """
-        response = self.patch(
+        response = self.raw_patch(
             f"projects/{project_name}/lists/{list_id}/items",
-            items=items,
-            mode=mode,
+            json={"items": items, "mode": mode},
+            compressible=True,
         )
         response.raise_for_status()
 
@@ -14,6 +14,7 @@ from ayon_api.graphql_queries import (
     products_graphql_query,
     product_types_query,
 )
+from ayon_api.columns import EntityColumns
 
 from .base import BaseServerAPI, _PLACEHOLDER
 
@@ -185,9 +186,9 @@ class ProductsAPI(BaseServerAPI):
         for attr, filter_value in graphql_filters.items():
             query.set_variable_value(attr, filter_value)
 
-        parsed_data = query.query(self)
-
-        products = parsed_data.get("project", {}).get("products", [])
+        products = self._iter_graphql_entities(
+            query, project_name, "product", fields, "productIds"
+        )
         # Filter products by 'names_by_folder_ids'
         if names_by_folder_ids:
             products_by_folder_id = collections.defaultdict(list)
@@ -212,6 +213,77 @@ class ProductsAPI(BaseServerAPI):
                 if filtered_product is not None:
                     yield filtered_product
 
+    def get_products_columns(
+        self,
+        project_name: str,
+        product_ids: Optional[Iterable[str]] = None,
+        product_names: Optional[Iterable[str]] = None,
+        folder_ids: Optional[Iterable[str]] = None,
+        product_types: Optional[Iterable[str]] = None,
+        product_base_types: Optional[Iterable[str]] = None,
+        product_name_regex: Optional[str] = None,
+        product_path_regex: Optional[str] = None,
+        names_by_folder_ids: Optional[dict[str, Iterable[str]]] = None,
+        statuses: Optional[Iterable[str]] = None,
+        tags: Optional[Iterable[str]] = None,
+        active: Optional[bool] = True,
+        filters: Optional[AdvancedFilterDict] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> EntityColumns:
+        """Get product entities stored as columns.
+
+        Products are added to columns while they're received from server,
+            so entity dictionaries are never held in memory all at once.
+            Useful for bulk scans of many products.
+
+        Args:
+            project_name (str): Name of project.
+            product_ids (Optional[Iterable[str]]): Task ids to filter.
+            product_names (Optional[Iterable[str]]): Task names used for
+                filtering.
+            folder_ids (Optional[Iterable[str]]): Ids of task parents.
+                Use 'None' if folder is direct child of project.
+            product_types (Optional[Iterable[str]]): Product types used for
+                filtering.
+            product_base_types (Optional[Iterable[str]]): Product base types
+                used for filtering.
+            product_name_regex (Optional[str]): Filter products by name regex.
+            product_path_regex (Optional[str]): Filter products by path regex.
+                Path starts with folder path and ends with product name.
+            names_by_folder_ids (Optional[dict[str, Iterable[str]]]): Product
+                name filtering by folder id.
+            statuses (Optional[Iterable[str]]): Product statuses used
+                for filtering.
+            tags (Optional[Iterable[str]]): Product tags used
+                for filtering.
+            active (Optional[bool]): Filter active/inactive products.
+                Both are returned if is set to None.
+            filters (Optional[AdvancedFilterDict]): Advanced filtering options.
+            fields (Optional[Iterable[str]]): Fields to be queried for
+                folder. All possible folder fields are returned
+                if 'None' is passed.
+
+        Returns:
+            EntityColumns: Compacted columns of queried products.
+
+        """
+        return EntityColumns.from_entities(self.get_products(
+            project_name,
+            product_ids=product_ids,
+            product_names=product_names,
+            folder_ids=folder_ids,
+            product_types=product_types,
+            product_base_types=product_base_types,
+            product_name_regex=product_name_regex,
+            product_path_regex=product_path_regex,
+            names_by_folder_ids=names_by_folder_ids,
+            statuses=statuses,
+            tags=tags,
+            active=active,
+            filters=filters,
+            fields=fields,
+        ))
+
     def get_product_by_id(
         self,
         project_name: str,
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import platform
 import warnings
 from enum import Enum
@@ -11,7 +10,12 @@ from ayon_api.constants import (
     PROJECT_NAME_REGEX,
     DEFAULT_PRODUCT_TYPE_FIELDS,
 )
-from ayon_api.utils import prepare_query_string, fill_own_attribs
+from ayon_api.utils import (
+    prepare_query_string,
+    fill_own_attribs,
+    fill_attrib_defaults,
+)
+from ayon_api.json_codec import json_loads
 from ayon_api.graphql_queries import projects_graphql_query
 
 from .base import BaseServerAPI
@@ -163,11 +167,9 @@ class ProjectsAPI(BaseServerAPI):
         if response.status != 200:
             return None
         project = response.data
-        attrib = project["attrib"]
-        for attr_name, attr_data in (
-            self.get_attributes_for_type("project").items()
-        ):
-            attrib.setdefault(attr_name, attr_data["default"])
+        fill_attrib_defaults(
+            project["attrib"], self.get_attributes_for_type("project")
+        )
         self._fill_project_entity_data(project)
         return project
 
@@ -868,7 +870,7 @@ class ProjectsAPI(BaseServerAPI):
             if project_data is None:
                 project["data"] = {}
             elif isinstance(project_data, str):
-                project_data = json.loads(project_data)
+                project_data = json_loads(project_data)
                 project["data"] = project_data
 
             # Fill 'bundle' from data if is not filled
@@ -887,7 +889,7 @@ class ProjectsAPI(BaseServerAPI):
             if config is None:
                 project["config"] = {}
             elif isinstance(config, str):
-                project["config"] = json.loads(config)
+                project["config"] = json_loads(config)
 
         # Unifiy 'linkTypes' data structure from REST and GraphQL
         if "linkTypes" in project:
@@ -939,16 +941,15 @@ class ProjectsAPI(BaseServerAPI):
                 attrib = None
                 all_attrib = project.get("allAttrib")
                 if isinstance(all_attrib, str):
-                    attrib = json.loads(all_attrib)
+                    attrib = json_loads(all_attrib)
 
                 if attrib is not None:
                     # NOTE 'ownAttrib' logic might change in the future if
                     #   allAttrib would return all attribute values.
                     project["ownAttrib"] = list(attrib)
                     project["attrib"] = attrib
-                    for name, attr_data in attributes.items():
-                        # NOTE 'default' can be 'None'
-                        attrib.setdefault(name, attr_data["default"])
+                    # NOTE 'default' can be 'None'
+                    fill_attrib_defaults(attrib, attributes)
 
                 if own_attributes:
                     fill_own_attribs(project)
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import warnings
 import typing
 from typing import Optional, Iterable, Generator, Any
@@ -12,6 +11,7 @@ from ayon_api.utils import (
     PatternType,
     create_entity_id,
 )
+from ayon_api.json_codec import json_loads
 from ayon_api.graphql_queries import (
     representations_graphql_query,
     representations_hierarchy_qraphql_query,
@@ -175,16 +175,21 @@ class RepresentationsAPI(BaseServerAPI):
         for attr, filter_value in graphql_filters.items():
             query.set_variable_value(attr, filter_value)
 
-        for parsed_data in query.continuous_query(self):
-            for repre in parsed_data["project"]["representations"]:
-                if active is not None and active is not repre["active"]:
-                    continue
+        for repre in self._iter_graphql_entities(
+            query,
+            project_name,
+            "representation",
+            fields,
+            "representationIds",
+        ):
+            if active is not None and active is not repre["active"]:
+                continue
 
-                self._convert_entity_data(repre)
+            self._convert_entity_data(repre)
 
-                self._representation_conversion(repre)
+            self._representation_conversion(repre)
 
-                yield repre
+            yield repre
 
     def get_representation_by_id(
         self,
@@ -744,7 +749,7 @@ class RepresentationsAPI(BaseServerAPI):
             orig_context = representation["context"]
             context = {}
             if orig_context and orig_context != "null":
-                context = json.loads(orig_context)
+                context = json_loads(orig_context)
             representation["context"] = context
 
         repre_files = representation.get("files")
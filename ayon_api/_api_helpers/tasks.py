@@ -105,20 +105,27 @@ class TasksAPI(BaseServerAPI):
 
         self._prepare_link_fields(fields)
 
-        query = tasks_graphql_query(fields)
-        for attr, filter_value in graphql_filters.items():
-            query.set_variable_value(attr, filter_value)
+        tasks = self._get_stored_entities(
+            project_name, "task", fields, graphql_filters
+        )
+        if tasks is None:
+            query = tasks_graphql_query(fields)
+            for attr, filter_value in graphql_filters.items():
+                query.set_variable_value(attr, filter_value)
+
+            tasks = self._iter_graphql_entities(
+                query, project_name, "task", fields, "taskIds"
+            )
 
-        for parsed_data in query.continuous_query(self):
-            for task in parsed_data["project"]["tasks"]:
-                if active is not None and active is not task["active"]:
-                    continue
+        for task in tasks:
+            if active is not None and active is not task["active"]:
+                continue
 
-                self._convert_entity_data(task)
+            self._convert_entity_data(task)
 
-                if own_attributes:
-                    fill_own_attribs(task)
-                yield task
+            if own_attributes:
+                fill_own_attribs(task)
+            yield task
 
     def get_task_by_name(
         self,
@@ -240,14 +247,38 @@ class TasksAPI(BaseServerAPI):
         if not project_name or not output:
             return output
 
-        folder_path_by_id = {
-            folder["id"]: folder["path"]
-            for folder in self.get_folders(
-                project_name,
-                folder_paths=output.keys(),
-                fields={"id", "path"},
+        if self.is_folder_path_index_enabled():
+            folder_ids_by_path = self.get_folder_ids_by_paths(
+                project_name, output.keys()
             )
-        }
+            # Index does not know active state of folders, tasks of
+            #   inactive folders are not returned
+            active_folder_ids = {
+                folder["id"]
+                for folder in self.get_folders(
+                    project_name,
+                    folder_ids={
+                        folder_id
+                        for folder_id in folder_ids_by_path.values()
+                        if folder_id is not None
+                    },
+                    fields={"id"},
+                )
+            }
+            folder_path_by_id = {
+                folder_id: folder_path
+                for folder_path, folder_id in folder_ids_by_path.items()
+                if folder_id in active_folder_ids
+            }
+        else:
+            folder_path_by_id = {
+                folder["id"]: folder["path"]
+                for folder in self.get_folders(
+                    project_name,
+                    folder_paths=output.keys(),
+                    fields={"id", "path"},
+                )
+            }
 
         if not fields:
             fields = self.get_default_fields_for_type("task")
@@ -10,6 +10,7 @@ from ayon_api.utils import (
     prepare_list_filters,
 )
 from ayon_api.graphql import GraphQlQuery
+from ayon_api.columns import EntityColumns
 from ayon_api.graphql_queries import versions_graphql_query
 
 from .base import BaseServerAPI, _PLACEHOLDER
@@ -155,17 +156,86 @@ class VersionsAPI(BaseServerAPI):
                 queries.append(standard_query)
 
         for query in queries:
-            for parsed_data in query.continuous_query(self):
-                for version in parsed_data["project"]["versions"]:
-                    if active is not None and version["active"] is not active:
-                        continue
+            for version in self._iter_graphql_entities(
+                query, project_name, "version", fields, "versionIds"
+            ):
+                if active is not None and version["active"] is not active:
+                    continue
 
-                    if not hero and version["version"] < 0:
-                        continue
+                if not hero and version["version"] < 0:
+                    continue
 
-                    self._convert_entity_data(version)
+                self._convert_entity_data(version)
 
-                    yield version
+                yield version
+
+    def get_versions_columns(
+        self,
+        project_name: str,
+        version_ids: Optional[Iterable[str]] = None,
+        product_ids: Optional[Iterable[str]] = None,
+        task_ids: Optional[Iterable[str]] = None,
+        versions: Optional[Iterable[str]] = None,
+        hero: bool = True,
+        standard: bool = True,
+        latest: Optional[bool] = None,
+        statuses: Optional[Iterable[str]] = None,
+        tags: Optional[Iterable[str]] = None,
+        active: Optional[bool] = True,
+        filters: Optional[AdvancedFilterDict] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> EntityColumns:
+        """Get version entities stored as columns.
+
+        Versions are added to columns while they're received from server,
+            so entity dictionaries are never held in memory all at once.
+            Useful for bulk scans of many versions.
+
+        Args:
+            project_name (str): Name of project where to look for versions.
+            version_ids (Optional[Iterable[str]]): Version ids used for
+                version filtering.
+            product_ids (Optional[Iterable[str]]): Product ids used for
+                version filtering.
+            task_ids (Optional[Iterable[str]]): Task ids used for
+                version filtering.
+            versions (Optional[Iterable[int]]): Versions we're interested in.
+            hero (Optional[bool]): Skip hero versions when set to False.
+            standard (Optional[bool]): Skip standard (non-hero) when
+                set to False.
+            latest (Optional[bool]): Return only latest version of standard
+                versions. This can be combined only with 'standard' attribute
+                set to True.
+            statuses (Optional[Iterable[str]]): Representation statuses used
+                for filtering.
+            tags (Optional[Iterable[str]]): Representation tags used
+                for filtering.
+            active (Optional[bool]): Receive active/inactive entities.
+                Both are returned when 'None' is passed.
+            filters (Optional[AdvancedFilterDict]): Advanced filtering options.
+            fields (Optional[Iterable[str]]): Fields to be queried
+                for version. All possible folder fields are returned
+                if 'None' is passed.
+
+        Returns:
+            EntityColumns: Compacted columns of queried versions.
+
+        """
+        return EntityColumns.from_entities(self.get_versions(
+            project_name,
+            version_ids=version_ids,
+            product_ids=product_ids,
+            task_ids=task_ids,
+            versions=versions,
+            hero=hero,
+            standard=standard,
+            latest=latest,
+            statuses=statuses,
+            tags=tags,
+            active=active,
+            filters=filters,
+            fields=fields,
+        ))
 
     def get_version_by_id(
         self,
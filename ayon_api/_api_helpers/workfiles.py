@@ -100,10 +100,9 @@ class WorkfilesAPI(BaseServerAPI):
         for attr, filter_value in filters.items():
             query.set_variable_value(attr, filter_value)
 
-        for parsed_data in query.continuous_query(self):
-            for workfile_info in parsed_data["project"]["workfiles"]:
-                self._convert_entity_data(workfile_info)
-                yield workfile_info
+        for workfile_info in query.iter_edges(self):
+            self._convert_entity_data(workfile_info)
+            yield workfile_info
 
     def get_workfile_entity(
         self,
@@ -0,0 +1,434 @@
+"""Asyncio server API.
+
+Provides 'AsyncServerAPI' which exposes the same methods as 'ServerAPI' but
+as coroutines and async generators, so many calls can be awaited
+concurrently on a single event loop.
+
+Blocking calls are executed in a thread pool owned by the connection, which
+relies on 'ServerAPI' being safe to use from multiple threads (session per
+thread, token state guarded by lock). Each call runs in a copy of
+the caller's context, so context based state (e.g. impersonation using
+'as_username' or 'as_sender') follows the awaiting task.
+
+Properties of 'ServerAPI' which communicate with server (e.g.
+'server_version' or 'has_valid_token') are coroutine methods instead,
+e.g. 'await con.server_version()'.
+
+Example:
+    >>> async def main():
+    ...     async with AsyncServerAPI(url, token) as con:
+    ...         folders, versions = await asyncio.gather(
+    ...             con.get_folders_list(project_name),
+    ...             con.get_versions_list(project_name),
+    ...         )
+    ...         async for product in con.get_products(project_name):
+    ...             print(product["name"])
+
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+import typing
+from typing import Optional, Any, Callable, AsyncGenerator
+
+from .server_api import ServerAPI
+
+if typing.TYPE_CHECKING:
+    from .graphql import GraphQlQuery
+
+# Pairs of connection setting methods (see '_get_sync_methods') which
+#   communicate with server and are wrapped to coroutines.
+_IO_SETTING_METHODS = {
+    "get_server_config",
+    "set_server_config",
+    # Validates token
+    "set_default_service_username",
+}
+
+# Methods that don't communicate with server and are not connection
+#   setting pairs.
+_LOCAL_METHODS = {
+    "get_base_url",
+    "get_rest_url",
+    "get_headers",
+    "get_connection_pool_info",
+    "get_metrics",
+    "get_circuit_breaker_state",
+    "graphql_batch",
+    "reset_folder_path_index",
+    "reset_attributes_cache",
+    "set_attributes_cache_timeout",
+}
+
+
+def _get_sync_methods() -> set[str]:
+    """Public methods of 'ServerAPI' which are not wrapped to coroutines.
+
+    Connection settings are detected as pairs of methods defined on
+        'ServerAPI' itself, e.g. 'get_timeout' and 'set_timeout' or
+        'is_single_flight_enabled' and 'set_single_flight_enabled'.
+        Context managers, class and static methods are synchronous too.
+
+    Returns:
+        set[str]: Names of synchronous methods.
+
+    """
+    own_names = {
+        attr_name
+        for attr_name in ServerAPI.__dict__
+        if not attr_name.startswith("_")
+    }
+    output = set(_LOCAL_METHODS)
+    for attr_name in dir(ServerAPI):
+        if attr_name.startswith("_"):
+            continue
+        attr = inspect.getattr_static(ServerAPI, attr_name)
+        if isinstance(attr, (classmethod, staticmethod)):
+            output.add(attr_name)
+            continue
+
+        if not inspect.isfunction(attr):
+            continue
+
+        # Functions decorated with 'contextmanager'
+        wrapped = getattr(attr, "__wrapped__", None)
+        if wrapped is not None and inspect.isgeneratorfunction(wrapped):
+            output.add(attr_name)
+            continue
+
+        if attr_name not in own_names:
+            continue
+        prefix, _, name = attr_name.partition("_")
+        if prefix == "set":
+            counterparts = {f"get_{name}", f"is_{name}"}
+        elif prefix in ("get", "is"):
+            counterparts = {f"set_{name}"}
+        else:
+            continue
+        if counterparts & own_names:
+            output.add(attr_name)
+
+    return output - _IO_SETTING_METHODS
+
+
+# Methods that don't communicate with server and are not wrapped
+#   to coroutines.
+_SYNC_METHODS = _get_sync_methods()
+
+# Properties which may communicate with server, exposed as coroutine methods
+#   so they don't block event loop.
+_IO_PROPERTIES = {
+    "graphql_allows_traits_in_representations",
+    "has_valid_token",
+    "is_server_available",
+    "server_version",
+    "server_version_tuple",
+}
+
+
+def _next_chunk(iterator, chunk_size: int) -> list[Any]:
+    output = []
+    for item in iterator:
+        output.append(item)
+        if len(output) >= chunk_size:
+            break
+    return output
+
+
+class AsyncServerAPI:
+    """Asyncio wrapper of 'ServerAPI'.
+
+    All public methods of 'ServerAPI' are available. Methods which
+        communicate with server are coroutines, generator methods
+        (e.g. 'get_folders') are async generators. Connection settings
+        and other methods which don't communicate with server
+        ('_SYNC_METHODS') and properties are forwarded without changes.
+
+    Generator methods have also '<name>_list' coroutine variant which
+        collects all items to a list, which is handy with 'asyncio.gather'.
+
+    Args:
+        base_url (str): Example: http://localhost:5000
+        token (Optional[str]): Access token (api key) to server.
+        max_workers (Optional[int]): Maximum number of threads used for
+            blocking calls. Default of 'ThreadPoolExecutor' is used
+            if not passed.
+        **kwargs (Any): Other arguments passed to 'ServerAPI'.
+
+    """
+    # How many items of generator are received in single thread call
+    generator_chunk_size = 100
+
+    def __init__(
+        self,
+        base_url: str,
+        token: Optional[str] = None,
+        *,
+        max_workers: Optional[int] = None,
+        **kwargs
+    ):
+        con = ServerAPI(base_url, token, **kwargs)
+        self._init_connection(con, max_workers)
+
+    @classmethod
+    def from_server_api(
+        cls,
+        con: ServerAPI,
+        max_workers: Optional[int] = None,
+    ) -> AsyncServerAPI:
+        """Create async connection from existing 'ServerAPI' object.
+
+        Args:
+            con (ServerAPI): Connection to server.
+            max_workers (Optional[int]): Maximum number of threads used for
+                blocking calls.
+
+        Returns:
+            AsyncServerAPI: Async connection using passed connection.
+
+        """
+        obj = cls.__new__(cls)
+        obj._init_connection(con, max_workers)
+        return obj
+
+    def _init_connection(
+        self, con: ServerAPI, max_workers: Optional[int]
+    ) -> None:
+        self._con: ServerAPI = con
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="AsyncServerAPI",
+        )
+
+    @property
+    def server_api(self) -> ServerAPI:
+        """Wrapped synchronous connection.
+
+        Returns:
+            ServerAPI: Connection used for requests.
+
+        """
+        return self._con
+
+    @property
+    def log(self):
+        return self._con.log
+
+    async def run_in_executor(
+        self, func: Callable[..., Any], *args, **kwargs
+    ) -> Any:
+        """Run blocking function in connection thread pool.
+
+        The function is executed in a copy of current context.
+
+        Args:
+            func (Callable[..., Any]): Function to call.
+            *args (Any): Positional arguments for the function.
+            **kwargs (Any): Keyword arguments for the function.
+
+        Returns:
+            Any: Result of the function.
+
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(context.run, func, *args, **kwargs)
+        )
+
+    async def iterate_in_executor(
+        self, iterator
+    ) -> AsyncGenerator[Any, None]:
+        """Iterate over blocking iterator in connection thread pool.
+
+        Items are received in chunks defined by 'generator_chunk_size' to
+            avoid switching threads for each item.
+
+        Args:
+            iterator (Iterator[Any]): Blocking iterator.
+
+        Returns:
+            AsyncGenerator[Any, None]: Items of the iterator.
+
+        """
+        try:
+            while True:
+                chunk = await self.run_in_executor(
+                    _next_chunk, iterator, self.generator_chunk_size
+                )
+                for item in chunk:
+                    yield item
+
+                if len(chunk) < self.generator_chunk_size:
+                    break
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                await self.run_in_executor(close)
+
+    async def query_graphql(
+        self,
+        query: str,
+        variables: Optional[dict[str, Any]] = None,
+    ):
+        return await self.run_in_executor(
+            self._con.query_graphql, query, variables
+        )
+
+    query_graphql.__doc__ = ServerAPI.query_graphql.__doc__
+
+    async def query(self, query: GraphQlQuery) -> dict[str, Any]:
+        """Run all pages of GraphQl query and return parsed output.
+
+        Args:
+            query (GraphQlQuery): Query to run.
+
+        Returns:
+            dict[str, Any]: Parsed output from GraphQl query.
+
+        """
+        return await query.async_query(self)
+
+    async def close(self) -> None:
+        """Close session and shutdown thread pool."""
+        await self.run_in_executor(self._con.close_session)
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> AsyncServerAPI:
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+
+def _create_forward_property(attr_name: str, prop: property) -> property:
+    def getter(self):
+        return getattr(self._con, attr_name)
+
+    setter = None
+    if prop.fset is not None:
+        def setter(self, value):
+            setattr(self._con, attr_name, value)
+
+    return property(getter, setter, doc=prop.__doc__)
+
+
+def _create_sync_method(attr_name: str, func) -> Callable[..., Any]:
+    @functools.wraps(func)
+    def method(self, *args, **kwargs):
+        return getattr(self._con, attr_name)(*args, **kwargs)
+    return method
+
+
+def _create_coroutine_method(attr_name: str, func) -> Callable[..., Any]:
+    @functools.wraps(func)
+    async def method(self, *args, **kwargs):
+        return await self.run_in_executor(
+            getattr(self._con, attr_name), *args, **kwargs
+        )
+    return method
+
+
+def _create_async_generator_method(
+    attr_name: str, func
+) -> Callable[..., Any]:
+    @functools.wraps(func)
+    async def method(self, *args, **kwargs):
+        iterator = getattr(self._con, attr_name)(*args, **kwargs)
+        async for item in self.iterate_in_executor(iterator):
+            yield item
+    return method
+
+
+def _create_property_coroutine(attr_name: str, prop: property):
+    async def method(self):
+        return await self.run_in_executor(getattr, self._con, attr_name)
+
+    method.__name__ = attr_name
+    method.__qualname__ = f"AsyncServerAPI.{attr_name}"
+    method.__doc__ = prop.__doc__
+    return method
+
+
+def _is_generator_method(func) -> bool:
+    if inspect.isgeneratorfunction(func):
+        return True
+    # Some methods return generator instead of yielding
+    # - annotations are strings because of 'from __future__ import annotations'
+    return_type = func.__annotations__.get("return")
+    if not isinstance(return_type, str):
+        return_type = getattr(return_type, "__name__", "")
+    return return_type.startswith("Generator")
+
+
+def _create_list_method(attr_name: str, func) -> Callable[..., Any]:
+    async def method(self, *args, **kwargs):
+        return [
+            item
+            async for item in getattr(self, attr_name)(*args, **kwargs)
+        ]
+
+    method.__name__ = f"{attr_name}_list"
+    method.__qualname__ = f"AsyncServerAPI.{attr_name}_list"
+    method.__doc__ = (
+        f"Collect all items of '{attr_name}' to a list.\n\n"
+        f"Arguments are the same as for '{attr_name}'."
+    )
+    method.__signature__ = inspect.signature(func)
+    return method
+
+
+def _prepare_async_server_api() -> None:
+    for attr_name in dir(ServerAPI):
+        if attr_name.startswith("_") or attr_name in AsyncServerAPI.__dict__:
+            continue
+
+        attr = inspect.getattr_static(ServerAPI, attr_name)
+        if isinstance(attr, property) and attr_name in _IO_PROPERTIES:
+            setattr(
+                AsyncServerAPI,
+                attr_name,
+                _create_property_coroutine(attr_name, attr)
+            )
+            continue
+
+        if isinstance(attr, property):
+            setattr(
+                AsyncServerAPI,
+                attr_name,
+                _create_forward_property(attr_name, attr)
+            )
+            continue
+
+        if isinstance(attr, (classmethod, staticmethod)):
+            attr = attr.__func__
+            method = _create_sync_method(attr_name, attr)
+
+        elif not inspect.isfunction(attr):
+            continue
+
+        elif attr_name in _SYNC_METHODS:
+            method = _create_sync_method(attr_name, attr)
+
+        elif _is_generator_method(attr):
+            method = _create_async_generator_method(attr_name, attr)
+            list_attr_name = f"{attr_name}_list"
+            if not hasattr(ServerAPI, list_attr_name):
+                setattr(
+                    AsyncServerAPI,
+                    list_attr_name,
+                    _create_list_method(attr_name, attr)
+                )
+
+        else:
+            method = _create_coroutine_method(attr_name, attr)
+
+        setattr(AsyncServerAPI, attr_name, method)
+
+
+_prepare_async_server_api()
@@ -0,0 +1,332 @@
+"""Invalidation of client side caches based on server events.
+
+Server creates events with topics 'entity.<entity type>.<action>' (e.g.
+'entity.folder.attrib_changed') when entities are created, changed or
+deleted by any client. 'CacheInvalidator' polls these events incrementally
+and removes affected entities from entity cache of the connection, so
+entities changed by other clients are not served from the cache. Hierarchy
+store of the connection synchronizes changed projects on next use and folder
+path index is rebuilt when folders are changed.
+
+Other caches can be invalidated using topic callbacks.
+
+Example:
+    >>> con.set_entity_cache(EntityCache())
+    >>> invalidator = CacheInvalidator(con, interval=2.0)
+    >>> invalidator.add_topic_callback(
+    ...     "settings.changed", lambda event: settings_cache.clear()
+    ... )
+    >>> with invalidator:
+    ...     run_application()
+
+"""
+from __future__ import annotations
+
+import json
+import time
+import fnmatch
+import logging
+import datetime
+import threading
+import typing
+from typing import Optional, Any, Callable, Iterable
+
+from .utils import SortOrder
+
+if typing.TYPE_CHECKING:
+    from .server_api import ServerAPI
+
+EventCallback = Callable[[dict[str, Any]], None]
+
+ENTITY_EVENT_TOPIC = "entity.*"
+_EVENT_FIELDS = {"id", "topic", "project", "summary", "createdAt"}
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        date = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=datetime.timezone.utc)
+    return date.timestamp()
+
+
+class CacheInvalidator:
+    """Poll server events and invalidate client side caches.
+
+    Events are queried in ascending order with 'newer_than' filter set to
+        creation time of last processed event (watermark), so each poll
+        receives only new events. Watermark is initialized from the last
+        existing event on first poll.
+
+    Update events of entities other than projects and folders invalidate
+        only the entity, other entity events invalidate all cached entities
+        of the project.
+
+    Processed events, lag between event creation and invalidation, and
+        number of invalidated items are recorded to metrics of connection.
+
+    Args:
+        con (ServerAPI): Connection to server.
+        interval (float): Seconds between polls when running in
+            background thread.
+        project_names (Optional[Iterable[str]]): Process only events of
+            these projects. All projects are processed if not passed.
+
+    """
+    def __init__(
+        self,
+        con: ServerAPI,
+        interval: float = 5.0,
+        project_names: Optional[Iterable[str]] = None,
+    ):
+        if project_names is not None:
+            project_names = list(project_names)
+        self._con = con
+        self._interval = interval
+        self._project_names = project_names
+        self._callbacks: list[tuple[str, EventCallback]] = []
+        self._lock = threading.Lock()
+        self._log = logging.getLogger(self.__class__.__name__)
+
+        self._watermark: Optional[str] = None
+        # Ids of processed events created at watermark time
+        self._watermark_ids: set[str] = set()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        self._events_count = 0
+        self._invalidated_count = 0
+        self._last_lag: Optional[float] = None
+        self._last_poll: Optional[float] = None
+
+    def __enter__(self) -> CacheInvalidator:
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def watermark(self) -> Optional[str]:
+        """Creation time of last processed event.
+
+        Returns:
+            Optional[str]: Iso datetime string or None if was not
+                initialized yet.
+
+        """
+        return self._watermark
+
+    def set_watermark(self, watermark: Optional[str]) -> None:
+        """Change creation time from which events are processed.
+
+        Args:
+            watermark (Optional[str]): Iso datetime string. Watermark is
+                initialized from last existing event if 'None' is passed.
+
+        """
+        with self._lock:
+            self._watermark = watermark
+            self._watermark_ids = set()
+
+    def add_topic_callback(self, topic: str, callback: EventCallback) -> None:
+        """Register callback called for events with matching topic.
+
+        Args:
+            topic (str): Topic pattern, e.g. 'settings.*'.
+            callback (EventCallback): Callback receiving event data.
+
+        """
+        self._callbacks.append((topic, callback))
+
+    def remove_topic_callback(
+        self, topic: str, callback: EventCallback
+    ) -> None:
+        """Unregister callback registered using 'add_topic_callback'.
+
+        Args:
+            topic (str): Topic pattern.
+            callback (EventCallback): Registered callback.
+
+        """
+        item = (topic, callback)
+        if item in self._callbacks:
+            self._callbacks.remove(item)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Counters of processed events.
+
+        Returns:
+            dict[str, Any]: 'events', 'invalidated', 'last_lag' in seconds,
+                'last_poll' time and 'watermark'.
+
+        """
+        return {
+            "events": self._events_count,
+            "invalidated": self._invalidated_count,
+            "last_lag": self._last_lag,
+            "last_poll": self._last_poll,
+            "watermark": self._watermark,
+        }
+
+    def poll(self) -> int:
+        """Receive new events and invalidate caches.
+
+        Returns:
+            int: Number of processed events.
+
+        """
+        with self._lock:
+            topics = {ENTITY_EVENT_TOPIC}
+            topics |= {topic for topic, _ in self._callbacks}
+            if self._watermark is None:
+                self._init_watermark(topics)
+                self._last_poll = time.time()
+                return 0
+
+            events = self._con.get_events(
+                topics=topics,
+                project_names=self._project_names,
+                newer_than=self._watermark,
+                fields=_EVENT_FIELDS,
+                order=SortOrder.ascending,
+            )
+            count = 0
+            for event in events:
+                if event["id"] in self._watermark_ids:
+                    continue
+                self._process_event(event)
+                count += 1
+                created_at = event["createdAt"]
+                if created_at != self._watermark:
+                    self._watermark = created_at
+                    self._watermark_ids = set()
+                self._watermark_ids.add(event["id"])
+            self._last_poll = time.time()
+        return count
+
+    def is_running(self) -> bool:
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def start(self) -> None:
+        """Start polling in background thread."""
+        if self.is_running():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="CacheInvalidator",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop polling in background thread.
+
+        Args:
+            timeout (Optional[float]): Maximum time to wait for the thread.
+
+        """
+        self._stop_event.set()
+        thread = self._thread
+        self._thread = None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.poll()
+            except Exception:
+                self._log.warning(
+                    "Failed to receive events for cache invalidation.",
+                    exc_info=True,
+                )
+            self._stop_event.wait(self._interval)
+
+    def _init_watermark(self, topics: set[str]) -> None:
+        for event in self._con.get_events(
+            topics=topics,
+            project_names=self._project_names,
+            fields={"id", "createdAt"},
+            last=1,
+        ):
+            self._watermark = event["createdAt"]
+            self._watermark_ids = {event["id"]}
+            return
+        self._watermark = (
+            datetime.datetime.now(datetime.timezone.utc).isoformat()
+        )
+        self._watermark_ids = set()
+
+    def _process_event(self, event: dict[str, Any]) -> None:
+        topic = event["topic"]
+        invalidated = 0
+        if fnmatch.fnmatchcase(topic, ENTITY_EVENT_TOPIC):
+            invalidated = self._invalidate_entities(event)
+
+        for callback_topic, callback in tuple(self._callbacks):
+            if not fnmatch.fnmatchcase(topic, callback_topic):
+                continue
+            try:
+                callback(event)
+            except Exception:
+                self._log.warning(
+                    f"Callback of topic '{callback_topic}' failed.",
+                    exc_info=True,
+                )
+
+        lag = None
+        created_at = _parse_timestamp(event.get("createdAt"))
+        if created_at is not None:
+            lag = max(time.time() - created_at, 0.0)
+            self._last_lag = lag
+        self._events_count += 1
+        self._invalidated_count += invalidated
+        self._con.get_metrics().record_cache_invalidation(
+            topic, lag, invalidated
+        )
+
+    def _invalidate_entities(self, event: dict[str, Any]) -> int:
+        project_name = event.get("project")
+        if not project_name:
+            return 0
+
+        parts = event["topic"].split(".")
+        entity_type = parts[1] if len(parts) > 2 else None
+        action = parts[-1]
+        summary = event.get("summary") or {}
+        if isinstance(summary, str):
+            summary = json.loads(summary)
+        entity_id = summary.get("entityId")
+
+        hierarchy_store = self._con.get_hierarchy_store()
+        if hierarchy_store is not None:
+            hierarchy_store.invalidate(
+                self._con.get_base_url(),
+                project_name,
+                reconcile=action == "deleted",
+            )
+
+        if entity_type in (None, "project", "folder"):
+            self._con.reset_folder_path_index(project_name)
+
+        entity_cache = self._con.get_entity_cache()
+        if entity_cache is None:
+            return 0
+
+        changed_entities = None
+        if (
+            entity_type
+            and entity_id
+            and action not in ("created", "deleted")
+        ):
+            changed_entities = [(entity_type, entity_id)]
+        return entity_cache.invalidate_changes(
+            project_name, changed_entities
+        )
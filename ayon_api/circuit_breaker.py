@@ -0,0 +1,203 @@
+"""Circuit breaker of requests sent to server.
+
+When server is not available, sending every request with full retry loop
+only delays the failure and adds load to server when it is starting up.
+Circuit breaker counts consecutive failed attempts (connection errors
+and 502, 503 or 504 responses) and when the threshold is reached it is
+'open', all requests fail immediately with 'ServerUnavailable'. After
+'reset_timeout' single probe request is let through ('half-open'), its
+result decides if circuit is closed again or stays open.
+
+Example:
+    >>> breaker = CircuitBreaker(failure_threshold=10, reset_timeout=60.0)
+    >>> con = ServerAPI(url, token, circuit_breaker=breaker)
+    >>> con.get_circuit_breaker_state()["state"]
+    'closed'
+
+"""
+from __future__ import annotations
+
+import time
+import threading
+from typing import Optional, Iterable, Any
+
+from .exceptions import ServerUnavailable
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """Fail fast when server repeatedly fails.
+
+    Args:
+        failure_threshold (int): Number of consecutive failed attempts after
+            which circuit opens.
+        reset_timeout (float): Seconds after which probe request is let
+            through open circuit.
+        failure_statuses (Optional[Iterable[int]]): Response status codes
+            counted as failure. Only statuses of unavailable server
+            (502, 503 and 504) are used by default, other 5xx statuses
+            are errors of single request.
+        enabled (bool): Circuit breaker is used. Requests are never
+            blocked if is 'False'.
+
+    """
+    default_failure_statuses = (502, 503, 504)
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        failure_statuses: Optional[Iterable[int]] = None,
+        enabled: bool = True,
+    ):
+        if failure_statuses is None:
+            failure_statuses = self.default_failure_statuses
+        self.failure_threshold: int = max(failure_threshold, 1)
+        self.reset_timeout: float = reset_timeout
+        self.failure_statuses: set[int] = set(failure_statuses)
+        self.enabled: bool = enabled
+
+        self._lock = threading.Lock()
+        self._state: str = CIRCUIT_CLOSED
+        self._failures: int = 0
+        self._opened_at: Optional[float] = None
+        self._probe_started: Optional[float] = None
+        self._last_error: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """Requests are blocked, probe request may be let through."""
+        return self.enabled and self._state != CIRCUIT_CLOSED
+
+    def is_failure_status(self, status_code: int) -> bool:
+        return status_code in self.failure_statuses
+
+    def before_request(self, url: Optional[str] = None) -> None:
+        """Check if request can be sent.
+
+        Args:
+            url (Optional[str]): Url of request used in error message.
+
+        Raises:
+            ServerUnavailable: Circuit is open and request is not a probe.
+
+        """
+        if not self.enabled or self._state == CIRCUIT_CLOSED:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            if self._state == CIRCUIT_OPEN:
+                retry_in = self._opened_at + self.reset_timeout - now
+                if retry_in <= 0:
+                    self._state = CIRCUIT_HALF_OPEN
+                    self._probe_started = now
+                    return
+
+            elif self._state == CIRCUIT_HALF_OPEN:
+                # Let next probe through if current probe did not finish
+                #   in time (e.g. it failed without result being recorded)
+                retry_in = self._probe_started + self.reset_timeout - now
+                if retry_in <= 0:
+                    self._probe_started = now
+                    return
+
+            else:
+                return
+
+        message = "Server is unavailable, circuit breaker is open."
+        if url:
+            message = (
+                f"Server is unavailable, circuit breaker is open."
+                f" Request to '{url}' was not sent."
+            )
+        raise ServerUnavailable(message, max(retry_in, 0.0))
+
+    def record_success(self) -> None:
+        """Record attempt which reached server and did not fail."""
+        if self._state == CIRCUIT_CLOSED and self._failures == 0:
+            return
+
+        with self._lock:
+            self._state = CIRCUIT_CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._probe_started = None
+            self._last_error = None
+
+    def record_failure(self, error: Optional[str] = None) -> None:
+        """Record failed attempt.
+
+        Args:
+            error (Optional[str]): Description of failure.
+
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._failures += 1
+            self._last_error = error
+            if (
+                self._state == CIRCUIT_HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                self._state = CIRCUIT_OPEN
+                self._opened_at = time.monotonic()
+                self._probe_started = None
+
+    def record_response(self, status_code: Optional[int]) -> None:
+        """Record result of attempt based on response status code.
+
+        Args:
+            status_code (Optional[int]): Response status code or 'None'
+                if server did not respond.
+
+        """
+        if status_code is None:
+            self.record_failure("Server did not respond.")
+        elif self.is_failure_status(status_code):
+            self.record_failure(f"Server responded with {status_code}.")
+        else:
+            self.record_success()
+
+    def reset(self) -> None:
+        """Close circuit and forget failures."""
+        with self._lock:
+            self._state = CIRCUIT_CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._probe_started = None
+            self._last_error = None
+
+    def get_state(self) -> dict[str, Any]:
+        """State of circuit breaker usable for health checks.
+
+        Returns:
+            dict[str, Any]: Current state ('closed', 'open' or 'half-open'),
+                number of consecutive failures, last failure and seconds
+                until probe request is let through.
+
+        """
+        with self._lock:
+            retry_in = None
+            if self._state == CIRCUIT_OPEN:
+                retry_in = max(
+                    self._opened_at + self.reset_timeout - time.monotonic(),
+                    0.0
+                )
+            return {
+                "enabled": self.enabled,
+                "state": self._state,
+                "failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "last_error": self._last_error,
+                "retry_in": retry_in,
+            }
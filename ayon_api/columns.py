@@ -0,0 +1,266 @@
+"""Columnar storage of entities for bulk scans.
+
+Scan of all entities of a type (e.g. all versions of a project) produces
+a lot of small dictionaries with the same keys. 'EntityColumns' stores values
+of each field in a single column instead. Numbers are stored in 'array'
+objects and repeated strings are stored only once per column.
+
+Entities are added one by one, so only columns are held in memory when
+entities are received from a generator (e.g. 'get_versions'). Use
+'get_versions_columns' or 'get_products_columns' of connection to build
+columns from entities while they're received from server.
+
+Example:
+    >>> columns = con.get_versions_columns(
+    ...     project_name, fields={"id", "version", "attrib.frameStart"}
+    ... )
+    >>> columns["attrib.frameStart"]
+    array('q', [1001, 1001, 1010])
+    >>> arrays = columns.to_numpy()
+
+"""
+from __future__ import annotations
+
+import array
+from typing import Optional, Iterable, Any, Generator, Union
+
+# Type codes of 'array' by exact type of values
+_ARRAY_TYPECODES = {
+    int: "q",
+    float: "d",
+}
+_TYPES_BY_TYPECODE = {
+    typecode: value_type
+    for value_type, typecode in _ARRAY_TYPECODES.items()
+}
+# Strings of column are not shared when most of them are unique (e.g. ids)
+_STRINGS_CACHE_MIN_SIZE = 1024
+
+
+def _flatten_entity(
+    entity: dict[str, Any],
+    output: dict[str, Any],
+    prefix: str = "",
+) -> dict[str, Any]:
+    for key, value in entity.items():
+        key = f"{prefix}{key}"
+        if isinstance(value, dict) and value:
+            _flatten_entity(value, output, f"{key}.")
+        else:
+            output[key] = value
+    return output
+
+
+class EntityColumns:
+    """Entities stored as columns of values.
+
+    Nested dictionaries of entities are flattened, e.g. 'attrib.frameStart'
+        is a column. Missing values are 'None'.
+
+    Call 'compact' after all entities were added to convert numeric
+        columns to 'array' objects.
+
+    Args:
+        fields (Optional[Iterable[str]]): Columns created in advance,
+            other columns are created when entity with new field is added.
+
+    """
+    def __init__(self, fields: Optional[Iterable[str]] = None):
+        self._columns: dict[str, Union[list[Any], array.array]] = {}
+        self._strings_caches: dict[str, Optional[dict[str, str]]] = {}
+        self._length = 0
+        for field in fields or []:
+            self._add_column(field)
+
+    @classmethod
+    def from_entities(
+        cls,
+        entities: Iterable[dict[str, Any]],
+        fields: Optional[Iterable[str]] = None,
+    ) -> EntityColumns:
+        """Create columns from entities.
+
+        Args:
+            entities (Iterable[dict[str, Any]]): Entities, e.g. generator
+                returned by 'get_versions'.
+            fields (Optional[Iterable[str]]): Columns created in advance.
+
+        Returns:
+            EntityColumns: Compacted columns of entities.
+
+        """
+        columns = cls(fields)
+        columns.extend(entities)
+        columns.compact()
+        return columns
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, field: str) -> bool:
+        return field in self._columns
+
+    def __getitem__(
+        self, field: str
+    ) -> Union[list[Any], array.array]:
+        return self._columns[field]
+
+    @property
+    def fields(self) -> list[str]:
+        """Names of columns.
+
+        Returns:
+            list[str]: Flattened field names.
+
+        """
+        return list(self._columns)
+
+    def append(self, entity: dict[str, Any]) -> None:
+        """Add entity to columns.
+
+        Args:
+            entity (dict[str, Any]): Entity data.
+
+        """
+        values = _flatten_entity(entity, {})
+        for field in values:
+            if field not in self._columns:
+                self._add_column(field)
+
+        for field, column in self._columns.items():
+            self._append_value(field, column, values.get(field))
+        self._length += 1
+
+    def extend(self, entities: Iterable[dict[str, Any]]) -> None:
+        """Add multiple entities to columns.
+
+        Args:
+            entities (Iterable[dict[str, Any]]): Entities data.
+
+        """
+        for entity in entities:
+            self.append(entity)
+
+    def compact(self) -> None:
+        """Convert columns with only numbers of single type to arrays.
+
+        Caches of shared strings are released.
+
+        """
+        self._strings_caches = dict.fromkeys(self._columns)
+        for field, column in tuple(self._columns.items()):
+            if not isinstance(column, list) or not column:
+                continue
+
+            value_types = {type(value) for value in column}
+            if len(value_types) != 1:
+                continue
+            typecode = _ARRAY_TYPECODES.get(value_types.pop())
+            if typecode is None:
+                continue
+            try:
+                self._columns[field] = array.array(typecode, column)
+            except OverflowError:
+                pass
+
+    def get_row(self, index: int) -> dict[str, Any]:
+        """Values of single entity.
+
+        Args:
+            index (int): Index of entity.
+
+        Returns:
+            dict[str, Any]: Flattened values of entity.
+
+        """
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Row index out of range")
+        return {
+            field: column[index]
+            for field, column in self._columns.items()
+        }
+
+    def iter_rows(self) -> Generator[dict[str, Any], None, None]:
+        """Iterate over values of entities.
+
+        Returns:
+            Generator[dict[str, Any], None, None]: Flattened values
+                of entities.
+
+        """
+        fields = list(self._columns)
+        for values in zip(*self._columns.values()):
+            yield dict(zip(fields, values))
+
+    def to_numpy(self) -> dict[str, Any]:
+        """Columns as NumPy arrays.
+
+        Numeric columns without missing values have numeric dtype, other
+            columns have 'object' dtype.
+
+        Returns:
+            dict[str, numpy.ndarray]: Arrays by field.
+
+        """
+        import numpy
+
+        output = {}
+        for field, column in self._columns.items():
+            if isinstance(column, array.array):
+                output[field] = numpy.array(column, dtype=column.typecode)
+                continue
+            values = numpy.empty(len(column), dtype=object)
+            values[:] = column
+            output[field] = values
+        return output
+
+    def to_arrow(self) -> Any:
+        """Columns as Apache Arrow table.
+
+        Returns:
+            pyarrow.Table: Table with column for each field.
+
+        """
+        import pyarrow
+
+        return pyarrow.table({
+            field: pyarrow.array(column)
+            for field, column in self._columns.items()
+        })
+
+    def _add_column(self, field: str) -> None:
+        if field in self._columns:
+            return
+        self._columns[field] = [None] * self._length
+        self._strings_caches[field] = {}
+
+    def _append_value(
+        self,
+        field: str,
+        column: Union[list[Any], array.array],
+        value: Any,
+    ) -> None:
+        if isinstance(column, array.array):
+            if type(value) is _TYPES_BY_TYPECODE[column.typecode]:
+                column.append(value)
+                return
+            column = self._columns[field] = column.tolist()
+
+        if isinstance(value, str):
+            value = self._get_shared_string(field, value)
+        column.append(value)
+
+    def _get_shared_string(self, field: str, value: str) -> str:
+        cache = self._strings_caches.get(field)
+        if cache is None:
+            return value
+        value = cache.setdefault(value, value)
+        if (
+            len(cache) > _STRINGS_CACHE_MIN_SIZE
+            and len(cache) * 2 > self._length
+        ):
+            # Values are mostly unique, sharing would only take memory
+            self._strings_caches[field] = None
+        return value
@@ -5,6 +5,22 @@ SERVER_URL_ENV_KEY = "AYON_SERVER_URL"
 SERVER_API_ENV_KEY = "AYON_API_KEY"
 SERVER_TIMEOUT_ENV_KEY = "AYON_SERVER_TIMEOUT"
 SERVER_RETRIES_ENV_KEY = "AYON_SERVER_RETRIES"
+# Connection pool and keep-alive of http connections
+SERVER_POOL_SIZE_ENV_KEY = "AYON_SERVER_POOL_SIZE"
+SERVER_POOL_BLOCK_ENV_KEY = "AYON_SERVER_POOL_BLOCK"
+SERVER_TCP_KEEPALIVE_ENV_KEY = "AYON_SERVER_TCP_KEEPALIVE"
+# Minimum size of request body compressed using gzip
+SERVER_REQUEST_COMPRESSION_ENV_KEY = "AYON_SERVER_REQUEST_COMPRESSION"
+# Number of GraphQl pages fetched ahead while caller handles current page
+GRAPHQL_PREFETCH_ENV_KEY = "AYON_GRAPHQL_PREFETCH"
+# Page size of GraphQl queries, number or 'adaptive'
+GRAPHQL_PAGE_SIZE_ENV_KEY = "AYON_GRAPHQL_PAGE_SIZE"
+# Maximum number of ids in single GraphQl id filter, bigger are split
+GRAPHQL_CHUNK_SIZE_ENV_KEY = "AYON_GRAPHQL_CHUNK_SIZE"
+# Send GraphQl queries as persisted query hashes
+GRAPHQL_PERSISTED_QUERIES_ENV_KEY = "AYON_GRAPHQL_PERSISTED_QUERIES"
+# Force JSON library used for encoding and decoding
+JSON_BACKEND_ENV_KEY = "AYON_JSON_BACKEND"
 # Default variant used for settings
 DEFAULT_VARIANT_ENV_KEY = "AYON_DEFAULT_SETTINGS_VARIANT"
 # Default site id used for connection
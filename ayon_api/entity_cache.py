@@ -0,0 +1,252 @@
+"""Client side cache of entities received from server.
+
+Cache is opt-in, see 'ServerAPI.set_entity_cache'. Getters which filter
+only by entity ids (e.g. 'get_folder_by_id' or 'get_folders(folder_ids=...)')
+receive cached entities and query only missing ids from server.
+
+Example:
+    >>> con.set_entity_cache(EntityCache(max_size=50000, ttl=120.0))
+    >>> folder = con.get_folder_by_id(project_name, folder_id)
+    >>> con.get_entity_cache().get_stats()
+    {'size': 1, 'hits': 0, 'misses': 1, 'evictions': 0, 'hit_ratio': 0.0}
+
+"""
+from __future__ import annotations
+
+import copy
+import time
+import threading
+import collections
+from typing import Optional, Any, Iterable
+
+CacheKey = tuple[str, str, str, frozenset]
+
+
+class EntityCache:
+    """Bounded cache of entities with LRU and TTL eviction.
+
+    Entities are cached by project name, entity type, entity id and set
+        of queried fields. Least recently used entities are evicted when
+        cache is full, entities older than 'ttl' are not used.
+
+    Cached entities are copied when stored and when returned, so
+        changes of returned data don't affect the cache.
+
+    Args:
+        max_size (int): Maximum number of cached entities.
+        ttl (float): Seconds after which cached entity expires,
+            '0' disables expiration.
+
+    """
+    def __init__(self, max_size: int = 10000, ttl: float = 60.0):
+        if max_size < 1:
+            raise ValueError(f"Invalid cache size {max_size}.")
+        self._max_size = max_size
+        self._ttl = max(ttl, 0.0)
+        self._lock = threading.Lock()
+        self._items: collections.OrderedDict[
+            CacheKey, tuple[float, dict[str, Any]]
+        ] = collections.OrderedDict()
+        # Keys of entity for all cached sets of fields
+        self._keys_by_entity: dict[tuple[str, str, str], set[CacheKey]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl
+
+    def get(
+        self,
+        project_name: str,
+        entity_type: str,
+        entity_id: str,
+        fields: Iterable[str],
+    ) -> Optional[dict[str, Any]]:
+        """Get cached entity.
+
+        Args:
+            project_name (str): Project name.
+            entity_type (str): Entity type, e.g. 'folder'.
+            entity_id (str): Entity id.
+            fields (Iterable[str]): Fields queried for the entity.
+
+        Returns:
+            Optional[dict[str, Any]]: Copy of cached entity or None if
+                entity is not cached or is expired.
+
+        """
+        key = (project_name, entity_type, entity_id, frozenset(fields))
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and self._is_expired(item[0]):
+                self._remove_key(key)
+                item = None
+
+            if item is None:
+                self._misses += 1
+                return None
+
+            self._hits += 1
+            self._items.move_to_end(key)
+            entity = item[1]
+        return copy.deepcopy(entity)
+
+    def set(
+        self,
+        project_name: str,
+        entity_type: str,
+        entity_id: str,
+        fields: Iterable[str],
+        entity: dict[str, Any],
+    ) -> None:
+        """Store entity to cache.
+
+        Args:
+            project_name (str): Project name.
+            entity_type (str): Entity type, e.g. 'folder'.
+            entity_id (str): Entity id.
+            fields (Iterable[str]): Fields queried for the entity.
+            entity (dict[str, Any]): Entity data.
+
+        """
+        key = (project_name, entity_type, entity_id, frozenset(fields))
+        entity = copy.deepcopy(entity)
+        with self._lock:
+            self._items[key] = (time.monotonic(), entity)
+            self._items.move_to_end(key)
+            self._keys_by_entity.setdefault(key[:3], set()).add(key)
+            while len(self._items) > self._max_size:
+                oldest_key = next(iter(self._items))
+                self._remove_key(oldest_key)
+                self._evictions += 1
+
+    def invalidate(
+        self,
+        project_name: Optional[str] = None,
+        entity_type: Optional[str] = None,
+        entity_ids: Optional[Iterable[str]] = None,
+    ) -> int:
+        """Remove entities from cache.
+
+        Args:
+            project_name (Optional[str]): Project name, all projects are
+                invalidated if not passed.
+            entity_type (Optional[str]): Entity type, all entity types are
+                invalidated if not passed.
+            entity_ids (Optional[Iterable[str]]): Entity ids, all entities
+                of project and entity type are invalidated if not passed.
+
+        Returns:
+            int: Number of removed cache items.
+
+        """
+        with self._lock:
+            if (
+                entity_ids is not None
+                and project_name is not None
+                and entity_type is not None
+            ):
+                keys = set()
+                for entity_id in entity_ids:
+                    keys |= self._keys_by_entity.get(
+                        (project_name, entity_type, entity_id), set()
+                    )
+            else:
+                if entity_ids is not None:
+                    entity_ids = set(entity_ids)
+                keys = {
+                    key
+                    for key in self._items
+                    if (
+                        (project_name is None or key[0] == project_name)
+                        and (entity_type is None or key[1] == entity_type)
+                        and (entity_ids is None or key[2] in entity_ids)
+                    )
+                }
+
+            for key in keys:
+                self._remove_key(key)
+        return len(keys)
+
+    def invalidate_changes(
+        self,
+        project_name: str,
+        changed_entities: Optional[Iterable[tuple[str, str]]] = None,
+    ) -> int:
+        """Remove entities affected by changes on server.
+
+        Update of entity other than project or folder invalidates only
+            the entity. Other changes (creation, deletion, project or folder
+            update which changes inherited attributes of children)
+            invalidate all cached entities of the project.
+
+        Args:
+            project_name (str): Project name.
+            changed_entities (Optional[Iterable[tuple[str, str]]]): Entity
+                type and id of updated entities. All entities of project
+                are invalidated if not passed.
+
+        Returns:
+            int: Number of removed cache items.
+
+        """
+        if changed_entities is not None:
+            changed_entities = list(changed_entities)
+        if changed_entities is None or any(
+            entity_type in ("project", "folder")
+            for entity_type, _ in changed_entities
+        ):
+            return self.invalidate(project_name)
+
+        return sum(
+            self.invalidate(project_name, entity_type, [entity_id])
+            for entity_type, entity_id in changed_entities
+        )
+
+    def clear(self) -> None:
+        """Remove all entities from cache."""
+        with self._lock:
+            self._items.clear()
+            self._keys_by_entity.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Counters of cache usage.
+
+        Returns:
+            dict[str, Any]: 'size', 'hits', 'misses', 'evictions'
+                and 'hit_ratio'.
+
+        """
+        with self._lock:
+            hits = self._hits
+            misses = self._misses
+            output = {
+                "size": len(self._items),
+                "hits": hits,
+                "misses": misses,
+                "evictions": self._evictions,
+            }
+        total = hits + misses
+        output["hit_ratio"] = hits / total if total else 0.0
+        return output
+
+    def _is_expired(self, created: float) -> bool:
+        return bool(self._ttl) and time.monotonic() - created > self._ttl
+
+    def _remove_key(self, key: CacheKey) -> None:
+        self._items.pop(key, None)
+        entity_key = key[:3]
+        keys = self._keys_by_entity.get(entity_key)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                self._keys_by_entity.pop(entity_key)
@@ -58,6 +58,21 @@ class ServerNotReached(ServerError):
     pass
 
 
+class ServerUnavailable(ServerNotReached):
+    """Request was not sent because server repeatedly failed.
+
+    Raised while circuit breaker of connection is open.
+
+    Args:
+        message (str): Error message.
+        retry_in (float): Seconds until next request is let through.
+
+    """
+    def __init__(self, message: str, retry_in: float):
+        self.retry_in = retry_in
+        super().__init__(message)
+
+
 class UnsupportedServerVersion(ServerError):
     """Server version does not support the requested operation.
 
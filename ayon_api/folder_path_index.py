@@ -0,0 +1,238 @@
+"""Local index of folder paths of a project.
+
+'FolderPathIndex' maps folder paths to folder ids. It is built from single
+'get_rest_folders' call, so path based getters can resolve folder ids
+without a request to server.
+
+Example:
+    >>> index = FolderPathIndex.from_server(con, project_name)
+    >>> index.get_id("/shots/sh010")
+    '0f1b2c3d...'
+    >>> index.find_prefix("/shots/")
+    {'/shots/sh010': '0f1b2c3d...', '/shots/sh020': '4e5f6a7b...'}
+
+"""
+from __future__ import annotations
+
+import re
+import time
+import bisect
+import threading
+import typing
+from typing import Optional, Any, Iterable, Union
+
+if typing.TYPE_CHECKING:
+    from .server_api import ServerAPI
+
+
+def normalize_folder_path(folder_path: str) -> str:
+    """Folder path in format used by server, e.g. '/shots/sh010'.
+
+    Args:
+        folder_path (str): Folder path with or without leading slash.
+
+    Returns:
+        str: Folder path with leading slash.
+
+    """
+    return "/" + folder_path.strip("/")
+
+
+class FolderPathIndex:
+    """Mapping of folder paths to folder ids.
+
+    Paths are stored in hash map for exact lookups and in sorted list
+        for prefix lookups.
+
+    Index is not updated automatically, use 'update_folders' and
+        'remove_folders' to apply known changes, or create new index.
+
+    Args:
+        folders (Optional[Iterable[dict[str, Any]]]): Folders with 'id'
+            and 'path', e.g. output of 'get_rest_folders'.
+
+    """
+    def __init__(self, folders: Optional[Iterable[dict[str, Any]]] = None):
+        self._lock = threading.Lock()
+        self._ids_by_path: dict[str, str] = {}
+        self._paths_by_id: dict[str, str] = {}
+        self._sorted_paths: Optional[list[str]] = None
+        self._created = time.monotonic()
+        if folders is not None:
+            self.update_folders(folders)
+
+    @classmethod
+    def from_server(
+        cls, con: ServerAPI, project_name: str
+    ) -> FolderPathIndex:
+        """Create index of all folders of project.
+
+        Args:
+            con (ServerAPI): Connection to server.
+            project_name (str): Project name.
+
+        Returns:
+            FolderPathIndex: Index of folder paths.
+
+        """
+        return cls(con.get_rest_folders(project_name))
+
+    def __len__(self) -> int:
+        return len(self._ids_by_path)
+
+    def __contains__(self, folder_path: str) -> bool:
+        return normalize_folder_path(folder_path) in self._ids_by_path
+
+    @property
+    def age(self) -> float:
+        """Seconds since index was created."""
+        return time.monotonic() - self._created
+
+    def get_id(self, folder_path: str) -> Optional[str]:
+        """Get folder id by path.
+
+        Args:
+            folder_path (str): Folder path.
+
+        Returns:
+            Optional[str]: Folder id or None if path is not in index.
+
+        """
+        return self._ids_by_path.get(normalize_folder_path(folder_path))
+
+    def get_ids(
+        self, folder_paths: Iterable[str]
+    ) -> dict[str, Optional[str]]:
+        """Get folder ids by paths.
+
+        Args:
+            folder_paths (Iterable[str]): Folder paths.
+
+        Returns:
+            dict[str, Optional[str]]: Folder ids by passed paths, id is
+                None if path is not in index.
+
+        """
+        return {
+            folder_path: self.get_id(folder_path)
+            for folder_path in folder_paths
+        }
+
+    def get_path(self, folder_id: str) -> Optional[str]:
+        """Get folder path by id.
+
+        Args:
+            folder_id (str): Folder id.
+
+        Returns:
+            Optional[str]: Folder path or None if id is not in index.
+
+        """
+        return self._paths_by_id.get(folder_id)
+
+    def find_prefix(self, prefix: str) -> dict[str, str]:
+        """Find folders with path starting with prefix.
+
+        Use prefix with trailing slash, e.g. '/shots/', to find only
+            folders below a folder.
+
+        Args:
+            prefix (str): Start of folder path.
+
+        Returns:
+            dict[str, str]: Folder ids by path.
+
+        """
+        if not prefix.startswith("/"):
+            prefix = f"/{prefix}"
+        with self._lock:
+            paths = self._get_sorted_paths()
+            output = {}
+            idx = bisect.bisect_left(paths, prefix)
+            while idx < len(paths) and paths[idx].startswith(prefix):
+                path = paths[idx]
+                output[path] = self._ids_by_path[path]
+                idx += 1
+        return output
+
+    def find_regex(self, pattern: Union[str, re.Pattern]) -> dict[str, str]:
+        """Find folders with path matching regex.
+
+        Args:
+            pattern (Union[str, re.Pattern]): Regex searched in paths.
+
+        Returns:
+            dict[str, str]: Folder ids by path.
+
+        """
+        if isinstance(pattern, str):
+            pattern = re.compile(pattern)
+        with self._lock:
+            return {
+                path: folder_id
+                for path, folder_id in self._ids_by_path.items()
+                if pattern.search(path)
+            }
+
+    def update_folders(self, folders: Iterable[dict[str, Any]]) -> None:
+        """Add new folders or change paths of existing folders.
+
+        Paths of folders below folder with changed path are changed too.
+
+        Args:
+            folders (Iterable[dict[str, Any]]): Folders with 'id'
+                and 'path'.
+
+        """
+        with self._lock:
+            for folder in folders:
+                folder_id = folder["id"]
+                path = normalize_folder_path(folder["path"])
+                old_path = self._paths_by_id.get(folder_id)
+                if old_path == path:
+                    continue
+
+                self._sorted_paths = None
+                if old_path is not None:
+                    self._ids_by_path.pop(old_path, None)
+                    for child_path, child_id in self._pop_children(
+                        old_path
+                    ):
+                        new_child_path = path + child_path[len(old_path):]
+                        self._ids_by_path[new_child_path] = child_id
+                        self._paths_by_id[child_id] = new_child_path
+                self._ids_by_path[path] = folder_id
+                self._paths_by_id[folder_id] = path
+
+    def remove_folders(self, folder_ids: Iterable[str]) -> None:
+        """Remove folders and folders below them.
+
+        Args:
+            folder_ids (Iterable[str]): Ids of removed folders.
+
+        """
+        with self._lock:
+            for folder_id in folder_ids:
+                path = self._paths_by_id.pop(folder_id, None)
+                if path is None:
+                    continue
+                self._sorted_paths = None
+                self._ids_by_path.pop(path, None)
+                for _, child_id in self._pop_children(path):
+                    self._paths_by_id.pop(child_id, None)
+
+    def _get_sorted_paths(self) -> list[str]:
+        if self._sorted_paths is None:
+            self._sorted_paths = sorted(self._ids_by_path)
+        return self._sorted_paths
+
+    def _pop_children(self, path: str) -> list[tuple[str, str]]:
+        prefix = f"{path}/"
+        children = [
+            (child_path, child_id)
+            for child_path, child_id in self._ids_by_path.items()
+            if child_path.startswith(prefix)
+        ]
+        for child_path, _ in children:
+            self._ids_by_path.pop(child_path)
+        return children
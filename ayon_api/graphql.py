@@ -1,20 +1,280 @@
 from __future__ import annotations
 
+import os
+import re
 import copy
+import time
+import queue
+import asyncio
 import numbers
+import threading
+import contextvars
+import collections
+from concurrent.futures import ThreadPoolExecutor
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 import typing
-from typing import Optional, Iterable, Any, Generator
+from typing import (
+    Optional, Iterable, Any, Generator, AsyncGenerator, Union
+)
 
+from .constants import GRAPHQL_PAGE_SIZE_ENV_KEY
 from .exceptions import GraphQlQueryError, GraphQlQueryFailed
+from .profiling import PageProfile
 from .utils import SortOrder
 
 if typing.TYPE_CHECKING:
-    from typing import Union
-
     from .server_api import ServerAPI
+    from .async_server_api import AsyncServerAPI
+    from .profiling import QueryProfile
 
 FIELD_VALUE = object()
+# Number of edges requested in single page
+DEFAULT_PAGE_SIZE = 300
+# Marks end of pages received from prefetch thread or task
+_PREFETCH_DONE = object()
+# Variable in query string, string values are matched to be skipped
+_VARIABLE_REGEX = re.compile(r'"(?:[^"\\]|\\.)*"|\$(\w+)')
+# Compiled query strings shared by queries with the same structure
+_COMPILED_QUERIES_LIMIT = 512
+_COMPILED_QUERIES: collections.OrderedDict = collections.OrderedDict()
+_COMPILED_QUERIES_LOCK = threading.Lock()
+
+
+@dataclass
+class _NestedPage:
+    """Next page of nested edge field of single parent entity.
+
+    Args:
+        field (GraphQlQueryEdgeField): Parent edge field.
+        nested_field (GraphQlQueryEdgeField): Nested edge field.
+        parent_id (str): Id of parent entity.
+        cursor (str): Cursor of next page of nested edge field.
+        output (dict[str, Any]): Parsed output of parent entity.
+
+    """
+    field: GraphQlQueryEdgeField
+    nested_field: GraphQlQueryEdgeField
+    parent_id: str
+    cursor: str
+    output: dict[str, Any]
+
+
+class _PrefetchError:
+    """Exception raised in prefetch thread or task passed to consumer."""
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+def _get_prefetch_depth(con: Any) -> int:
+    # Connection may not have prefetch setting (e.g. custom connection object)
+    get_graphql_prefetch = getattr(con, "get_graphql_prefetch", None)
+    if get_graphql_prefetch is None:
+        return 0
+    return get_graphql_prefetch()
+
+
+class AdaptivePageSize:
+    """Page size of GraphQl queries adapted to observed responses.
+
+    Page size is tracked per query name, because size of one item differs
+    a lot between queries (e.g. folders with 'id' only and representations
+    with 'files'). After each full page the size is scaled towards target
+    latency, and limited so page payload is not bigger than maximum
+    page bytes.
+
+    Object can be shared by multiple queries and threads.
+
+    Args:
+        target_latency (float): Wanted duration of single page in seconds.
+        max_page_bytes (int): Maximum size of page response in bytes.
+        min_size (int): Minimum page size.
+        max_size (int): Maximum page size.
+        initial_size (int): Page size of first page of a query.
+
+    """
+    def __init__(
+        self,
+        target_latency: float = 1.0,
+        max_page_bytes: int = 8 * 1024 * 1024,
+        min_size: int = 20,
+        max_size: int = 5000,
+        initial_size: int = DEFAULT_PAGE_SIZE,
+    ):
+        self.target_latency: float = target_latency
+        self.max_page_bytes: int = max_page_bytes
+        self.min_size: int = min_size
+        self.max_size: int = max_size
+        self.initial_size: int = initial_size
+        self._sizes: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__}"
+            f" target_latency={self.target_latency}>"
+        )
+
+    def get_page_size(self, query_name: str) -> int:
+        """Page size of next page of a query.
+
+        Args:
+            query_name (str): Name of query.
+
+        Returns:
+            int: Page size.
+
+        """
+        return self._sizes.get(query_name, self.initial_size)
+
+    def record_page(
+        self,
+        query_name: str,
+        page_size: int,
+        duration: float,
+        size_bytes: int = 0,
+    ) -> None:
+        """Adapt page size of query based on received full page.
+
+        Args:
+            query_name (str): Name of query.
+            page_size (int): Page size used for the page.
+            duration (float): Duration of request in seconds.
+            size_bytes (int): Size of response in bytes.
+
+        """
+        if page_size <= 0 or duration <= 0:
+            return
+
+        new_size = page_size * self.target_latency / duration
+        if size_bytes:
+            new_size = min(
+                new_size, page_size * self.max_page_bytes / size_bytes
+            )
+        # Change size at most twice per page, so single slow response
+        #   does not collapse the page size
+        new_size = min(max(new_size, page_size / 2), page_size * 2)
+        new_size = min(max(int(new_size), self.min_size), self.max_size)
+        with self._lock:
+            self._sizes[query_name] = new_size
+
+
+def get_default_page_size() -> Union[int, AdaptivePageSize]:
+    """Default page size of GraphQl queries.
+
+    Looks for environment variable GRAPHQL_PAGE_SIZE_ENV_KEY which can
+    contain number or 'adaptive'. If not available then 'DEFAULT_PAGE_SIZE'
+    is used.
+
+    Returns:
+        Union[int, AdaptivePageSize]: Page size or adaptive page size.
+
+    """
+    value = (os.environ.get(GRAPHQL_PAGE_SIZE_ENV_KEY) or "").strip()
+    if value.lower() == "adaptive":
+        return AdaptivePageSize()
+    try:
+        page_size = int(value)
+        if page_size > 0:
+            return page_size
+    except ValueError:
+        pass
+    return DEFAULT_PAGE_SIZE
+
+
+def _get_connection_page_size(con: Any) -> Union[int, AdaptivePageSize]:
+    # Connection may not have page size (e.g. custom connection object)
+    get_graphql_page_size = getattr(con, "get_graphql_page_size", None)
+    if get_graphql_page_size is None:
+        return DEFAULT_PAGE_SIZE
+    return get_graphql_page_size()
+
+
+def _get_chunk_size(con: Any) -> int:
+    # Connection may not have chunk size (e.g. custom connection object)
+    get_graphql_chunk_size = getattr(con, "get_graphql_chunk_size", None)
+    if get_graphql_chunk_size is None:
+        return 0
+    return get_graphql_chunk_size()
+
+
+def _merge_outputs(output: dict[str, Any], source: dict[str, Any]) -> None:
+    """Merge parsed output of a chunk query to output of previous chunks.
+
+    Lists (edges) are extended, dictionaries are merged and other values
+        are kept from first chunk.
+
+    """
+    for key, value in source.items():
+        current = output.get(key)
+        if isinstance(current, dict) and isinstance(value, dict):
+            _merge_outputs(current, value)
+        elif isinstance(current, list) and isinstance(value, list):
+            current.extend(value)
+        elif key not in output or current is None:
+            output[key] = value
+
+
+def _remove_duplicates(
+    output: dict[str, Any],
+    seen_ids: dict[tuple[str, ...], set[str]],
+    path: tuple[str, ...] = (),
+) -> None:
+    """Remove entities received by previous chunks from output of a chunk.
+
+    Only lists of entities of queried edge fields are checked, lists of
+        nested edge fields belong to a parent entity.
+
+    """
+    for key, value in output.items():
+        item_path = path + (key, )
+        if isinstance(value, dict):
+            _remove_duplicates(value, seen_ids, item_path)
+            continue
+
+        if not isinstance(value, list):
+            continue
+
+        ids = seen_ids.setdefault(item_path, set())
+        items = []
+        for item in value:
+            entity_id = item.get("id") if isinstance(item, dict) else None
+            if entity_id is not None:
+                if entity_id in ids:
+                    continue
+                ids.add(entity_id)
+            items.append(item)
+        value[:] = items
+
+
+def _get_ijson() -> Optional[Any]:
+    # 'ijson' is optional dependency used for incremental parsing of pages
+    try:
+        import ijson
+    except ImportError:
+        return None
+    return ijson
+
+
+def _iter_json_events(
+    ijson: Any, chunks: Iterable[bytes]
+) -> Generator[tuple[str, str, Any], None, None]:
+    """Parse JSON from chunks of bytes to events of 'ijson'."""
+    events = ijson.sendable_list()
+    parser = ijson.parse_coro(events, use_float=True)
+    for chunk in chunks:
+        parser.send(chunk)
+        yield from events
+        del events[:]
+    parser.close()
+    yield from events
+
+
+def _get_response_size(response: Any) -> int:
+    content = getattr(response.data, "content", None)
+    if isinstance(content, (bytes, str)):
+        return len(content)
+    return 0
 
 
 def fields_to_dict(fields: Optional[Iterable[str]]) -> dict:
@@ -73,17 +333,62 @@ class QueryVariable:
         return self._name.__format__(*args, **kwargs)
 
 
+class _PageVariable(QueryVariable):
+    """Variable used for pagination of edge field.
+
+    Pagination variables are always part of query, so query string does
+        not change between pages.
+
+    Args:
+        variable_name (str): Name of variable in query.
+        value_type (str): GraphQl type of variable.
+
+    """
+    def __init__(self, variable_name: str, value_type: str) -> None:
+        super().__init__(variable_name)
+        self.value_type = value_type
+
+
 class GraphQlQuery:
     """GraphQl query which can have fields to query.
 
     Single use object which can be used only for one query. Object and children
     objects keep track about paging and progress.
 
+    Nested edge fields (e.g. links of folders) are queried with full pages
+        of parents. Next pages of nested edges are queried in follow-up
+        queries, each for multiple parents at once, see 'nested_batch_size'.
+
+    Cursors and page sizes are passed as variables, so query string is
+        compiled only once for all pages. Queries with cache key set
+        (see 'set_cache_key') share compiled query strings.
+
+    Id filters of queried entities (variables added with 'chunkable')
+        bigger than chunk size of connection are split to chunks queried
+        concurrently, results are merged in order of chunks. Entities
+        received by previous chunk are skipped. Filters by ids of other
+        entities, e.g. parents, are never split, as entity could match
+        multiple chunks and order and paging of results would be lost.
+
+    Values of single edge field can be received one by one using
+        'iter_edges'. Pages are parsed incrementally while they're received
+        if 'ijson' is installed, see 'stream_edges'.
+
+    Pages are recorded to query profilers of connection, see
+        'ServerAPI.profile_queries'.
+
     Args:
         name (str): Name of query.
 
     """
     offset = 2
+    # Maximum number of parents in single follow-up query of nested
+    #   edge fields, '0' queries parents one by one
+    nested_batch_size = 25
+    # Maximum number of chunks of id filter queried at the same time
+    chunk_workers = 4
+    # Parse pages in 'iter_edges' while they're received (requires 'ijson')
+    stream_edges = True
 
     def __init__(self, name: str, order: Optional[int] = None) -> None:
         self._name = name
@@ -91,6 +396,17 @@ class GraphQlQuery:
         self._children = []
         self._has_multiple_edge_fields = None
         self._order = SortOrder.parse_value(order, SortOrder.ascending)
+        self._page_size: Optional[Union[int, AdaptivePageSize]] = None
+        # Page size of currently queried page
+        self._current_page_size: Optional[int] = None
+        # Next pages of nested edge fields waiting for follow-up query
+        self._nested_pages: collections.deque[_NestedPage] = (
+            collections.deque()
+        )
+        self._cache_key: Optional[Any] = None
+        self._compiled_queries: dict[Any, tuple[str, Any]] = {}
+        # Profiles in active query profilers of connection
+        self._profiles: Optional[list[QueryProfile]] = None
 
     @property
     def indent(self) -> int:
@@ -122,6 +438,9 @@ class GraphQlQuery:
             bool: If still need query from server.
 
         """
+        if self._nested_pages:
+            return True
+
         for child in self._children:
             if child.need_query:
                 return True
@@ -139,8 +458,72 @@ class GraphQlQuery:
 
         return self._has_multiple_edge_fields
 
+    def get_page_size(self) -> int:
+        """Number of edges requested in single page.
+
+        Returns:
+            int: Page size of currently queried page, or of next page.
+
+        """
+        if self._current_page_size is not None:
+            return self._current_page_size
+        if isinstance(self._page_size, int):
+            return self._page_size
+        if isinstance(self._page_size, AdaptivePageSize):
+            return self._page_size.get_page_size(self._name)
+        return DEFAULT_PAGE_SIZE
+
+    def set_page_size(
+        self, page_size: Optional[Union[int, AdaptivePageSize]]
+    ) -> None:
+        """Change number of edges requested in single page.
+
+        Page size of connection is used if not set. Edge fields can have
+            own page size.
+
+        Args:
+            page_size (Optional[Union[int, AdaptivePageSize]]): Page size,
+                or adaptive page size changed based on responses.
+
+        """
+        if isinstance(page_size, int) and page_size < 1:
+            raise ValueError(f"Invalid page size {page_size}.")
+        self._page_size = page_size
+
+    def get_cache_key(self) -> Optional[Any]:
+        """Key identifying structure of the query.
+
+        Returns:
+            Optional[Any]: Hashable key, or None if compiled query string
+                is not shared with other queries.
+
+        """
+        return self._cache_key
+
+    def set_cache_key(self, cache_key: Optional[Any]) -> None:
+        """Set key identifying structure of the query.
+
+        Queries with the same cache key share compiled query strings, so
+            a query built repeatedly with the same fields is compiled only
+            once. The key is unset when structure of the query changes.
+
+        Args:
+            cache_key (Optional[Any]): Hashable key e.g. name of query
+                builder with its arguments.
+
+        """
+        self._cache_key = cache_key
+
+    def _structure_changed(self) -> None:
+        self._cache_key = None
+        self._compiled_queries = {}
+
     def add_variable(
-        self, key: str, value_type: str, value: Optional[Any] = None
+        self,
+        key: str,
+        value_type: str,
+        value: Optional[Any] = None,
+        chunkable: bool = False,
     ) -> QueryVariable:
         """Add variable to query.
 
@@ -149,6 +532,8 @@ class GraphQlQuery:
             value_type (str): Type of expected value in variables. This is
                 graphql type e.g. "[String!]", "Int", "Boolean", etc.
             value (Any): Default value for variable. Can be changed later.
+            chunkable (bool): Value is a list of ids of queried entities
+                which can be split to chunks, see 'GraphQlQuery'.
 
         Returns:
             QueryVariable: Created variable object.
@@ -168,8 +553,10 @@ class GraphQlQuery:
         self._variables[key] = {
             "type": value_type,
             "variable": variable,
-            "value": value
+            "value": value,
+            "chunkable": chunkable,
         }
+        self._structure_changed()
         return variable
 
     def get_variable(self, key: str) -> QueryVariable:
@@ -224,20 +611,38 @@ class GraphQlQuery:
     def get_variables_values(self) -> dict[str, Any]:
         """Calculate variable values used that should be used in query.
 
-        Variables with value set to 'None' are skipped.
+        Variables with value set to 'None' are skipped. Values of
+            pagination variables are included.
 
         Returns:
             dict[str, Any]: Variable values by their name.
 
         """
+        nested_pages = self._get_nested_pages_batch()
+        if nested_pages:
+            field = nested_pages[0].field
+            return field.get_nested_variables_values(nested_pages)
+
         output = {}
         for key, item in self._variables.items():
             value = item["value"]
             if value is not None:
                 output[key] = item["value"]
 
+        for field in self._iter_edge_fields():
+            output.update(field.get_page_variables_values())
         return output
 
+    def _iter_edge_fields(
+        self
+    ) -> Generator[GraphQlQueryEdgeField, None, None]:
+        fields = list(self._children)
+        while fields:
+            field = fields.pop(0)
+            if field.has_edges:
+                yield field
+            fields.extend(field._children_iter())
+
     def add_obj_field(self, field: BaseGraphQlQueryField) -> None:
         """Add field object to children.
 
@@ -249,6 +654,7 @@ class GraphQlQuery:
             return
 
         self._children.append(field)
+        self._structure_changed()
         field.set_parent(self)
 
     def add_field_with_edges(self, name: str) -> GraphQlQueryEdgeField:
@@ -292,134 +698,1122 @@ class GraphQlQuery:
                 return child.get_field_by_keys(keys)
         return None
 
-    def get_field_by_path(
-        self, path: str
-    ) -> Optional[BaseGraphQlQueryField]:
-        return self.get_field_by_keys(path.split("/"))
+    def get_field_by_path(
+        self, path: str
+    ) -> Optional[BaseGraphQlQueryField]:
+        return self.get_field_by_keys(path.split("/"))
+
+    def calculate_query(self) -> str:
+        """Calculate query string which is sent to server.
+
+        Returns:
+            str: GraphQl string with variables and headers.
+
+        Raises:
+            ValueError: Query has no fields.
+
+        """
+        if not self._children:
+            raise ValueError("Missing fields to query")
+
+        nested_pages = self._get_nested_pages_batch()
+        nested_key = None
+        if nested_pages:
+            nested_key = (
+                nested_pages[0].field.path,
+                tuple(
+                    nested_page.nested_field.path
+                    for nested_page in nested_pages
+                ),
+            )
+
+        # Query string depends only on structure and on variables with value
+        key = (
+            frozenset(
+                key
+                for key, item in self._variables.items()
+                if item["value"] is not None
+            ),
+            nested_key,
+        )
+        query_str = self._compiled_queries.get(key)
+        if query_str is not None:
+            return query_str
+
+        shared_key = None
+        if self._cache_key is not None:
+            shared_key = (self._name, self._cache_key, key)
+            with _COMPILED_QUERIES_LOCK:
+                query_str = _COMPILED_QUERIES.get(shared_key)
+                if query_str is not None:
+                    _COMPILED_QUERIES.move_to_end(shared_key)
+
+        if query_str is None:
+            query_str = self._compile_query(nested_pages)
+            if shared_key is not None:
+                with _COMPILED_QUERIES_LOCK:
+                    _COMPILED_QUERIES[shared_key] = query_str
+                    while len(_COMPILED_QUERIES) > _COMPILED_QUERIES_LIMIT:
+                        _COMPILED_QUERIES.popitem(last=False)
+
+        self._compiled_queries[key] = query_str
+        return query_str
+
+    def _compile_query(self, nested_pages: list[_NestedPage]) -> str:
+        if nested_pages:
+            field = nested_pages[0].field
+            fields_query, variable_keys, page_variables = (
+                field.calculate_nested_query(nested_pages)
+            )
+            return "\n".join([
+                self._calculate_header(variable_keys, page_variables) + " {",
+                fields_query,
+                "}",
+            ])
+
+        output = []
+        output.append(self._calculate_header(
+            None, self._get_page_variables()
+        ) + " {")
+        for field in self._children:
+            output.append(field.calculate_query())
+        output.append("}")
+
+        return "\n".join(output)
+
+    def _get_page_variables(self) -> list[_PageVariable]:
+        page_variables = []
+        for field in self._iter_edge_fields():
+            page_variables.extend(field.get_page_variables())
+        return page_variables
+
+    def _get_variable_definitions(
+        self,
+        variable_keys: Optional[set[str]],
+        page_variables: list[_PageVariable],
+    ) -> list[str]:
+        variables = []
+        for key, item in self._variables.items():
+            if item["value"] is None:
+                continue
+
+            if variable_keys is not None and key not in variable_keys:
+                continue
+
+            variables.append(f"{item['variable']}: {item['type']}")
+
+        for variable in page_variables:
+            variables.append(f"{variable}: {variable.value_type}")
+        return variables
+
+    def _calculate_header(
+        self,
+        variable_keys: Optional[set[str]],
+        page_variables: list[_PageVariable],
+    ) -> str:
+        variables = self._get_variable_definitions(
+            variable_keys, page_variables
+        )
+        variables_str = ""
+        if variables:
+            variables_str = f"({','.join(variables)})"
+        return f"query {self._name}{variables_str}"
+
+    def _get_nested_pages_batch(self) -> list[_NestedPage]:
+        """Next pages of nested edge fields queried by next query.
+
+        Follow-up query is sent when there is enough next pages for full
+            batch, or when all pages of parents were received.
+
+        Returns:
+            list[_NestedPage]: Next pages of the same parent edge field.
+
+        """
+        if not self._nested_pages:
+            return []
+        batch_size = max(self.nested_batch_size, 1)
+        field = self._nested_pages[0].field
+        output = []
+        for nested_page in self._nested_pages:
+            if nested_page.field is not field or len(output) >= batch_size:
+                break
+            output.append(nested_page)
+
+        if len(output) < batch_size:
+            for child in self._children:
+                if child.need_query:
+                    return []
+        return output
+
+    def _add_nested_page(self, nested_page: _NestedPage) -> None:
+        """Add next page of nested edge field to follow-up queries.
+
+        Args:
+            nested_page (_NestedPage): Next page of nested edge field.
+
+        """
+        self._nested_pages.append(nested_page)
+
+    def parse_result(
+        self,
+        data: dict[str, Any],
+        output: dict[str, Any],
+        progress_data: dict[str, Any],
+    ) -> None:
+        """Parse data from response for output.
+
+        Output is stored to passed 'output' variable. That's because of paging
+        during which objects must have access to both new and previous values.
+
+        Args:
+            data (dict[str, Any]): Data received using calculated query.
+            output (dict[str, Any]): Where parsed data are stored.
+            progress_data (dict[str, Any]): Data used for paging.
+
+        """
+        nested_pages = self._get_nested_pages_batch()
+        if nested_pages:
+            # Response of follow-up query of nested edge fields
+            for _ in nested_pages:
+                self._nested_pages.popleft()
+            field = nested_pages[0].field
+            field.parse_nested_result(data, nested_pages, progress_data)
+            return
+
+        if not data:
+            return
+
+        for child in self._children:
+            child.parse_result(data, output, progress_data)
+
+    def query(self, con: ServerAPI) -> dict[str, Any]:
+        """Do a query from server.
+
+        Args:
+            con (ServerAPI): Connection to server with 'query' method.
+
+        Returns:
+            dict[str, Any]: Parsed output from GraphQl query.
+
+        """
+        self._start_profiles(con)
+        chunks = self._get_variable_chunks(con)
+        if chunks is not None:
+            output = {}
+            for chunk_output in self._iter_chunk_outputs(con, *chunks):
+                _merge_outputs(output, chunk_output)
+            return output
+
+        started = time.perf_counter()
+        progress_data = {}
+        output = {}
+        while self.need_query:
+            self._query_page(con, progress_data, output)
+
+        self._record_metrics(con, time.perf_counter() - started)
+        return output
+
+    def _get_variable_chunks(
+        self, con: Any
+    ) -> Optional[tuple[str, list[list[Any]]]]:
+        """Split id filter to chunks if is bigger than chunk size.
+
+        Returns:
+            Optional[tuple[str, list[list[Any]]]]: Variable name and chunks
+                of its value, or None if query should not be split.
+
+        """
+        chunk_size = _get_chunk_size(con)
+        if chunk_size < 1:
+            return None
+
+        key = values = None
+        for variable_key, item in self._variables.items():
+            value = item["value"]
+            if (
+                item["chunkable"]
+                and isinstance(value, (list, tuple, set))
+                and len(value) > chunk_size
+                and (values is None or len(value) > len(values))
+            ):
+                key = variable_key
+                values = value
+
+        if key is None:
+            return None
+
+        # Limit of edge field can't be split between chunks
+        for field in self._iter_edge_fields():
+            if field._limit:
+                return None
+
+        # Sort values so chunks are same for same filter
+        values = sorted(set(values), key=str)
+        chunks = [
+            values[idx:idx + chunk_size]
+            for idx in range(0, len(values), chunk_size)
+        ]
+        return key, chunks
+
+    def _create_chunk_query(
+        self, key: str, values: list[Any]
+    ) -> GraphQlQuery:
+        # Adaptive page size is shared with the original query
+        memo = {}
+        if isinstance(self._page_size, AdaptivePageSize):
+            memo[id(self._page_size)] = self._page_size
+        # Chunks are recorded as pages of the original query
+        if self._profiles is not None:
+            memo[id(self._profiles)] = self._profiles
+        query = copy.deepcopy(self, memo)
+        query.set_variable_value(key, values)
+        return query
+
+    def _iter_chunk_outputs(
+        self, con: ServerAPI, key: str, chunks: list[list[Any]]
+    ) -> Generator[dict[str, Any], None, None]:
+        """Query chunks concurrently and yield outputs in order of chunks.
+
+        Only limited number of chunks is queried ahead of the consumer.
+
+        """
+        chunks_iter = iter(chunks)
+        futures = collections.deque()
+        workers = max(min(self.chunk_workers, len(chunks)), 1)
+        executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix=f"GraphQlChunks-{self._name}",
+        )
+
+        def _submit():
+            values = next(chunks_iter, None)
+            if values is None:
+                return
+            query = self._create_chunk_query(key, values)
+            # Run in copy of current context so impersonation and sender
+            #   are used by the threads too
+            context = contextvars.copy_context()
+            futures.append(executor.submit(context.run, query.query, con))
+
+        try:
+            for _ in range(workers):
+                _submit()
+
+            seen_ids = {}
+            while futures:
+                output = futures.popleft().result()
+                _submit()
+                _remove_duplicates(output, seen_ids)
+                yield output
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def continuous_query(
+        self, con: ServerAPI, prefetch: Optional[int] = None
+    ) -> Generator[dict[str, Any], None, None]:
+        """Do a query from server.
+
+        With prefetch the next pages are requested in a background thread
+            while the caller handles the current page. Pages are still
+            yielded in order.
+
+        Args:
+            con (ServerAPI): Connection to server with 'query' method.
+            prefetch (Optional[int]): Maximum number of pages fetched ahead,
+                '0' disables prefetch. Prefetch of connection is used
+                if not passed.
+
+        Returns:
+            dict[str, Any]: Parsed output from GraphQl query.
+
+        """
+        self._start_profiles(con)
+        chunks = self._get_variable_chunks(con)
+        if chunks is not None:
+            yield from self._iter_chunk_outputs(con, *chunks)
+            return
+
+        if self.has_multiple_edge_fields:
+            yield self.query(con)
+            return
+
+        if prefetch is None:
+            prefetch = _get_prefetch_depth(con)
+
+        if prefetch > 0:
+            yield from self._prefetch_continuous_query(con, prefetch)
+            return
+
+        # Time spent by consumer of the generator is not measured
+        duration = 0.0
+        progress_data = {}
+        try:
+            while self.need_query:
+                started = time.perf_counter()
+                output = self._query_page(con, progress_data)
+                duration += time.perf_counter() - started
+
+                yield output
+        finally:
+            # Record also when consumer stops the iteration
+            self._record_metrics(con, duration)
+
+    def _query_page(
+        self,
+        con: ServerAPI,
+        progress_data: dict[str, Any],
+        output: Optional[dict[str, Any]] = None,
+    ) -> dict[str, Any]:
+        if output is None:
+            output = {}
+        self._start_profiles(con)
+        page_size = self._start_page(con)
+        query_str = self.calculate_query()
+        variables = self.get_variables_values()
+        profile_state = self._get_profile_state()
+        started = time.perf_counter()
+        response = con.query_graphql(query_str, variables)
+        duration = time.perf_counter() - started
+        if response.errors:
+            self._current_page_size = None
+            raise GraphQlQueryFailed(response.errors, query_str, variables)
+
+        parse_started = time.perf_counter()
+        self.parse_result(response.data["data"], output, progress_data)
+        response_size = _get_response_size(response)
+        self._add_page_profile(
+            profile_state,
+            query_str,
+            duration,
+            time.perf_counter() - parse_started,
+            response_size,
+        )
+        self._finish_page(page_size, response_size, duration)
+        return output
+
+    def _get_root_edge_field(self) -> Optional[GraphQlQueryEdgeField]:
+        """Edge field which is not nested in other edge field.
+
+        Returns:
+            Optional[GraphQlQueryEdgeField]: Edge field or None if query
+                does not have exactly one such field.
+
+        """
+        output = None
+        fields = list(self._children)
+        while fields:
+            field = fields.pop(0)
+            if not field.has_edges:
+                fields.extend(field._children_iter())
+            elif output is None:
+                output = field
+            else:
+                return None
+        return output
+
+    def iter_edges(
+        self, con: ServerAPI, prefetch: Optional[int] = None
+    ) -> Generator[dict[str, Any], None, None]:
+        """Do a query from server and yield parsed values of edges.
+
+        Query must have single edge field which is not nested in other
+            edge field, e.g. 'project/folders'.
+
+        If 'ijson' is installed and connection has 'query_graphql_stream',
+            pages are parsed while they're received and values are yielded
+            as soon as they're parsed, so whole page is never held in
+            memory. Error in response may be received after some values
+            were already yielded. Query with nested edge fields, with
+            id filter split to chunks, or with prefetch, is queried page
+            by page using 'continuous_query'.
+
+        Args:
+            con (ServerAPI): Connection to server with 'query' method.
+            prefetch (Optional[int]): Maximum number of pages fetched ahead,
+                '0' disables prefetch. Prefetch of connection is used
+                if not passed.
+
+        Returns:
+            Generator[dict[str, Any], None, None]: Parsed values of edges.
+
+        """
+        self._start_profiles(con)
+        field = self._get_root_edge_field()
+        if field is None:
+            raise GraphQlQueryError(
+                f"Query '{self._name}' does not have single edge field"
+                " to iterate."
+            )
+
+        keys = [field.get_name()]
+        parent = field._parent
+        while not isinstance(parent, GraphQlQuery):
+            keys.insert(0, parent.get_name())
+            parent = parent._parent
+
+        if prefetch is None:
+            prefetch = _get_prefetch_depth(con)
+
+        # Next page can't be requested before streamed page is received,
+        #   pages are prefetched by 'continuous_query' instead
+        ijson = _get_ijson() if self.stream_edges else None
+        if (
+            ijson is None
+            or prefetch > 0
+            or not hasattr(con, "query_graphql_stream")
+            or field.child_has_edges
+            or self._get_variable_chunks(con) is not None
+        ):
+            for output in self.continuous_query(con, prefetch):
+                for key in keys:
+                    if not output:
+                        break
+                    output = output.get(key)
+                if output:
+                    yield from output
+            return
+
+        duration = 0.0
+        progress_data = {}
+        try:
+            while self.need_query:
+                duration += yield from self._stream_page(
+                    con, field, keys, ijson, progress_data
+                )
+        finally:
+            # Record also when consumer stops the iteration
+            self._record_metrics(con, duration)
+
+    def _stream_page(
+        self,
+        con: ServerAPI,
+        field: GraphQlQueryEdgeField,
+        keys: list[str],
+        ijson: Any,
+        progress_data: dict[str, Any],
+    ) -> Generator[dict[str, Any], None, float]:
+        """Query single page and yield values of edges while parsing.
+
+        Values of edges are built separately and are not added to output
+            of the page, everything else in response is parsed as usual
+            once the page is received.
+
+        Returns:
+            Generator[dict[str, Any], None, float]: Parsed values of edges,
+                returns duration of the page without time spent
+                by consumer.
+
+        """
+        page_size = self._start_page(con)
+        query_str = self.calculate_query()
+        variables = self.get_variables_values()
+        edge_prefix = ".".join(("data", *keys, "edges", "item"))
+        edge_child_prefix = f"{edge_prefix}."
+        page_builder = ijson.ObjectBuilder()
+        edge_builder = None
+        response_size = 0
+        edges_count = 0
+        parse_time = 0.0
+        profile_state = self._get_profile_state()
+
+        def _iter_chunks():
+            nonlocal response_size
+            for chunk in chunks:
+                response_size += len(chunk)
+                yield chunk
+
+        started = time.perf_counter()
+        chunks = con.query_graphql_stream(query_str, variables)
+        try:
+            for prefix, event, value in _iter_json_events(
+                ijson, _iter_chunks()
+            ):
+                if (
+                    prefix != edge_prefix
+                    and not prefix.startswith(edge_child_prefix)
+                ):
+                    page_builder.event(event, value)
+                    continue
+
+                if edge_builder is None:
+                    edge_builder = ijson.ObjectBuilder()
+                edge_builder.event(event, value)
+                if prefix == edge_prefix and event == "end_map":
+                    edges_count += 1
+                    parse_started = time.perf_counter()
+                    edge_value = field.parse_edge(
+                        edge_builder.value, progress_data
+                    )
+                    parse_time += time.perf_counter() - parse_started
+                    edge_builder = None
+                    paused = time.perf_counter()
+                    yield edge_value
+                    started += time.perf_counter() - paused
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+
+        duration = time.perf_counter() - started
+        data = getattr(page_builder, "value", None) or {}
+        errors = data.get("errors")
+        if errors:
+            self._current_page_size = None
+            raise GraphQlQueryFailed(errors, query_str, variables)
+
+        # Edges were parsed already, rest of the page marks progress
+        parse_started = time.perf_counter()
+        field._fetched_counter += edges_count
+        self.parse_result(data.get("data"), {}, progress_data)
+        parse_time += time.perf_counter() - parse_started
+        self._add_page_profile(
+            profile_state,
+            query_str,
+            duration - parse_time,
+            parse_time,
+            response_size,
+        )
+        self._finish_page(page_size, response_size, duration)
+        return duration
+
+    def _start_page(
+        self, con: Any
+    ) -> Union[int, AdaptivePageSize]:
+        """Resolve page size used for next page.
+
+        Returns:
+            Union[int, AdaptivePageSize]: Page size source, passed
+                to '_finish_page'.
+
+        """
+        page_size = self._page_size
+        if page_size is None:
+            page_size = _get_connection_page_size(con)
+
+        if isinstance(page_size, AdaptivePageSize):
+            self._current_page_size = page_size.get_page_size(self._name)
+            if self._nested_pages:
+                # Follow-up query of nested edges is not a page of the query
+                return self._current_page_size
+        else:
+            self._current_page_size = page_size
+        return page_size
+
+    def _finish_page(
+        self,
+        page_size: Union[int, AdaptivePageSize],
+        response_size: int,
+        duration: float,
+    ) -> None:
+        current_page_size = self._current_page_size
+        self._current_page_size = None
+        # Only full pages tell how long does it take to receive a page
+        if isinstance(page_size, AdaptivePageSize) and self.need_query:
+            page_size.record_page(
+                self._name,
+                current_page_size,
+                duration,
+                response_size,
+            )
+
+    def _prefetch_continuous_query(
+        self, con: ServerAPI, depth: int
+    ) -> Generator[dict[str, Any], None, None]:
+        pages = queue.Queue(maxsize=depth)
+        stop_event = threading.Event()
+        # Time spent by the thread, consumer of the generator is not measured
+        durations = [0.0]
+
+        def _put(item: Any) -> bool:
+            # Don't block forever when consumer stopped the iteration
+            while not stop_event.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def _producer():
+            progress_data = {}
+            try:
+                while self.need_query and not stop_event.is_set():
+                    started = time.perf_counter()
+                    output = self._query_page(con, progress_data)
+                    durations[0] += time.perf_counter() - started
+                    if not _put(output):
+                        return
+            except BaseException as exc:
+                _put(_PrefetchError(exc))
+                return
+            _put(_PREFETCH_DONE)
+
+        # Run in copy of current context so impersonation and sender
+        #   are used by the thread too
+        context = contextvars.copy_context()
+        thread = threading.Thread(
+            target=context.run,
+            args=(_producer, ),
+            name=f"GraphQlPrefetch-{self._name}",
+            daemon=True,
+        )
+        thread.start()
+        try:
+            while True:
+                item = pages.get()
+                if item is _PREFETCH_DONE:
+                    break
+                if isinstance(item, _PrefetchError):
+                    raise item.exc
+                yield item
+        finally:
+            stop_event.set()
+            self._record_metrics(con, durations[0])
+
+    async def async_query(self, con: AsyncServerAPI) -> dict[str, Any]:
+        """Do a query from server using asyncio connection.
+
+        Args:
+            con (AsyncServerAPI): Asyncio connection to server.
+
+        Returns:
+            dict[str, Any]: Parsed output from GraphQl query.
+
+        """
+        self._start_profiles(con)
+        chunks = self._get_variable_chunks(con)
+        if chunks is not None:
+            output = {}
+            async for chunk_output in self._async_iter_chunk_outputs(
+                con, *chunks
+            ):
+                _merge_outputs(output, chunk_output)
+            return output
+
+        started = time.perf_counter()
+        progress_data = {}
+        output = {}
+        while self.need_query:
+            await self._async_query_page(con, progress_data, output)
+
+        self._record_metrics(con, time.perf_counter() - started)
+        return output
+
+    async def async_continuous_query(
+        self, con: AsyncServerAPI, prefetch: Optional[int] = None
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """Do a query from server using asyncio connection.
+
+        Async counterpart of 'continuous_query'. Pages are prefetched
+            using asyncio task.
+
+        Args:
+            con (AsyncServerAPI): Asyncio connection to server.
+            prefetch (Optional[int]): Maximum number of pages fetched ahead,
+                '0' disables prefetch. Prefetch of connection is used
+                if not passed.
+
+        Returns:
+            AsyncGenerator[dict[str, Any], None]: Parsed output from
+                GraphQl query.
+
+        """
+        self._start_profiles(con)
+        chunks = self._get_variable_chunks(con)
+        if chunks is not None:
+            async for output in self._async_iter_chunk_outputs(
+                con, *chunks
+            ):
+                yield output
+            return
+
+        if self.has_multiple_edge_fields:
+            yield await self.async_query(con)
+            return
+
+        if prefetch is None:
+            prefetch = _get_prefetch_depth(con)
+
+        if prefetch > 0:
+            async for output in self._async_prefetch_continuous_query(
+                con, prefetch
+            ):
+                yield output
+            return
+
+        duration = 0.0
+        progress_data = {}
+        try:
+            while self.need_query:
+                started = time.perf_counter()
+                output = await self._async_query_page(con, progress_data)
+                duration += time.perf_counter() - started
+
+                yield output
+        finally:
+            # Record also when consumer stops the iteration
+            self._record_metrics(con, duration)
+
+    async def _async_iter_chunk_outputs(
+        self, con: AsyncServerAPI, key: str, chunks: list[list[Any]]
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """Async counterpart of '_iter_chunk_outputs'.
+
+        Chunks are queried by asyncio tasks, only limited number of chunks
+            is queried ahead of the consumer.
+
+        """
+        chunks_iter = iter(chunks)
+        tasks = collections.deque()
+        workers = max(min(self.chunk_workers, len(chunks)), 1)
+
+        def _submit():
+            values = next(chunks_iter, None)
+            if values is None:
+                return
+            query = self._create_chunk_query(key, values)
+            tasks.append(asyncio.ensure_future(query.async_query(con)))
+
+        try:
+            for _ in range(workers):
+                _submit()
+
+            seen_ids = {}
+            while tasks:
+                output = await tasks.popleft()
+                _submit()
+                _remove_duplicates(output, seen_ids)
+                yield output
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _async_query_page(
+        self,
+        con: AsyncServerAPI,
+        progress_data: dict[str, Any],
+        output: Optional[dict[str, Any]] = None,
+    ) -> dict[str, Any]:
+        if output is None:
+            output = {}
+        self._start_profiles(con)
+        page_size = self._start_page(con)
+        query_str = self.calculate_query()
+        variables = self.get_variables_values()
+        profile_state = self._get_profile_state()
+        started = time.perf_counter()
+        response = await con.query_graphql(query_str, variables)
+        duration = time.perf_counter() - started
+        if response.errors:
+            self._current_page_size = None
+            raise GraphQlQueryFailed(response.errors, query_str, variables)
+
+        parse_started = time.perf_counter()
+        self.parse_result(response.data["data"], output, progress_data)
+        response_size = _get_response_size(response)
+        self._add_page_profile(
+            profile_state,
+            query_str,
+            duration,
+            time.perf_counter() - parse_started,
+            response_size,
+        )
+        self._finish_page(page_size, response_size, duration)
+        return output
+
+    async def _async_prefetch_continuous_query(
+        self, con: AsyncServerAPI, depth: int
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        pages = asyncio.Queue(maxsize=depth)
+        durations = [0.0]
+
+        async def _producer():
+            progress_data = {}
+            try:
+                while self.need_query:
+                    started = time.perf_counter()
+                    output = await self._async_query_page(con, progress_data)
+                    durations[0] += time.perf_counter() - started
+                    await pages.put(output)
+            except Exception as exc:
+                await pages.put(_PrefetchError(exc))
+                return
+            await pages.put(_PREFETCH_DONE)
+
+        task = asyncio.ensure_future(_producer())
+        try:
+            while True:
+                item = await pages.get()
+                if item is _PREFETCH_DONE:
+                    break
+                if isinstance(item, _PrefetchError):
+                    raise item.exc
+                yield item
+        finally:
+            task.cancel()
+            self._record_metrics(con, durations[0])
+
+    def _start_profiles(self, con: Any) -> None:
+        """Start profiles of the query in active profilers of connection.
+
+        Profiles are started only once, on first call of the query.
+
+        """
+        if self._profiles is not None:
+            return
+        self._profiles = []
+        # Connection may not have metrics (e.g. custom connection object)
+        get_metrics = getattr(con, "get_metrics", None)
+        if get_metrics is None:
+            return
+        for profiler in get_metrics().get_query_profilers():
+            self._profiles.append(profiler.start_query(self._name))
+
+    def _get_fetched_edges(self) -> int:
+        return sum(
+            field._fetched_counter
+            for field in self._iter_edge_fields()
+        )
+
+    def _get_profile_state(self) -> Optional[tuple[Optional[str], int]]:
+        """State of the query before page is received.
+
+        Returns:
+            Optional[tuple[Optional[str], int]]: Path of nested edge field
+                queried by the page and number of fetched edges, or None
+                if the query is not profiled.
+
+        """
+        if not self._profiles:
+            return None
+        nested_path = None
+        nested_pages = self._get_nested_pages_batch()
+        if nested_pages:
+            nested_path = nested_pages[0].nested_field.path
+        return nested_path, self._get_fetched_edges()
+
+    def _add_page_profile(
+        self,
+        profile_state: Optional[tuple[Optional[str], int]],
+        query_str: str,
+        latency: float,
+        parse_time: float,
+        response_size: int,
+    ) -> None:
+        if profile_state is None:
+            return
+        nested_path, fetched_edges = profile_state
+        page = PageProfile(
+            latency=latency,
+            parse_time=parse_time,
+            edges=self._get_fetched_edges() - fetched_edges,
+            query_size=len(query_str),
+            response_size=response_size,
+            nested_path=nested_path,
+        )
+        for profile in self._profiles:
+            profile.add_page(page)
 
-    def calculate_query(self) -> str:
-        """Calculate query string which is sent to server.
+    def _record_metrics(self, con: Any, duration: float) -> None:
+        # Connection may not have metrics (e.g. custom connection object)
+        get_metrics = getattr(con, "get_metrics", None)
+        if get_metrics is not None:
+            get_metrics().record_graphql_query(self._name, duration)
 
-        Returns:
-            str: GraphQl string with variables and headers.
 
-        Raises:
-            ValueError: Query has no fields.
+class GraphQlBatch:
+    """Send first pages of multiple GraphQl queries in single request.
 
-        """
-        if not self._children:
-            raise ValueError("Missing fields to query")
+    Queries are merged to single query document. Top level fields and
+        variables of each query are prefixed with 'q<index>_', results are
+        passed back to each query. Next pages are queried separately
+        for each query.
 
-        variables = []
-        for item in self._variables.values():
-            if item["value"] is None:
-                continue
+    Queries with id filters which are split to chunks (see
+        'GraphQlQuery') are queried separately.
 
-            variables.append(f"{item['variable']}: {item['type']}")
+    Example:
+        >>> with con.graphql_batch() as batch:
+        ...     batch.add_query(folders_query)
+        ...     batch.add_query(tasks_query)
+        >>> folders = batch.get_output(folders_query)["project"]["folders"]
 
-        variables_str = ""
-        if variables:
-            variables_str = f"({','.join(variables)})"
-        header = f"query {self._name}{variables_str}"
+    Args:
+        con (ServerAPI): Connection to server.
+        name (str): Name of merged query.
 
-        output = []
-        output.append(header + " {")
-        for field in self._children:
-            output.append(field.calculate_query())
-        output.append("}")
+    """
+    def __init__(self, con: ServerAPI, name: str = "Batch") -> None:
+        self._con = con
+        self._name = name
+        self._queries: list[GraphQlQuery] = []
+        self._outputs: Optional[list[dict[str, Any]]] = None
 
-        return "\n".join(output)
+    def __enter__(self) -> GraphQlBatch:
+        return self
 
-    def parse_result(
-        self,
-        data: dict[str, Any],
-        output: dict[str, Any],
-        progress_data: dict[str, Any],
-    ) -> None:
-        """Parse data from response for output.
+    def __exit__(self, exc_type, exc_value, exc_traceback) -> None:
+        if exc_type is None and self._outputs is None:
+            self.query()
 
-        Output is stored to passed 'output' variable. That's because of paging
-        during which objects must have access to both new and previous values.
+    def add_query(self, query: GraphQlQuery) -> GraphQlQuery:
+        """Add query to the batch.
 
         Args:
-            data (dict[str, Any]): Data received using calculated query.
-            output (dict[str, Any]): Where parsed data are stored.
-            progress_data (dict[str, Any]): Data used for paging.
+            query (GraphQlQuery): Query which was not queried yet.
+
+        Returns:
+            GraphQlQuery: Added query.
 
         """
-        if not data:
-            return
+        if self._outputs is not None:
+            raise ValueError("Batch was already queried.")
 
-        for child in self._children:
-            child.parse_result(data, output, progress_data)
+        if query not in self._queries:
+            self._queries.append(query)
+        return query
 
-    def query(self, con: ServerAPI) -> dict[str, Any]:
-        """Do a query from server.
+    def get_output(self, query: GraphQlQuery) -> dict[str, Any]:
+        """Parsed output of query from the batch.
 
         Args:
-            con (ServerAPI): Connection to server with 'query' method.
+            query (GraphQlQuery): Query added to the batch.
 
         Returns:
             dict[str, Any]: Parsed output from GraphQl query.
 
         """
-        progress_data = {}
-        output = {}
-        while self.need_query:
-            query_str = self.calculate_query()
-            variables = self.get_variables_values()
-            response = con.query_graphql(
-                query_str,
-                variables
-            )
-            if response.errors:
-                raise GraphQlQueryFailed(response.errors, query_str, variables)
-            self.parse_result(response.data["data"], output, progress_data)
-
-        return output
+        if self._outputs is None:
+            raise ValueError("Batch was not queried yet.")
+        return self._outputs[self._queries.index(query)]
 
-    def continuous_query(
-        self, con: ServerAPI
-    ) -> Generator[dict[str, Any], None, None]:
-        """Do a query from server.
+    def calculate_query(
+        self, queries: Optional[list[GraphQlQuery]] = None
+    ) -> tuple[str, dict[str, Any]]:
+        """Calculate merged query string and its variables.
 
         Args:
-            con (ServerAPI): Connection to server with 'query' method.
+            queries (Optional[list[GraphQlQuery]]): Queries to merge, all
+                queries of the batch are used if not passed.
 
         Returns:
-            dict[str, Any]: Parsed output from GraphQl query.
+            tuple[str, dict[str, Any]]: Query string and variable values.
 
         """
-        progress_data = {}
-        if self.has_multiple_edge_fields:
-            output = {}
-            while self.need_query:
-                query_str = self.calculate_query()
-                variables = self.get_variables_values()
+        if queries is None:
+            queries = self._queries
+
+        definitions = []
+        variables = {}
+        fields = []
+        for idx, query in enumerate(queries):
+            prefix = f"q{idx}_"
+            definitions.extend(
+                _prefix_variables(definition, prefix)
+                for definition in query._get_variable_definitions(
+                    None, query._get_page_variables()
+                )
+            )
+            for key, value in query.get_variables_values().items():
+                variables[f"{prefix}{key}"] = value
 
-                response = con.query_graphql(query_str, variables)
-                if response.errors:
-                    raise GraphQlQueryFailed(
-                        response.errors, query_str, variables
-                    )
-                self.parse_result(response.data["data"], output, progress_data)
+            for child in query._children:
+                field_query = _prefix_variables(
+                    child.calculate_query().lstrip(" "), prefix
+                )
+                fields.append(
+                    f"{child.indent * ' '}{prefix}{child.name}: {field_query}"
+                )
 
-            yield output
+        variables_str = ""
+        if definitions:
+            variables_str = f"({','.join(definitions)})"
 
-        else:
-            while self.need_query:
-                output = {}
-                query_str = self.calculate_query()
-                variables = self.get_variables_values()
+        output = [f"query {self._name}{variables_str} {{"]
+        output.extend(fields)
+        output.append("}")
+        return "\n".join(output), variables
+
+    def query(self) -> list[dict[str, Any]]:
+        """Query all queries of the batch.
+
+        Returns:
+            list[dict[str, Any]]: Parsed outputs of queries in order in
+                which were added.
+
+        """
+        if self._outputs is not None:
+            return self._outputs
+
+        con = self._con
+        outputs = {}
+        batched = []
+        for query in self._queries:
+            if query._get_variable_chunks(con) is not None:
+                outputs[id(query)] = query.query(con)
+            else:
+                batched.append(query)
+
+        if batched:
+            profile_states = []
+            for query in batched:
+                query._start_profiles(con)
+                query._start_page(con)
+                profile_states.append(query._get_profile_state())
+            query_str, variables = self.calculate_query(batched)
+            started = time.perf_counter()
+            try:
                 response = con.query_graphql(query_str, variables)
-                if response.errors:
-                    raise GraphQlQueryFailed(
-                        response.errors, query_str, variables
-                    )
+            finally:
+                # Merged page does not tell anything about page size
+                #   of the queries
+                for query in batched:
+                    query._current_page_size = None
+            duration = time.perf_counter() - started
+            if response.errors:
+                raise GraphQlQueryFailed(
+                    response.errors, query_str, variables
+                )
+
+            data = response.data["data"]
+            for idx, query in enumerate(batched):
+                started = time.perf_counter()
+                prefix = f"q{idx}_"
+                query_data = {
+                    child.name: data.get(f"{prefix}{child.name}")
+                    for child in query._children
+                }
+                progress_data = {}
+                output = {}
+                query.parse_result(query_data, output, progress_data)
+                query._add_page_profile(
+                    profile_states[idx],
+                    query_str,
+                    duration,
+                    time.perf_counter() - started,
+                    _get_response_size(response),
+                )
+                while query.need_query:
+                    query._query_page(con, progress_data, output)
+                query._record_metrics(
+                    con, duration + time.perf_counter() - started
+                )
+                outputs[id(query)] = output
 
-                self.parse_result(response.data["data"], output, progress_data)
+        self._outputs = [outputs[id(query)] for query in self._queries]
+        return self._outputs
 
-                yield output
+
+def _prefix_variables(query_str: str, prefix: str) -> str:
+    def _replace(match):
+        variable_name = match.group(1)
+        if variable_name is None:
+            return match.group(0)
+        return f"${prefix}{variable_name}"
+
+    return _VARIABLE_REGEX.sub(_replace, query_str)
 
 
 class BaseGraphQlQueryField(ABC):
@@ -456,6 +1850,7 @@ class BaseGraphQlQueryField(ABC):
         self._path = None
 
         self._limit = None
+        self._page_size = None
         self._order = order
         self._fetched_counter = 0
 
@@ -483,6 +1878,24 @@ class BaseGraphQlQueryField(ABC):
     def set_limit(self, limit: Optional[int]) -> None:
         self._limit = limit
 
+    def get_page_size(self) -> int:
+        """Number of edges requested in single page.
+
+        Page size of query is used if field does not have own page size.
+
+        Returns:
+            int: Page size.
+
+        """
+        if self._page_size:
+            return self._page_size
+        return self._query_item.get_page_size()
+
+    def set_page_size(self, page_size: Optional[int]) -> None:
+        if page_size is not None and page_size < 1:
+            raise ValueError(f"Invalid page size {page_size}.")
+        self._page_size = page_size
+
     def set_order(self, order: SortOrder) -> None:
         order = SortOrder.parse_value(order)
         if order is None:
@@ -491,6 +1904,7 @@ class BaseGraphQlQueryField(ABC):
                 f" Expected {SortOrder.ascending} or {SortOrder.descending}"
             )
         self._order = order
+        self._query_item._structure_changed()
 
     def set_ascending_order(self, enabled: bool = True) -> None:
         self.set_order(
@@ -505,6 +1919,7 @@ class BaseGraphQlQueryField(ABC):
         key: str,
         value_type: str,
         value: Optional[Any] = None,
+        chunkable: bool = False,
     ) -> QueryVariable:
         """Add variable to query.
 
@@ -513,6 +1928,8 @@ class BaseGraphQlQueryField(ABC):
             value_type (str): Type of expected value in variables. This is
                 graphql type e.g. "[String!]", "Int", "Boolean", etc.
             value (Any): Default value for variable. Can be changed later.
+            chunkable (bool): Value is a list of ids of queried entities
+                which can be split to chunks, see 'GraphQlQuery'.
 
         Returns:
             QueryVariable: Created variable object.
@@ -521,7 +1938,7 @@ class BaseGraphQlQueryField(ABC):
             KeyError: If variable was already added before.
 
         """
-        return self._parent.add_variable(key, value_type, value)
+        return self._parent.add_variable(key, value_type, value, chunkable)
 
     def get_variable(self, key: str) -> QueryVariable:
         """Variable object.
@@ -646,12 +2063,14 @@ class BaseGraphQlQueryField(ABC):
 
     def set_filter(self, key: str, value: Any) -> None:
         self._filters[key] = value
+        self._query_item._structure_changed()
 
     def has_filter(self, key: str) -> bool:
         return key in self._filters
 
     def remove_filter(self, key: str) -> None:
         self._filters.pop(key, None)
+        self._query_item._structure_changed()
 
     def set_parent(
         self, parent: Union[BaseGraphQlQueryField, GraphQlQuery]
@@ -666,6 +2085,7 @@ class BaseGraphQlQueryField(ABC):
             return
 
         self._children.append(field)
+        self._query_item._structure_changed()
         field.set_parent(self)
 
     def add_field_with_edges(self, name: str) -> GraphQlQueryEdgeField:
@@ -679,6 +2099,9 @@ class BaseGraphQlQueryField(ABC):
         return item
 
     def _filter_value_to_str(self, value: Any) -> Optional[str]:
+        if isinstance(value, _PageVariable):
+            return str(value)
+
         if isinstance(value, QueryVariable):
             if self.get_variable_value(value.variable_name) is None:
                 return None
@@ -730,6 +2153,28 @@ class BaseGraphQlQueryField(ABC):
         joined_items = ", ".join(filter_items)
         return f"({joined_items})"
 
+    def _get_used_variable_keys(self) -> set[str]:
+        """Names of variables used in filters of field and its children.
+
+        Returns:
+            set[str]: Variable names.
+
+        """
+        output = set()
+        values = list(self.get_filters().values())
+        while values:
+            value = values.pop(0)
+            if isinstance(value, _PageVariable):
+                continue
+            if isinstance(value, QueryVariable):
+                output.add(value.variable_name)
+            elif isinstance(value, (list, set, tuple)):
+                values.extend(value)
+
+        for child in self._children_iter():
+            output |= child._get_used_variable_keys()
+        return output
+
     def _fake_children_parse(self) -> None:
         """Mark children as they don't need query."""
         for child in self._children_iter():
@@ -832,6 +2277,7 @@ class GraphQlQueryEdgeField(BaseGraphQlQueryField):
         super().__init__(*args, **kwargs)
         self._cursor = None
         self._edge_children = []
+        self._page_variables = None
 
     @property
     def child_indent(self) -> int:
@@ -856,6 +2302,7 @@ class GraphQlQueryEdgeField(BaseGraphQlQueryField):
             return
 
         self._edge_children.append(field)
+        self._query_item._structure_changed()
         field.set_parent(self)
 
     def add_edge_field(self, name: str) -> GraphQlQueryField:
@@ -902,13 +2349,14 @@ class GraphQlQueryEdgeField(BaseGraphQlQueryField):
             else:
                 progress_data[cursor_key] = nodes_by_cursor
 
-        page_info = value["pageInfo"]
-        if self._order == SortOrder.ascending:
-            new_cursor = page_info["endCursor"]
-            self._need_query = page_info["hasNextPage"]
-        else:
-            new_cursor = page_info["startCursor"]
-            self._need_query = page_info["hasPreviousPage"]
+        new_cursor, self._need_query = self._get_next_page(value)
+        if self._is_paginated_by_parent():
+            # Next pages are queried for each parent by parent edge field
+            self._need_query = False
+
+        nested_fields = None
+        if handle_cursors:
+            nested_fields = self._get_batched_nested_fields()
 
         edges = value["edges"]
         # Fake result parse
@@ -931,11 +2379,12 @@ class GraphQlQueryEdgeField(BaseGraphQlQueryField):
                     nodes_by_cursor[edge_cursor] = edge_value
                     node_values.append(edge_value)
 
-            for child in self._edge_children:
-                child.parse_result(edge, edge_value, progress_data)
+            self._parse_edge(edge, edge_value, progress_data)
 
-            for child in self._children:
-                child.parse_result(edge["node"], edge_value, progress_data)
+            if nested_fields:
+                self._add_nested_pages(
+                    edge["node"], edge_value, nested_fields
+                )
 
         change_cursor = True
         for child in self._children_iter():
@@ -953,32 +2402,372 @@ class GraphQlQueryEdgeField(BaseGraphQlQueryField):
                 child.reset_cursor()
             self._cursor = new_cursor
 
+    def _parse_edge(
+        self,
+        edge: dict[str, Any],
+        edge_value: dict[str, Any],
+        progress_data: dict[str, Any],
+    ) -> None:
+        for child in self._edge_children:
+            child.parse_result(edge, edge_value, progress_data)
+
+        for child in self._children:
+            child.parse_result(edge["node"], edge_value, progress_data)
+
+    def parse_edge(
+        self, edge: dict[str, Any], progress_data: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Parse single edge received outside of page output.
+
+        Used for edges parsed while page is received, pagination state
+            is updated once whole page is parsed.
+
+        Args:
+            edge (dict[str, Any]): Edge data with 'node'.
+            progress_data (dict[str, Any]): Data used for paging.
+
+        Returns:
+            dict[str, Any]: Parsed value of the edge.
+
+        """
+        edge_value = {}
+        self._parse_edge(edge, edge_value, progress_data)
+        return edge_value
+
     def _get_cursor_key(self) -> str:
         return f"{self.path}/__cursor__"
 
-    def get_filters(self) -> dict[str, Any]:
-        filters = super().get_filters()
+    def _get_next_page(self, value: dict[str, Any]) -> tuple[str, bool]:
+        page_info = value["pageInfo"]
+        if self._order == SortOrder.ascending:
+            return page_info["endCursor"], page_info["hasNextPage"]
+        return page_info["startCursor"], page_info["hasPreviousPage"]
+
+    def _get_batched_nested_fields(
+        self
+    ) -> Optional[list[GraphQlQueryEdgeField]]:
+        """Nested edge fields paginated using batched follow-up queries.
+
+        Follow-up queries filter parents by id, so the field must query
+            'id' and must not be nested in other edge field. Only nested
+            edge fields which are direct children of node, without own
+            nested edges, are supported.
+
+        Returns:
+            Optional[list[GraphQlQueryEdgeField]]: Nested edge fields, or
+                None if parents must be queried one at a time.
+
+        """
+        if self._query_item.nested_batch_size < 1:
+            return None
+
+        parent = self._parent
+        while isinstance(parent, BaseGraphQlQueryField):
+            if parent.has_edges:
+                return None
+            parent = parent._parent
+
+        has_id = False
+        nested_fields = []
+        for child in self._children:
+            if child.child_has_edges:
+                return None
+            if child.has_edges:
+                nested_fields.append(child)
+            elif child.name == "id":
+                has_id = True
+
+        for child in self._edge_children:
+            if child.child_has_edges:
+                return None
+
+        if not has_id or not nested_fields:
+            return None
+        return nested_fields
+
+    def _is_paginated_by_parent(self) -> bool:
+        parent = self._parent
+        if not isinstance(parent, GraphQlQueryEdgeField):
+            return False
+        nested_fields = parent._get_batched_nested_fields()
+        return bool(nested_fields) and self in nested_fields
+
+    def _add_nested_pages(
+        self,
+        node: dict[str, Any],
+        output: dict[str, Any],
+        nested_fields: list[GraphQlQueryEdgeField],
+        previous_cursor: Optional[str] = None,
+    ) -> None:
+        for nested_field in nested_fields:
+            value = node.get(nested_field.name)
+            if not value:
+                continue
+
+            cursor, has_next_page = nested_field._get_next_page(value)
+            if not has_next_page:
+                continue
+
+            if cursor == previous_cursor:
+                raise GraphQlQueryError(
+                    "Cursor didn't change during pagination."
+                    " This can cause infinite loop."
+                )
+            self._query_item._add_nested_page(_NestedPage(
+                self, nested_field, node["id"], cursor, output
+            ))
+
+    def _calculate_query_with_cursor_variable(
+        self, cursor_variable: _PageVariable
+    ) -> str:
+        page_variables = self._page_variables
+        limit_variable, _ = self.get_page_variables()
+        self._page_variables = (limit_variable, cursor_variable)
+        try:
+            return self.calculate_query()
+        finally:
+            self._page_variables = page_variables
+
+    def _get_nested_variable_keys(
+        self, nested_pages: list[_NestedPage]
+    ) -> set[str]:
+        """Names of query variables used by follow-up query.
+
+        Args:
+            nested_pages (list[_NestedPage]): Next pages of nested edge
+                fields.
+
+        Returns:
+            set[str]: Variable names used by parent fields and nested
+                edge fields.
+
+        """
+        variable_keys = set()
+        nested_fields = []
+        for nested_page in nested_pages:
+            if nested_page.nested_field not in nested_fields:
+                nested_fields.append(nested_page.nested_field)
+
+        for nested_field in nested_fields:
+            variable_keys |= nested_field._get_used_variable_keys()
+
+        parent = self._parent
+        while isinstance(parent, BaseGraphQlQueryField):
+            variable_keys |= {
+                value.variable_name
+                for value in parent.get_filters().values()
+                if isinstance(value, QueryVariable)
+            }
+            parent = parent._parent
+        return variable_keys
+
+    def calculate_nested_query(
+        self, nested_pages: list[_NestedPage]
+    ) -> tuple[str, set[str], list[_PageVariable]]:
+        """Calculate follow-up query of nested edge fields.
+
+        Each parent is queried by id under own alias, so each nested edge
+            field can continue from cursor of the parent. Ids and cursors
+            are passed as variables, so query string depends only on
+            nested fields of the batch.
+
+        Args:
+            nested_pages (list[_NestedPage]): Next pages of nested edge
+                fields.
+
+        Returns:
+            tuple[str, set[str], list[_PageVariable]]: Query fields, names
+                of used query variables and used pagination variables.
+
+        """
         limit_key = "first" if self._order == SortOrder.ascending else "last"
+        offset = self.indent * " "
+        edges_offset = offset + self.offset * " "
+        node_offset = edges_offset + self.offset * " "
+        id_offset = node_offset + self.offset * " "
+
+        page_variables = []
+        output = []
+        for idx, nested_page in enumerate(nested_pages):
+            nested_field = nested_page.nested_field
+            limit_variable, _ = nested_field.get_page_variables()
+            if limit_variable not in page_variables:
+                page_variables.append(limit_variable)
+            id_variable = _PageVariable(f"nested{idx}Id", "String!")
+            cursor_variable = _PageVariable(f"nested{idx}Cursor", "String")
+            page_variables.extend((id_variable, cursor_variable))
+
+            output.append(
+                f"{offset}nested{idx}: {self._name}"
+                f"(ids: [{id_variable}], {limit_key}: 1) {{"
+            )
+            output.append(edges_offset + "edges {")
+            output.append(node_offset + "node {")
+            output.append(id_offset + "id")
+            output.append(
+                nested_field._calculate_query_with_cursor_variable(
+                    cursor_variable
+                )
+            )
+            output.append(node_offset + "}")
+            output.append(edges_offset + "}")
+            output.append(offset + "}")
+
+        parent = self._parent
+        while isinstance(parent, BaseGraphQlQueryField):
+            parent_offset = parent.indent * " "
+            output.insert(0, (
+                f"{parent_offset}{parent.name}"
+                f"{parent._filters_to_string()} {{"
+            ))
+            output.append(parent_offset + "}")
+            parent = parent._parent
+
+        return (
+            "\n".join(output),
+            self._get_nested_variable_keys(nested_pages),
+            page_variables,
+        )
+
+    def get_nested_variables_values(
+        self, nested_pages: list[_NestedPage]
+    ) -> dict[str, Any]:
+        """Variable values of follow-up query of nested edge fields.
+
+        Args:
+            nested_pages (list[_NestedPage]): Next pages of nested edge
+                fields.
+
+        Returns:
+            dict[str, Any]: Variable values by their name.
+
+        """
+        output = {}
+        for key in self._get_nested_variable_keys(nested_pages):
+            value = self.get_variable_value(key)
+            if value is not None:
+                output[key] = value
+
+        for idx, nested_page in enumerate(nested_pages):
+            nested_field = nested_page.nested_field
+            limit_variable, _ = nested_field.get_page_variables()
+            output[limit_variable.variable_name] = (
+                nested_field._get_limit_amount()
+            )
+            output[f"nested{idx}Id"] = nested_page.parent_id
+            output[f"nested{idx}Cursor"] = nested_page.cursor
+        return output
+
+    def parse_nested_result(
+        self,
+        data: dict[str, Any],
+        nested_pages: list[_NestedPage],
+        progress_data: dict[str, Any],
+    ) -> None:
+        """Parse response of follow-up query of nested edge fields.
+
+        Args:
+            data (dict[str, Any]): Data received using follow-up query.
+            nested_pages (list[_NestedPage]): Next pages of nested edge
+                fields used to calculate the query.
+            progress_data (dict[str, Any]): Data used for paging.
+
+        """
+        names = []
+        parent = self._parent
+        while isinstance(parent, BaseGraphQlQueryField):
+            names.insert(0, parent.name)
+            parent = parent._parent
+
+        value = data
+        for name in names:
+            if not isinstance(value, dict):
+                break
+            value = value.get(name)
+
+        if not isinstance(value, dict):
+            value = {}
+
+        for idx, nested_page in enumerate(nested_pages):
+            parent_value = value.get(f"nested{idx}")
+            # Parent might be removed in the meantime
+            if not parent_value or not parent_value["edges"]:
+                continue
+
+            node = parent_value["edges"][0]["node"]
+            nested_field = nested_page.nested_field
+            nested_field.parse_result(
+                node, nested_page.output, progress_data
+            )
+            self._add_nested_pages(
+                node,
+                nested_page.output,
+                [nested_field],
+                nested_page.cursor,
+            )
+
+    def get_page_variables(self) -> tuple[_PageVariable, _PageVariable]:
+        """Variables used for page size and cursor of the field.
+
+        Variable names are based on path of the field,
+            e.g. 'projectFoldersLimit' and 'projectFoldersCursor'.
+
+        Returns:
+            tuple[_PageVariable, _PageVariable]: Page size and cursor
+                variables.
+
+        """
+        if self._page_variables is None:
+            parts = self.path.split("/")
+            prefix = parts.pop(0) + "".join(
+                part[:1].upper() + part[1:]
+                for part in parts
+            )
+            self._page_variables = (
+                _PageVariable(f"{prefix}Limit", "Int"),
+                _PageVariable(f"{prefix}Cursor", "String"),
+            )
+        return self._page_variables
+
+    def get_page_variables_values(self) -> dict[str, Any]:
+        """Values of pagination variables for next page.
+
+        Returns:
+            dict[str, Any]: Variable values by their name.
+
+        """
+        limit_variable, cursor_variable = self.get_page_variables()
+        return {
+            limit_variable.variable_name: self._get_limit_amount(),
+            cursor_variable.variable_name: self._cursor,
+        }
 
-        limit_amount = 300
+    def _get_limit_amount(self) -> int:
+        limit_amount = self.get_page_size()
         if self._limit:
             total = self._fetched_counter + limit_amount
             if total > self._limit:
                 limit_amount = self._limit - self._fetched_counter
 
-        if self.child_has_edges:
+        if (
+            self.child_has_edges
+            and self._get_batched_nested_fields() is None
+        ):
             # Nested edge fields share a single cursor argument in the query.
             # Query one parent item at a time so child pagination can't be
             # overwritten by another parent from the same outer page.
             limit_amount = 1
+        return limit_amount
 
-        filters[limit_key] = limit_amount
-
-        if self._cursor:
-            cursor_key = (
-                "after" if self._order == SortOrder.ascending else "before"
-            )
-            filters[cursor_key] = self._cursor
+    def get_filters(self) -> dict[str, Any]:
+        filters = super().get_filters()
+        limit_variable, cursor_variable = self.get_page_variables()
+        if self._order == SortOrder.ascending:
+            filters["first"] = limit_variable
+            filters["after"] = cursor_variable
+        else:
+            filters["last"] = limit_variable
+            filters["before"] = cursor_variable
         return filters
 
     def calculate_query(self) -> str:
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import collections
+import functools
 import typing
 
 from .constants import DEFAULT_LINK_FIELDS
@@ -12,6 +13,40 @@ if typing.TYPE_CHECKING:
     )
 
 
+def _freeze_value(value):
+    if isinstance(value, (set, frozenset, list, tuple)):
+        return frozenset(value)
+    return value
+
+
+def _shared_query(func):
+    """Share compiled query string of queries built with same arguments.
+
+    Query builders create new field tree on each call, but query string
+        is compiled only once for the same arguments.
+
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        query = func(*args, **kwargs)
+        try:
+            cache_key = (
+                func.__name__,
+                tuple(_freeze_value(arg) for arg in args),
+                frozenset(
+                    (key, _freeze_value(value))
+                    for key, value in kwargs.items()
+                ),
+            )
+            hash(cache_key)
+        except TypeError:
+            # Arguments can't be used as key (e.g. nested dictionaries)
+            return query
+        query.set_cache_key(cache_key)
+        return query
+    return wrapper
+
+
 def add_links_fields(
     entity_field: GraphQlQueryEdgeField,
     nested_fields: dict | None,
@@ -64,6 +99,7 @@ def add_links_fields(
             query_queue.append((k, v, field))
 
 
+@_shared_query
 def project_graphql_query(fields):
     query = GraphQlQuery("ProjectQuery")
     project_name_var = query.add_variable("projectName", "String!")
@@ -88,6 +124,7 @@ def project_graphql_query(fields):
     return query
 
 
+@_shared_query
 def projects_graphql_query(fields):
     query = GraphQlQuery("ProjectsQuery")
     project_name_var = query.add_variable("projectName", "String!")
@@ -114,6 +151,7 @@ def projects_graphql_query(fields):
     return query
 
 
+@_shared_query
 def product_types_query(fields):
     query = GraphQlQuery("ProductTypes")
     product_types_field = query.add_field("productTypes")
@@ -136,10 +174,13 @@ def product_types_query(fields):
     return query
 
 
+@_shared_query
 def folders_graphql_query(fields: set[str]) -> GraphQlQuery:
     query = GraphQlQuery("FoldersQuery")
     project_name_var = query.add_variable("projectName", "String!")
-    folder_ids_var = query.add_variable("folderIds", "[String!]")
+    folder_ids_var = query.add_variable(
+        "folderIds", "[String!]", chunkable=True
+    )
     parent_folder_ids_var = query.add_variable("parentFolderIds", "[String!]")
     folder_paths_var = query.add_variable("folderPaths", "[String!]")
     folder_path_regex_var = query.add_variable("folderPathRegex", "String!")
@@ -195,10 +236,13 @@ def folders_graphql_query(fields: set[str]) -> GraphQlQuery:
     return query
 
 
+@_shared_query
 def tasks_graphql_query(fields: set[str]) -> GraphQlQuery:
     query = GraphQlQuery("TasksQuery")
     project_name_var = query.add_variable("projectName", "String!")
-    task_ids_var = query.add_variable("taskIds", "[String!]")
+    task_ids_var = query.add_variable(
+        "taskIds", "[String!]", chunkable=True
+    )
     task_names_var = query.add_variable("taskNames", "[String!]")
     task_types_var = query.add_variable("taskTypes", "[String!]")
     folder_ids_var = query.add_variable("folderIds", "[String!]")
@@ -243,11 +287,14 @@ def tasks_graphql_query(fields: set[str]) -> GraphQlQuery:
     return query
 
 
+@_shared_query
 def products_graphql_query(fields: set[str]) -> GraphQlQuery:
     query = GraphQlQuery("ProductsQuery")
 
     project_name_var = query.add_variable("projectName", "String!")
-    product_ids_var = query.add_variable("productIds", "[String!]")
+    product_ids_var = query.add_variable(
+        "productIds", "[String!]", chunkable=True
+    )
     product_names_var = query.add_variable("productNames", "[String!]")
     folder_ids_var = query.add_variable("folderIds", "[String!]")
     product_types_var = query.add_variable("productTypes", "[String!]")
@@ -293,12 +340,15 @@ def products_graphql_query(fields: set[str]) -> GraphQlQuery:
     return query
 
 
+@_shared_query
 def versions_graphql_query(fields: set[str]) -> GraphQlQuery:
     query = GraphQlQuery("VersionsQuery")
 
     project_name_var = query.add_variable("projectName", "String!")
     product_ids_var = query.add_variable("productIds", "[String!]")
-    version_ids_var = query.add_variable("versionIds", "[String!]")
+    version_ids_var = query.add_variable(
+        "versionIds", "[String!]", chunkable=True
+    )
     task_ids_var = query.add_variable("taskIds", "[String!]")
     versions_var = query.add_variable("versions", "[Int!]")
     hero_only_var = query.add_variable("heroOnly", "Boolean")
@@ -344,11 +394,14 @@ def versions_graphql_query(fields: set[str]) -> GraphQlQuery:
     return query
 
 
+@_shared_query
 def representations_graphql_query(fields: set[str]) -> GraphQlQuery:
     query = GraphQlQuery("RepresentationsQuery")
 
     project_name_var = query.add_variable("projectName", "String!")
-    repre_ids_var = query.add_variable("representationIds", "[String!]")
+    repre_ids_var = query.add_variable(
+        "representationIds", "[String!]", chunkable=True
+    )
     repre_names_var = query.add_variable("representationNames", "[String!]")
     version_ids_var = query.add_variable("versionIds", "[String!]")
     has_links_var = query.add_variable(
@@ -393,13 +446,16 @@ def representations_graphql_query(fields: set[str]) -> GraphQlQuery:
     return query
 
 
+@_shared_query
 def representations_parents_qraphql_query(
     version_fields, product_fields, folder_fields
 ):
     query = GraphQlQuery("RepresentationsParentsQuery")
 
     project_name_var = query.add_variable("projectName", "String!")
-    repre_ids_var = query.add_variable("representationIds", "[String!]")
+    repre_ids_var = query.add_variable(
+        "representationIds", "[String!]", chunkable=True
+    )
 
     project_field = query.add_field("project")
     project_field.set_filter("name", project_name_var)
@@ -434,6 +490,7 @@ def representations_parents_qraphql_query(
     return query
 
 
+@_shared_query
 def representations_hierarchy_qraphql_query(
     folder_fields,
     task_fields,
@@ -444,7 +501,9 @@ def representations_hierarchy_qraphql_query(
     query = GraphQlQuery("RepresentationsParentsQuery")
 
     project_name_var = query.add_variable("projectName", "String!")
-    repre_ids_var = query.add_variable("representationIds", "[String!]")
+    repre_ids_var = query.add_variable(
+        "representationIds", "[String!]", chunkable=True
+    )
 
     project_field = query.add_field("project")
     project_field.set_filter("name", project_name_var)
@@ -492,10 +551,13 @@ def representations_hierarchy_qraphql_query(
     return query
 
 
+@_shared_query
 def workfiles_info_graphql_query(fields: set[str]) -> GraphQlQuery:
     query = GraphQlQuery("WorkfilesInfo")
     project_name_var = query.add_variable("projectName", "String!")
-    workfiles_info_ids = query.add_variable("workfileIds", "[String!]")
+    workfiles_info_ids = query.add_variable(
+        "workfileIds", "[String!]", chunkable=True
+    )
     task_ids_var = query.add_variable("taskIds", "[String!]")
     paths_var = query.add_variable("paths", "[String!]")
     path_regex_var = query.add_variable("workfilePathRegex", "String!")
@@ -534,10 +596,13 @@ def workfiles_info_graphql_query(fields: set[str]) -> GraphQlQuery:
     return query
 
 
+@_shared_query
 def events_graphql_query(fields, order, use_states=False):
     query = GraphQlQuery("Events", order=order)
     topics_var = query.add_variable("eventTopics", "[String!]")
-    ids_var = query.add_variable("eventIds", "[String!]")
+    ids_var = query.add_variable(
+        "eventIds", "[String!]", chunkable=True
+    )
     projects_var = query.add_variable("projectNames", "[String!]")
     statuses_var = query.add_variable("eventStatuses", "[String!]")
     users_var = query.add_variable("eventUsers", "[String!]")
@@ -580,6 +645,7 @@ def events_graphql_query(fields, order, use_states=False):
     return query
 
 
+@_shared_query
 def users_graphql_query(fields):
     query = GraphQlQuery("Users")
     names_var = query.add_variable("userNames", "[String!]")
@@ -609,10 +675,13 @@ def users_graphql_query(fields):
     return query
 
 
+@_shared_query
 def activities_graphql_query(fields, order):
     query = GraphQlQuery("Activities", order=order)
     project_name_var = query.add_variable("projectName", "String!")
-    activity_ids_var = query.add_variable("activityIds", "[String!]")
+    activity_ids_var = query.add_variable(
+        "activityIds", "[String!]", chunkable=True
+    )
     activity_types_var = query.add_variable("activityTypes", "[String!]")
     entity_ids_var = query.add_variable("entityIds", "[String!]")
     entity_names_var = query.add_variable("entityNames", "[String!]")
@@ -653,10 +722,13 @@ def activities_graphql_query(fields, order):
     return query
 
 
+@_shared_query
 def entity_lists_graphql_query(fields):
     query = GraphQlQuery("EntityLists")
     project_name_var = query.add_variable("projectName", "String!")
-    entity_list_ids = query.add_variable("listIds", "[String!]")
+    entity_list_ids = query.add_variable(
+        "listIds", "[String!]", chunkable=True
+    )
 
     project_field = query.add_field("project")
     project_field.set_filter("name", project_name_var)
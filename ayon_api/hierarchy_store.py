@@ -0,0 +1,665 @@
+"""Persistent local store of project folders and tasks.
+
+Querying all folders and tasks of a big project can take several seconds.
+'HierarchyStore' keeps folders and tasks of projects in SQLite database on
+disk, so they're received from server only once and later only changes
+are synchronized.
+
+Synchronization queries only folders and tasks updated since last
+synchronization. Folders below updated folder, and their tasks, are
+received too because their paths and inherited attributes may change.
+Deleted entities are removed by reconciliation which compares ids of all
+entities on server with stored ids.
+
+Store set on connection is used by 'get_folders', 'get_folder_by_path',
+'get_tasks' and 'get_tasks_by_folder_paths' when they filter only by ids,
+paths, names, types or parents, and requested fields are stored.
+
+Example:
+    >>> store = HierarchyStore("/tmp/ayon_hierarchy.db", max_age=30.0)
+    >>> con.set_hierarchy_store(store)
+    >>> folder = con.get_folder_by_path(project_name, "/shots/sh010")
+
+"""
+from __future__ import annotations
+
+import json
+import time
+import sqlite3
+import logging
+import threading
+import typing
+from typing import Optional, Any, Iterable
+
+from .graphql_queries import folders_graphql_query, tasks_graphql_query
+
+if typing.TYPE_CHECKING:
+    from .server_api import ServerAPI
+
+# Columns filled from entity data, in addition to server url and project
+_ENTITY_KEYS = {
+    "folder": {
+        "id": "id",
+        "parent_id": "parentId",
+        "path": "path",
+        "name": "name",
+        "type_name": "folderType",
+        "updated_at": "updatedAt",
+    },
+    "task": {
+        "id": "id",
+        "parent_id": "folderId",
+        "path": None,
+        "name": "name",
+        "type_name": "taskType",
+        "updated_at": "updatedAt",
+    },
+}
+# Columns by GraphQl filters which can be resolved by the store
+_FILTER_COLUMNS = {
+    "folder": {
+        "folderIds": "id",
+        "folderPaths": "path",
+        "folderNames": "name",
+        "folderTypes": "type_name",
+        "parentFolderIds": "parent_id",
+    },
+    "task": {
+        "taskIds": "id",
+        "taskNames": "name",
+        "taskTypes": "type_name",
+        "folderIds": "parent_id",
+    },
+}
+_TABLES = {
+    "folder": "folders",
+    "task": "tasks",
+}
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    server_url TEXT NOT NULL,
+    project_name TEXT NOT NULL,
+    project_updated_at TEXT,
+    fields TEXT NOT NULL,
+    watermark TEXT,
+    last_reconcile REAL NOT NULL,
+    PRIMARY KEY (server_url, project_name)
+);
+CREATE TABLE IF NOT EXISTS folders (
+    server_url TEXT NOT NULL,
+    project_name TEXT NOT NULL,
+    id TEXT NOT NULL,
+    parent_id TEXT,
+    path TEXT,
+    name TEXT,
+    type_name TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (server_url, project_name, id)
+);
+CREATE INDEX IF NOT EXISTS folders_path
+    ON folders (server_url, project_name, path);
+CREATE INDEX IF NOT EXISTS folders_parent
+    ON folders (server_url, project_name, parent_id);
+CREATE TABLE IF NOT EXISTS tasks (
+    server_url TEXT NOT NULL,
+    project_name TEXT NOT NULL,
+    id TEXT NOT NULL,
+    parent_id TEXT,
+    path TEXT,
+    name TEXT,
+    type_name TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (server_url, project_name, id)
+);
+CREATE INDEX IF NOT EXISTS tasks_parent
+    ON tasks (server_url, project_name, parent_id);
+"""
+
+
+class HierarchyStore:
+    """SQLite store of project folders and tasks.
+
+    Stored entities are raw GraphQl data with default fields of folders
+        and tasks, and 'updatedAt'. Store can be shared by connections to
+        multiple servers, entities are stored by server url.
+
+    Args:
+        path (str): Path to SQLite database, ':memory:' keeps the store
+            only in memory.
+        max_age (float): Seconds after which project is synchronized
+            before its entities are used.
+        reconcile_interval (float): Seconds after which synchronization
+            also removes entities deleted on server.
+        auto_sync (bool): Synchronize project which is not stored yet
+            when its entities are requested. Only synchronized projects
+            are used otherwise.
+
+    """
+    def __init__(
+        self,
+        path: str,
+        max_age: float = 60.0,
+        reconcile_interval: float = 600.0,
+        auto_sync: bool = True,
+    ):
+        self._path = path
+        self._max_age = max_age
+        self._reconcile_interval = reconcile_interval
+        self._auto_sync = auto_sync
+        # Lock of database and synchronization state, not held while
+        #   entities are received from server
+        self._lock = threading.RLock()
+        # Synchronization of single project runs only once at a time
+        self._sync_locks: dict[tuple[str, str], threading.Lock] = {}
+        self._log = logging.getLogger(self.__class__.__name__)
+        # Last synchronization by server url and project name
+        self._last_sync: dict[tuple[str, str], float] = {}
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.executescript(_SCHEMA)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def close(self) -> None:
+        """Close database connection."""
+        with self._lock:
+            self._db.close()
+
+    def is_project_stored(self, server_url: str, project_name: str) -> bool:
+        """Project was synchronized to the store.
+
+        Args:
+            server_url (str): Server url.
+            project_name (str): Project name.
+
+        Returns:
+            bool: Project entities are stored.
+
+        """
+        return self._get_state(server_url, project_name) is not None
+
+    def invalidate(
+        self,
+        server_url: str,
+        project_name: str,
+        reconcile: bool = False,
+    ) -> None:
+        """Synchronize project before next use of its entities.
+
+        Args:
+            server_url (str): Server url.
+            project_name (str): Project name.
+            reconcile (bool): Remove entities deleted on server during
+                next synchronization.
+
+        """
+        with self._lock:
+            self._last_sync.pop((server_url, project_name), None)
+            if reconcile:
+                with self._db:
+                    self._db.execute(
+                        "UPDATE projects SET last_reconcile = 0"
+                        " WHERE server_url = ? AND project_name = ?",
+                        (server_url, project_name),
+                    )
+
+    def remove_project(self, server_url: str, project_name: str) -> None:
+        """Remove stored entities of project.
+
+        Args:
+            server_url (str): Server url.
+            project_name (str): Project name.
+
+        """
+        with self._lock, self._db:
+            self._last_sync.pop((server_url, project_name), None)
+            for table in ("projects", *_TABLES.values()):
+                self._db.execute(
+                    f"DELETE FROM {table}"
+                    " WHERE server_url = ? AND project_name = ?",
+                    (server_url, project_name),
+                )
+
+    def sync(
+        self,
+        con: ServerAPI,
+        project_name: str,
+        reconcile: Optional[bool] = None,
+    ) -> dict[str, int]:
+        """Synchronize folders and tasks of project with server.
+
+        All entities are received on first synchronization, or when project
+            or stored fields changed. Otherwise only entities updated since
+            last synchronization are received.
+
+        Args:
+            con (ServerAPI): Connection to server.
+            project_name (str): Project name.
+            reconcile (Optional[bool]): Remove entities deleted on server.
+                Entities are reconciled after 'reconcile_interval' if
+                'None' is passed.
+
+        Returns:
+            dict[str, int]: Number of 'updated' and 'removed' entities.
+
+        """
+        server_url = con.get_base_url()
+        with self._get_sync_lock(server_url, project_name):
+            return self._sync(con, server_url, project_name, reconcile)
+
+    def _sync(
+        self,
+        con: ServerAPI,
+        server_url: str,
+        project_name: str,
+        reconcile: Optional[bool],
+    ) -> dict[str, int]:
+        project = con.get_project(project_name, fields={"updatedAt"})
+        if project is None:
+            self.remove_project(server_url, project_name)
+            return {"updated": 0, "removed": 0}
+
+        fields_by_type = {
+            entity_type: self._get_stored_fields(con, entity_type)
+            for entity_type in _TABLES
+        }
+        fields_key = json.dumps(
+            {
+                entity_type: sorted(fields)
+                for entity_type, fields in fields_by_type.items()
+            },
+            sort_keys=True,
+        )
+        project_updated_at = project.get("updatedAt")
+        state = self._get_state(server_url, project_name)
+        if (
+            state is None
+            or state["fields"] != fields_key
+            or state["project_updated_at"] != project_updated_at
+        ):
+            # Project attributes are inherited by all entities
+            updated = self._full_sync(con, project_name, fields_by_type)
+            removed = 0
+            last_reconcile = time.time()
+            watermark = self._get_max_updated_at(server_url, project_name)
+
+        else:
+            watermark = state["watermark"]
+            updated = self._incremental_sync(
+                con, project_name, fields_by_type, watermark
+            )
+            watermark = (
+                self._get_max_updated_at(server_url, project_name)
+                or watermark
+            )
+            last_reconcile = state["last_reconcile"]
+            if reconcile is None:
+                reconcile = (
+                    time.time() - last_reconcile > self._reconcile_interval
+                )
+            removed = 0
+            if reconcile:
+                removed = self._reconcile(con, project_name)
+                last_reconcile = time.time()
+
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO projects"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    server_url,
+                    project_name,
+                    project_updated_at,
+                    fields_key,
+                    watermark,
+                    last_reconcile,
+                ),
+            )
+            self._last_sync[(server_url, project_name)] = time.time()
+        return {"updated": updated, "removed": removed}
+
+    def get_entities(
+        self,
+        con: ServerAPI,
+        project_name: str,
+        entity_type: str,
+        fields: set[str],
+        filters: dict[str, Any],
+    ) -> Optional[list[dict[str, Any]]]:
+        """Get stored entities matching GraphQl filters.
+
+        Project is synchronized first if it was not synchronized for
+            'max_age' seconds.
+
+        Args:
+            con (ServerAPI): Connection to server.
+            project_name (str): Project name.
+            entity_type (str): 'folder' or 'task'.
+            fields (set[str]): Requested fields.
+            filters (dict[str, Any]): GraphQl filters by variable name.
+
+        Returns:
+            Optional[list[dict[str, Any]]]: Raw entities data with requested
+                fields, or None if store can't resolve the request.
+
+        """
+        filter_columns = _FILTER_COLUMNS.get(entity_type)
+        if filter_columns is None or any(
+            key not in filter_columns
+            for key in filters
+            if key != "projectName"
+        ):
+            return None
+
+        if not fields <= self._get_stored_fields(con, entity_type):
+            return None
+
+        server_url = con.get_base_url()
+        if not self._prepare_project(con, server_url, project_name):
+            return None
+
+        conditions = []
+        values = [server_url, project_name]
+        for key, column in filter_columns.items():
+            filter_values = filters.get(key)
+            if filter_values is None:
+                continue
+            filter_values = list(filter_values)
+            condition = f"{column} IN (SELECT value FROM json_each(?))"
+            if column == "parent_id" and "root" in filter_values:
+                condition = f"({condition} OR parent_id IS NULL)"
+            conditions.append(condition)
+            values.append(json.dumps(filter_values))
+
+        query = (
+            f"SELECT data FROM {_TABLES[entity_type]}"
+            " WHERE server_url = ? AND project_name = ?"
+        )
+        for condition in conditions:
+            query += f" AND {condition}"
+
+        keys = {field.split(".")[0] for field in fields}
+        with self._lock:
+            rows = self._db.execute(query, values).fetchall()
+        output = []
+        for (data, ) in rows:
+            entity = json.loads(data)
+            output.append({
+                key: value
+                for key, value in entity.items()
+                if key in keys
+            })
+        return output
+
+    def _get_sync_lock(
+        self, server_url: str, project_name: str
+    ) -> threading.Lock:
+        with self._lock:
+            return self._sync_locks.setdefault(
+                (server_url, project_name), threading.Lock()
+            )
+
+    def _is_project_fresh(self, server_url: str, project_name: str) -> bool:
+        with self._lock:
+            last_sync = self._last_sync.get((server_url, project_name))
+        return (
+            last_sync is not None
+            and time.time() - last_sync < self._max_age
+        )
+
+    def _prepare_project(
+        self, con: ServerAPI, server_url: str, project_name: str
+    ) -> bool:
+        if self._is_project_fresh(server_url, project_name):
+            return True
+
+        if not self._auto_sync and not self.is_project_stored(
+            server_url, project_name
+        ):
+            return False
+
+        try:
+            with self._get_sync_lock(server_url, project_name):
+                # Project may have been synchronized by other thread
+                if not self._is_project_fresh(server_url, project_name):
+                    self._sync(con, server_url, project_name, None)
+        except Exception:
+            self._log.warning(
+                f"Failed to synchronize project '{project_name}'.",
+                exc_info=True,
+            )
+            return False
+        return self.is_project_stored(server_url, project_name)
+
+    def _get_stored_fields(
+        self, con: ServerAPI, entity_type: str
+    ) -> set[str]:
+        fields = con.get_default_fields_for_type(entity_type)
+        fields |= {"id", "updatedAt"}
+        fields |= {
+            key
+            for key in _ENTITY_KEYS[entity_type].values()
+            if key
+        }
+        return fields
+
+    def _get_state(
+        self, server_url: str, project_name: str
+    ) -> Optional[dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT project_updated_at, fields, watermark, last_reconcile"
+                " FROM projects WHERE server_url = ? AND project_name = ?",
+                (server_url, project_name),
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(
+            ("project_updated_at", "fields", "watermark", "last_reconcile"),
+            row
+        ))
+
+    def _get_max_updated_at(
+        self, server_url: str, project_name: str
+    ) -> Optional[str]:
+        values = []
+        with self._lock:
+            for table in _TABLES.values():
+                (value, ) = self._db.execute(
+                    f"SELECT MAX(updated_at) FROM {table}"
+                    " WHERE server_url = ? AND project_name = ?",
+                    (server_url, project_name),
+                ).fetchone()
+                if value:
+                    values.append(value)
+        return max(values, default=None)
+
+    def _iter_server_entities(
+        self,
+        con: ServerAPI,
+        project_name: str,
+        entity_type: str,
+        fields: set[str],
+        filters: Optional[dict[str, Any]] = None,
+    ):
+        if entity_type == "folder":
+            query = folders_graphql_query(fields)
+        else:
+            query = tasks_graphql_query(fields)
+        query.set_variable_value("projectName", project_name)
+        for key, value in (filters or {}).items():
+            query.set_variable_value(key, value)
+        return query.iter_edges(con)
+
+    def _store_entities(
+        self,
+        server_url: str,
+        project_name: str,
+        entity_type: str,
+        entities: Iterable[dict[str, Any]],
+    ) -> int:
+        keys = _ENTITY_KEYS[entity_type]
+        rows = []
+        for entity in entities:
+            row = [server_url, project_name]
+            row.extend(
+                entity.get(key) if key else None
+                for key in keys.values()
+            )
+            row.append(json.dumps(entity))
+            rows.append(row)
+
+        if rows:
+            columns = ", ".join(keys)
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO {_TABLES[entity_type]}"
+                f" (server_url, project_name, {columns}, data)"
+                f" VALUES ({', '.join('?' * (len(keys) + 3))})",
+                rows,
+            )
+        return len(rows)
+
+    def _full_sync(
+        self,
+        con: ServerAPI,
+        project_name: str,
+        fields_by_type: dict[str, set[str]],
+    ) -> int:
+        server_url = con.get_base_url()
+        # Receive all entities before stored entities are removed
+        entities_by_type = {
+            entity_type: list(self._iter_server_entities(
+                con, project_name, entity_type, fields
+            ))
+            for entity_type, fields in fields_by_type.items()
+        }
+        count = 0
+        with self._lock, self._db:
+            for entity_type, entities in entities_by_type.items():
+                self._db.execute(
+                    f"DELETE FROM {_TABLES[entity_type]}"
+                    " WHERE server_url = ? AND project_name = ?",
+                    (server_url, project_name),
+                )
+                count += self._store_entities(
+                    server_url, project_name, entity_type, entities
+                )
+        return count
+
+    def _incremental_sync(
+        self,
+        con: ServerAPI,
+        project_name: str,
+        fields_by_type: dict[str, set[str]],
+        watermark: Optional[str],
+    ) -> int:
+        server_url = con.get_base_url()
+        filters = {}
+        if watermark:
+            # Use 'gte' to not miss entities updated at the same time
+            filters["filter"] = json.dumps({
+                "conditions": [{
+                    "key": "updatedAt",
+                    "value": watermark,
+                    "operator": "gte",
+                }],
+                "operator": "and",
+            })
+
+        folders = list(self._iter_server_entities(
+            con, project_name, "folder", fields_by_type["folder"], filters
+        ))
+        tasks = list(self._iter_server_entities(
+            con, project_name, "task", fields_by_type["task"], filters
+        ))
+
+        # Paths and inherited attributes of folders below updated folders,
+        #   and of their tasks, may have changed
+        received_folder_ids = {folder["id"] for folder in folders}
+        with self._lock:
+            descendant_ids = self._get_descendant_ids(
+                server_url, project_name, received_folder_ids
+            )
+        changed_folder_ids = received_folder_ids | descendant_ids
+        missing_folder_ids = changed_folder_ids - received_folder_ids
+        if missing_folder_ids:
+            folders.extend(self._iter_server_entities(
+                con,
+                project_name,
+                "folder",
+                fields_by_type["folder"],
+                {"folderIds": list(missing_folder_ids)},
+            ))
+
+        if changed_folder_ids:
+            received_task_ids = {task["id"] for task in tasks}
+            tasks.extend(
+                task
+                for task in self._iter_server_entities(
+                    con,
+                    project_name,
+                    "task",
+                    fields_by_type["task"],
+                    {"folderIds": list(changed_folder_ids)},
+                )
+                if task["id"] not in received_task_ids
+            )
+
+        with self._lock, self._db:
+            return (
+                self._store_entities(
+                    server_url, project_name, "folder", folders
+                )
+                + self._store_entities(
+                    server_url, project_name, "task", tasks
+                )
+            )
+
+    def _get_descendant_ids(
+        self,
+        server_url: str,
+        project_name: str,
+        folder_ids: set[str],
+    ) -> set[str]:
+        if not folder_ids:
+            return set()
+        rows = self._db.execute(
+            "WITH RECURSIVE descendants(id) AS ("
+            " SELECT id FROM folders"
+            " WHERE server_url = ?1 AND project_name = ?2"
+            " AND parent_id IN (SELECT value FROM json_each(?3))"
+            " UNION"
+            " SELECT folders.id FROM folders JOIN descendants"
+            " ON folders.parent_id = descendants.id"
+            " WHERE server_url = ?1 AND project_name = ?2"
+            ") SELECT id FROM descendants",
+            (server_url, project_name, json.dumps(list(folder_ids))),
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def _reconcile(self, con: ServerAPI, project_name: str) -> int:
+        server_url = con.get_base_url()
+        ids_by_type = {
+            entity_type: [
+                entity["id"]
+                for entity in self._iter_server_entities(
+                    con, project_name, entity_type, {"id"}
+                )
+            ]
+            for entity_type in _TABLES
+        }
+        removed = 0
+        with self._lock, self._db:
+            for entity_type, entity_ids in ids_by_type.items():
+                cursor = self._db.execute(
+                    f"DELETE FROM {_TABLES[entity_type]}"
+                    " WHERE server_url = ? AND project_name = ?"
+                    " AND id NOT IN (SELECT value FROM json_each(?))",
+                    (server_url, project_name, json.dumps(entity_ids)),
+                )
+                removed += cursor.rowcount
+        return removed
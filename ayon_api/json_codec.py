@@ -0,0 +1,254 @@
+"""JSON encoding and decoding used by the package.
+
+Fastest available library is used, order of preference is 'orjson',
+'msgspec', 'ujson' and standard library 'json' as fallback. Backend can be
+forced with environment variable ``AYON_JSON_BACKEND`` or using
+'set_json_backend'.
+
+All backends behave the same way from the package point of view. Decoding
+errors are 'ValueError', encoding errors are 'TypeError' or 'ValueError'
+(including 'NaN' and 'Infinity' values, which are not valid JSON), and
+'default' callback is called for values that are not JSON serializable
+(including datetime objects).
+
+"""
+from __future__ import annotations
+
+import os
+import json
+import math
+import logging
+from typing import Any, Callable, Optional
+
+from .constants import JSON_BACKEND_ENV_KEY
+
+DefaultFunc = Optional[Callable[[Any], Any]]
+
+
+class JsonBackend:
+    """Standard library 'json' backend.
+
+    Other backends inherit from this class and override methods which
+    they can do faster.
+
+    """
+    name = "json"
+
+    def loads(self, data: str | bytes) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any, default: DefaultFunc = None) -> str:
+        return json.dumps(
+            obj,
+            default=default,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            allow_nan=False,
+        )
+
+    def dumps_bytes(self, obj: Any, default: DefaultFunc = None) -> bytes:
+        return self.dumps(obj, default).encode("utf-8")
+
+
+class OrjsonBackend(JsonBackend):
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+        # Datetime objects are passed to 'default' to match standard library
+        self._options = (
+            orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        )
+
+    def loads(self, data: str | bytes) -> Any:
+        return self._orjson.loads(data)
+
+    def dumps(self, obj: Any, default: DefaultFunc = None) -> str:
+        return self.dumps_bytes(obj, default).decode("utf-8")
+
+    def dumps_bytes(self, obj: Any, default: DefaultFunc = None) -> bytes:
+        output = self._orjson.dumps(
+            obj, default=default, option=self._options
+        )
+        # 'orjson' silently converts 'NaN' and 'Infinity' to 'null'
+        if b"null" in output and _has_invalid_float(obj):
+            raise ValueError(
+                "Out of range float values are not JSON compliant"
+            )
+        return output
+
+
+class MsgspecBackend(JsonBackend):
+    """Uses 'msgspec' only for decoding."""
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._msgspec = msgspec
+        self._decoder = msgspec.json.Decoder()
+
+    def loads(self, data: str | bytes) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._msgspec.DecodeError as exc:
+            raise ValueError(str(exc)) from exc
+
+    def dumps_bytes(self, obj: Any, default: DefaultFunc = None) -> bytes:
+        # 'msgspec' serializes datetime objects on its own and does not
+        #   call 'default' for them, and it encodes 'NaN' as 'null'. Use
+        #   standard library to keep the same behavior as other backends.
+        return super().dumps_bytes(obj, default)
+
+
+class UjsonBackend(JsonBackend):
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+
+        self._ujson = ujson
+
+    def loads(self, data: str | bytes) -> Any:
+        return self._ujson.loads(data)
+
+    def dumps(self, obj: Any, default: DefaultFunc = None) -> str:
+        # 'ujson' raises 'OverflowError' for 'NaN' and 'Infinity'
+        try:
+            return self._ujson.dumps(
+                obj, default=default, ensure_ascii=False
+            )
+        except OverflowError as exc:
+            raise ValueError(str(exc)) from exc
+
+
+def _has_invalid_float(obj: Any) -> bool:
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_invalid_float(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_invalid_float(value) for value in obj)
+    return False
+
+
+_BACKENDS = {
+    backend_cls.name: backend_cls
+    for backend_cls in (
+        OrjsonBackend,
+        MsgspecBackend,
+        UjsonBackend,
+        JsonBackend,
+    )
+}
+_backend: Optional[JsonBackend] = None
+
+
+def _create_backend(name: Optional[str]) -> JsonBackend:
+    if name:
+        backend_cls = _BACKENDS.get(name)
+        if backend_cls is None:
+            raise ValueError(
+                f"Unknown JSON backend '{name}'."
+                f" Available backends: {', '.join(_BACKENDS)}"
+            )
+        return backend_cls()
+
+    for backend_cls in _BACKENDS.values():
+        try:
+            return backend_cls()
+        except ImportError:
+            pass
+    return JsonBackend()
+
+
+def get_json_backend() -> JsonBackend:
+    """Backend used for JSON encoding and decoding.
+
+    Returns:
+        JsonBackend: Current backend.
+
+    """
+    global _backend
+    if _backend is None:
+        name = os.environ.get(JSON_BACKEND_ENV_KEY)
+        try:
+            _backend = _create_backend(name)
+        except (ImportError, ValueError):
+            # Invalid environment should not break the client
+            logging.getLogger(__name__).warning(
+                f"JSON backend '{name}' from '{JSON_BACKEND_ENV_KEY}'"
+                " is not available. Using fastest available backend.",
+                exc_info=True,
+            )
+            _backend = _create_backend(None)
+    return _backend
+
+
+def set_json_backend(name: Optional[str] = None) -> JsonBackend:
+    """Change backend used for JSON encoding and decoding.
+
+    Args:
+        name (Optional[str]): Name of backend, one of 'orjson', 'msgspec',
+            'ujson' or 'json'. Fastest available backend is used
+            if not passed.
+
+    Raises:
+        ValueError: Unknown backend name.
+        ImportError: Library of backend is not available.
+
+    Returns:
+        JsonBackend: New backend.
+
+    """
+    global _backend
+    _backend = _create_backend(name)
+    return _backend
+
+
+def json_loads(data: str | bytes) -> Any:
+    """Decode JSON string.
+
+    Args:
+        data (str | bytes): JSON string or UTF-8 encoded bytes.
+
+    Raises:
+        ValueError: Data are not valid JSON.
+
+    Returns:
+        Any: Decoded data.
+
+    """
+    return get_json_backend().loads(data)
+
+
+def json_dumps(obj: Any, default: DefaultFunc = None) -> str:
+    """Encode object to compact JSON string.
+
+    Args:
+        obj (Any): Object to encode.
+        default (Optional[Callable[[Any], Any]]): Function called for values
+            that can't be serialized.
+
+    Returns:
+        str: JSON string.
+
+    """
+    return get_json_backend().dumps(obj, default)
+
+
+def json_dumps_bytes(obj: Any, default: DefaultFunc = None) -> bytes:
+    """Encode object to compact UTF-8 encoded JSON.
+
+    Args:
+        obj (Any): Object to encode.
+        default (Optional[Callable[[Any], Any]]): Function called for values
+            that can't be serialized.
+
+    Returns:
+        bytes: JSON bytes.
+
+    """
+    return get_json_backend().dumps_bytes(obj, default)
@@ -0,0 +1,711 @@
+"""Client side instrumentation of requests to server.
+
+Each 'ServerAPI' object has 'ClientMetrics' available using 'get_metrics'.
+It collects request latency histograms per endpoint, transferred bytes,
+compression ratio of bodies, retries, GraphQl pages per query name and
+requests which were not sent because of invalid token. It also calls
+registered hooks before each request and after each response.
+
+Metrics can be exported in Prometheus text format using 'to_prometheus',
+or as flat samples using 'iter_samples' (e.g. to push them to StatsD).
+
+Example:
+    >>> metrics = con.get_metrics()
+    >>> metrics.add_response_hook(
+    ...     lambda info: print(info.endpoint, info.duration)
+    ... )
+    >>> print(metrics.to_prometheus())
+
+"""
+from __future__ import annotations
+
+import re
+import time
+import bisect
+import logging
+import threading
+import functools
+from dataclasses import dataclass
+from urllib.parse import urlparse
+import typing
+from typing import Optional, Any, Callable, Iterator
+
+if typing.TYPE_CHECKING:
+    from .profiling import QueryProfiler
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+_ID_SEGMENT_REGEX = re.compile(
+    r"^(?:[0-9a-fA-F]{32}|[0-9a-fA-F]{8}(?:-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12}"
+    r"|\d+)$"
+)
+_GRAPHQL_NAME_REGEX = re.compile(r"^\s*(?:query|mutation)\s+(\w+)")
+
+LabelsType = tuple[tuple[str, str], ...]
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize_endpoint(url: str) -> str:
+    """Endpoint of url usable as metric label.
+
+    Entity ids and project names are replaced by placeholders, so number
+    of different endpoints does not grow with data on server.
+
+    Args:
+        url (str): Full url or endpoint.
+
+    Returns:
+        str: Normalized endpoint e.g. 'api/projects/{project}/folders/{id}'.
+
+    """
+    segments = []
+    previous = None
+    for segment in urlparse(url).path.split("/"):
+        if not segment:
+            continue
+        if previous == "projects":
+            segment = "{project}"
+        elif _ID_SEGMENT_REGEX.match(segment):
+            segment = "{id}"
+        segments.append(segment)
+        previous = segment
+    return "/".join(segments)
+
+
+def get_graphql_query_name(query: str) -> str:
+    """Name of GraphQl query from query string.
+
+    Args:
+        query (str): GraphQl query.
+
+    Returns:
+        str: Name of query or 'unnamed'.
+
+    """
+    result = _GRAPHQL_NAME_REGEX.match(query)
+    if result:
+        return result.group(1)
+    return "unnamed"
+
+
+@dataclass
+class RequestInfo:
+    """Information about request passed to hooks.
+
+    Response related values are filled before response hooks are called.
+    Wire bytes are sizes of bodies as sent over network, which differ
+    from body sizes when body is compressed.
+
+    """
+    method: str
+    url: str
+    endpoint: str
+    bytes_sent: int = 0
+    wire_bytes_sent: int = 0
+    started: float = 0.0
+    status_code: Optional[int] = None
+    bytes_received: int = 0
+    wire_bytes_received: int = 0
+    duration: float = 0.0
+    attempts: int = 0
+    error: Optional[str] = None
+    short_circuit: bool = False
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        idx = bisect.bisect_left(self.buckets, value)
+        if idx < len(self.buckets):
+            self.counts[idx] += 1
+        self.sum += value
+        self.count += 1
+
+    def iter_cumulative(self) -> Iterator[tuple[str, int]]:
+        total = 0
+        for bucket, count in zip(self.buckets, self.counts):
+            total += count
+            yield _format_value(bucket), total
+        yield "+Inf", self.count
+
+
+class MetricsRegistry:
+    """Thread safe storage of counters, gauges and histograms.
+
+    Args:
+        prefix (str): Prefix of all metric names.
+
+    """
+    def __init__(self, prefix: str = "ayon_api"):
+        self.prefix: str = prefix
+        self.enabled: bool = True
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, LabelsType], float] = {}
+        self._gauges: dict[tuple[str, LabelsType], float] = {}
+        self._histograms: dict[tuple[str, LabelsType], _Histogram] = {}
+        self._descriptions: dict[str, str] = {}
+        self._collectors: list[Callable[[MetricsRegistry], None]] = []
+
+    def describe(self, name: str, description: str) -> None:
+        """Set description of metric used in exported output.
+
+        Args:
+            name (str): Metric name without prefix.
+            description (str): Description of the metric.
+
+        """
+        self._descriptions[name] = description
+
+    def inc(
+        self,
+        name: str,
+        value: float = 1.0,
+        labels: Optional[dict[str, Any]] = None,
+    ) -> None:
+        if not self.enabled:
+            return
+        key = (name, _prepare_labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(
+        self,
+        name: str,
+        value: float,
+        labels: Optional[dict[str, Any]] = None,
+    ) -> None:
+        key = (name, _prepare_labels(labels))
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        labels: Optional[dict[str, Any]] = None,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        if not self.enabled:
+            return
+        key = (name, _prepare_labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(buckets)
+            histogram.observe(value)
+
+    def add_collector(
+        self, collector: Callable[[MetricsRegistry], None]
+    ) -> None:
+        """Add callback which updates gauges before export.
+
+        Args:
+            collector (Callable[[MetricsRegistry], None]): Callback
+                receiving the registry.
+
+        """
+        self._collectors.append(collector)
+
+    def reset(self) -> None:
+        """Remove all collected values."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def _collect(self) -> None:
+        for collector in tuple(self._collectors):
+            try:
+                collector(self)
+            except Exception:
+                logging.getLogger(self.__class__.__name__).warning(
+                    "Metrics collector failed.", exc_info=True
+                )
+
+    def iter_samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """Iterate over all values as flat samples.
+
+        Histograms are converted to '_bucket', '_sum' and '_count' samples
+            the same way as in Prometheus.
+
+        Returns:
+            Iterator[tuple[str, dict[str, str], float]]: Metric name with
+                prefix, labels and value.
+
+        """
+        for metric_type, name, labels, value in self._iter_values():
+            full_name = f"{self.prefix}_{name}"
+            if metric_type != "histogram":
+                yield full_name, dict(labels), value
+                continue
+
+            for bucket, count in value.iter_cumulative():
+                bucket_labels = dict(labels)
+                bucket_labels["le"] = bucket
+                yield f"{full_name}_bucket", bucket_labels, count
+            yield f"{full_name}_sum", dict(labels), value.sum
+            yield f"{full_name}_count", dict(labels), value.count
+
+    def get_snapshot(self) -> dict[str, list[dict[str, Any]]]:
+        """Current values of all metrics.
+
+        Returns:
+            dict[str, list[dict[str, Any]]]: Values by metric name. Each
+                value has 'labels' and 'value', histograms have 'count',
+                'sum' and 'buckets' instead of 'value'.
+
+        """
+        output = {}
+        for metric_type, name, labels, value in self._iter_values():
+            item = {"labels": dict(labels)}
+            if metric_type == "histogram":
+                item["count"] = value.count
+                item["sum"] = value.sum
+                item["buckets"] = dict(value.iter_cumulative())
+            else:
+                item["value"] = value
+            output.setdefault(name, []).append(item)
+        return output
+
+    def to_prometheus(self) -> str:
+        """Metrics in Prometheus text exposition format.
+
+        Returns:
+            str: Text which can be returned by Prometheus scrape endpoint.
+
+        """
+        lines = []
+        types_by_name = {}
+        samples_by_name = {}
+        for metric_type, name, labels, value in self._iter_values():
+            types_by_name[name] = metric_type
+            samples_by_name.setdefault(name, []).append((labels, value))
+
+        for name, metric_type in types_by_name.items():
+            full_name = f"{self.prefix}_{name}"
+            description = self._descriptions.get(name)
+            if description:
+                lines.append(f"# HELP {full_name} {description}")
+            lines.append(f"# TYPE {full_name} {metric_type}")
+            for labels, value in samples_by_name[name]:
+                if metric_type != "histogram":
+                    lines.append(
+                        f"{full_name}{_format_labels(labels)}"
+                        f" {_format_value(value)}"
+                    )
+                    continue
+
+                for bucket, count in value.iter_cumulative():
+                    bucket_labels = labels + (("le", bucket),)
+                    lines.append(
+                        f"{full_name}_bucket{_format_labels(bucket_labels)}"
+                        f" {count}"
+                    )
+                lines.append(
+                    f"{full_name}_sum{_format_labels(labels)}"
+                    f" {_format_value(value.sum)}"
+                )
+                lines.append(
+                    f"{full_name}_count{_format_labels(labels)} {value.count}"
+                )
+        return "\n".join(lines) + "\n"
+
+    def _iter_values(self) -> Iterator[tuple[str, str, LabelsType, Any]]:
+        self._collect()
+        with self._lock:
+            counters = list(self._counters.items())
+            gauges = list(self._gauges.items())
+            histograms = [
+                (key, _copy_histogram(histogram))
+                for key, histogram in self._histograms.items()
+            ]
+
+        for metric_type, items in (
+            ("counter", counters),
+            ("gauge", gauges),
+            ("histogram", histograms),
+        ):
+            for (name, labels), value in sorted(items, key=lambda i: i[0]):
+                yield metric_type, name, labels, value
+
+
+class ClientMetrics(MetricsRegistry):
+    """Metrics and request hooks of single connection.
+
+    Request hooks are called before request is sent, response hooks after
+    the last attempt of request. Both receive 'RequestInfo'. Exceptions
+    raised by hooks are logged and ignored.
+
+    """
+    def __init__(self, prefix: str = "ayon_api"):
+        super().__init__(prefix)
+        self._log = logging.getLogger(self.__class__.__name__)
+        self._request_hooks: list[Callable[[RequestInfo], None]] = []
+        self._response_hooks: list[Callable[[RequestInfo], None]] = []
+        self._query_profilers: list[QueryProfiler] = []
+        for name, description in (
+            ("request_duration_seconds", "Duration of REST requests."),
+            ("request_bytes_sent_total", "Bytes of request bodies."),
+            ("response_bytes_received_total", "Bytes of response bodies."),
+            (
+                "request_wire_bytes_sent_total",
+                "Bytes of request bodies sent over network."
+            ),
+            (
+                "response_wire_bytes_received_total",
+                "Bytes of response bodies received over network."
+            ),
+            (
+                "request_compression_ratio",
+                "Ratio of request body bytes to bytes sent over network."
+            ),
+            (
+                "response_compression_ratio",
+                "Ratio of response body bytes to bytes received over network."
+            ),
+            ("request_retries_total", "Retried attempts of requests."),
+            (
+                "invalid_token_short_circuits_total",
+                "Requests not sent because token is invalid."
+            ),
+            ("graphql_pages_total", "GraphQl requests by query name."),
+            ("graphql_queries_total", "GraphQl queries by query name."),
+            (
+                "graphql_query_duration_seconds",
+                "Duration of GraphQl queries including all pages."
+            ),
+            (
+                "single_flight_shared_total",
+                "Requests which shared response of identical request."
+            ),
+            (
+                "cache_invalidation_events_total",
+                "Server events processed by cache invalidator."
+            ),
+            (
+                "cache_invalidation_lag_seconds",
+                "Delay between creation of event and cache invalidation."
+            ),
+            (
+                "cache_invalidated_items_total",
+                "Cached items removed by cache invalidator."
+            ),
+            ("transfer_bytes_total", "Bytes of uploaded/downloaded files."),
+            (
+                "transfer_duration_seconds",
+                "Duration of file uploads/downloads."
+            ),
+        ):
+            self.describe(name, description)
+        self.add_collector(self._collect_compression_ratio)
+
+    def get_compression_stats(self) -> dict[str, dict[str, float]]:
+        """Bandwidth saved by compression of request and response bodies.
+
+        Ratio is size of bodies divided by size transferred over network,
+            e.g. '5.0' means bodies were compressed to 20% of their size.
+
+        Returns:
+            dict[str, dict[str, float]]: 'bytes', 'wire_bytes' and 'ratio'
+                for 'request' and 'response'.
+
+        """
+        totals = {
+            "request_bytes_sent_total": 0,
+            "request_wire_bytes_sent_total": 0,
+            "response_bytes_received_total": 0,
+            "response_wire_bytes_received_total": 0,
+        }
+        with self._lock:
+            for (name, _), value in self._counters.items():
+                if name in totals:
+                    totals[name] += value
+
+        output = {}
+        for key, size, wire_size in (
+            (
+                "request",
+                totals["request_bytes_sent_total"],
+                totals["request_wire_bytes_sent_total"],
+            ),
+            (
+                "response",
+                totals["response_bytes_received_total"],
+                totals["response_wire_bytes_received_total"],
+            ),
+        ):
+            output[key] = {
+                "bytes": size,
+                "wire_bytes": wire_size,
+                "ratio": size / wire_size if wire_size else 1.0,
+            }
+        return output
+
+    def _collect_compression_ratio(self, metrics: MetricsRegistry) -> None:
+        for key, stats in self.get_compression_stats().items():
+            if stats["wire_bytes"]:
+                metrics.set_gauge(f"{key}_compression_ratio", stats["ratio"])
+
+    def add_request_hook(self, hook: Callable[[RequestInfo], None]) -> None:
+        self._request_hooks.append(hook)
+
+    def remove_request_hook(
+        self, hook: Callable[[RequestInfo], None]
+    ) -> None:
+        if hook in self._request_hooks:
+            self._request_hooks.remove(hook)
+
+    def add_response_hook(self, hook: Callable[[RequestInfo], None]) -> None:
+        self._response_hooks.append(hook)
+
+    def remove_response_hook(
+        self, hook: Callable[[RequestInfo], None]
+    ) -> None:
+        if hook in self._response_hooks:
+            self._response_hooks.remove(hook)
+
+    def add_query_profiler(self, profiler: QueryProfiler) -> None:
+        self._query_profilers.append(profiler)
+
+    def remove_query_profiler(self, profiler: QueryProfiler) -> None:
+        if profiler in self._query_profilers:
+            self._query_profilers.remove(profiler)
+
+    def get_query_profilers(self) -> list[QueryProfiler]:
+        """Active profilers of GraphQl queries.
+
+        Returns:
+            list[QueryProfiler]: Profilers where queries are recorded.
+
+        """
+        return list(self._query_profilers)
+
+    def request_started(
+        self, method: str, url: str, body: Any = None
+    ) -> RequestInfo:
+        """Create request info and call request hooks.
+
+        Args:
+            method (str): Request method.
+            url (str): Request url.
+            body (Any): Request body.
+
+        Returns:
+            RequestInfo: Info which should be passed to 'request_finished'.
+
+        """
+        bytes_sent = 0
+        if isinstance(body, (bytes, bytearray, str)):
+            bytes_sent = len(body)
+        info = RequestInfo(
+            method=method.upper(),
+            url=url,
+            endpoint=normalize_endpoint(url),
+            bytes_sent=bytes_sent,
+            wire_bytes_sent=bytes_sent,
+            started=time.perf_counter(),
+        )
+        self._call_hooks(self._request_hooks, info)
+        return info
+
+    def request_finished(
+        self,
+        info: RequestInfo,
+        status_code: Optional[int],
+        bytes_received: int,
+        attempts: int,
+        error: Optional[str] = None,
+        wire_bytes_received: Optional[int] = None,
+    ) -> None:
+        """Record finished request and call response hooks.
+
+        Args:
+            info (RequestInfo): Info created by 'request_started'.
+            status_code (Optional[int]): Response status code. 'None' if
+                server did not respond.
+            bytes_received (int): Size of response body.
+            attempts (int): Number of attempts.
+            error (Optional[str]): Error message if request failed
+                without response.
+            wire_bytes_received (Optional[int]): Size of response body
+                received over network. Same as 'bytes_received' if
+                not passed.
+
+        """
+        if wire_bytes_received is None:
+            wire_bytes_received = bytes_received
+        info.duration = time.perf_counter() - info.started
+        info.status_code = status_code
+        info.bytes_received = bytes_received
+        info.wire_bytes_received = wire_bytes_received
+        info.attempts = attempts
+        info.error = error
+
+        labels = {"method": info.method, "endpoint": info.endpoint}
+        self.observe(
+            "request_duration_seconds",
+            info.duration,
+            {**labels, "status": status_code or "error"},
+        )
+        if info.bytes_sent:
+            self.inc("request_bytes_sent_total", info.bytes_sent, labels)
+            self.inc(
+                "request_wire_bytes_sent_total", info.wire_bytes_sent, labels
+            )
+        if bytes_received:
+            self.inc("response_bytes_received_total", bytes_received, labels)
+            self.inc(
+                "response_wire_bytes_received_total",
+                wire_bytes_received,
+                labels,
+            )
+        if attempts > 1:
+            self.inc("request_retries_total", attempts - 1, labels)
+        self._call_hooks(self._response_hooks, info)
+
+    def record_short_circuit(self, method: str, url: str) -> None:
+        """Record request which was not sent because token is invalid.
+
+        Args:
+            method (str): Request method.
+            url (str): Request url.
+
+        """
+        info = RequestInfo(
+            method=method.upper(),
+            url=url,
+            endpoint=normalize_endpoint(url),
+            status_code=401,
+            short_circuit=True,
+        )
+        self.inc(
+            "invalid_token_short_circuits_total",
+            labels={"method": info.method, "endpoint": info.endpoint},
+        )
+        self._call_hooks(self._response_hooks, info)
+
+    def record_graphql_page(self, query: str) -> None:
+        """Record single GraphQl request.
+
+        Args:
+            query (str): GraphQl query string.
+
+        """
+        self.inc(
+            "graphql_pages_total",
+            labels={"query": get_graphql_query_name(query)},
+        )
+
+    def record_graphql_query(self, query_name: str, duration: float) -> None:
+        """Record GraphQl query which may consist of multiple pages.
+
+        Args:
+            query_name (str): Name of query.
+            duration (float): Duration of all pages in seconds.
+
+        """
+        labels = {"query": query_name}
+        self.inc("graphql_queries_total", labels=labels)
+        self.observe("graphql_query_duration_seconds", duration, labels)
+
+    def record_cache_invalidation(
+        self,
+        topic: str,
+        lag: Optional[float],
+        invalidated: int,
+    ) -> None:
+        """Record server event processed by cache invalidator.
+
+        Args:
+            topic (str): Topic of event.
+            lag (Optional[float]): Seconds since event was created,
+                'None' if unknown.
+            invalidated (int): Number of removed cached items.
+
+        """
+        # Use only 'entity.folder' part of topic to have bounded labels
+        labels = {"topic": ".".join(topic.split(".")[:2])}
+        self.inc("cache_invalidation_events_total", labels=labels)
+        if lag is not None:
+            self.observe("cache_invalidation_lag_seconds", lag, labels)
+        if invalidated:
+            self.inc("cache_invalidated_items_total", invalidated, labels)
+
+    def record_transfer(
+        self,
+        direction: str,
+        url: str,
+        size: int,
+        duration: float,
+    ) -> None:
+        """Record file upload or download.
+
+        Request of the transfer should be recorded using 'request_started'
+            and 'request_finished' too.
+
+        Args:
+            direction (str): 'upload' or 'download'.
+            url (str): Url of file.
+            size (int): Transferred bytes.
+            duration (float): Duration in seconds.
+
+        """
+        labels = {"direction": direction, "endpoint": normalize_endpoint(url)}
+        self.inc("transfer_bytes_total", size, labels)
+        self.observe("transfer_duration_seconds", duration, labels)
+
+    def _call_hooks(
+        self, hooks: list[Callable[[RequestInfo], None]], info: RequestInfo
+    ) -> None:
+        for hook in tuple(hooks):
+            try:
+                hook(info)
+            except Exception:
+                self._log.warning("Request hook failed.", exc_info=True)
+
+
+def _prepare_labels(labels: Optional[dict[str, Any]]) -> LabelsType:
+    if not labels:
+        return ()
+    return tuple(sorted(
+        (key, str(value))
+        for key, value in labels.items()
+    ))
+
+
+def _copy_histogram(histogram: _Histogram) -> _Histogram:
+    output = _Histogram(histogram.buckets)
+    output.counts = list(histogram.counts)
+    output.sum = histogram.sum
+    output.count = histogram.count
+    return output
+
+
+def _format_labels(labels: LabelsType) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels:
+        value = (
+            value.replace("\\", "\\\\")
+            .replace("\n", "\\n")
+            .replace('"', '\\"')
+        )
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return str(value)
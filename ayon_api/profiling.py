@@ -0,0 +1,233 @@
+"""Profiling of GraphQl queries.
+
+Each logical query (single 'GraphQlQuery' object, including all its pages,
+follow-up queries of nested edge fields and chunks of id filters) is recorded
+as 'QueryProfile'. Profiles also contain call site which started the query,
+so it is possible to find out which 'get_*' call caused many pages.
+
+Example:
+    >>> with con.profile_queries() as profiler:
+    ...     folders = list(con.get_folders(project_name))
+    >>> for item in profiler.get_summary():
+    ...     print(item["caller"], item["pages"], item["duration"])
+    >>> print(profiler.to_json(indent=4))
+
+"""
+from __future__ import annotations
+
+import os
+import sys
+import json
+import threading
+from dataclasses import dataclass, field, asdict
+from typing import Optional, Any
+
+# Frames of this package are skipped when looking for call site
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@dataclass
+class PageProfile:
+    """Single request of GraphQl query.
+
+    Args:
+        latency (float): Duration of request in seconds.
+        parse_time (float): Duration of parsing of response in seconds.
+        edges (int): Number of edges received in the page.
+        query_size (int): Size of query string.
+        response_size (int): Size of response in bytes, '0' if unknown.
+        nested_path (Optional[str]): Path of nested edge field if page
+            is follow-up query of nested edge field.
+
+    """
+    latency: float
+    parse_time: float
+    edges: int
+    query_size: int
+    response_size: int = 0
+    nested_path: Optional[str] = None
+
+
+@dataclass
+class QueryProfile:
+    """Profile of logical GraphQl query.
+
+    Args:
+        name (str): Name of query.
+        caller (Optional[str]): Location of code which started the query,
+            e.g. 'publish.py:42'.
+        entry_point (Optional[str]): Function of 'ayon_api' called by
+            caller, e.g. 'get_folders'.
+        pages (list[PageProfile]): Requests of the query.
+
+    """
+    name: str
+    caller: Optional[str] = None
+    entry_point: Optional[str] = None
+    pages: list[PageProfile] = field(default_factory=list)
+
+    @property
+    def compiled_size(self) -> int:
+        return max((page.query_size for page in self.pages), default=0)
+
+    @property
+    def edges(self) -> int:
+        return sum(page.edges for page in self.pages)
+
+    @property
+    def duration(self) -> float:
+        return sum(page.latency for page in self.pages)
+
+    @property
+    def parse_time(self) -> float:
+        return sum(page.parse_time for page in self.pages)
+
+    @property
+    def nested_paths(self) -> list[str]:
+        """Paths of nested edge fields which needed follow-up queries.
+
+        Returns:
+            list[str]: Field paths, e.g. 'project/folders/tasks'.
+
+        """
+        return sorted({
+            page.nested_path
+            for page in self.pages
+            if page.nested_path
+        })
+
+    def add_page(self, page: PageProfile) -> None:
+        self.pages.append(page)
+
+    def to_data(self) -> dict[str, Any]:
+        """Profile data which can be converted to JSON.
+
+        Returns:
+            dict[str, Any]: Profile data with totals.
+
+        """
+        output = asdict(self)
+        output.update({
+            "compiled_size": self.compiled_size,
+            "page_count": len(self.pages),
+            "edges": self.edges,
+            "duration": self.duration,
+            "parse_time": self.parse_time,
+            "nested_paths": self.nested_paths,
+        })
+        return output
+
+
+def _get_call_site() -> tuple[Optional[str], Optional[str]]:
+    """Find code outside of this package which called it.
+
+    Returns:
+        tuple[Optional[str], Optional[str]]: Caller location and name
+            of function of this package called by the caller.
+
+    """
+    entry_point = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        if not os.path.abspath(code.co_filename).startswith(_PACKAGE_DIR):
+            # Code running in asyncio loop or in other thread
+            if entry_point is None:
+                return None, None
+            return f"{code.co_filename}:{frame.f_lineno}", entry_point
+        if not code.co_name.startswith("_"):
+            entry_point = code.co_name
+        frame = frame.f_back
+    return None, entry_point
+
+
+class QueryProfiler:
+    """Collects profiles of GraphQl queries of a connection.
+
+    Profiler is active only while it is registered to metrics of
+        connection, see 'ServerAPI.profile_queries'.
+
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queries: list[QueryProfile] = []
+
+    @property
+    def queries(self) -> list[QueryProfile]:
+        with self._lock:
+            return list(self._queries)
+
+    def start_query(self, name: str) -> QueryProfile:
+        """Create profile of a query started by current code.
+
+        Args:
+            name (str): Name of query.
+
+        Returns:
+            QueryProfile: Profile where pages of the query are added.
+
+        """
+        caller, entry_point = _get_call_site()
+        profile = QueryProfile(name, caller, entry_point)
+        with self._lock:
+            self._queries.append(profile)
+        return profile
+
+    def get_summary(self) -> list[dict[str, Any]]:
+        """Totals of queries by call site, the slowest first.
+
+        Returns:
+            list[dict[str, Any]]: Totals with 'name', 'caller',
+                'entry_point', 'queries', 'pages', 'edges', 'duration'
+                and 'parse_time'.
+
+        """
+        totals = {}
+        for profile in self.queries:
+            key = (profile.name, profile.caller, profile.entry_point)
+            item = totals.get(key)
+            if item is None:
+                item = totals[key] = {
+                    "name": profile.name,
+                    "caller": profile.caller,
+                    "entry_point": profile.entry_point,
+                    "queries": 0,
+                    "pages": 0,
+                    "edges": 0,
+                    "duration": 0.0,
+                    "parse_time": 0.0,
+                }
+            item["queries"] += 1
+            item["pages"] += len(profile.pages)
+            item["edges"] += profile.edges
+            item["duration"] += profile.duration
+            item["parse_time"] += profile.parse_time
+        return sorted(
+            totals.values(),
+            key=lambda item: item["duration"],
+            reverse=True,
+        )
+
+    def to_data(self) -> dict[str, Any]:
+        """Profiles data which can be converted to JSON.
+
+        Returns:
+            dict[str, Any]: 'queries' with profiles and 'summary'.
+
+        """
+        return {
+            "queries": [profile.to_data() for profile in self.queries],
+            "summary": self.get_summary(),
+        }
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        """Profiles as JSON string.
+
+        Args:
+            indent (Optional[int]): Indentation of JSON.
+
+        Returns:
+            str: JSON string.
+
+        """
+        return json.dumps(self.to_data(), indent=indent)
@@ -0,0 +1,316 @@
+"""Retry policy of requests sent to server.
+
+Retries use exponential backoff with full jitter, so many clients which lost
+connection at the same moment (e.g. on server restart) don't reconnect in
+lockstep. 'Retry-After' header of 429 and 503 responses is respected.
+
+Example:
+    >>> policy = RetryPolicy(backoff_base=0.5, total_timeout=30.0)
+    >>> con = ServerAPI(url, token, retry_policy=policy)
+
+"""
+from __future__ import annotations
+
+import math
+import time
+import random
+import datetime
+from email.utils import parsedate_to_datetime
+import typing
+from typing import Optional, Iterable
+
+import requests
+
+if typing.TYPE_CHECKING:
+    from .utils import RequestType
+
+
+class RetryPolicy:
+    """Rules deciding if and when a failed request is sent again.
+
+    Non-idempotent requests (e.g. 'POST') are retried only when it is known
+    that server did not process the request, which is when connection could
+    not be established or when server responded with a status
+    from 'rejected_statuses'.
+
+    Args:
+        backoff_base (float): Base delay in seconds, maximum delay of
+            attempt is 'backoff_base * 2 ** attempt'.
+        backoff_max (float): Maximum delay between attempts in seconds.
+        total_timeout (Optional[float]): Time budget in seconds for all
+            attempts of a request. Request is not retried if next attempt
+            would start after the budget. No limit if is 'None'.
+        retry_statuses (Optional[Iterable[int]]): Response status codes
+            which are retried for idempotent requests.
+        rejected_statuses (Optional[Iterable[int]]): Response status codes
+            which mean that server did not process the request. These are
+            retried for all requests.
+        idempotent_methods (Optional[Iterable[str]]): Methods which are
+            safe to send again.
+        respect_retry_after (bool): Use 'Retry-After' header of response
+            as delay.
+
+    """
+    default_retry_statuses = (429, 502, 503, 504)
+    default_rejected_statuses = (429, 503)
+    default_idempotent_methods = (
+        "GET", "HEAD", "OPTIONS", "PUT", "DELETE"
+    )
+
+    def __init__(
+        self,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        total_timeout: Optional[float] = 120.0,
+        retry_statuses: Optional[Iterable[int]] = None,
+        rejected_statuses: Optional[Iterable[int]] = None,
+        idempotent_methods: Optional[Iterable[str]] = None,
+        respect_retry_after: bool = True,
+    ):
+        if retry_statuses is None:
+            retry_statuses = self.default_retry_statuses
+        if rejected_statuses is None:
+            rejected_statuses = self.default_rejected_statuses
+        if idempotent_methods is None:
+            idempotent_methods = self.default_idempotent_methods
+
+        self.backoff_base: float = backoff_base
+        self.backoff_max: float = backoff_max
+        self.total_timeout: Optional[float] = total_timeout
+        self.retry_statuses: set[int] = set(retry_statuses)
+        self.rejected_statuses: set[int] = set(rejected_statuses)
+        self.idempotent_methods: set[str] = {
+            method.upper()
+            for method in idempotent_methods
+        }
+        self.respect_retry_after: bool = respect_retry_after
+
+    def is_idempotent(self, method: str) -> bool:
+        return method.upper() in self.idempotent_methods
+
+    def is_retry_status(self, status_code: int, idempotent: bool) -> bool:
+        """Response with the status code should be retried.
+
+        Args:
+            status_code (int): Response status code.
+            idempotent (bool): Request can be safely sent again.
+
+        Returns:
+            bool: Request should be retried.
+
+        """
+        if status_code in self.rejected_statuses:
+            return True
+        return idempotent and status_code in self.retry_statuses
+
+    def is_retry_exception(
+        self, exc: BaseException, idempotent: bool
+    ) -> bool:
+        """Request which failed with the exception should be retried.
+
+        Args:
+            exc (BaseException): Exception raised by request.
+            idempotent (bool): Request can be safely sent again.
+
+        Returns:
+            bool: Request should be retried.
+
+        """
+        # Request did not reach the server
+        if isinstance(exc, (
+            ConnectionRefusedError,
+            requests.exceptions.ConnectTimeout,
+        )):
+            return True
+
+        if isinstance(exc, requests.exceptions.ConnectionError):
+            # Failed before connection was established
+            if _is_connect_error(exc):
+                return True
+            return idempotent
+
+        if isinstance(exc, requests.exceptions.Timeout):
+            return idempotent
+        return False
+
+    def get_backoff(self, attempt: int) -> float:
+        """Delay before next attempt using full jitter.
+
+        Args:
+            attempt (int): Index of failed attempt, starting from 0.
+
+        Returns:
+            float: Delay in seconds.
+
+        """
+        cap = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0.0, cap)
+
+    def start(
+        self,
+        method: str | RequestType,
+        max_attempts: int,
+        idempotent: Optional[bool] = None,
+    ) -> RetryState:
+        """Start tracking attempts of a request.
+
+        Args:
+            method (str | RequestType): Request method.
+            max_attempts (int): Maximum number of attempts.
+            idempotent (Optional[bool]): Request can be safely sent again.
+                Decided by method if not passed.
+
+        Returns:
+            RetryState: Retry state of the request.
+
+        """
+        method = getattr(method, "name", method)
+        if idempotent is None:
+            idempotent = self.is_idempotent(method)
+        return RetryState(self, max_attempts, idempotent)
+
+
+class RetryState:
+    """Attempts of single request.
+
+    Args:
+        policy (RetryPolicy): Retry policy.
+        max_attempts (int): Maximum number of attempts.
+        idempotent (bool): Request can be safely sent again.
+
+    """
+    def __init__(
+        self, policy: RetryPolicy, max_attempts: int, idempotent: bool
+    ):
+        self.policy: RetryPolicy = policy
+        self.max_attempts: int = max(max_attempts, 1)
+        self.idempotent: bool = idempotent
+        self.attempt: int = 0
+        self._started: float = time.monotonic()
+
+    @property
+    def is_last_attempt(self) -> bool:
+        return self.attempt + 1 >= self.max_attempts
+
+    def is_retry_response(self, response: requests.Response) -> bool:
+        return self.policy.is_retry_status(
+            response.status_code, self.idempotent
+        )
+
+    def next_delay(
+        self,
+        response: Optional[requests.Response] = None,
+        exc: Optional[BaseException] = None,
+    ) -> Optional[float]:
+        """Delay before next attempt.
+
+        Attempt counter is increased if request should be retried.
+
+        Args:
+            response (Optional[requests.Response]): Response of failed
+                attempt.
+            exc (Optional[BaseException]): Exception of failed attempt.
+
+        Returns:
+            Optional[float]: Delay in seconds or 'None' if request
+                should not be retried.
+
+        """
+        if self.is_last_attempt:
+            return None
+
+        if exc is not None:
+            if not self.policy.is_retry_exception(exc, self.idempotent):
+                return None
+        elif response is not None and not self.is_retry_response(response):
+            return None
+
+        delay = self.policy.get_backoff(self.attempt)
+        if response is not None and self.policy.respect_retry_after:
+            retry_after = parse_retry_after(
+                response.headers.get("Retry-After")
+            )
+            if retry_after is not None:
+                # Add jitter so clients don't come back at the same time
+                delay = retry_after + random.uniform(
+                    0.0, self.policy.backoff_base
+                )
+
+        total_timeout = self.policy.total_timeout
+        if total_timeout is None:
+            # Without time budget don't wait longer than maximum backoff
+            delay = min(delay, self.policy.backoff_max)
+        else:
+            elapsed = time.monotonic() - self._started
+            if elapsed + delay > total_timeout:
+                return None
+
+        self.attempt += 1
+        return delay
+
+    def wait(
+        self,
+        response: Optional[requests.Response] = None,
+        exc: Optional[BaseException] = None,
+    ) -> bool:
+        """Sleep before next attempt.
+
+        Args:
+            response (Optional[requests.Response]): Response of failed
+                attempt.
+            exc (Optional[BaseException]): Exception of failed attempt.
+
+        Returns:
+            bool: Request should be retried.
+
+        """
+        delay = self.next_delay(response, exc)
+        if delay is None:
+            return False
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse value of 'Retry-After' header.
+
+    Args:
+        value (Optional[str]): Seconds or HTTP date.
+
+    Returns:
+        Optional[float]: Delay in seconds or 'None' if value is invalid.
+
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = None
+
+    if seconds is not None:
+        # Values like 'nan' or 'inf' are not valid
+        if not math.isfinite(seconds):
+            return None
+        return max(seconds, 0.0)
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=datetime.timezone.utc)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return max((date - now).total_seconds(), 0.0)
+
+
+def _is_connect_error(exc: requests.exceptions.ConnectionError) -> bool:
+    # 'requests' wraps urllib3 errors, connection errors raised before
+    #   request was sent are 'NewConnectionError'
+    reason = exc.args[0] if exc.args else None
+    reason = getattr(reason, "reason", reason)
+    return type(reason).__name__ in (
+        "NewConnectionError", "NameResolutionError"
+    )
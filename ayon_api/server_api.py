@@ -6,6 +6,9 @@ Provides access to server API.
 from __future__ import annotations
 
 import copy
+import contextvars
+import functools
+import hashlib
 from dataclasses import dataclass
 import os
 import re
@@ -14,7 +17,10 @@ import json
 import time
 import logging
 import platform
+import threading
 import uuid
+import gzip
+import weakref
 from contextlib import contextmanager
 import typing
 from typing import Optional, Iterable, Generator, Any, Union, Literal
@@ -42,7 +48,22 @@ from .constants import (
     DEFAULT_ENTITY_LIST_FIELDS,
     DEFAULT_LINK_FIELDS,
 )
-from .graphql import INTROSPECTION_QUERY
+from .json_codec import json_loads, json_dumps, json_dumps_bytes
+from .graphql import (
+    INTROSPECTION_QUERY,
+    AdaptivePageSize,
+    GraphQlBatch,
+    GraphQlQuery,
+    get_default_page_size,
+)
+from .retries import RetryPolicy, RetryState
+from .circuit_breaker import CircuitBreaker
+from .transports import Transport
+from .metrics import ClientMetrics, RequestInfo, normalize_endpoint
+from .profiling import QueryProfiler
+from .entity_cache import EntityCache
+from .hierarchy_store import HierarchyStore
+from .folder_path_index import FolderPathIndex
 from .graphql_queries import users_graphql_query
 from .exceptions import (
     FailedOperations,
@@ -61,6 +82,14 @@ from .utils import (
     failed_json_default,
     TransferProgress,
     get_default_timeout,
+    get_default_pool_size,
+    get_default_pool_block,
+    get_default_tcp_keepalive,
+    get_default_request_compression_min_size,
+    get_default_graphql_prefetch,
+    get_default_graphql_chunk_size,
+    get_default_graphql_persisted_queries,
+    get_socket_options,
     get_default_settings_variant,
     get_default_site_id,
     NOT_SET,
@@ -68,6 +97,7 @@ from .utils import (
     get_media_mime_type_for_stream,
     get_machine_name,
     fill_own_attribs,
+    fill_attrib_defaults,
     get_user_info_by_token,
 )
 from ._api_helpers import (
@@ -108,6 +138,22 @@ VERSION_REGEX = re.compile(
 )
 
 
+# Persisted queries errors by messages used by servers without error codes
+_PERSISTED_QUERY_ERRORS_BY_MESSAGE = {
+    "PersistedQueryNotFound": "PERSISTED_QUERY_NOT_FOUND",
+    "PersistedQueryNotSupported": "PERSISTED_QUERY_NOT_SUPPORTED",
+}
+_PERSISTED_QUERY_ERRORS = set(_PERSISTED_QUERY_ERRORS_BY_MESSAGE.values())
+# Responses with persisted query errors are not bigger than this
+_PERSISTED_QUERY_ERROR_MAX_SIZE = 4096
+# Project endpoints which change cached entities
+_PROJECT_ENDPOINT_REGEX = re.compile(
+    r"/api/projects/(?P<project_name>[^/?]+)"
+    r"(?:/(?P<entity_type>folder|task|product|version|representation)s"
+    r"/(?P<entity_id>[^/?]+))?"
+)
+
+
 class GraphQlResponse:
     """GraphQl response."""
 
@@ -132,6 +178,9 @@ class _AsUserStack:
 
     ServerAPI can behave as other users if it is using special API key.
 
+    The stack is stored in a context variable, so each thread (or asyncio
+    task) has its own stack. Default username is shared.
+
     Examples:
         >>> stack = _AsUserStack()
         >>> stack.set_default_username("DefaultName")
@@ -156,23 +205,22 @@ class _AsUserStack:
 
     """
     def __init__(self):
-        self._users_by_id = {}
-        self._user_ids = []
-        self._last_user = None
+        self._users_stack = contextvars.ContextVar(
+            f"as_user_stack_{uuid.uuid4().hex}", default=()
+        )
         self._default_user = None
 
     def clear(self):
-        self._users_by_id = {}
-        self._user_ids = []
-        self._last_user = None
+        self._users_stack.set(())
         self._default_user = None
 
     @property
     def username(self) -> Optional[str]:
-        # Use '_user_ids' for boolean check to have ability "unset"
+        # Use stack for boolean check to have ability "unset"
         #   default user
-        if self._user_ids:
-            return self._last_user
+        users_stack = self._users_stack.get()
+        if users_stack:
+            return users_stack[-1]
         return self._default_user
 
     def get_default_username(self) -> Optional[str]:
@@ -185,34 +233,386 @@ class _AsUserStack:
 
     @contextmanager
     def as_user(self, username: Optional[str]) -> Generator[None, None, None]:
-        self._last_user = username
-        user_id = uuid.uuid4().hex
-        self._user_ids.append(user_id)
-        self._users_by_id[user_id] = username
-
-        def _cleanup():
-            self._users_by_id.pop(user_id, None)
-            if not self._user_ids:
-                return
+        token = self._users_stack.set(self._users_stack.get() + (username,))
+        try:
+            yield
+        finally:
+            self._users_stack.reset(token)
 
-            # First check if is the user id the last one
-            was_last = self._user_ids[-1] == user_id
-            # Remove id from variables
-            if user_id in self._user_ids:
-                self._user_ids.remove(user_id)
 
-            if not was_last:
-                return
+class _SingleFlightCall:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
 
-            new_last_user = None
-            if self._user_ids:
-                new_last_user = self._users_by_id.get(self._user_ids[-1])
-            self._last_user = new_last_user
+
+class _SingleFlight:
+    """Share result of identical calls running at the same time.
+
+    First caller of a key executes the function, other callers with the same
+    key wait for its result instead of doing the same work.
+
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Any, _SingleFlightCall] = {}
+
+    def do(self, key: Any, func: typing.Callable[[], Any]) -> tuple[Any, bool]:
+        """Execute function or wait for result of running call.
+
+        Args:
+            key (Any): Hashable key of call.
+            func (Callable[[], Any]): Function executed if there is not
+                running call with the key.
+
+        Returns:
+            tuple[Any, bool]: Result of function and if result was shared
+                from other call.
+
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_owner = call is None
+            if is_owner:
+                call = self._calls[key] = _SingleFlightCall()
+
+        if not is_owner:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
 
         try:
-            yield
+            call.result = func()
+        except BaseException as exc:
+            call.error = exc
+            raise
         finally:
-            _cleanup()
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+        return call.result, False
+
+
+class _PersistedQueries:
+    """Registry of persisted GraphQl query hashes known by server.
+
+    Queries with registered hash are sent without query text. Hash is
+    registered once server accepted the query with full text, and is
+    removed when server does not know it anymore (e.g. after restart).
+    Persisted queries are not used anymore if server does not support them,
+    or if query without text failed but the same query with full text
+    did not, e.g. server ignores 'extensions' of request.
+
+    """
+    def __init__(self):
+        self._hashes: set[str] = set()
+        # Server does not support persisted queries
+        self.supported = True
+
+    def is_registered(self, query_hash: str) -> bool:
+        return query_hash in self._hashes
+
+    def register(self, query_hash: str) -> None:
+        self._hashes.add(query_hash)
+
+    def unregister(self, query_hash: str) -> None:
+        self._hashes.discard(query_hash)
+
+
+@functools.lru_cache(maxsize=512)
+def _get_query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def _get_graphql_errors(
+    response: RestApiResponse, stream: bool
+) -> list[Any]:
+    """Errors of GraphQl response without data.
+
+    Streamed response body is read only if it is small, errors are small
+        responses with known content length.
+
+    Returns:
+        list[Any]: Errors in response, empty if response has data or body
+            of streamed response was not read.
+
+    """
+    if stream:
+        try:
+            size = int(response.headers.get("Content-Length"))
+        except (TypeError, ValueError):
+            return []
+        if size > _PERSISTED_QUERY_ERROR_MAX_SIZE:
+            return []
+
+    data = response.data
+    if not isinstance(data, dict) or data.get("data"):
+        return []
+    return data.get("errors") or []
+
+
+def _get_persisted_query_error(errors: list[Any]) -> Optional[str]:
+    """Persisted query error code in GraphQl errors.
+
+    Returns:
+        Optional[str]: 'PERSISTED_QUERY_NOT_FOUND',
+            'PERSISTED_QUERY_NOT_SUPPORTED' or None.
+
+    """
+    for error in errors:
+        if not isinstance(error, dict):
+            continue
+        code = (error.get("extensions") or {}).get("code")
+        if code in _PERSISTED_QUERY_ERRORS:
+            return code
+        message = error.get("message")
+        if message in _PERSISTED_QUERY_ERRORS_BY_MESSAGE:
+            return _PERSISTED_QUERY_ERRORS_BY_MESSAGE[message]
+    return None
+
+
+def _get_response_wire_size(response: requests.Response, size: int) -> int:
+    """Size of response body received over network.
+
+    Differs from size of content when server compressed the response.
+
+    Args:
+        response (requests.Response): Response with consumed content.
+        size (int): Size of decoded content used as fallback.
+
+    Returns:
+        int: Size of body in bytes as received over network.
+
+    """
+    # 'httpx' response of 'HttpxTransport'
+    wire_size = getattr(response, "num_bytes_downloaded", None)
+    if wire_size is None:
+        raw = getattr(response, "raw", None)
+        try:
+            wire_size = raw.tell()
+        except Exception:
+            wire_size = None
+    if not wire_size:
+        return size
+    return wire_size
+
+
+def _get_entity_changes(
+    method: str,
+    url: str,
+    body: Any,
+) -> Optional[tuple[str, Optional[list[tuple[str, str]]]]]:
+    """Find out which entities may be changed by a request.
+
+    Args:
+        method (str): Request method, e.g. 'PATCH'.
+        url (str): Request url.
+        body (Any): Json body of request.
+
+    Returns:
+        Optional[tuple[str, Optional[list[tuple[str, str]]]]]: Project name
+            with entity type and id of updated entities, entities are
+            'None' if any entity of project may be changed. 'None' is
+            returned if request does not change project entities.
+
+    """
+    match = _PROJECT_ENDPOINT_REGEX.search(url)
+    if match is None:
+        return None
+
+    project_name = match.group("project_name")
+    changed_entities = None
+    if match.group("entity_id"):
+        if method == "PATCH":
+            changed_entities = [
+                (match.group("entity_type"), match.group("entity_id"))
+            ]
+
+    elif url[match.end():].startswith("/operations") and body:
+        operations = body.get("operations") or []
+        if all(
+            operation.get("type") == "update"
+            for operation in operations
+        ):
+            changed_entities = [
+                (operation.get("entityType"), operation.get("entityId"))
+                for operation in operations
+            ]
+
+    return project_name, changed_entities
+
+
+def _copy_rest_response(response: RestApiResponse) -> RestApiResponse:
+    """Copy of response with independent data.
+
+    Data of copy are decoded again from response content, or deep copied if
+    response was not received from server.
+
+    """
+    data = None
+    if response.orig_response is None:
+        data = copy.deepcopy(response.data)
+    output = RestApiResponse(response.orig_response, data)
+    output.status = response.status
+    return output
+
+
+class _SessionPool:
+    """Sessions used by connection shared across threads.
+
+    Each thread receives its own 'requests.Session' object, but all of them
+    share single connection pool (adapter), headers, cert and ssl
+    verification. Changes of shared values are applied to a session
+    lazily by the thread which owns it.
+
+    Args:
+        headers (dict[str, str]): Headers used by all sessions.
+        cert (Optional[str]): Path to cert file.
+        verify (Union[bool, str]): SSL verification.
+        pool_size (int): Maximum number of connections kept per host.
+        pool_block (bool): Wait for free connection if all connections
+            are used, instead of creating a connection which is discarded
+            after the request.
+        socket_options (Optional[list[tuple[int, int, int]]]): Socket
+            options of new connections.
+
+    """
+    def __init__(
+        self,
+        headers: dict[str, str],
+        cert: Optional[str],
+        verify: Union[bool, str],
+        pool_size: int = 10,
+        pool_block: bool = False,
+        socket_options: Optional[list[tuple[int, int, int]]] = None,
+    ):
+        self._headers = dict(headers)
+        self._cert = cert
+        self._verify = verify
+        self._state_id = 0
+        self._pool_size = pool_size
+        self._pool_block = pool_block
+        adapter = requests.adapters.HTTPAdapter(
+            pool_maxsize=pool_size,
+            pool_block=pool_block,
+        )
+        if socket_options is not None:
+            # Re-create pool manager with socket options, 'HTTPAdapter'
+            #   does not allow to pass them to constructor
+            adapter.init_poolmanager(
+                requests.adapters.DEFAULT_POOLSIZE,
+                pool_size,
+                block=pool_block,
+                socket_options=socket_options,
+            )
+        self._adapter = adapter
+        self._local = threading.local()
+        self._sessions = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def get_session(self) -> requests.Session:
+        """Session for current thread.
+
+        Returns:
+            requests.Session: Session owned by current thread.
+
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", self._adapter)
+            session.mount("http://", self._adapter)
+            with self._lock:
+                self._sessions.add(session)
+            self._local.session = session
+            self._local.state_id = None
+
+        if self._local.state_id != self._state_id:
+            with self._lock:
+                self._local.state_id = self._state_id
+                session.cert = self._cert
+                session.verify = self._verify
+                # Keep default headers of 'requests' (e.g. Accept-Encoding)
+                session.headers = requests.utils.default_headers()
+                session.headers.update(self._headers)
+        return session
+
+    def update_headers(self, headers: dict[str, Optional[str]]) -> None:
+        """Change headers used by sessions.
+
+        Args:
+            headers (dict[str, Optional[str]]): Header values, header is
+                removed if value is 'None'.
+
+        """
+        with self._lock:
+            for key, value in headers.items():
+                if value is not None:
+                    self._headers[key] = value
+                else:
+                    self._headers.pop(key, None)
+            self._state_id += 1
+
+    def set_cert(self, cert: Optional[str]) -> None:
+        with self._lock:
+            self._cert = cert
+            self._state_id += 1
+
+    def set_verify(self, verify: Union[bool, str]) -> None:
+        with self._lock:
+            self._verify = verify
+            self._state_id += 1
+
+    def get_info(self) -> dict[str, Any]:
+        """Information about connection pools.
+
+        Connection pool is saturated when all connections are in use. In
+        that case requests are waiting for a connection when pool is
+        blocking, or new connections are created and discarded after
+        the request.
+
+        Returns:
+            dict[str, Any]: Pool configuration and state of pool
+                of each host.
+
+        """
+        hosts = []
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None or pool.pool is None:
+                continue
+            queue = pool.pool
+            with queue.mutex:
+                idle = sum(1 for conn in queue.queue if conn is not None)
+                available = len(queue.queue)
+            in_use = queue.maxsize - available
+            hosts.append({
+                "url": f"{pool.scheme}://{pool.host}:{pool.port}",
+                "max_size": queue.maxsize,
+                "in_use": in_use,
+                "idle": idle,
+                "saturation": in_use / queue.maxsize,
+                "connections_created": pool.num_connections,
+                "requests": pool.num_requests,
+            })
+
+        return {
+            "pool_size": self._pool_size,
+            "pool_block": self._pool_block,
+            "hosts": hosts,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions)
+            self._sessions = weakref.WeakSet()
+
+        for session in sessions:
+            session.close()
+        self._adapter.close()
 
 
 @dataclass
@@ -273,6 +673,56 @@ class ServerAPI(
             token is available. Default is True.
         timeout (Optional[float]): Timeout for requests.
         max_retries (Optional[int]): Number of retries for requests.
+        pool_size (Optional[int]): Maximum number of connections to server
+            kept in pool. Looks for env variable value
+            ``AYON_SERVER_POOL_SIZE`` by default, 32 is used otherwise.
+        pool_block (Optional[bool]): Wait for free pooled connection when
+            all connections are in use instead of opening new connection.
+            Looks for env variable value ``AYON_SERVER_POOL_BLOCK``
+            by default.
+        tcp_keepalive (Optional[int]): Idle time in seconds before TCP
+            keep-alive probes are sent, '0' disables TCP keep-alive. Looks
+            for env variable value ``AYON_SERVER_TCP_KEEPALIVE`` by default,
+            60 is used otherwise.
+        retry_policy (Optional[RetryPolicy]): Rules and delays of request
+            retries. Default 'RetryPolicy' is used if not passed.
+        circuit_breaker (Optional[CircuitBreaker]): Fail fast when server
+            repeatedly fails. Default 'CircuitBreaker' is used if
+            not passed.
+        single_flight (bool): Identical GET requests and GraphQl queries
+            running at the same time share one request to server.
+        transport (Optional[Transport]): Transport used to send requests,
+            e.g. 'HttpxTransport' for HTTP/2. Sessions of 'requests' are
+            used if not passed.
+        request_compression_min_size (Optional[int]): Minimum size of big
+            request bodies (e.g. batch operations) compressed using gzip.
+            Looks for env variable value ``AYON_SERVER_REQUEST_COMPRESSION``
+            by default, '0' (disabled) is used otherwise.
+        graphql_prefetch (Optional[int]): Number of GraphQl pages requested
+            ahead while caller of 'get_*' generator handles current page.
+            Looks for env variable value ``AYON_GRAPHQL_PREFETCH``
+            by default, '0' (disabled) is used otherwise.
+        graphql_page_size (Optional[Union[int, AdaptivePageSize]]): Number
+            of edges requested in single GraphQl page, or adaptive page
+            size. Looks for env variable value ``AYON_GRAPHQL_PAGE_SIZE``
+            (number or 'adaptive') by default, 300 is used otherwise.
+        graphql_chunk_size (Optional[int]): Maximum number of ids in single
+            GraphQl id filter, bigger filters are split to chunks queried
+            concurrently. Looks for env variable value
+            ``AYON_GRAPHQL_CHUNK_SIZE`` by default, 5000 is used otherwise.
+        graphql_persisted_queries (Optional[bool]): Send GraphQl queries
+            as SHA-256 hash of query, full query is sent only if server
+            does not know the hash. Looks for env variable value
+            ``AYON_GRAPHQL_PERSISTED_QUERIES`` by default, disabled
+            otherwise.
+        entity_cache (Optional[EntityCache]): Cache of entities queried
+            by ids, e.g. 'get_folder_by_id'. Entities are not cached
+            if not passed.
+        hierarchy_store (Optional[HierarchyStore]): Local store of project
+            folders and tasks used by folder and task getters. Entities
+            are always queried from server if not passed.
+        folder_path_index (bool): Resolve folder paths to ids using local
+            index of project folder paths, see 'get_folder_path_index'.
 
     """
     _default_max_retries = 3
@@ -280,6 +730,8 @@ class ServerAPI(
     # TODO find out if these are reasonable default value
     default_download_chunk_size = 1024 * 1024
     default_upload_chunk_size = 1024 * 1024
+    # Seconds after which folder path index of a project is rebuilt
+    folder_path_index_max_age = 60.0
 
     def __init__(
         self,
@@ -295,6 +747,21 @@ class ServerAPI(
         create_session: bool = True,
         timeout: Optional[float] = None,
         max_retries: Optional[int] = None,
+        pool_size: Optional[int] = None,
+        pool_block: Optional[bool] = None,
+        tcp_keepalive: Optional[int] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        single_flight: bool = False,
+        transport: Optional[Transport] = None,
+        request_compression_min_size: Optional[int] = None,
+        graphql_prefetch: Optional[int] = None,
+        graphql_page_size: Optional[Union[int, AdaptivePageSize]] = None,
+        graphql_chunk_size: Optional[int] = None,
+        graphql_persisted_queries: Optional[bool] = None,
+        entity_cache: Optional[EntityCache] = None,
+        hierarchy_store: Optional[HierarchyStore] = None,
+        folder_path_index: bool = False,
     ):
         if not base_url:
             raise ValueError(f"Invalid server URL {str(base_url)}")
@@ -323,6 +790,19 @@ class ServerAPI(
         # Set timeout and max retries based on passed values
         self.set_timeout(timeout)
         self.set_max_retries(max_retries)
+        if retry_policy is None:
+            retry_policy = RetryPolicy()
+        self._retry_policy: RetryPolicy = retry_policy
+        if circuit_breaker is None:
+            circuit_breaker = CircuitBreaker()
+        self._circuit_breaker: CircuitBreaker = circuit_breaker
+        self._single_flight: Optional[_SingleFlight] = None
+        if single_flight:
+            self._single_flight = _SingleFlight()
+        self._transport: Optional[Transport] = transport
+        self._metrics: ClientMetrics = ClientMetrics()
+        self._metrics.add_collector(self._collect_pool_metrics)
+        self._metrics.add_collector(self._collect_circuit_metrics)
 
         if ssl_verify is None:
             # Custom AYON env variable for CA file or 'True'
@@ -336,6 +816,39 @@ class ServerAPI(
         self._ssl_verify = ssl_verify
         self._cert = cert
 
+        if pool_size is None:
+            pool_size = get_default_pool_size()
+        if pool_block is None:
+            pool_block = get_default_pool_block()
+        if tcp_keepalive is None:
+            tcp_keepalive = get_default_tcp_keepalive()
+        self._pool_size: int = pool_size
+        self._pool_block: bool = pool_block
+        self._tcp_keepalive: int = tcp_keepalive
+        self._request_compression_min_size: int = 0
+        self.set_request_compression_min_size(request_compression_min_size)
+        self._graphql_prefetch: int = 0
+        self.set_graphql_prefetch(graphql_prefetch)
+        self._graphql_page_size: Union[int, AdaptivePageSize] = 0
+        self.set_graphql_page_size(graphql_page_size)
+        self._graphql_chunk_size: int = 0
+        self.set_graphql_chunk_size(graphql_chunk_size)
+        self._persisted_queries: Optional[_PersistedQueries] = None
+        if graphql_persisted_queries is None:
+            graphql_persisted_queries = (
+                get_default_graphql_persisted_queries()
+            )
+        self.set_graphql_persisted_queries_enabled(graphql_persisted_queries)
+        self._entity_cache: Optional[EntityCache] = entity_cache
+        self._hierarchy_store: Optional[HierarchyStore] = hierarchy_store
+        self._folder_path_index_enabled: bool = folder_path_index
+        self._folder_path_indexes: dict[str, FolderPathIndex] = {}
+        self._folder_path_indexes_lock = threading.Lock()
+        # Index of a project is built only once at a time
+        self._folder_path_index_build_locks: dict[str, threading.Lock] = {}
+        # Increased on reset, index built before reset is not stored
+        self._folder_path_index_resets: int = 0
+
         self._token_info = TokenInfo(token=token)
 
         self._server_available = None
@@ -346,7 +859,11 @@ class ServerAPI(
         self._product_base_type_supported = None
         self._links_graphql_support_data = None
 
-        self._session = None
+        self._session_pool: Optional[_SessionPool] = None
+        self._token_lock = threading.RLock()
+        self._context_headers = contextvars.ContextVar(
+            f"context_headers_{uuid.uuid4().hex}", default={}
+        )
 
         self._base_functions_mapping = {
             RequestTypes.get: requests.get,
@@ -355,11 +872,9 @@ class ServerAPI(
             RequestTypes.patch: requests.patch,
             RequestTypes.delete: requests.delete
         }
-        self._session_functions_mapping = {}
 
-        # Attributes cache
-        self._attributes_schema = None
-        self._entity_type_attributes_cache = {}
+        # Attributes cache of this connection, created on first use
+        self._attributes_cache = None
 
         self._as_user_stack = _AsUserStack()
 
@@ -401,8 +916,8 @@ class ServerAPI(
         if self._ssl_verify == ssl_verify:
             return
         self._ssl_verify = ssl_verify
-        if self._session is not None:
-            self._session.verify = ssl_verify
+        if self._session_pool is not None:
+            self._session_pool.set_verify(ssl_verify)
 
     def get_cert(self):
         """Current cert file used for connection to server.
@@ -423,8 +938,8 @@ class ServerAPI(
         if cert == self._cert:
             return
         self._cert = cert
-        if self._session is not None:
-            self._session.cert = cert
+        if self._session_pool is not None:
+            self._session_pool.set_cert(cert)
 
     ssl_verify = property(get_ssl_verify, set_ssl_verify)
     cert = property(get_cert, set_cert)
@@ -503,6 +1018,392 @@ class ServerAPI(
     timeout = property(get_timeout, set_timeout)
     max_retries = property(get_max_retries, set_max_retries)
 
+    def get_retry_policy(self) -> RetryPolicy:
+        """Current retry policy of requests.
+
+        Returns:
+            RetryPolicy: Rules and delays of request retries.
+
+        """
+        return self._retry_policy
+
+    def set_retry_policy(self, retry_policy: Optional[RetryPolicy]):
+        """Change retry policy of requests.
+
+        Args:
+            retry_policy (Optional[RetryPolicy]): Rules and delays of request
+                retries. Default 'RetryPolicy' is used if 'None' is passed.
+
+        """
+        if retry_policy is None:
+            retry_policy = RetryPolicy()
+        self._retry_policy = retry_policy
+
+    retry_policy = property(get_retry_policy, set_retry_policy)
+
+    def get_circuit_breaker(self) -> CircuitBreaker:
+        """Circuit breaker of requests.
+
+        Returns:
+            CircuitBreaker: Circuit breaker used by the connection.
+
+        """
+        return self._circuit_breaker
+
+    def set_circuit_breaker(self, circuit_breaker: Optional[CircuitBreaker]):
+        """Change circuit breaker of requests.
+
+        Args:
+            circuit_breaker (Optional[CircuitBreaker]): Circuit breaker.
+                Default 'CircuitBreaker' is used if 'None' is passed.
+
+        """
+        if circuit_breaker is None:
+            circuit_breaker = CircuitBreaker()
+        self._circuit_breaker = circuit_breaker
+
+    def is_single_flight_enabled(self) -> bool:
+        """Identical requests running at the same time are shared.
+
+        Returns:
+            bool: Single-flight de-duplication is enabled.
+
+        """
+        return self._single_flight is not None
+
+    def set_single_flight_enabled(self, enabled: bool):
+        """Enable or disable sharing of identical requests.
+
+        When enabled, identical GET requests and read-only GraphQl queries
+            running at the same time (e.g. from multiple threads) share
+            one request to server. Requests are identical if they have the
+            same url, body and impersonated user. Each caller receives
+            its own copy of response data.
+
+        Args:
+            enabled (bool): Enable single-flight de-duplication.
+
+        """
+        if not enabled:
+            self._single_flight = None
+        elif self._single_flight is None:
+            self._single_flight = _SingleFlight()
+
+    def get_transport(self) -> Optional[Transport]:
+        """Transport used to send requests.
+
+        Returns:
+            Optional[Transport]: Custom transport or 'None' if sessions
+                of 'requests' are used.
+
+        """
+        return self._transport
+
+    def set_transport(self, transport: Optional[Transport]):
+        """Change transport used to send requests.
+
+        Previous transport is not closed, it is owned by the caller.
+
+        Args:
+            transport (Optional[Transport]): Transport, e.g.
+                'HttpxTransport' for HTTP/2. Sessions of 'requests' are
+                used if 'None' is passed.
+
+        """
+        self._transport = transport
+
+    def get_request_compression_min_size(self) -> int:
+        """Minimum size of request body compressed using gzip.
+
+        Returns:
+            int: Size in bytes, '0' if compression is disabled.
+
+        """
+        return self._request_compression_min_size
+
+    def set_request_compression_min_size(self, min_size: Optional[int]):
+        """Change minimum size of request body compressed using gzip.
+
+        Only big request bodies which are known to be highly repetitive are
+            compressed, i.e. batch operations and entity list items. Server
+            (or proxy in front of it) must accept gzip encoded bodies.
+
+        Args:
+            min_size (Optional[int]): Size in bytes, '0' disables
+                compression. Default value is used if 'None' is passed.
+
+        """
+        if min_size is None:
+            min_size = get_default_request_compression_min_size()
+        self._request_compression_min_size = max(int(min_size), 0)
+
+    def get_graphql_prefetch(self) -> int:
+        """Number of GraphQl pages fetched ahead.
+
+        Returns:
+            int: Maximum number of pages fetched ahead, '0' if prefetch
+                is disabled.
+
+        """
+        return self._graphql_prefetch
+
+    def set_graphql_prefetch(self, prefetch: Optional[int]):
+        """Change number of GraphQl pages fetched ahead.
+
+        When enabled, 'get_*' generators (e.g. 'get_folders') request next
+            page in a background thread while caller handles current page.
+
+        Args:
+            prefetch (Optional[int]): Maximum number of pages fetched ahead,
+                '0' disables prefetch. Default value is used if 'None'
+                is passed.
+
+        """
+        if prefetch is None:
+            prefetch = get_default_graphql_prefetch()
+        self._graphql_prefetch = max(int(prefetch), 0)
+
+    def get_graphql_page_size(self) -> Union[int, AdaptivePageSize]:
+        """Number of edges requested in single GraphQl page.
+
+        Used by queries which don't have own page size.
+
+        Returns:
+            Union[int, AdaptivePageSize]: Page size or adaptive page size.
+
+        """
+        return self._graphql_page_size
+
+    def set_graphql_page_size(
+        self, page_size: Optional[Union[int, AdaptivePageSize]]
+    ):
+        """Change number of edges requested in single GraphQl page.
+
+        Adaptive page size grows or shrinks page size of each query based
+            on duration and size of received pages.
+
+        Args:
+            page_size (Optional[Union[int, AdaptivePageSize]]): Page size,
+                or adaptive page size. Default value is used if 'None'
+                is passed.
+
+        """
+        if page_size is None:
+            page_size = get_default_page_size()
+        elif isinstance(page_size, int) and page_size < 1:
+            raise ValueError(f"Invalid page size {page_size}.")
+        self._graphql_page_size = page_size
+
+    def get_graphql_chunk_size(self) -> int:
+        """Maximum number of ids in single GraphQl id filter.
+
+        Returns:
+            int: Maximum number of ids, '0' if chunking is disabled.
+
+        """
+        return self._graphql_chunk_size
+
+    def set_graphql_chunk_size(self, chunk_size: Optional[int]):
+        """Change maximum number of ids in single GraphQl id filter.
+
+        Bigger id filters of 'get_*' methods (e.g. 'version_ids' of
+            'get_representations') are split to chunks queried concurrently.
+
+        Args:
+            chunk_size (Optional[int]): Maximum number of ids, '0' disables
+                chunking. Default value is used if 'None' is passed.
+
+        """
+        if chunk_size is None:
+            chunk_size = get_default_graphql_chunk_size()
+        self._graphql_chunk_size = max(int(chunk_size), 0)
+
+    def is_graphql_persisted_queries_enabled(self) -> bool:
+        """GraphQl queries are sent as persisted query hashes.
+
+        Returns:
+            bool: Persisted queries are enabled.
+
+        """
+        return self._persisted_queries is not None
+
+    def set_graphql_persisted_queries_enabled(self, enabled: bool):
+        """Enable or disable persisted GraphQl queries.
+
+        When enabled, read-only GraphQl queries are sent as SHA-256 hash
+            of query text. Full query text is sent with the hash on first
+            use and when server does not know the hash (cache miss), server
+            then registers the query for next requests. Hashes registered
+            on server are kept per connection. Queries are sent with full
+            text if server does not support persisted queries.
+
+        Args:
+            enabled (bool): Enable persisted queries.
+
+        """
+        if not enabled:
+            self._persisted_queries = None
+        elif self._persisted_queries is None:
+            self._persisted_queries = _PersistedQueries()
+
+    def get_entity_cache(self) -> Optional[EntityCache]:
+        """Cache of entities queried by ids.
+
+        Returns:
+            Optional[EntityCache]: Entity cache or None if entities
+                are not cached.
+
+        """
+        return self._entity_cache
+
+    def set_entity_cache(self, entity_cache: Optional[EntityCache]):
+        """Change cache of entities queried by ids.
+
+        Getters of folders, tasks, products, versions and representations
+            which filter only by ids use cached entities and query only
+            ids missing in cache. Cached entities are invalidated when
+            they are changed or deleted using this connection.
+
+        Args:
+            entity_cache (Optional[EntityCache]): Entity cache, caching
+                is disabled if 'None' is passed.
+
+        """
+        self._entity_cache = entity_cache
+
+    def get_hierarchy_store(self) -> Optional[HierarchyStore]:
+        """Local store of project folders and tasks.
+
+        Returns:
+            Optional[HierarchyStore]: Hierarchy store or None if folders
+                and tasks are always queried from server.
+
+        """
+        return self._hierarchy_store
+
+    def set_hierarchy_store(self, hierarchy_store: Optional[HierarchyStore]):
+        """Change local store of project folders and tasks.
+
+        Getters of folders and tasks which filter only by ids, paths,
+            names, types or parents use entities from the store. Project
+            is synchronized with server when its entities were not
+            synchronized for 'max_age' of the store.
+
+        Args:
+            hierarchy_store (Optional[HierarchyStore]): Hierarchy store,
+                store is not used if 'None' is passed.
+
+        """
+        self._hierarchy_store = hierarchy_store
+
+    def is_folder_path_index_enabled(self) -> bool:
+        """Folder paths are resolved to ids using folder path index.
+
+        Returns:
+            bool: Folder path index is used by path based getters.
+
+        """
+        return self._folder_path_index_enabled
+
+    def set_folder_path_index_enabled(self, enabled: bool):
+        """Enable or disable usage of folder path index.
+
+        Path based getters, e.g. 'get_folder_by_path' or
+            'get_tasks_by_folder_paths', resolve folder ids using index
+            of project folder paths and query entities by ids. Paths missing
+            in index are queried from server.
+
+        Index is rebuilt after 'folder_path_index_max_age' seconds, or when
+            folders are changed using this connection. Changes of other
+            clients are not visible until then, unless 'CacheInvalidator'
+            is used. Active state of folders is not checked when index
+            is used.
+
+        Args:
+            enabled (bool): Use folder path index.
+
+        """
+        self._folder_path_index_enabled = enabled
+        if not enabled:
+            self.reset_folder_path_index()
+
+    def get_folder_path_index(
+        self, project_name: str, refresh: bool = False
+    ) -> FolderPathIndex:
+        """Index of folder paths of a project.
+
+        Index is built from single 'get_rest_folders' call and is reused
+            until it is older than 'folder_path_index_max_age'.
+
+        Args:
+            project_name (str): Project name.
+            refresh (bool): Rebuild index even if is not outdated.
+
+        Returns:
+            FolderPathIndex: Index of folder paths.
+
+        """
+        with self._folder_path_indexes_lock:
+            index = self._folder_path_indexes.get(project_name)
+            if self._is_folder_path_index_valid(index, refresh):
+                return index
+            build_lock = self._folder_path_index_build_locks.setdefault(
+                project_name, threading.Lock()
+            )
+
+        # Server is queried without the lock shared by all projects
+        with build_lock:
+            with self._folder_path_indexes_lock:
+                current_index = self._folder_path_indexes.get(project_name)
+                # Index was rebuilt by other thread in the meantime
+                if current_index is not index and (
+                    self._is_folder_path_index_valid(current_index, False)
+                ):
+                    return current_index
+                resets = self._folder_path_index_resets
+
+            index = FolderPathIndex.from_server(self, project_name)
+            with self._folder_path_indexes_lock:
+                if resets == self._folder_path_index_resets:
+                    self._folder_path_indexes[project_name] = index
+        return index
+
+    def reset_folder_path_index(self, project_name: Optional[str] = None):
+        """Remove folder path index so it is rebuilt on next use.
+
+        Args:
+            project_name (Optional[str]): Project name. Indexes of all
+                projects are removed if not passed.
+
+        """
+        with self._folder_path_indexes_lock:
+            self._folder_path_index_resets += 1
+            if project_name is None:
+                self._folder_path_indexes.clear()
+            else:
+                self._folder_path_indexes.pop(project_name, None)
+
+    def _is_folder_path_index_valid(
+        self, index: Optional[FolderPathIndex], refresh: bool
+    ) -> bool:
+        return (
+            index is not None
+            and not refresh
+            and index.age <= self.folder_path_index_max_age
+        )
+
+    def get_circuit_breaker_state(self) -> dict[str, Any]:
+        """State of circuit breaker usable for health checks.
+
+        Does not send any request to server.
+
+        Returns:
+            dict[str, Any]: State of circuit breaker, 'state' is one of
+                'closed', 'open' or 'half-open'.
+
+        """
+        return self._circuit_breaker.get_state()
+
     @property
     def access_token(self) -> Optional[str]:
         """Access token used for authorization to server.
@@ -626,10 +1527,7 @@ class ServerAPI(
             sender (Optional[str]): Sender name or None.
 
         """
-        if sender == self._sender:
-            return
         self._sender = sender
-        self._update_session_headers()
 
     sender = property(get_sender, set_sender)
 
@@ -651,13 +1549,40 @@ class ServerAPI(
             sender_type (Optional[str]): Sender type or None.
 
         """
-        if sender_type == self._sender_type:
-            return
         self._sender_type = sender_type
-        self._update_session_headers()
 
     sender_type = property(get_sender_type, set_sender_type)
 
+    @contextmanager
+    def as_sender(
+        self,
+        sender: Optional[str] = NOT_SET,
+        sender_type: Optional[str] = NOT_SET,
+    ):
+        """Temporarily use different sender and sender type.
+
+        Change affects only current thread (or asyncio task), other threads
+            using the same connection keep using connection values.
+
+        Args:
+            sender (Optional[str]): Sender used for requests.
+            sender_type (Optional[str]): Sender type used for requests.
+
+        """
+        context_headers = dict(self._context_headers.get())
+        for key, value in (
+            ("x-sender", sender),
+            ("x-sender-type", sender_type),
+        ):
+            if value is not NOT_SET:
+                context_headers[key] = value
+
+        token = self._context_headers.set(context_headers)
+        try:
+            yield
+        finally:
+            self._context_headers.reset(token)
+
     def get_default_service_username(self) -> Optional[str]:
         """Default username used for callbacks when used with service API key.
 
@@ -697,8 +1622,6 @@ class ServerAPI(
             )
 
         self._as_user_stack.set_default_username(username)
-        if self._as_user_stack.username == username:
-            self._update_session_headers()
 
     @contextmanager
     def as_username(
@@ -708,7 +1631,9 @@ class ServerAPI(
     ):
         """Service API will temporarily work as other user.
 
-        This method can be used only if service API key is logged in.
+        This method can be used only if service API key is logged in. Change
+            affects only current thread (or asyncio task), other threads
+            using the same connection are not affected.
 
         Args:
             username (Optional[str]): Username to work as when service.
@@ -733,12 +1658,8 @@ class ServerAPI(
                 "Can't set service username. API key is not a service token."
             )
 
-        try:
-            with self._as_user_stack.as_user(username) as o:
-                self._update_session_headers()
-                yield o
-        finally:
-            self._update_session_headers()
+        with self._as_user_stack.as_user(username) as o:
+            yield o
 
     @property
     def is_server_available(self) -> bool:
@@ -758,7 +1679,10 @@ class ServerAPI(
             return False
 
         if self._token_info.is_valid is None:
-            self.validate_token()
+            with self._token_lock:
+                # Other thread might validate token in the meantime
+                if self._token_info.is_valid is None:
+                    self.validate_token()
         return self._token_info.is_valid
 
     def validate_server_availability(self):
@@ -768,9 +1692,13 @@ class ServerAPI(
             )
 
     def validate_token(self) -> bool:
-        if self._token_info.token is None:
-            self._token_info.is_valid = False
-            self._token_info.unauthorized_response = None
+        with self._token_lock:
+            return self._validate_token()
+
+    def _validate_token(self) -> bool:
+        token = self._token_info.token
+        if token is None:
+            self._token_info = TokenInfo(is_valid=False)
             self.close_session()
             return False
 
@@ -783,31 +1711,33 @@ class ServerAPI(
 
         user_info = get_user_info_by_token(
             self.base_url,
-            self._token_info.token,
+            token,
             verify=self._ssl_verify,
             cert=self._cert,
             timeout=self.timeout,
         )
-        self._token_info.is_valid = user_info.is_valid
-        self._token_info.unauthorized_response = user_info.response
         is_service = None
         if user_info.is_valid:
             is_service = user_info.is_service
-        self._token_info.is_service = is_service
-
-        return self._token_info.is_valid
+        # Replace whole object so other threads never see partial state
+        self._token_info = TokenInfo(
+            token=token,
+            is_valid=user_info.is_valid,
+            is_service=is_service,
+            unauthorized_response=user_info.response,
+        )
+        return user_info.is_valid
 
     def set_token(self, token: Optional[str]):
-        self.reset_token()
-        self._token_info.token = token
-        self.validate_token()
+        with self._token_lock:
+            self.reset_token()
+            self._token_info = TokenInfo(token=token)
+            self._validate_token()
 
     def reset_token(self):
-        self._token_info.token = None
-        self._token_info.is_service = None
-        self._token_info.is_valid = None
-        self._token_info.unauthorized_response = None
-        self.close_session()
+        with self._token_lock:
+            self._token_info = TokenInfo()
+            self.close_session()
 
     def create_session(
         self, ignore_existing: bool = True, force: bool = False
@@ -824,10 +1754,10 @@ class ServerAPI(
                 create new.
 
         """
-        if force and self._session is not None:
+        if force and self._session_pool is not None:
             self.close_session()
 
-        if self._session is not None:
+        if self._session_pool is not None:
             if ignore_existing:
                 return
             raise ValueError("Session is already created.")
@@ -836,45 +1766,149 @@ class ServerAPI(
         # Validate token before session creation
         self.validate_token()
 
-        session = requests.Session()
-        session.cert = self._cert
-        session.verify = self._ssl_verify
-        session.headers.update(self.get_headers())
-
-        self._session_functions_mapping = {
-            RequestTypes.get: session.get,
-            RequestTypes.post: session.post,
-            RequestTypes.put: session.put,
-            RequestTypes.patch: session.patch,
-            RequestTypes.delete: session.delete
-        }
-        self._session = session
+        self._session_pool = _SessionPool(
+            self._get_session_headers(),
+            cert=self._cert,
+            verify=self._ssl_verify,
+            pool_size=self._pool_size,
+            pool_block=self._pool_block,
+            socket_options=get_socket_options(self._tcp_keepalive),
+        )
 
     def close_session(self):
-        if self._session is None:
+        session_pool = self._session_pool
+        if session_pool is None:
             return
 
-        session = self._session
-        self._session = None
-        self._session_functions_mapping = {}
-        session.close()
+        self._session_pool = None
+        session_pool.close()
+
+    def get_connection_pool_info(self) -> dict[str, Any]:
+        """Information about pooled connections to server.
+
+        Can be used to find out if connection pool is saturated, e.g. when
+            connection is used from more threads than is size of the pool.
+
+        Returns:
+            dict[str, Any]: Pool size, block mode and state of pool of each
+                host. Hosts are empty if session is not created.
+
+        """
+        session_pool = self._session_pool
+        if session_pool is not None:
+            return session_pool.get_info()
+        return {
+            "pool_size": self._pool_size,
+            "pool_block": self._pool_block,
+            "hosts": [],
+        }
+
+    def get_metrics(self) -> ClientMetrics:
+        """Metrics and request hooks of the connection.
+
+        Metrics can be exported in Prometheus text format or as flat samples
+            for other exporters.
+
+        Returns:
+            ClientMetrics: Metrics of the connection.
+
+        """
+        return self._metrics
+
+    @contextmanager
+    def profile_queries(self):
+        """Record profiles of GraphQl queries executed in the context.
+
+        Queries from all threads using the connection are recorded. Each
+            profile contains name of query, call site which started it,
+            size of compiled query, pages with their latency, parse time
+            and number of edges, and paths of nested edge fields which
+            needed follow-up queries.
+
+        Example:
+            >>> with con.profile_queries() as profiler:
+            ...     folders = list(con.get_folders(project_name))
+            >>> print(profiler.to_json(indent=4))
+
+        Returns:
+            Generator[QueryProfiler, None, None]: Profiler with recorded
+                queries, available also after the context ends.
+
+        """
+        profiler = QueryProfiler()
+        self._metrics.add_query_profiler(profiler)
+        try:
+            yield profiler
+        finally:
+            self._metrics.remove_query_profiler(profiler)
+
+    def _collect_pool_metrics(self, metrics: ClientMetrics):
+        for host_info in self.get_connection_pool_info()["hosts"]:
+            labels = {"url": host_info["url"]}
+            for key in ("max_size", "in_use", "idle", "saturation"):
+                metrics.set_gauge(
+                    f"connection_pool_{key}", host_info[key], labels
+                )
+
+    def _collect_circuit_metrics(self, metrics: ClientMetrics):
+        breaker_state = self._circuit_breaker.get_state()
+        metrics.set_gauge(
+            "circuit_breaker_open",
+            int(breaker_state["state"] != "closed"),
+        )
+        metrics.set_gauge(
+            "circuit_breaker_failures", breaker_state["failures"]
+        )
+
+    def _get_transport_function(
+        self,
+        request_type: RequestType,
+        kwargs: dict[str, Any],
+    ) -> Optional[typing.Callable[..., requests.Response]]:
+        """Request function of custom transport.
+
+        Transport does not have session state, so all connection headers,
+            cert and ssl verification are added to request kwargs. Headers
+            explicitly passed to request have priority.
+
+        Returns:
+            Optional[Callable[..., requests.Response]]: Function sending
+                request or 'None' if transport is not set.
+
+        """
+        transport = self._transport
+        if transport is None:
+            return None
+
+        headers = requests.structures.CaseInsensitiveDict(self.get_headers())
+        headers.update(kwargs.get("headers") or {})
+        kwargs["headers"] = dict(headers.items())
+        kwargs.setdefault("verify", self._ssl_verify)
+        kwargs.setdefault("cert", self._cert)
+        return functools.partial(transport.request, request_type.name)
+
+    def _get_session(self) -> Optional[requests.Session]:
+        """Session of current thread.
+
+        Returns:
+            Optional[requests.Session]: Session or None if session
+                was not created.
+
+        """
+        session_pool = self._session_pool
+        if session_pool is None:
+            return None
+        return session_pool.get_session()
 
     def _update_session_headers(self):
-        if self._session is None:
+        if self._session_pool is None:
             return
 
         # Header keys that may change over time
-        for key, value in (
-            ("X-as-user", self._as_user_stack.username),
-            ("x-ayon-version", self._client_version),
-            ("x-ayon-site-id", self._site_id),
-            ("x-sender-type", self._sender_type),
-            ("x-sender", self._sender),
-        ):
-            if value is not None:
-                self._session.headers[key] = value
-            elif key in self._session.headers:
-                self._session.headers.pop(key)
+        self._session_pool.update_headers({
+            "x-ayon-version": self._client_version,
+            "x-ayon-site-id": self._site_id,
+        })
 
     def get_info(self) -> dict[str, Any]:
         """Get information about current used api key.
@@ -1038,17 +2072,17 @@ class ServerAPI(
             for user in parsed_data["users"]:
                 access_groups = user.get("accessGroups")
                 if isinstance(access_groups, str):
-                    user["accessGroups"] = json.loads(access_groups)
+                    user["accessGroups"] = json_loads(access_groups)
 
                 attrib = user.get("allAttrib")
                 if isinstance(attrib, str):
-                    attrib = json.loads(attrib)
+                    attrib = json_loads(attrib)
 
                 if attrib is not None:
                     own_attrib = copy.deepcopy(attrib)
                     user["ownAttrib"] = own_attrib
-                    for name, attr_data in attributes.items():
-                        attrib.setdefault(name, attr_data["default"])
+                    fill_attrib_defaults(attrib, attributes)
+                    for name in attributes:
                         own_attrib.setdefault(name, None)
 
                     user["attrib"] = attrib
@@ -1112,9 +2146,9 @@ class ServerAPI(
             response.raise_for_status()
             user = response.data
 
-        attributes = self.get_attributes_for_type("user")
-        for attr_name, attr_data in attributes.items():
-            user["attrib"].setdefault(attr_name, attr_data["default"])
+        fill_attrib_defaults(
+            user["attrib"], self.get_attributes_for_type("user")
+        )
 
         fill_own_attribs(user)
         return user
@@ -1122,6 +2156,14 @@ class ServerAPI(
     def get_headers(
         self, content_type: Optional[str] = None
     ) -> dict[str, str]:
+        headers = self._get_session_headers(content_type)
+        headers.update(self._get_context_headers())
+        return headers
+
+    def _get_session_headers(
+        self, content_type: Optional[str] = None
+    ) -> dict[str, str]:
+        """Headers shared by all threads using the connection."""
         if content_type is None:
             content_type = "application/json"
 
@@ -1134,24 +2176,57 @@ class ServerAPI(
         if self._site_id is not None:
             headers["x-ayon-site-id"] = self._site_id
 
-        if self._client_version is not None:
-            headers["x-ayon-version"] = self._client_version
+        if self._client_version is not None:
+            headers["x-ayon-version"] = self._client_version
+
+        if self._token_info.token and self._token_info.is_valid is not False:
+            if self._token_info.is_service:
+                headers["X-Api-Key"] = self._token_info.token
+            else:
+                headers["Authorization"] = f"Bearer {self._token_info.token}"
+        return headers
+
+    def _get_context_headers(self) -> dict[str, str]:
+        """Headers that may differ per thread or asyncio task.
+
+        Contains sender, sender type and username used by service API key.
+
+        """
+        headers = {}
+        context_headers = self._context_headers.get()
+        for key, value in (
+            (
+                "x-sender-type",
+                context_headers.get("x-sender-type", self._sender_type)
+            ),
+            ("x-sender", context_headers.get("x-sender", self._sender)),
+        ):
+            if value is not None:
+                headers[key] = value
+
+        if (
+            self._token_info.token
+            and self._token_info.is_valid is not False
+            and self._token_info.is_service
+        ):
+            username = self._as_user_stack.username
+            if username:
+                headers["X-as-user"] = username
+        return headers
 
-        if self._sender_type is not None:
-            headers["x-sender-type"] = self._sender_type
+    def _add_context_headers(self, kwargs: dict[str, Any]) -> None:
+        """Add context headers to request kwargs when session is used.
 
-        if self._sender is not None:
-            headers["x-sender"] = self._sender
+        Headers explicitly passed to request have priority.
 
-        if self._token_info.token and self._token_info.is_valid is not False:
-            if self._token_info.is_service:
-                headers["X-Api-Key"] = self._token_info.token
-                username = self._as_user_stack.username
-                if username:
-                    headers["X-as-user"] = username
-            else:
-                headers["Authorization"] = f"Bearer {self._token_info.token}"
-        return headers
+        """
+        context_headers = self._get_context_headers()
+        if not context_headers:
+            return
+        headers = kwargs.get("headers")
+        if headers:
+            context_headers.update(headers)
+        kwargs["headers"] = context_headers
 
     def login(
         self, username: str, password: str, create_session: bool = True
@@ -1201,11 +2276,15 @@ class ServerAPI(
 
             raise AuthenticationError(f"Login failed {details}")
 
-        self._token_info.token = response["token"]
-        # Should be valid if was just logged in
-        self._token_info.is_valid = True
-        # Service token can't be obtained by login, so it is not service token
-        self._token_info.is_service = False
+        with self._token_lock:
+            self._token_info = TokenInfo(
+                token=response["token"],
+                # Should be valid if was just logged in
+                is_valid=True,
+                # Service token can't be obtained by login, so it is not
+                #   service token
+                is_service=False,
+            )
 
         if not self.has_valid_token:
             raise AuthenticationError("Invalid credentials")
@@ -1509,18 +2588,25 @@ class ServerAPI(
         url: str,
         *,
         handle_invalid_token: bool = True,
+        idempotent: Optional[bool] = None,
+        compressible: bool = False,
         **kwargs
     ):
         kwargs.setdefault("timeout", self.timeout)
-        max_retries = kwargs.get("max_retries", self.max_retries)
+        max_retries = kwargs.pop("max_retries", self.max_retries)
         if max_retries < 1:
             max_retries = 1
+        if isinstance(function, RequestType):
+            method = function.name
+        else:
+            method = getattr(function, "__name__", "")
 
         if handle_invalid_token and self._token_info.is_valid is False:
             # Return a fake error response if the token is known to be invalid.
             # Added to prevent DDOS attack on server when many requests
             #   with invalid token are send. It is better to return error
             #   immediately without trying to send a request to server.
+            self._metrics.record_short_circuit(method, url)
             if self._token_info.unauthorized_response is not None:
                 return RestApiResponse(self._token_info.unauthorized_response)
 
@@ -1531,51 +2617,221 @@ class ServerAPI(
             new_response.status = 401
             return new_response
 
-        if self._session is None:
+        self._circuit_breaker.before_request(url)
+
+        invalidate_caches = method.upper() != "GET" and (
+            self._entity_cache is not None
+            or self._hierarchy_store is not None
+            or bool(self._folder_path_indexes)
+        )
+        cache_body = kwargs.get("json") if invalidate_caches else None
+
+        # Encode json body with package codec instead of 'requests'
+        if kwargs.get("json") is not None and kwargs.get("data") is None:
+            kwargs["data"] = json_dumps_bytes(kwargs.pop("json"))
+            headers = kwargs.get("headers")
+            if headers and not any(
+                key.lower() == "content-type"
+                for key in headers
+            ):
+                # Don't change headers passed by caller
+                headers = dict(headers)
+                headers["Content-Type"] = "application/json"
+                kwargs["headers"] = headers
+
+        single_flight_key = self._get_single_flight_key(
+            method, url, idempotent, kwargs
+        )
+        if single_flight_key is None:
+            try:
+                return self._send_rest_request(
+                    function,
+                    url,
+                    method,
+                    handle_invalid_token,
+                    idempotent,
+                    max_retries,
+                    compressible,
+                    kwargs,
+                )
+            finally:
+                # Request may change entities even if it failed
+                if invalidate_caches:
+                    self._invalidate_local_caches(
+                        method.upper(), url, cache_body
+                    )
+
+        response, shared = self._single_flight.do(
+            single_flight_key,
+            lambda: self._send_rest_request(
+                function,
+                url,
+                method,
+                handle_invalid_token,
+                idempotent,
+                max_retries,
+                compressible,
+                kwargs,
+            )
+        )
+        if not shared:
+            return response
+        self._metrics.inc(
+            "single_flight_shared_total",
+            labels={"method": method, "endpoint": normalize_endpoint(url)},
+        )
+        return _copy_rest_response(response)
+
+    def _invalidate_local_caches(
+        self, method: str, url: str, body: Any
+    ) -> None:
+        changes = _get_entity_changes(method, url, body)
+        if changes is None:
+            return
+
+        project_name, changed_entities = changes
+        entity_cache = self._entity_cache
+        if entity_cache is not None:
+            entity_cache.invalidate_changes(project_name, changed_entities)
+
+        hierarchy_store = self._hierarchy_store
+        if hierarchy_store is not None:
+            hierarchy_store.invalidate(
+                self._base_url,
+                project_name,
+                reconcile=changed_entities is None,
+            )
+
+        if changed_entities is None or any(
+            entity_type == "folder"
+            for entity_type, _ in changed_entities
+        ):
+            self.reset_folder_path_index(project_name)
+
+    def _get_single_flight_key(
+        self,
+        method: str,
+        url: str,
+        idempotent: Optional[bool],
+        kwargs: dict[str, Any],
+    ) -> Optional[tuple]:
+        """Key of request used to share in-flight requests.
+
+        Only GET requests and read-only GraphQl queries are shared.
+
+        Returns:
+            Optional[tuple]: Key or 'None' if request should not be shared.
+
+        """
+        if self._single_flight is None or kwargs.get("stream"):
+            return None
+
+        if method != "GET" and not (
+            method == "POST"
+            and idempotent
+            and url == self._graphql_url
+        ):
+            return None
+
+        data = kwargs.get("data")
+        if data is not None and not isinstance(data, (bytes, str)):
+            return None
+
+        params = kwargs.get("params")
+        if isinstance(params, dict):
+            params = tuple(sorted(params.items()))
+        headers = kwargs.get("headers") or {}
+        key = (
+            method,
+            url,
+            params,
+            data,
+            tuple(sorted(headers.items())),
+            # Impersonated user and sender
+            tuple(sorted(self._get_context_headers().items())),
+            self._token_info.token,
+            kwargs.get("timeout"),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            # Unhashable values in params
+            return None
+        return key
+
+    def _send_rest_request(
+        self,
+        function: Any,
+        url: str,
+        method: str,
+        handle_invalid_token: bool,
+        idempotent: Optional[bool],
+        max_retries: int,
+        compressible: bool,
+        kwargs: dict[str, Any],
+    ):
+        circuit_breaker = self._circuit_breaker
+        session = self._get_session()
+        use_transport = (
+            self._transport is not None
+            and isinstance(function, RequestType)
+        )
+        if session is None or use_transport:
             # Validate token if was not yet validated
             if (
                 handle_invalid_token
                 and self._token_info.is_valid is None
             ):
-                self.validate_token()
+                with self._token_lock:
+                    # Other thread might validate token in the meantime
+                    if self._token_info.is_valid is None:
+                        self._validate_token()
+
+        if use_transport:
+            function = self._get_transport_function(function, kwargs)
 
+        elif session is None:
             if "headers" not in kwargs:
                 kwargs["headers"] = self.get_headers()
 
             if isinstance(function, RequestType):
                 function = self._base_functions_mapping[function]
 
-        elif isinstance(function, RequestType):
-            function = self._session_functions_mapping[function]
+        else:
+            self._add_context_headers(kwargs)
+            if isinstance(function, RequestType):
+                function = getattr(session, function.name.lower())
 
+        retry_state = self._retry_policy.start(
+            method, max_retries, idempotent
+        )
+        request_info = self._metrics.request_started(
+            method, url, kwargs.get("data")
+        )
+        if compressible:
+            self._compress_request_body(kwargs, request_info)
         response = None
-        new_response = None
-        for retry_idx in reversed(range(max_retries)):
+        while True:
+            new_response = None
+            exc = None
             try:
                 response = function(url, **kwargs)
-
+                circuit_breaker.record_response(response.status_code)
                 # Usually these mean, try later.
+                # 429: too many requests
                 # 502: returned by the proxy: nginx
                 # 503: returned by the server: if no capacity
-                if response.status_code in {502, 503}:
-                    new_response = RestApiResponse(response)
-                    self.log.warning(
-                        "Server returned %s status code."
-                        " Retrying with longer delay...",
-                        response.status_code
-                    )
-                    if retry_idx != 0:
-                        time.sleep(2)
-                    continue
-                break
+                if not retry_state.is_retry_response(response):
+                    break
 
-            except ConnectionRefusedError:
-                if retry_idx == 0:
-                    self.log.warning(
-                        "AYON api error: Connection error happened.",
-                        exc_info=True,
-                    )
+                new_response = RestApiResponse(response)
+                self.log.warning(
+                    "Server returned %s status code.",
+                    response.status_code
+                )
 
+            except ConnectionRefusedError as _exc:
+                exc = _exc
                 # Server may be restarting
                 new_response = RestApiResponse(
                     None,
@@ -1587,21 +2843,16 @@ class ServerAPI(
                     }
                 )
 
-            except requests.exceptions.Timeout:
+            except requests.exceptions.Timeout as _exc:
+                exc = _exc
                 # Connection timed out
                 new_response = RestApiResponse(
                     None,
                     {"detail": "AYON api error: Connection timed out."}
                 )
 
-            except requests.exceptions.ConnectionError:
-                # Log warning only on last attempt
-                if retry_idx == 0:
-                    self.log.warning(
-                        "AYON api error: Connection error happened.",
-                        exc_info=True
-                    )
-
+            except requests.exceptions.ConnectionError as _exc:
+                exc = _exc
                 new_response = RestApiResponse(
                     None,
                     {
@@ -1612,8 +2863,50 @@ class ServerAPI(
                     }
                 )
 
-            if retry_idx != 0:
-                time.sleep(0.1)
+            if exc is not None:
+                circuit_breaker.record_failure(new_response.detail)
+
+            # Don't retry when other requests already found out that
+            #   server is unavailable
+            if (
+                not circuit_breaker.is_open
+                and retry_state.wait(response=response, exc=exc)
+            ):
+                response = None
+                continue
+
+            # Log warning only on last attempt
+            if exc is not None and not isinstance(
+                exc, requests.exceptions.Timeout
+            ):
+                self.log.warning(
+                    "AYON api error: Connection error happened.",
+                    exc_info=exc,
+                )
+            break
+
+        if response is None:
+            self._metrics.request_finished(
+                request_info,
+                None,
+                0,
+                retry_state.attempt + 1,
+                error=new_response.detail,
+            )
+        else:
+            bytes_received = wire_bytes_received = 0
+            if not kwargs.get("stream"):
+                bytes_received = len(response.content)
+                wire_bytes_received = _get_response_wire_size(
+                    response, bytes_received
+                )
+            self._metrics.request_finished(
+                request_info,
+                response.status_code,
+                bytes_received,
+                retry_state.attempt + 1,
+                wire_bytes_received=wire_bytes_received,
+            )
 
         if new_response is not None:
             return new_response
@@ -1624,13 +2917,71 @@ class ServerAPI(
             and new_response.status_code == 401
             and self._token_info.is_valid
         ):
-            self._token_info.is_valid = False
-            self._token_info.unauthorized_response = response
-            self.close_session()
+            with self._token_lock:
+                self._token_info = TokenInfo(
+                    token=self._token_info.token,
+                    is_valid=False,
+                    is_service=self._token_info.is_service,
+                    unauthorized_response=response,
+                )
+                self.close_session()
 
         self.log.debug(f"Response {str(new_response)}")
         return new_response
 
+    def _compress_request_body(
+        self, kwargs: dict[str, Any], request_info: RequestInfo
+    ):
+        """Compress request body using gzip if it is big enough."""
+        min_size = self._request_compression_min_size
+        data = kwargs.get("data")
+        if (
+            not min_size
+            or not isinstance(data, (bytes, str))
+            or len(data) < min_size
+        ):
+            return
+
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        # Faster than default level, repetitive json compresses well anyway
+        data = gzip.compress(data, compresslevel=5)
+        headers = kwargs.get("headers")
+        if headers is None:
+            kwargs["headers"] = headers = {}
+        headers["Content-Encoding"] = "gzip"
+        kwargs["data"] = data
+        request_info.wire_bytes_sent = len(data)
+
+    def _finish_transfer(
+        self,
+        direction: str,
+        request_info: RequestInfo,
+        progress: TransferProgress,
+        retry_state: RetryState,
+        response: Optional[requests.Response],
+        error: Optional[BaseException] = None,
+    ):
+        self._circuit_breaker.record_response(
+            response.status_code if response is not None else None
+        )
+        size = progress.get_transferred_size()
+        bytes_received = size
+        if direction == "upload":
+            request_info.bytes_sent = size
+            bytes_received = 0
+
+        self._metrics.request_finished(
+            request_info,
+            response.status_code if response is not None else None,
+            bytes_received,
+            retry_state.attempt + 1,
+            error=str(error) if error is not None else None,
+        )
+        self._metrics.record_transfer(
+            direction, request_info.url, size, request_info.duration
+        )
+
     def _download_file_to_stream(
         self,
         endpoint: str,
@@ -1643,57 +2994,95 @@ class ServerAPI(
             "stream": True,
             "headers": headers,
         }
-        if self._session is None:
+        session = self._get_session()
+        get_func = self._get_transport_function(RequestTypes.get, kwargs)
+        if get_func is not None:
+            # Transport headers are a copy, 'Range' is set on them
+            headers = kwargs["headers"]
+        elif session is None:
             get_func = self._base_functions_mapping[RequestTypes.get]
         else:
-            get_func = self._session_functions_mapping[RequestTypes.get]
+            get_func = session.get
 
         url = self._endpoint_to_url(endpoint, use_rest=False)
         progress.set_source_url(url)
+        self._circuit_breaker.before_request(url)
 
-        retries = self.get_default_max_retries()
+        request_info = self._metrics.request_started("GET", url)
+        retry_state = self._retry_policy.start(
+            RequestTypes.get, self.get_default_max_retries()
+        )
+        response = None
+        error = None
         api_prepended = False
-        for attempt in range(retries):
-            # Continue in download
-            offset = progress.get_transferred_size()
-            if offset > 0:
-                headers["Range"] = f"bytes={offset}-"
+        try:
+            while True:
+                # Continue in download
+                offset = progress.get_transferred_size()
+                if offset > 0:
+                    headers["Range"] = f"bytes={offset}-"
+
+                response = None
+                try:
+                    with get_func(url, **kwargs) as response:
+                        # Auto-fix missing 'api/'
+                        if (
+                            response.status_code in (404, 405)
+                            and not api_prepended
+                        ):
+                            api_prepended = True
+                            if (
+                                not endpoint.startswith(self._base_url)
+                                and not endpoint.startswith("api/")
+                            ):
+                                url = self._endpoint_to_url(
+                                    endpoint, use_rest=True
+                                )
+                                progress.set_destination_url(url)
+                                continue
 
-            try:
-                with get_func(url, **kwargs) as response:
-                    # Auto-fix missing 'api/'
-                    if (
-                        response.status_code in (404, 405)
-                        and not api_prepended
-                    ):
-                        api_prepended = True
                         if (
-                            not endpoint.startswith(self._base_url)
-                            and not endpoint.startswith("api/")
+                            retry_state.is_retry_response(response)
+                            and retry_state.wait(response=response)
                         ):
-                            url = self._endpoint_to_url(
-                                endpoint, use_rest=True
-                            )
-                            progress.set_destination_url(url)
+                            progress.next_attempt()
                             continue
-                    response.raise_for_status()
-                    if progress.get_content_size() is None:
-                        progress.set_content_size(
-                            response.headers["Content-length"]
-                        )
+                        response.raise_for_status()
+                        if progress.get_content_size() is None:
+                            progress.set_content_size(
+                                response.headers["Content-length"]
+                            )
 
-                    for chunk in response.iter_content(chunk_size=chunk_size):
-                        stream.write(chunk)
-                        progress.add_transferred_chunk(len(chunk))
-                break
+                        for chunk in response.iter_content(
+                            chunk_size=chunk_size
+                        ):
+                            stream.write(chunk)
+                            progress.add_transferred_chunk(len(chunk))
+                    break
+
+                except (
+                    requests.exceptions.Timeout,
+                    requests.exceptions.ConnectionError,
+                ) as exc:
+                    # Server did not respond
+                    response = None
+                    if not retry_state.wait(exc=exc):
+                        raise
+                    progress.next_attempt()
+
+        except BaseException as exc:
+            error = exc
+            raise
 
-            except (
-                requests.exceptions.Timeout,
-                requests.exceptions.ConnectionError,
-            ):
-                if attempt == retries - 1:
-                    raise
-                progress.next_attempt()
+        finally:
+            self._finish_transfer(
+                "download",
+                request_info,
+                progress,
+                retry_state,
+                response,
+                error,
+            )
 
         if api_prepended:
             self.log.warning(
@@ -2022,6 +3411,7 @@ class ServerAPI(
         *,
         content_type: Optional[str] = None,
         filename: Optional[str] = None,
+        idempotent: Optional[bool] = None,
         **kwargs
     ) -> requests.Response:
         """Upload file to server.
@@ -2035,6 +3425,9 @@ class ServerAPI(
                 be used. Default is PUT.
             chunk_size (Optional[int]): Size of chunks that are uploaded
                 at once.
+            idempotent (Optional[bool]): Upload can be safely sent again
+                on failure. Decided by request type if not passed, POST
+                uploads which create new entities are not repeated.
             **kwargs (Any): Additional arguments that will be passed
                 to request function.
 
@@ -2048,21 +3441,30 @@ class ServerAPI(
         endpoint = endpoint.lstrip("/")
         url = self._endpoint_to_url(endpoint, use_rest=False)
         progress.set_destination_url(url)
+        self._circuit_breaker.before_request(url)
 
         headers = kwargs.get("headers")
         if headers is None:
             kwargs["headers"] = headers = {}
 
         headers_keys_by_low_key = {key.lower(): key for key in headers}
-        if self._session is None:
-            for key, value in self.get_headers().items():
-                orig_key = headers_keys_by_low_key.get(key)
-                if not orig_key:
-                    headers[key] = value
-
+        session = self._get_session()
+        post_func = self._get_transport_function(request_type, kwargs)
+        if post_func is not None:
+            default_headers = {}
+            headers = kwargs["headers"]
+            headers_keys_by_low_key = {key.lower(): key for key in headers}
+        elif session is None:
+            default_headers = self.get_headers()
             post_func = self._base_functions_mapping[request_type]
         else:
-            post_func = self._session_functions_mapping[request_type]
+            default_headers = self._get_context_headers()
+            post_func = getattr(session, request_type.name.lower())
+
+        for key, value in default_headers.items():
+            orig_key = headers_keys_by_low_key.get(key.lower())
+            if not orig_key:
+                headers[key] = value
 
         if not chunk_size:
             chunk_size = self.default_upload_chunk_size
@@ -2078,7 +3480,9 @@ class ServerAPI(
                 headers.pop(orig_key)
             headers[key] = value
 
-        retries = self.get_default_max_retries()
+        retry_state = self._retry_policy.start(
+            request_type, self.get_default_max_retries(), idempotent
+        )
         response = None
 
         # Get size of file
@@ -2087,36 +3491,71 @@ class ServerAPI(
         # Set content size to progress object
         progress.set_content_size(size)
 
+        request_info = self._metrics.request_started(
+            request_type.name, url
+        )
+        error = None
         api_prepended = False
-        for attempt in range(retries):
-            try:
-                response = post_func(
-                    url,
-                    data=self._upload_chunks_iter(
-                        stream, progress, chunk_size
-                    ),
-                    **kwargs
-                )
-                # Auto-fix missing 'api/'
-                if response.status_code in (404, 405) and not api_prepended:
-                    api_prepended = True
+        try:
+            while True:
+                response = None
+                try:
+                    response = post_func(
+                        url,
+                        data=self._upload_chunks_iter(
+                            stream, progress, chunk_size
+                        ),
+                        **kwargs
+                    )
+                    # Auto-fix missing 'api/'
+                    if (
+                        response.status_code in (404, 405)
+                        and not api_prepended
+                    ):
+                        api_prepended = True
+                        if (
+                            not endpoint.startswith(self._base_url)
+                            and not endpoint.startswith("api/")
+                        ):
+                            url = self._endpoint_to_url(
+                                endpoint, use_rest=True
+                            )
+                            progress.set_destination_url(url)
+                            continue
+
                     if (
-                        not endpoint.startswith(self._base_url)
-                        and not endpoint.startswith("api/")
+                        retry_state.is_retry_response(response)
+                        and retry_state.wait(response=response)
                     ):
-                        url = self._endpoint_to_url(endpoint, use_rest=True)
-                        progress.set_destination_url(url)
+                        progress.next_attempt()
+                        progress.reset_transferred()
                         continue
-                break
+                    break
+
+                except (
+                    requests.exceptions.Timeout,
+                    requests.exceptions.ConnectionError,
+                ) as exc:
+                    # Server did not respond
+                    response = None
+                    if not retry_state.wait(exc=exc):
+                        raise
+                    progress.next_attempt()
+                    progress.reset_transferred()
+
+        except BaseException as exc:
+            error = exc
+            raise
 
-            except (
-                requests.exceptions.Timeout,
-                requests.exceptions.ConnectionError,
-            ):
-                if attempt == retries - 1:
-                    raise
-                progress.next_attempt()
-                progress.reset_transferred()
+        finally:
+            self._finish_transfer(
+                "upload",
+                request_info,
+                progress,
+                retry_state,
+                response,
+                error,
+            )
 
         response.raise_for_status()
         if api_prepended:
@@ -2135,6 +3574,7 @@ class ServerAPI(
         *,
         content_type: Optional[str] = None,
         filename: Optional[str] = None,
+        idempotent: Optional[bool] = None,
         **kwargs
     ) -> requests.Response:
         """Upload file to server from bytes.
@@ -2152,6 +3592,9 @@ class ServerAPI(
                 be used to upload file.
             content_type (Optional[str]): MIME type of the file.
             filename (Optional[str]): Filename of file on server.
+            idempotent (Optional[bool]): Upload can be safely sent again
+                on failure. Decided by request type if not passed, POST
+                uploads which create new entities are not repeated.
             **kwargs (Any): Additional arguments that will be passed
                 to request function.
 
@@ -2174,6 +3617,7 @@ class ServerAPI(
                 request_type,
                 content_type=content_type,
                 filename=filename,
+                idempotent=idempotent,
                 **kwargs
             )
 
@@ -2193,6 +3637,7 @@ class ServerAPI(
         *,
         content_type: Optional[str] = None,
         filename: Optional[str] = None,
+        idempotent: Optional[bool] = None,
         **kwargs
     ) -> requests.Response:
         """Upload file to server.
@@ -2210,6 +3655,9 @@ class ServerAPI(
                 be used to upload file.
             content_type (Optional[str]): MIME type of the file.
             filename (Optional[str]): Filename of file on server.
+            idempotent (Optional[bool]): Upload can be safely sent again
+                on failure. Decided by request type if not passed, POST
+                uploads which create new entities are not repeated.
             **kwargs (Any): Additional arguments that will be passed
                 to request function.
 
@@ -2230,6 +3678,7 @@ class ServerAPI(
                 request_type,
                 content_type=content_type,
                 filename=filename,
+                idempotent=idempotent,
                 **kwargs
             )
 
@@ -2316,14 +3765,140 @@ class ServerAPI(
             GraphQlResponse: Response from server.
 
         """
+        self._metrics.record_graphql_page(query)
+        response = self._send_graphql_request(query, variables)
+        response.raise_for_status()
+        return GraphQlResponse(response)
+
+    def query_graphql_stream(
+        self,
+        query: str,
+        variables: Optional[dict[str, Any]] = None,
+        chunk_size: int = 65536,
+    ) -> Generator[bytes, None, None]:
+        """Execute GraphQl query and yield raw response as it is received.
+
+        Response is not loaded to memory at once, which allows to parse
+            the response incrementally (e.g. using 'ijson').
+
+        Args:
+            query (str): GraphQl query string.
+            variables (Optional[dict[str, Any]): Variables that can be
+                used in query.
+            chunk_size (int): Maximum size of yielded chunk in bytes.
+
+        Returns:
+            Generator[bytes, None, None]: Chunks of JSON response.
+
+        """
+        self._metrics.record_graphql_page(query)
+        response = self._send_graphql_request(query, variables, stream=True)
+        response.raise_for_status()
+        orig_response = response.orig_response
+        try:
+            yield from orig_response.iter_content(chunk_size=chunk_size)
+        finally:
+            orig_response.close()
+
+    def _send_graphql_request(
+        self,
+        query: str,
+        variables: Optional[dict[str, Any]],
+        stream: bool = False,
+    ) -> RestApiResponse:
+        # Queries don't change data on server
+        idempotent = not query.lstrip().startswith("mutation")
         data = {"query": query, "variables": variables or {}}
+        persisted_queries = self._persisted_queries
+        if (
+            persisted_queries is None
+            or not persisted_queries.supported
+            or not idempotent
+        ):
+            return self._do_rest_request(
+                RequestTypes.post,
+                self._graphql_url,
+                idempotent=idempotent,
+                stream=stream,
+                json=data
+            )
+
+        query_hash = _get_query_hash(query)
+        data["extensions"] = {
+            "persistedQuery": {"version": 1, "sha256Hash": query_hash}
+        }
+        hash_failed = False
+        if persisted_queries.is_registered(query_hash):
+            response = self._do_rest_request(
+                RequestTypes.post,
+                self._graphql_url,
+                idempotent=True,
+                stream=stream,
+                json={
+                    key: value
+                    for key, value in data.items()
+                    if key != "query"
+                }
+            )
+            errors = _get_graphql_errors(response, stream)
+            if response.ok and not errors:
+                return response
+
+            # Send the query again with full text
+            persisted_queries.unregister(query_hash)
+            if stream and response.orig_response is not None:
+                response.orig_response.close()
+            # Server which ignores 'extensions' fails because query text
+            #   is missing, it is confirmed if the full text does not fail
+            hash_failed = (
+                _get_persisted_query_error(errors) is None
+                and response.status < 500
+            )
+
         response = self._do_rest_request(
             RequestTypes.post,
             self._graphql_url,
+            idempotent=True,
+            stream=stream,
             json=data
         )
-        response.raise_for_status()
-        return GraphQlResponse(response)
+        errors = _get_graphql_errors(response, stream)
+        error = _get_persisted_query_error(errors)
+        if error == "PERSISTED_QUERY_NOT_SUPPORTED":
+            persisted_queries.supported = False
+            data.pop("extensions")
+            return self._do_rest_request(
+                RequestTypes.post,
+                self._graphql_url,
+                idempotent=True,
+                stream=stream,
+                json=data
+            )
+
+        if not errors and response.ok:
+            if hash_failed:
+                persisted_queries.supported = False
+            else:
+                persisted_queries.register(query_hash)
+        return response
+
+    def graphql_batch(self) -> GraphQlBatch:
+        """Query first pages of multiple GraphQl queries in single request.
+
+        Next pages of queries are queried separately once the batch is
+            sent.
+
+        Example:
+            >>> with con.graphql_batch() as batch:
+            ...     batch.add_query(folders_query)
+            ...     batch.add_query(tasks_query)
+            >>> output = batch.get_output(folders_query)
+
+        Returns:
+            GraphQlBatch: Batch of queries sent on exit of context.
+
+        """
+        return GraphQlBatch(self)
 
     def get_graphql_schema(self) -> dict[str, Any]:
         return self.query_graphql(INTROSPECTION_QUERY).data["data"]
@@ -2540,10 +4115,10 @@ class ServerAPI(
 
         """
         operations_body = self._prepare_operations_body(operations)
-        response = self.post(
+        response = self.raw_post(
             f"projects/{project_name}/operations/background",
-            operations=operations_body,
-            canFail=can_fail
+            json={"operations": operations_body, "canFail": can_fail},
+            compressible=True,
         )
         response.raise_for_status()
         if not wait:
@@ -2598,9 +4173,9 @@ class ServerAPI(
                 operation["id"] = op_id
 
             try:
-                body = json.loads(
-                    json.dumps(operation, default=entity_data_json_default)
-                )
+                body = json_loads(json_dumps_bytes(
+                    operation, default=entity_data_json_default
+                ))
             except (TypeError, ValueError):
                 raise ValueError("Couldn't json parse body: {}".format(
                     json.dumps(
@@ -2625,10 +4200,10 @@ class ServerAPI(
         if not operations_body:
             return []
 
-        response = self.post(
+        response = self.raw_post(
             uri,
-            operations=operations_body,
-            canFail=can_fail
+            json={"operations": operations_body, "canFail": can_fail},
+            compressible=True,
         )
 
         op_results = response.get("operations")
@@ -2752,9 +4327,96 @@ class ServerAPI(
             return None
 
         if isinstance(filters, dict):
-            return json.dumps(filters)
+            return json_dumps(filters)
         return filters
 
+    def _get_stored_entities(
+        self,
+        project_name: str,
+        entity_type: str,
+        fields: set[str],
+        graphql_filters: dict[str, Any],
+    ) -> Optional[list[dict[str, Any]]]:
+        """Get entities from hierarchy store if possible.
+
+        Args:
+            project_name (str): Project name.
+            entity_type (str): Entity type, 'folder' or 'task'.
+            fields (set[str]): Fields used to create the query.
+            graphql_filters (dict[str, Any]): Filters of GraphQl query.
+
+        Returns:
+            Optional[list[dict[str, Any]]]: Raw entities data or None
+                if entities must be queried from server.
+
+        """
+        hierarchy_store = self._hierarchy_store
+        if hierarchy_store is None:
+            return None
+        return hierarchy_store.get_entities(
+            self, project_name, entity_type, fields, graphql_filters
+        )
+
+    def _iter_graphql_entities(
+        self,
+        query: GraphQlQuery,
+        project_name: str,
+        entity_type: str,
+        fields: set[str],
+        ids_filter_key: str,
+    ) -> Generator[dict[str, Any], None, None]:
+        """Query entities using entity cache if possible.
+
+        Entity cache is used only if query filters entities only by ids.
+            Cached entities are returned first, then missing entities are
+            queried from server and stored to cache.
+
+        Args:
+            query (GraphQlQuery): Query with filled variables.
+            project_name (str): Project name.
+            entity_type (str): Entity type, e.g. 'folder'.
+            fields (set[str]): Fields used to create the query.
+            ids_filter_key (str): Variable name of ids filter.
+
+        Returns:
+            Generator[dict[str, Any], None, None]: Raw entities data.
+
+        """
+        entity_cache = self._entity_cache
+        entity_ids = query.get_variable_value(ids_filter_key)
+        if (
+            entity_cache is None
+            or not entity_ids
+            or "id" not in fields
+            or any(
+                query.get_variable_value(key) is not None
+                for key in query.get_variable_keys()
+                if key not in ("projectName", ids_filter_key)
+            )
+        ):
+            yield from query.iter_edges(self)
+            return
+
+        missing_ids = []
+        for entity_id in entity_ids:
+            entity = entity_cache.get(
+                project_name, entity_type, entity_id, fields
+            )
+            if entity is None:
+                missing_ids.append(entity_id)
+            else:
+                yield entity
+
+        if not missing_ids:
+            return
+
+        query.set_variable_value(ids_filter_key, missing_ids)
+        for entity in query.iter_edges(self):
+            entity_cache.set(
+                project_name, entity_type, entity["id"], fields, entity
+            )
+            yield entity
+
     def _convert_entity_data(self, entity: AnyEntityDict):
         if not entity:
             return
@@ -2762,7 +4424,7 @@ class ServerAPI(
         if "data" in entity:
             entity_data = entity["data"] or {}
             if isinstance(entity_data, str):
-                entity_data = json.loads(entity_data)
+                entity_data = json_loads(entity_data)
 
             entity["data"] = entity_data
 
@@ -2770,4 +4432,4 @@ class ServerAPI(
         if isinstance(all_attrib, str):
             # NOTE: This expects server returns all attributes available for
             #   the entity type.
-            entity["attrib"] = json.loads(all_attrib)
+            entity["attrib"] = json_loads(all_attrib)
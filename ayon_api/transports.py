@@ -0,0 +1,412 @@
+"""Transports used to send HTTP requests to server.
+
+By default 'ServerAPI' sends requests using 'requests' sessions. Other
+transport can be set using 'ServerAPI.set_transport' (or 'transport'
+argument), e.g. to use HTTP/2 which multiplexes many concurrent requests
+over a single connection.
+
+Transport must implement 'request' which accepts the same keyword
+arguments as 'requests.request' and returns object compatible with
+'requests.Response'. Connection errors and timeouts must be raised as
+'requests' exceptions, so retries and circuit breaker work the same way
+for all transports.
+
+Example:
+    >>> from ayon_api.transports import HttpxTransport
+    >>> con = ServerAPI(url, token, transport=HttpxTransport(http2=True))
+
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import typing
+from typing import Optional, Any, Iterator, Iterable, AsyncIterator
+
+import requests
+
+if typing.TYPE_CHECKING:
+    from requests.structures import CaseInsensitiveDict
+
+
+class Transport:
+    """Base class of transports."""
+    name = "base"
+
+    def request(
+        self, method: str, url: str, **kwargs
+    ) -> requests.Response:
+        """Send request.
+
+        Args:
+            method (str): Request method.
+            url (str): Request url.
+            **kwargs (Any): Arguments of 'requests.request'.
+
+        Returns:
+            requests.Response: Response compatible object.
+
+        """
+        raise NotImplementedError(
+            f"Transport '{self.name}' does not implement 'request'."
+        )
+
+    def get_info(self) -> dict[str, Any]:
+        """Information about transport usable for diagnostics.
+
+        Returns:
+            dict[str, Any]: Transport information.
+
+        """
+        return {"name": self.name}
+
+    def close(self) -> None:
+        """Close all connections."""
+        pass
+
+
+class RequestsTransport(Transport):
+    """Transport using single 'requests' session per thread.
+
+    Mainly to be used as base for custom transports. 'ServerAPI' does use
+    its own sessions when transport is not set.
+
+    Args:
+        pool_size (int): Maximum number of connections kept in pool.
+
+    """
+    name = "requests"
+
+    def __init__(self, pool_size: int = 10):
+        self._pool_size = pool_size
+        self._local = threading.local()
+        self._adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size
+        )
+
+    def _get_session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self._adapter)
+            session.mount("https://", self._adapter)
+            self._local.session = session
+        return session
+
+    def request(
+        self, method: str, url: str, **kwargs
+    ) -> requests.Response:
+        return self._get_session().request(method, url, **kwargs)
+
+    def get_info(self) -> dict[str, Any]:
+        return {"name": self.name, "pool_size": self._pool_size}
+
+    def close(self) -> None:
+        self._adapter.close()
+
+
+class HttpxResponse:
+    """'requests.Response' compatible wrapper of 'httpx.Response'.
+
+    Body of streamed response is read using event loop of transport.
+
+    Args:
+        response (httpx.Response): Response of 'httpx'.
+        transport (HttpxTransport): Transport which sent the request.
+        stream (bool): Body was not read yet.
+
+    """
+    def __init__(
+        self,
+        response: Any,
+        transport: HttpxTransport,
+        stream: bool = False,
+    ):
+        self._response = response
+        self._transport = transport
+        self._stream = stream
+        self.status_code: int = response.status_code
+        self.url: str = str(response.url)
+        self.reason: str = response.reason_phrase
+        self.http_version: str = response.http_version
+        self.headers: CaseInsensitiveDict = (
+            requests.structures.CaseInsensitiveDict(response.headers)
+        )
+
+    @property
+    def content(self) -> bytes:
+        if self._stream:
+            self._stream = False
+            self._transport.run(self._response.aread())
+        return self._response.content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self._response.encoding or "utf-8")
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def num_bytes_downloaded(self) -> int:
+        return self._response.num_bytes_downloaded
+
+    def json(self, **kwargs) -> Any:
+        from .json_codec import json_loads
+
+        return json_loads(self.content)
+
+    def iter_content(
+        self, chunk_size: Optional[int] = 1, decode_unicode: bool = False
+    ) -> Iterator[bytes]:
+        if not self._stream:
+            content = self.content
+            if not chunk_size:
+                yield content
+                return
+            for idx in range(0, len(content), chunk_size):
+                yield content[idx:idx + chunk_size]
+            return
+
+        self._stream = False
+        iterator = self._response.aiter_bytes(chunk_size=chunk_size)
+        while True:
+            try:
+                yield self._transport.run(iterator.__anext__())
+            except StopAsyncIteration:
+                break
+
+    def raise_for_status(self) -> None:
+        if self.status_code < 400:
+            return
+        kind = "Client" if self.status_code < 500 else "Server"
+        raise requests.exceptions.HTTPError(
+            f"{self.status_code} {kind} Error: {self.reason}"
+            f" for url: {self.url}",
+            response=self,
+        )
+
+    def close(self) -> None:
+        self._transport.run(self._response.aclose())
+
+    def __enter__(self) -> HttpxResponse:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"<Response [{self.status_code}]>"
+
+
+class HttpxTransport(Transport):
+    """Transport using 'httpx' with optional HTTP/2.
+
+    With HTTP/2 concurrent requests from all threads are multiplexed over
+    single connection per host, which avoids head-of-line blocking of
+    HTTP/1.1 connections and cost of TLS handshakes for new connections.
+
+    Synchronous HTTP/2 connection of 'httpx' is not safe to share across
+    threads, so requests are sent by async client on event loop running in
+    a background thread, and calling thread waits for the result.
+
+    Requires 'httpx' package, and 'h2' package for HTTP/2
+    (``pip install httpx[http2]``).
+
+    Args:
+        http2 (bool): Use HTTP/2. Negotiated using ALPN on https urls.
+        http1 (bool): Allow HTTP/1.1. Disable to use HTTP/2 without TLS
+            (prior knowledge), e.g. for local servers.
+        max_connections (int): Maximum number of connections.
+
+    """
+    name = "httpx"
+
+    def __init__(
+        self,
+        http2: bool = True,
+        http1: bool = True,
+        max_connections: int = 10,
+    ):
+        import httpx
+
+        self._httpx = httpx
+        self._http2 = http2
+        self._http1 = http1
+        self._max_connections = max_connections
+        self._clients: dict[tuple[Any, Any], Any] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def run(self, coro: typing.Awaitable[Any]) -> Any:
+        """Run coroutine on event loop of transport and wait for result.
+
+        Errors of 'httpx' are re-raised as 'requests' errors.
+
+        Args:
+            coro (Awaitable[Any]): Coroutine to run.
+
+        Returns:
+            Any: Result of the coroutine.
+
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+        with _map_httpx_exceptions(self._httpx):
+            return future.result()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        loop = self._loop
+        if loop is not None:
+            return loop
+
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=loop.run_forever,
+                    name="HttpxTransportLoop",
+                    daemon=True,
+                )
+                self._thread.start()
+                self._loop = loop
+        return self._loop
+
+    def _get_client(self, verify: Any, cert: Any) -> Any:
+        if isinstance(cert, list):
+            cert = tuple(cert)
+        key = (verify, cert)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._httpx.AsyncClient(
+                    http1=self._http1,
+                    http2=self._http2,
+                    verify=verify,
+                    cert=cert,
+                    limits=self._httpx.Limits(
+                        max_connections=self._max_connections
+                    ),
+                )
+                self._clients[key] = client
+        return client
+
+    def request(
+        self, method: str, url: str, **kwargs
+    ) -> HttpxResponse:
+        client = self._get_client(
+            kwargs.pop("verify", True), kwargs.pop("cert", None)
+        )
+        stream = bool(kwargs.pop("stream", False))
+        follow_redirects = kwargs.pop("allow_redirects", True)
+        timeout = _convert_timeout(kwargs.pop("timeout", None))
+        data = kwargs.pop("data", None)
+        if isinstance(data, (bytes, str)):
+            kwargs["content"] = data
+        elif _is_iterable_body(data):
+            kwargs["content"] = _iter_body_async(data)
+        elif data is not None:
+            kwargs["data"] = data
+
+        request = client.build_request(method, url, timeout=timeout, **kwargs)
+        response = self.run(client.send(
+            request, stream=stream, follow_redirects=follow_redirects
+        ))
+        return HttpxResponse(response, self, stream=stream)
+
+    def get_info(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "http2": self._http2,
+            "max_connections": self._max_connections,
+            "clients": len(self._clients),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            loop = self._loop
+            thread = self._thread
+            self._loop = self._thread = None
+
+        if loop is None:
+            return
+
+        for client in clients:
+            asyncio.run_coroutine_threadsafe(
+                client.aclose(), loop
+            ).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def _is_iterable_body(data: Any) -> bool:
+    return (
+        data is not None
+        and not isinstance(data, (dict, list, tuple))
+        and isinstance(data, Iterable)
+    )
+
+
+async def _iter_body_async(data: Iterable[bytes]) -> AsyncIterator[bytes]:
+    # Chunks are read in thread so file reads don't block event loop
+    loop = asyncio.get_running_loop()
+    iterator = iter(data)
+    sentinel = object()
+    while True:
+        chunk = await loop.run_in_executor(None, next, iterator, sentinel)
+        if chunk is sentinel:
+            break
+        yield chunk
+
+
+def _convert_timeout(timeout: Any) -> Any:
+    # 'requests' uses '(connect, read)' tuple
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return (connect, read, read, connect)
+    return timeout
+
+
+class _map_httpx_exceptions:
+    """Re-raise 'httpx' errors as 'requests' errors."""
+    def __init__(self, httpx: Any):
+        self._httpx = httpx
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is None:
+            return False
+        httpx = self._httpx
+        if isinstance(exc, httpx.ConnectTimeout):
+            raise requests.exceptions.ConnectTimeout(str(exc)) from exc
+        if isinstance(exc, httpx.TimeoutException):
+            raise requests.exceptions.ReadTimeout(str(exc)) from exc
+        if isinstance(exc, httpx.ConnectError):
+            # Error raised before request was sent
+            raise requests.exceptions.ConnectionError(
+                _ConnectError(str(exc))
+            ) from exc
+        if isinstance(exc, httpx.TransportError):
+            raise requests.exceptions.ConnectionError(str(exc)) from exc
+        return False
+
+
+class _ConnectError(Exception):
+    """Reason of connection error which happened before request was sent.
+
+    Name matches 'urllib3' error so retry policy handles it the same way.
+
+    """
+
+
+_ConnectError.__name__ = "NewConnectionError"
@@ -11,12 +11,13 @@ import json
 import uuid
 import string
 import platform
+import socket
 import traceback
 import collections
 import itertools
 from urllib.parse import urlparse, urlencode, ParseResult
 import typing
-from typing import Any, Iterable
+from typing import Any, Iterable, Mapping
 import warnings
 from enum import IntEnum
 
@@ -25,16 +26,23 @@ import unidecode
 
 from .constants import (
     SERVER_TIMEOUT_ENV_KEY,
+    SERVER_POOL_SIZE_ENV_KEY,
+    SERVER_POOL_BLOCK_ENV_KEY,
+    SERVER_TCP_KEEPALIVE_ENV_KEY,
+    SERVER_REQUEST_COMPRESSION_ENV_KEY,
+    GRAPHQL_PREFETCH_ENV_KEY,
+    GRAPHQL_CHUNK_SIZE_ENV_KEY,
+    GRAPHQL_PERSISTED_QUERIES_ENV_KEY,
     DEFAULT_VARIANT_ENV_KEY,
     SITE_ID_ENV_KEY,
 )
+from .json_codec import json_loads
 from .exceptions import (
     UrlError,
     UrlNotReached,
     ServerError,
     UnauthorizedError,
     HTTPRequestError,
-    RequestsJSONDecodeError,
 )
 
 try:
@@ -44,7 +52,7 @@ except ImportError:
 
 
 if typing.TYPE_CHECKING:
-    from .typing import AnyEntityDict, StreamType
+    from .typing import AnyEntityDict, StreamType, AttributeSchemaDataDict
 
 REMOVED_VALUE = object()
 NOT_SET = object()
@@ -172,8 +180,8 @@ class RestApiResponse:
     def data(self):
         if self._data is None:
             try:
-                self._data = self.orig_response.json()
-            except (AttributeError, RequestsJSONDecodeError):
+                self._data = json_loads(self.orig_response.content)
+            except (AttributeError, TypeError, ValueError):
                 self._data = {}
         return self._data
 
@@ -294,6 +302,30 @@ def fill_own_attribs(entity: AnyEntityDict) -> None:
             own_attrib[key] = copy.deepcopy(value)
 
 
+def fill_attrib_defaults(
+    attrib: dict[str, Any],
+    attributes: Mapping[str, AttributeSchemaDataDict],
+) -> None:
+    """Fill default values of attributes missing in entity attributes.
+
+    Mutable default values are copied so changes of entity data do not
+        change cached attributes schema.
+
+    Args:
+        attrib (dict[str, Any]): Attribute values of entity.
+        attributes (Mapping[str, AttributeSchemaDataDict]): Attribute
+            schemas by attribute name, output of 'get_attributes_for_type'.
+
+    """
+    for name, attr_data in attributes.items():
+        if name in attrib:
+            continue
+        default = attr_data["default"]
+        if isinstance(default, (list, dict)):
+            default = copy.deepcopy(default)
+        attrib[name] = default
+
+
 def _convert_filter_value(value: Any) -> list[Any] | None:
     if value is None:
         return None
@@ -336,6 +368,162 @@ def get_default_timeout() -> float:
     return 10.0
 
 
+def get_default_pool_size() -> int:
+    """Default maximum number of pooled connections to server.
+
+    First looks for environment variable SERVER_POOL_SIZE_ENV_KEY. If not
+    available then use 32, which matches maximum number of workers of
+    'ThreadPoolExecutor' created with default arguments.
+
+    Returns:
+        int: Maximum number of connections kept in pool.
+
+    """
+    try:
+        pool_size = int(os.environ.get(SERVER_POOL_SIZE_ENV_KEY))
+        if pool_size > 0:
+            return pool_size
+    except (ValueError, TypeError):
+        pass
+    return 32
+
+
+def get_default_pool_block() -> bool:
+    """Default pool block mode.
+
+    Looks for environment variable SERVER_POOL_BLOCK_ENV_KEY. When enabled
+    requests wait for a free connection instead of opening a new one that
+    is thrown away afterward.
+
+    Returns:
+        bool: Pool should block when all connections are used.
+
+    """
+    value = os.environ.get(SERVER_POOL_BLOCK_ENV_KEY) or ""
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+def get_default_tcp_keepalive() -> int:
+    """Default TCP keep-alive idle time.
+
+    First looks for environment variable SERVER_TCP_KEEPALIVE_ENV_KEY. If not
+    available then use 60 seconds. Value '0' disables TCP keep-alive.
+
+    Returns:
+        int: Seconds of idle time before keep-alive probes are sent.
+
+    """
+    try:
+        keepalive = int(os.environ.get(SERVER_TCP_KEEPALIVE_ENV_KEY))
+        return max(keepalive, 0)
+    except (ValueError, TypeError):
+        pass
+    return 60
+
+
+def get_default_request_compression_min_size() -> int:
+    """Default minimum size of request body compressed using gzip.
+
+    Looks for environment variable SERVER_REQUEST_COMPRESSION_ENV_KEY. If not
+    available then '0' is used which disables compression of request bodies.
+
+    Returns:
+        int: Minimum body size in bytes, '0' if compression is disabled.
+
+    """
+    try:
+        min_size = int(os.environ.get(SERVER_REQUEST_COMPRESSION_ENV_KEY))
+        return max(min_size, 0)
+    except (ValueError, TypeError):
+        pass
+    return 0
+
+
+def get_default_graphql_prefetch() -> int:
+    """Default number of GraphQl pages fetched ahead.
+
+    Looks for environment variable GRAPHQL_PREFETCH_ENV_KEY. If not
+    available then '0' is used which disables prefetch.
+
+    Returns:
+        int: Maximum number of pages fetched ahead.
+
+    """
+    try:
+        prefetch = int(os.environ.get(GRAPHQL_PREFETCH_ENV_KEY))
+        return max(prefetch, 0)
+    except (ValueError, TypeError):
+        pass
+    return 0
+
+
+def get_default_graphql_chunk_size() -> int:
+    """Default maximum number of ids in single GraphQl id filter.
+
+    Looks for environment variable GRAPHQL_CHUNK_SIZE_ENV_KEY. If not
+    available then '5000' is used. Value '0' disables chunking.
+
+    Returns:
+        int: Maximum number of ids in single query.
+
+    """
+    try:
+        chunk_size = int(os.environ.get(GRAPHQL_CHUNK_SIZE_ENV_KEY))
+        return max(chunk_size, 0)
+    except (ValueError, TypeError):
+        pass
+    return 5000
+
+
+def get_default_graphql_persisted_queries() -> bool:
+    """Default persisted GraphQl queries mode.
+
+    Looks for environment variable GRAPHQL_PERSISTED_QUERIES_ENV_KEY. When
+    enabled queries are sent as hash of query and full query is sent only
+    if server does not know the hash.
+
+    Returns:
+        bool: Persisted queries are enabled.
+
+    """
+    value = os.environ.get(GRAPHQL_PERSISTED_QUERIES_ENV_KEY) or ""
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+def get_socket_options(tcp_keepalive: int) -> list[tuple[int, int, int]]:
+    """Socket options used for connections to server.
+
+    Keep 'TCP_NODELAY' which is used by urllib3 by default and add TCP
+    keep-alive options so idle pooled connections are not silently
+    dropped by proxies and firewalls.
+
+    Args:
+        tcp_keepalive (int): Seconds of idle time before keep-alive probes
+            are sent. Keep-alive is disabled if is '0'.
+
+    Returns:
+        list[tuple[int, int, int]]: Socket options.
+
+    """
+    options = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+    if not tcp_keepalive:
+        return options
+
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    # 'TCP_KEEPIDLE' is named 'TCP_KEEPALIVE' on macOS
+    idle_option = getattr(
+        socket, "TCP_KEEPIDLE", getattr(socket, "TCP_KEEPALIVE", None)
+    )
+    for option, value in (
+        (idle_option, tcp_keepalive),
+        (getattr(socket, "TCP_KEEPINTVL", None), max(tcp_keepalive // 4, 1)),
+        (getattr(socket, "TCP_KEEPCNT", None), 4),
+    ):
+        if option is not None:
+            options.append((socket.IPPROTO_TCP, option, value))
+    return options
+
+
 def get_default_settings_variant() -> str:
     """Default settings variant.
 
@@ -1302,7 +1490,7 @@ def _get_svg_mime_type(content: bytes) -> str | None:
 def _get_json_mime_type(content: bytes) -> str | None:
     # json
     try:
-        json.loads(content.decode("utf-8"))
+        json_loads(content.decode("utf-8"))
         return "application/json"
     except (UnicodeDecodeError, ValueError):
         pass
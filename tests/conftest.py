@@ -1,4 +1,6 @@
+import threading
 from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer
 import pytest
 
 from ayon_api import (
@@ -139,6 +141,34 @@ def event_id():
     return recent_events[0]["id"] if recent_events else None
 
 
+@pytest.fixture
+def local_server():
+    """Start local HTTP server with passed request handler class.
+
+    Server uses thread per connection, so keep-alive connections don't
+    block other requests. All started servers are stopped on teardown.
+
+    Returns:
+        Callable[[type[BaseHTTPRequestHandler]], str]: Function starting
+            server, returns url of the server.
+
+    """
+    servers = []
+
+    def _start(handler_cls):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler_cls)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}"
+
+    yield _start
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
 class TestEventFilters:
     project_names = [
         ([]),
@@ -0,0 +1,230 @@
+import asyncio
+import inspect
+
+from ayon_api import ServerAPI, AsyncServerAPI
+from ayon_api.graphql import GraphQlQuery
+from ayon_api.graphql_queries import folders_graphql_query
+from ayon_api.async_server_api import (
+    _SYNC_METHODS,
+    _IO_SETTING_METHODS,
+    _LOCAL_METHODS,
+)
+
+
+class _FakeServerAPI(ServerAPI):
+    def get_folders(self, project_name, **kwargs):
+        for idx in range(250):
+            yield {"id": str(idx), "projectName": project_name}
+
+    def get_project(self, project_name, **kwargs):
+        return {"name": project_name}
+
+    def get_info(self):
+        return {"version": "1.0.0"}
+
+
+def _create_connection():
+    con = _FakeServerAPI("http://localhost:5000", create_session=False)
+    return AsyncServerAPI.from_server_api(con, max_workers=4)
+
+
+def test_async_methods_types():
+    assert inspect.iscoroutinefunction(AsyncServerAPI.get_project)
+    assert inspect.isasyncgenfunction(AsyncServerAPI.get_folders)
+    assert inspect.iscoroutinefunction(AsyncServerAPI.get_folders_list)
+    assert not inspect.iscoroutinefunction(AsyncServerAPI.get_base_url)
+    # Methods returning generator without 'yield'
+    assert inspect.isasyncgenfunction(AsyncServerAPI.get_hero_versions)
+    assert inspect.iscoroutinefunction(AsyncServerAPI.get_hero_versions_list)
+    assert inspect.isasyncgenfunction(AsyncServerAPI.get_workfiles_info)
+    # Properties communicating with server
+    assert inspect.iscoroutinefunction(AsyncServerAPI.server_version)
+    assert inspect.iscoroutinefunction(AsyncServerAPI.has_valid_token)
+
+
+def test_all_public_methods_are_wrapped():
+    for attr_name in dir(ServerAPI):
+        if attr_name.startswith("_"):
+            continue
+        attr = inspect.getattr_static(ServerAPI, attr_name)
+        if not (
+            inspect.isfunction(attr)
+            or isinstance(attr, (classmethod, staticmethod))
+        ):
+            continue
+
+        method = getattr(AsyncServerAPI, attr_name)
+        is_async = (
+            inspect.iscoroutinefunction(method)
+            or inspect.isasyncgenfunction(method)
+        )
+        assert is_async is (attr_name not in _SYNC_METHODS), attr_name
+
+    # Explicit lists don't contain removed methods
+    for attr_name in _IO_SETTING_METHODS | _LOCAL_METHODS:
+        assert hasattr(ServerAPI, attr_name), attr_name
+
+    # Connection settings are detected
+    assert "set_graphql_prefetch" in _SYNC_METHODS
+    assert "is_single_flight_enabled" in _SYNC_METHODS
+    assert "as_username" in _SYNC_METHODS
+    assert "get_server_config" not in _SYNC_METHODS
+    # Pairs of methods on mixins communicate with server
+    assert "get_entity_watchers" not in _SYNC_METHODS
+
+
+def test_async_gather():
+    async def _main():
+        async with _create_connection() as con:
+            assert con.get_base_url() == "http://localhost:5000"
+            assert await con.server_version() == "1.0.0"
+            project, folders = await asyncio.gather(
+                con.get_project("TestProject"),
+                con.get_folders_list("TestProject"),
+            )
+            iterated = [
+                folder
+                async for folder in con.get_folders("TestProject")
+            ]
+        return project, folders, iterated
+
+    project, folders, iterated = asyncio.run(_main())
+    assert project == {"name": "TestProject"}
+    assert len(folders) == 250
+    assert folders == iterated
+
+
+def test_async_continuous_query():
+    pages = [
+        {"data": {"users": {
+            "edges": [{"node": {"name": "a"}}],
+            "pageInfo": {"endCursor": "1", "hasNextPage": True},
+        }}},
+        {"data": {"users": {
+            "edges": [{"node": {"name": "b"}}],
+            "pageInfo": {"endCursor": "2", "hasNextPage": False},
+        }}},
+    ]
+
+    class _Response:
+        def __init__(self, data):
+            self.data = data
+            self.errors = None
+
+    class _Con:
+        async def query_graphql(self, query, variables):
+            return _Response(pages.pop(0))
+
+    query = GraphQlQuery("Users")
+    users_field = query.add_field_with_edges("users")
+    users_field.add_field("name")
+
+    async def _main():
+        return [
+            output
+            async for output in query.async_continuous_query(_Con())
+        ]
+
+    outputs = asyncio.run(_main())
+    assert [output["users"] for output in outputs] == [
+        [{"name": "a"}], [{"name": "b"}]
+    ]
+
+
+def test_async_continuous_query_prefetch():
+    class _Response:
+        def __init__(self, data):
+            self.data = data
+            self.errors = None
+
+    class _Con:
+        requested = 0
+
+        async def query_graphql(self, query, variables):
+            await asyncio.sleep(0.01)
+            _Con.requested += 1
+            idx = _Con.requested
+            return _Response({"data": {"users": {
+                "edges": [{"node": {"name": str(idx)}}],
+                "pageInfo": {"endCursor": str(idx), "hasNextPage": idx < 5},
+            }}})
+
+        def get_graphql_prefetch(self):
+            return 2
+
+    query = GraphQlQuery("Users")
+    query.add_field_with_edges("users").add_field("name")
+
+    async def _main():
+        names = []
+        async for output in query.async_continuous_query(_Con()):
+            # Next page is requested while current page is handled
+            await asyncio.sleep(0.02)
+            names.extend(user["name"] for user in output["users"])
+        return names
+
+    assert asyncio.run(_main()) == ["1", "2", "3", "4", "5"]
+
+
+def test_async_query_id_filter_chunks():
+    class _Response:
+        def __init__(self, data):
+            self.data = data
+            self.errors = None
+
+    class _Con:
+        def __init__(self):
+            self.requested_ids = []
+
+        def get_graphql_chunk_size(self):
+            return 10
+
+        async def query_graphql(self, query, variables):
+            folder_ids = variables["folderIds"]
+            self.requested_ids.append(folder_ids)
+            # Later chunks are answered sooner
+            if folder_ids[0] == "00":
+                await asyncio.sleep(0.05)
+            return _Response({"data": {"project": {
+                "folders": {
+                    "edges": [
+                        {"node": {"id": folder_id}}
+                        for folder_id in folder_ids
+                    ],
+                    "pageInfo": {"endCursor": "1", "hasNextPage": False},
+                },
+            }}})
+
+    def _create_query():
+        query = folders_graphql_query({"id"})
+        query.set_variable_value("projectName", "test")
+        query.set_variable_value("folderIds", folder_ids)
+        return query
+
+    async def _main():
+        outputs = [
+            output
+            async for output in _create_query().async_continuous_query(con)
+        ]
+        return outputs, await _create_query().async_query(con)
+
+    folder_ids = [f"{idx:02}" for idx in reversed(range(25))]
+    con = _Con()
+    outputs, output = asyncio.run(_main())
+    assert len(con.requested_ids) == 6
+    assert all(len(ids) <= 10 for ids in con.requested_ids)
+    # Outputs are in stable order of chunks
+    assert [
+        folder["id"]
+        for chunk_output in outputs
+        for folder in chunk_output["project"]["folders"]
+    ] == sorted(folder_ids)
+    assert [
+        folder["id"] for folder in output["project"]["folders"]
+    ] == sorted(folder_ids)
+
+    # Chunk size is not a coroutine on asyncio connection
+    async_con = _create_connection()
+    assert not inspect.iscoroutinefunction(
+        async_con.get_graphql_chunk_size
+    )
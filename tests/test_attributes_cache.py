@@ -0,0 +1,130 @@
+import threading
+import time
+
+from ayon_api import ServerAPI
+from ayon_api.utils import RestApiResponse, fill_attrib_defaults
+
+SCHEMA = {
+    "attributes": [
+        {
+            "name": "fps",
+            "position": 0,
+            "scope": ["project", "folder"],
+            "builtin": True,
+            "data": {"type": "float", "default": 25.0},
+        },
+        {
+            "name": "tools",
+            "position": 1,
+            "scope": ["folder"],
+            "builtin": True,
+            "data": {"type": "list_of_strings", "default": []},
+        },
+    ]
+}
+
+
+class _Response:
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+
+class _AttributesConnection(ServerAPI):
+    """Connection returning attributes schema with ETag."""
+    def __init__(self, base_url="http://127.0.0.1:1"):
+        super().__init__(base_url, create_session=False)
+        self.etag = '"1"'
+        self.requests = []
+
+    def _send_rest_request(self, function, url, method, *args):
+        kwargs = args[-1]
+        if_none_match = kwargs["headers"].get("If-None-Match")
+        self.requests.append(if_none_match)
+        if if_none_match == self.etag:
+            return RestApiResponse(_Response(304))
+        response = _Response(200, SCHEMA, {"ETag": self.etag})
+        return RestApiResponse(response, response.data)
+
+
+def test_attributes_cache_is_per_connection():
+    con = _AttributesConnection()
+    other_con = _AttributesConnection("http://127.0.0.1:2")
+    assert set(con.get_attributes_for_type("folder")) == {"fps", "tools"}
+    assert set(other_con.get_attributes_for_type("project")) == {"fps"}
+    assert len(con.requests) == 1
+    assert len(other_con.requests) == 1
+
+    # Returned attributes can be modified without changing the cache
+    attributes = con.get_attributes_for_type("folder")
+    assert isinstance(attributes, dict)
+    attributes["fps"]["default"] = 30.0
+    attributes.pop("tools")
+    assert con.get_attributes_for_type("folder") == {
+        "fps": {"type": "float", "default": 25.0},
+        "tools": {"type": "list_of_strings", "default": []},
+    }
+    assert con.get_attributes_for_type("user") == {}
+    assert len(con.requests) == 1
+
+
+def test_attributes_cache_revalidation():
+    con = _AttributesConnection()
+    con.get_attributes_for_type("folder")
+    con.set_attributes_cache_timeout(0)
+
+    # Not modified schema is kept
+    con.get_attributes_for_type("folder")
+    assert con.requests == [None, '"1"']
+    assert con._attributes_cache.etag == '"1"'
+
+    con.etag = '"2"'
+    con.get_attributes_for_type("folder")
+    assert con.requests[-1] == '"1"'
+    assert con._attributes_cache.etag == '"2"'
+
+    # Schema received without cache is a copy
+    schema = con.get_attributes_schema(use_cache=False)
+    assert con.requests[-1] is None
+    schema["attributes"].clear()
+    assert con.get_attributes_fields_for_type("project") == {"attrib.fps"}
+
+
+def test_fill_attrib_defaults():
+    con = _AttributesConnection()
+    attributes = con.get_attributes_for_type("folder")
+    attrib = {"fps": 24.0}
+    fill_attrib_defaults(attrib, attributes)
+    assert attrib == {"fps": 24.0, "tools": []}
+    attrib["tools"].append("nuke")
+    assert attributes["tools"]["default"] == []
+
+
+def test_attributes_cache_threads():
+    class _SlowConnection(_AttributesConnection):
+        def _send_rest_request(self, *args):
+            time.sleep(0.05)
+            return super()._send_rest_request(*args)
+
+    con = _SlowConnection()
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                con.get_attributes_for_type("folder")
+            )
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Schema was requested only once
+    assert len(con.requests) == 1
+    assert all(set(result) == {"fps", "tools"} for result in results)
@@ -0,0 +1,122 @@
+import fnmatch
+
+from ayon_api import CacheInvalidator, EntityCache
+from ayon_api.metrics import ClientMetrics
+
+
+class _EventsConnection:
+    """Connection with events stored in memory."""
+    def __init__(self):
+        self.events = []
+        self.entity_cache = EntityCache()
+        self.metrics = ClientMetrics()
+        self.requests = []
+        self.reset_indexes = []
+
+    def add_event(self, topic, project_name, entity_id, created_at):
+        self.events.append({
+            "id": str(len(self.events)),
+            "topic": topic,
+            "project": project_name,
+            "summary": f'{{"entityId": "{entity_id}"}}',
+            "createdAt": created_at,
+        })
+
+    def get_events(self, topics, project_names=None, newer_than=None,
+                   fields=None, order=None, last=None):
+        self.requests.append(newer_than)
+        events = [
+            event
+            for event in self.events
+            if (
+                any(fnmatch.fnmatchcase(event["topic"], t) for t in topics)
+                and (newer_than is None or event["createdAt"] >= newer_than)
+            )
+        ]
+        if last:
+            events = events[-last:]
+        return iter(events)
+
+    def get_base_url(self):
+        return "http://127.0.0.1"
+
+    def get_entity_cache(self):
+        return self.entity_cache
+
+    def get_hierarchy_store(self):
+        return None
+
+    def reset_folder_path_index(self, project_name=None):
+        self.reset_indexes.append(project_name)
+
+    def get_metrics(self):
+        return self.metrics
+
+
+def test_cache_invalidator():
+    con = _EventsConnection()
+    cache = con.entity_cache
+    con.add_event(
+        "entity.task.created", "project", "1", "2024-01-01T10:00:00+00:00"
+    )
+    invalidator = CacheInvalidator(con)
+    # Watermark is initialized from last event
+    assert invalidator.poll() == 0
+    assert invalidator.watermark == "2024-01-01T10:00:00+00:00"
+
+    for entity_type, entity_id in (
+        ("folder", "1"),
+        ("task", "2"),
+        ("task", "3"),
+    ):
+        cache.set("project", entity_type, entity_id, {"id"}, {})
+    cache.set("other", "task", "3", {"id"}, {})
+
+    settings_events = []
+    invalidator.add_topic_callback("settings.*", settings_events.append)
+    con.add_event(
+        "entity.task.status_changed",
+        "project",
+        "2",
+        "2024-01-01T10:00:01+00:00",
+    )
+    con.add_event("settings.changed", None, None, "2024-01-01T10:00:01Z")
+    assert invalidator.poll() == 2
+    assert len(cache) == 3
+    assert [event["topic"] for event in settings_events] == [
+        "settings.changed"
+    ]
+
+    # Already processed events are skipped
+    assert invalidator.poll() == 0
+    assert con.requests[-1] == "2024-01-01T10:00:01Z"
+
+    con.add_event(
+        "entity.folder.deleted", "project", "1", "2024-01-01T10:00:02Z"
+    )
+    assert invalidator.poll() == 1
+    assert len(cache) == 1
+    # Only folder events invalidate folder path index
+    assert con.reset_indexes == ["project"]
+
+    stats = invalidator.get_stats()
+    assert stats["events"] == 3
+    assert stats["invalidated"] == 3
+    assert stats["last_lag"] > 0
+    samples = {
+        (name, labels.get("topic")): value
+        for name, labels, value in con.metrics.iter_samples()
+    }
+    assert samples[
+        ("ayon_api_cache_invalidation_events_total", "entity.task")
+    ] == 1
+    assert samples[
+        ("ayon_api_cache_invalidated_items_total", "entity.folder")
+    ] == 2
+
+
+def test_cache_invalidator_thread():
+    con = _EventsConnection()
+    with CacheInvalidator(con, interval=0.01) as invalidator:
+        assert invalidator.is_running()
+    assert not invalidator.is_running()
@@ -0,0 +1,129 @@
+import io
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+import requests
+
+from ayon_api import ServerAPI, RetryPolicy, CircuitBreaker
+from ayon_api.exceptions import ServerUnavailable
+from ayon_api.utils import RequestTypes
+
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    status = 200
+    requests_count = 0
+
+    def do_GET(self):
+        _StatusHandler.requests_count += 1
+        body = b"{}"
+        self.send_response(_StatusHandler.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_circuit_breaker_states():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.before_request()
+    breaker.record_response(None)
+    assert breaker.state == "closed"
+    breaker.record_response(503)
+    assert breaker.state == "open"
+
+    with pytest.raises(ServerUnavailable) as exc_info:
+        breaker.before_request("http://localhost/api/info")
+    assert exc_info.value.retry_in > 0
+
+    time.sleep(0.06)
+    # Single probe is let through
+    breaker.before_request()
+    assert breaker.state == "half-open"
+    with pytest.raises(ServerUnavailable):
+        breaker.before_request()
+
+    # Failed probe opens circuit again
+    breaker.record_failure("Connection refused")
+    assert breaker.get_state()["state"] == "open"
+    assert breaker.get_state()["last_error"] == "Connection refused"
+
+    time.sleep(0.06)
+    breaker.before_request()
+    breaker.record_response(200)
+    assert breaker.get_state()["state"] == "closed"
+    assert breaker.get_state()["failures"] == 0
+
+
+def test_disabled_circuit_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, enabled=False)
+    breaker.record_response(500)
+    breaker.before_request()
+    assert not breaker.is_open
+
+
+def test_connection_fails_fast_when_open(local_server):
+    _StatusHandler.status = 503
+    _StatusHandler.requests_count = 0
+    url = local_server(_StatusHandler)
+    con = ServerAPI(
+        url,
+        create_session=False,
+        max_retries=10,
+        retry_policy=RetryPolicy(backoff_base=0.01),
+        circuit_breaker=CircuitBreaker(
+            failure_threshold=3, reset_timeout=60.0
+        ),
+    )
+    response = con._do_rest_request(
+        RequestTypes.get, f"{url}/api/info", handle_invalid_token=False
+    )
+    assert response.status_code == 503
+    # Retries stopped once circuit opened
+    assert _StatusHandler.requests_count == 3
+    assert con.get_circuit_breaker_state()["state"] == "open"
+
+    with pytest.raises(ServerUnavailable):
+        con._do_rest_request(
+            RequestTypes.get, f"{url}/api/info", handle_invalid_token=False
+        )
+    assert _StatusHandler.requests_count == 3
+    assert "ayon_api_circuit_breaker_open 1" in (
+        con.get_metrics().to_prometheus()
+    )
+
+
+def test_server_error_does_not_open_circuit():
+    breaker = CircuitBreaker(failure_threshold=1)
+    # Error of single request, server is available
+    breaker.record_response(500)
+    assert breaker.state == "closed"
+    breaker.record_response(502)
+    assert breaker.state == "open"
+
+
+def test_failed_download_opens_circuit(local_server):
+    _StatusHandler.status = 503
+    _StatusHandler.requests_count = 0
+    url = local_server(_StatusHandler)
+    con = ServerAPI(
+        url,
+        create_session=False,
+        retry_policy=RetryPolicy(backoff_base=0.01),
+        circuit_breaker=CircuitBreaker(failure_threshold=1),
+    )
+    finished = []
+    con.get_metrics().add_response_hook(finished.append)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        con.download_file_to_stream(f"{url}/api/file", io.BytesIO())
+
+    assert con.get_circuit_breaker_state()["state"] == "open"
+    # Request of the transfer was finished with the error
+    assert len(finished) == 1
+    assert finished[0].status_code == 503
+    assert finished[0].error is not None
@@ -0,0 +1,131 @@
+import array
+import json
+import tracemalloc
+
+import pytest
+
+from ayon_api import ServerAPI, EntityColumns
+from ayon_api.server_api import GraphQlResponse
+
+
+def _versions(count):
+    for idx in range(count):
+        yield {
+            "id": f"{idx:032}",
+            "version": idx + 1,
+            "status": "Approved" if idx % 2 else "In progress",
+            "attrib": {"frameStart": 1001, "fps": 25.0},
+        }
+
+
+def test_entity_columns():
+    columns = EntityColumns.from_entities(_versions(3000))
+    assert len(columns) == 3000
+    assert set(columns.fields) == {
+        "id", "version", "status", "attrib.frameStart", "attrib.fps"
+    }
+    assert isinstance(columns["version"], array.array)
+    assert isinstance(columns["attrib.fps"], array.array)
+    assert columns["version"][-1] == 3000
+    assert columns.get_row(1) == {
+        "id": f"{1:032}",
+        "version": 2,
+        "status": "Approved",
+        "attrib.frameStart": 1001,
+        "attrib.fps": 25.0,
+    }
+    # Repeated strings are stored once
+    statuses = columns["status"]
+    assert len({id(status) for status in statuses}) == 2
+    rows = list(columns.iter_rows())
+    assert rows[-1] == columns.get_row(-1)
+
+    # Missing values and new fields are filled with 'None'
+    columns.append({"id": "new", "version": None, "name": "v001"})
+    assert isinstance(columns["version"], list)
+    assert columns["version"][-1] is None
+    assert columns["name"][0] is None
+    assert columns["name"][-1] == "v001"
+    assert columns["attrib.fps"][-1] is None
+
+
+def _get_allocated_size(func):
+    tracemalloc.start()
+    try:
+        output = func()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return output, size
+
+
+def test_entity_columns_memory():
+    entities, dicts_size = _get_allocated_size(
+        lambda: list(_versions(3000))
+    )
+    columns, columns_size = _get_allocated_size(
+        lambda: EntityColumns.from_entities(_versions(3000))
+    )
+    assert len(columns) == len(entities)
+    assert columns_size * 3 < dicts_size
+
+
+class _VersionsConnection(ServerAPI):
+    """Connection returning pages of versions."""
+    def __init__(self, count):
+        super().__init__("http://127.0.0.1:1", create_session=False)
+        self.count = count
+        self.requested = 0
+
+    def get_default_fields_for_type(self, entity_type):
+        return {"id", "version", "active", "attrib.fps"}
+
+    def _get_data(self, variables):
+        self.requested += 1
+        idx = self.requested
+        limit = variables["projectVersionsLimit"]
+        start = (idx - 1) * limit
+        end = min(start + limit, self.count)
+        edges = [
+            {"node": {
+                "id": f"{version:032}",
+                "version": version + 1,
+                "active": True,
+                "attrib": {"fps": 25.0},
+            }}
+            for version in range(start, end)
+        ]
+        return {"data": {"project": {"versions": {
+            "edges": edges,
+            "pageInfo": {
+                "endCursor": str(idx),
+                "hasNextPage": end < self.count,
+            },
+        }}}}
+
+    def query_graphql(self, query, variables=None):
+        return GraphQlResponse(self._get_data(variables))
+
+    def query_graphql_stream(self, query, variables=None, chunk_size=65536):
+        yield json.dumps(self._get_data(variables)).encode()
+
+
+def test_get_versions_columns():
+    con = _VersionsConnection(250)
+    con.set_graphql_page_size(100)
+    columns = con.get_versions_columns("test")
+    assert con.requested == 3
+    assert len(columns) == 250
+    assert isinstance(columns["version"], array.array)
+    assert columns["version"][-1] == 250
+    assert set(columns["attrib.fps"]) == {25.0}
+
+
+def test_entity_columns_numpy():
+    numpy = pytest.importorskip("numpy")
+    columns = EntityColumns.from_entities(_versions(10))
+    arrays = columns.to_numpy()
+    assert arrays["version"].dtype == numpy.int64
+    assert arrays["status"].dtype == object
+    mask = arrays["version"] > 5
+    assert list(arrays["id"][mask]) == [f"{idx:032}" for idx in range(5, 10)]
@@ -0,0 +1,144 @@
+import json
+import time
+
+import pytest
+
+from ayon_api import ServerAPI, EntityCache
+from ayon_api.server_api import GraphQlResponse
+from ayon_api.utils import RestApiResponse
+
+
+class _FoldersConnection(ServerAPI):
+    """Connection returning folders of stand-in project."""
+    def __init__(self, folder_ids):
+        super().__init__("http://127.0.0.1:1", create_session=False)
+        self.folders = {
+            folder_id: {
+                "id": folder_id,
+                "name": f"folder_{folder_id}",
+                "active": True,
+            }
+            for folder_id in folder_ids
+        }
+        self.requested_ids = []
+        self.rest_requests = []
+
+    def _get_data(self, variables):
+        folder_ids = variables.get("folderIds") or list(self.folders)
+        self.requested_ids.append(sorted(folder_ids))
+        edges = [
+            {"node": self.folders[folder_id]}
+            for folder_id in folder_ids
+            if folder_id in self.folders
+        ]
+        return {"data": {"project": {"folders": {
+            "edges": edges,
+            "pageInfo": {"endCursor": None, "hasNextPage": False},
+        }}}}
+
+    def _send_rest_request(self, function, url, method, *args):
+        self.rest_requests.append((method, url))
+        return RestApiResponse(None, {})
+
+    def query_graphql(self, query, variables=None):
+        return GraphQlResponse(self._get_data(variables))
+
+    def query_graphql_stream(self, query, variables=None, chunk_size=65536):
+        yield json.dumps(self._get_data(variables)).encode()
+
+
+def test_entity_cache_lru_and_ttl():
+    cache = EntityCache(max_size=2, ttl=0.05)
+    cache.set("project", "folder", "1", {"id"}, {"id": "1"})
+    cache.set("project", "folder", "2", {"id"}, {"id": "2"})
+    assert cache.get("project", "folder", "1", {"id"}) == {"id": "1"}
+    # Different fields are different cache items
+    assert cache.get("project", "folder", "1", {"id", "name"}) is None
+
+    # '2' is least recently used
+    cache.set("project", "folder", "3", {"id"}, {"id": "3"})
+    assert cache.get("project", "folder", "2", {"id"}) is None
+    assert len(cache) == 2
+
+    # Returned entities are copies
+    cache.get("project", "folder", "1", {"id"})["id"] = "changed"
+    assert cache.get("project", "folder", "1", {"id"}) == {"id": "1"}
+
+    time.sleep(0.1)
+    assert cache.get("project", "folder", "1", {"id"}) is None
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["size"] == 1
+    assert stats["hits"] == 3
+    assert stats["misses"] == 3
+    assert stats["hit_ratio"] == pytest.approx(0.5)
+
+    with pytest.raises(ValueError):
+        EntityCache(max_size=0)
+
+
+def test_entity_cache_invalidate():
+    cache = EntityCache()
+    for project_name in ("a", "b"):
+        for entity_type in ("folder", "task"):
+            for fields in ({"id"}, {"id", "name"}):
+                cache.set(project_name, entity_type, "1", fields, {})
+
+    assert cache.invalidate("a", "folder", ["1"]) == 2
+    assert cache.invalidate("a") == 2
+    assert cache.invalidate(entity_type="folder") == 2
+    assert len(cache) == 2
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_get_folders_cached():
+    con = _FoldersConnection(["1", "2", "3"])
+    fields = {"id", "name", "active"}
+    # Cache is not used by default
+    assert con.get_entity_cache() is None
+    con.get_folder_by_id("project", "1", fields=fields)
+    con.get_folder_by_id("project", "1", fields=fields)
+    assert con.requested_ids == [["1"], ["1"]]
+
+    cache = EntityCache()
+    con.set_entity_cache(cache)
+    con.requested_ids.clear()
+
+    folder = con.get_folder_by_id("project", "1", fields=fields)
+    assert folder == {"id": "1", "name": "folder_1", "active": True}
+    folder["name"] = "changed"
+    folder = con.get_folder_by_id("project", "1", fields=fields)
+    assert folder == {"id": "1", "name": "folder_1", "active": True}
+    assert con.requested_ids == [["1"]]
+
+    # Only missing ids are queried
+    folders = con.get_folders(
+        "project", folder_ids=["1", "2", "4"], active=None, fields=fields
+    )
+    assert {folder["id"] for folder in folders} == {"1", "2"}
+    assert con.requested_ids[-1] == ["2", "4"]
+
+    # Other filters don't use cache
+    list(con.get_folders(
+        "project", folder_ids=["1"], folder_names=["a"], fields=fields
+    ))
+    assert con.requested_ids[-1] == ["1"]
+
+    cache.set("project", "task", "5", fields, {"id": "5"})
+    cache.set("other", "folder", "1", fields, {"id": "1"})
+    # Update of task invalidates only the task
+    con.patch("projects/project/tasks/5", name="renamed")
+    assert len(cache) == 3
+    assert con.rest_requests[-1][0] == "PATCH"
+
+    # Update of folder invalidates cached entities of project
+    con.post("projects/project/operations", operations=[{
+        "type": "update",
+        "entityType": "folder",
+        "entityId": "1",
+        "data": {"name": "renamed"},
+    }])
+    assert len(cache) == 1
+    con.get("projects/other/folders/1")
+    assert len(cache) == 1
@@ -0,0 +1,211 @@
+import json
+import threading
+
+from ayon_api import ServerAPI, FolderPathIndex
+from ayon_api.server_api import GraphQlResponse
+from ayon_api.utils import RestApiResponse
+
+FOLDERS = [
+    {"id": "1", "path": "/shots"},
+    {"id": "2", "path": "/shots/sh010"},
+    {"id": "3", "path": "/shots/sh020"},
+    {"id": "4", "path": "/shots/sh020/fx"},
+    {"id": "5", "path": "/assets"},
+]
+
+
+class _FoldersConnection(ServerAPI):
+    """Connection with folders and tasks of single project in memory."""
+    def __init__(self):
+        super().__init__(
+            "http://127.0.0.1:1",
+            create_session=False,
+            folder_path_index=True,
+        )
+        self.folders = {
+            folder["id"]: dict(folder, name=folder["path"].split("/")[-1])
+            for folder in FOLDERS
+        }
+        self.tasks = {
+            "t1": {"id": "t1", "name": "comp", "folderId": "2"},
+            "t2": {"id": "t2", "name": "comp", "folderId": "3"},
+        }
+        self.requests = []
+
+    def get_rest_folders(self, project_name, include_attrib=False):
+        self.requests.append("rest")
+        return [dict(folder) for folder in self.folders.values()]
+
+    def get_default_fields_for_type(self, entity_type):
+        return {"id", "name", "path", "folderId", "active"}
+
+    def _get_data(self, query, variables):
+        is_folders = "FoldersQuery" in query
+        self.requests.append("folders" if is_folders else "tasks")
+        entities = self.folders if is_folders else self.tasks
+        filters = {
+            "id": variables.get("folderIds" if is_folders else "taskIds"),
+            "path": variables.get("folderPaths"),
+        }
+        if not is_folders:
+            filters["folderId"] = variables.get("folderIds")
+        edges = [
+            {"node": dict({"active": True}, **entity)}
+            for entity in entities.values()
+            if not any(
+                values is not None and entity.get(key) not in values
+                for key, values in filters.items()
+            )
+        ]
+        key = "folders" if is_folders else "tasks"
+        return {"data": {"project": {key: {
+            "edges": edges,
+            "pageInfo": {"endCursor": None, "hasNextPage": False},
+        }}}}
+
+    def _send_rest_request(self, function, url, method, *args):
+        return RestApiResponse(None, {})
+
+    def query_graphql(self, query, variables=None):
+        return GraphQlResponse(self._get_data(query, variables))
+
+    def query_graphql_stream(self, query, variables=None, chunk_size=65536):
+        yield json.dumps(self._get_data(query, variables)).encode()
+
+
+def test_folder_path_index_lookups():
+    index = FolderPathIndex(FOLDERS)
+    assert len(index) == 5
+    assert "shots/sh010" in index
+    assert index.get_id("/shots/sh010/") == "2"
+    assert index.get_path("4") == "/shots/sh020/fx"
+    assert index.get_ids(["/assets", "/missing"]) == {
+        "/assets": "5", "/missing": None
+    }
+    assert index.find_prefix("/shots/") == {
+        "/shots/sh010": "2",
+        "/shots/sh020": "3",
+        "/shots/sh020/fx": "4",
+    }
+    assert index.find_regex(r"sh0\d0$") == {
+        "/shots/sh010": "2", "/shots/sh020": "3"
+    }
+
+
+def test_folder_path_index_updates():
+    index = FolderPathIndex(FOLDERS)
+    # Children of moved folder are moved too
+    index.update_folders([
+        {"id": "3", "path": "/seq/sh020"},
+        {"id": "6", "path": "/seq"},
+    ])
+    assert index.get_id("/shots/sh020") is None
+    assert index.get_id("/seq/sh020/fx") == "4"
+    assert index.find_prefix("/seq") == {
+        "/seq": "6", "/seq/sh020": "3", "/seq/sh020/fx": "4"
+    }
+
+    index.remove_folders(["1"])
+    assert index.find_prefix("/shots") == {}
+    assert index.get_path("2") is None
+    assert len(index) == 4
+
+
+def test_path_getters_use_index():
+    con = _FoldersConnection()
+    folder = con.get_folder_by_path("project", "/shots/sh010")
+    assert folder["id"] == "2"
+    assert con.requests == ["rest", "folders"]
+
+    con.requests.clear()
+    tasks = con.get_tasks_by_folder_paths(
+        "project", ["/shots/sh010", "shots/sh020", "/missing"]
+    )
+    assert {
+        path: [task["id"] for task in path_tasks]
+        for path, path_tasks in tasks.items()
+    } == {"/shots/sh010": ["t1"], "shots/sh020": ["t2"], "/missing": []}
+    # Missing path is queried from server, active state of folders too
+    assert con.requests == ["folders", "folders", "tasks"]
+
+    con.requests.clear()
+    assert con.get_folder_ids_by_paths("project", ["/shots"]) == {
+        "/shots": "1"
+    }
+    assert con.requests == []
+
+
+def test_index_is_invalidated():
+    con = _FoldersConnection()
+    con.get_folder_path_index("project")
+
+    # Folder moved by other client
+    con.folders["2"]["path"] = "/assets/sh010"
+    assert con.get_folder_by_path("project", "/shots/sh010") is None
+    assert con.get_folder_by_path("project", "/assets/sh010")["id"] == "2"
+    assert con.requests.count("rest") == 2
+
+    # Change of folder using the connection removes the index
+    con.patch("projects/project/folders/2", name="sh")
+    con.requests.clear()
+    con.get_folder_by_path("project", "/assets/sh010")
+    assert con.requests[0] == "rest"
+
+    con.set_folder_path_index_enabled(False)
+    con.requests.clear()
+    con.get_folder_by_path("project", "/assets/sh010")
+    assert con.requests == ["folders"]
+
+
+def test_tasks_by_folder_paths_of_inactive_folder():
+    con = _FoldersConnection()
+    con.folders["3"]["active"] = False
+    # Tasks of inactive folder are not returned with or without index
+    for enabled in (True, False):
+        con.set_folder_path_index_enabled(enabled)
+        tasks = con.get_tasks_by_folder_paths(
+            "project", ["/shots/sh010", "/shots/sh020"]
+        )
+        assert {
+            path: [task["id"] for task in path_tasks]
+            for path, path_tasks in tasks.items()
+        } == {"/shots/sh010": ["t1"], "/shots/sh020": []}
+
+
+def test_index_build_per_project():
+    con = _FoldersConnection()
+    started = threading.Event()
+    release = threading.Event()
+    get_rest_folders = con.get_rest_folders
+
+    def _get_rest_folders(project_name, include_attrib=False):
+        if project_name == "slow":
+            started.set()
+            release.wait(5.0)
+        return get_rest_folders(project_name, include_attrib)
+
+    con.get_rest_folders = _get_rest_folders
+    threads = [
+        threading.Thread(target=con.get_folder_path_index, args=("slow", ))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        assert started.wait(5.0)
+        # Index of other project is not blocked by the slow build
+        done = threading.Event()
+
+        def _get_index():
+            con.get_folder_path_index("project")
+            done.set()
+
+        threading.Thread(target=_get_index).start()
+        assert done.wait(1.0)
+    finally:
+        release.set()
+        for thread in threads:
+            thread.join()
+
+    # Index of the slow project was built only once
+    assert con.requests.count("rest") == 2
@@ -1,9 +1,18 @@
+import json
+import time
+import threading
+
 import pytest
 
-from ayon_api.graphql import GraphQlQuery
+from ayon_api import ServerAPI
+from ayon_api.exceptions import GraphQlQueryFailed
+from ayon_api.graphql import GraphQlQuery, GraphQlBatch, AdaptivePageSize
+from ayon_api.metrics import ClientMetrics
+from ayon_api.profiling import QueryProfiler
 from ayon_api.graphql_queries import (
     project_graphql_query,
     folders_graphql_query,
+    tasks_graphql_query,
 )
 
 from .conftest import project_name_fixture
@@ -125,3 +134,595 @@ def test_filters(folder_query):
     print(folder_query._children[0]._children[0].get_filters())
     print(folder_query.calculate_query())
 """
+
+
+class _PagesResponse:
+    def __init__(self, data, errors=None):
+        self.data = data
+        self.errors = errors
+
+
+class _PagesCon:
+    """Connection returning pages of users with delay."""
+    def __init__(self, count, delay=0.0, fail_on=None):
+        self.count = count
+        self.delay = delay
+        self.fail_on = fail_on
+        self.requested = 0
+        self.threads = set()
+        self.queries = []
+        self.variables = []
+
+    def query_graphql(self, query, variables):
+        self.queries.append(query)
+        self.variables.append(variables)
+        time.sleep(self.delay)
+        self.threads.add(threading.current_thread().name)
+        self.requested += 1
+        idx = self.requested
+        if idx == self.fail_on:
+            return _PagesResponse({}, [{"message": "failed"}])
+        return _PagesResponse({"data": {"users": {
+            "edges": [{"node": {"name": str(idx)}}],
+            "pageInfo": {
+                "endCursor": str(idx),
+                "hasNextPage": idx < self.count,
+            },
+        }}})
+
+
+def _users_query():
+    query = GraphQlQuery("Users")
+    query.add_field_with_edges("users").add_field("name")
+    return query
+
+
+def test_continuous_query_prefetch():
+    delay = 0.05
+    con = _PagesCon(6, delay)
+    started = time.perf_counter()
+    names = []
+    for output in _users_query().continuous_query(con, prefetch=2):
+        # Consumer is as slow as server
+        time.sleep(delay)
+        names.extend(user["name"] for user in output["users"])
+    duration = time.perf_counter() - started
+
+    assert names == ["1", "2", "3", "4", "5", "6"]
+    assert con.threads == {"GraphQlPrefetch-Users"}
+    # Serialized requests and processing would take 12 * delay
+    assert duration < 10 * delay
+
+
+def test_continuous_query_prefetch_stop_and_errors():
+    con = _PagesCon(100)
+    for _ in _users_query().continuous_query(con, prefetch=2):
+        break
+    time.sleep(0.3)
+    # Only bounded amount of pages was requested ahead
+    assert con.requested <= 4
+
+    con = _PagesCon(5, fail_on=3)
+    names = []
+    with pytest.raises(GraphQlQueryFailed):
+        for output in _users_query().continuous_query(con, prefetch=3):
+            names.extend(user["name"] for user in output["users"])
+    assert names == ["1", "2"]
+
+
+def test_page_size():
+    con = _PagesCon(1)
+    con.get_graphql_page_size = lambda: 25
+    query = _users_query()
+    query.query(con)
+    assert con.variables[-1]["usersLimit"] == 25
+
+    query = _users_query()
+    query.set_page_size(50)
+    query.query(con)
+    assert con.variables[-1]["usersLimit"] == 50
+
+    query = _users_query()
+    query.set_page_size(50)
+    query.get_field_by_path("users").set_page_size(10)
+    query.query(con)
+    assert con.variables[-1]["usersLimit"] == 10
+
+    with pytest.raises(ValueError):
+        query.set_page_size(0)
+
+
+def test_adaptive_page_size():
+    page_size = AdaptivePageSize(
+        target_latency=1.0, max_page_bytes=1000, min_size=10, max_size=1000
+    )
+    assert page_size.get_page_size("Users") == 300
+    # Fast small page grows, at most twice
+    page_size.record_page("Users", 300, 0.1, 100)
+    assert page_size.get_page_size("Users") == 600
+    # Payload is limited by max page bytes
+    page_size.record_page("Users", 600, 0.5, 1200)
+    assert page_size.get_page_size("Users") == 500
+    # Slow page shrinks
+    page_size.record_page("Users", 500, 1.25, 100)
+    assert page_size.get_page_size("Users") == 400
+    page_size.record_page("Users", 400, 100.0, 100)
+    assert page_size.get_page_size("Users") == 200
+    # Other queries are not affected
+    assert page_size.get_page_size("Folders") == 300
+
+    # Page size changes between pages of single query
+    con = _PagesCon(3)
+    query = _users_query()
+    query.set_page_size(AdaptivePageSize(max_size=1000))
+    query.query(con)
+    assert con.variables[0] == {"usersLimit": 300, "usersCursor": None}
+    assert con.variables[1] == {"usersLimit": 600, "usersCursor": "1"}
+
+
+class _NestedLinksCon:
+    """Connection returning folders with links.
+
+    Every 10th folder has more links than fit to single page of links.
+
+    """
+    def __init__(self, folders_count):
+        self.folders = [str(idx) for idx in range(folders_count)]
+        self.requested = 0
+        self.queries = set()
+
+    def _links_count(self, folder_id):
+        if int(folder_id) % 10 == 0:
+            return 700
+        return 2
+
+    def _get_page(self, items, limit, cursor):
+        start = 0
+        if cursor is not None:
+            start = int(cursor) + 1
+        page = items[start:start + limit]
+        return page, {
+            "endCursor": str(start + len(page) - 1),
+            "hasNextPage": start + len(page) < len(items),
+        }
+
+    def _get_folder_node(self, folder_id, links_limit, links_cursor):
+        links = [
+            {"id": f"{folder_id}-{idx}"}
+            for idx in range(self._links_count(folder_id))
+        ]
+        edges, page_info = self._get_page(links, links_limit, links_cursor)
+        return {
+            "id": folder_id,
+            "links": {"edges": edges, "pageInfo": page_info},
+        }
+
+    def query_graphql(self, query, variables):
+        self.requested += 1
+        self.queries.add(query)
+        links_limit = variables["projectFoldersLinksLimit"]
+        if "nested0:" not in query:
+            folder_ids, page_info = self._get_page(
+                self.folders,
+                variables["projectFoldersLimit"],
+                variables["projectFoldersCursor"],
+            )
+            project = {"folders": {
+                "edges": [
+                    {
+                        "node": self._get_folder_node(
+                            folder_id,
+                            links_limit,
+                            variables["projectFoldersLinksCursor"],
+                        ),
+                        "cursor": folder_id,
+                    }
+                    for folder_id in folder_ids
+                ],
+                "pageInfo": page_info,
+            }}
+            return _PagesResponse({"data": {"project": project}})
+
+        project = {}
+        idx = 0
+        while f"nested{idx}Id" in variables:
+            folder_id = variables[f"nested{idx}Id"]
+            cursor = variables[f"nested{idx}Cursor"]
+            project[f"nested{idx}"] = {"edges": [
+                {"node": self._get_folder_node(folder_id, links_limit, cursor)}
+            ]}
+            idx += 1
+        return _PagesResponse({"data": {"project": project}})
+
+
+def _folders_links_query():
+    query = folders_graphql_query({"id", "links.id"})
+    query.set_variable_value("projectName", "test")
+    return query
+
+
+def test_nested_edges_pagination_benchmark():
+    """Nested edges don't need round trip per parent entity.
+
+    1000 folders with 2 links, every 10th folder has 700 links (3 pages).
+
+    """
+    folders_count = 1000
+    legacy_con = _NestedLinksCon(folders_count)
+    legacy_query = _folders_links_query()
+    legacy_query.nested_batch_size = 0
+    expected = legacy_query.query(legacy_con)
+
+    con = _NestedLinksCon(folders_count)
+    query = _folders_links_query()
+    output = query.query(con)
+    print(
+        f"Nested edges of {folders_count} folders took {con.requested}"
+        f" round trips (one parent at a time took {legacy_con.requested})"
+    )
+
+    folders = output["project"]["folders"]
+    assert output == expected
+    assert len(folders) == folders_count
+    assert len(folders[10]["links"]) == 700
+    assert [link["id"] for link in folders[10]["links"]] == [
+        f"10-{idx}" for idx in range(700)
+    ]
+    assert legacy_con.requested == 1200
+    # Query string of folders pages and one for each size of batch
+    assert len(con.queries) < con.requested / 2
+    # 4 pages of folders, 2 next pages of links for 100 folders queried
+    #   in batches of 25 (last batch of a page might not be full)
+    assert con.requested <= 4 + 2 * 4 + 1
+
+
+def test_compiled_query_cache(monkeypatch):
+    compiled = []
+    compile_query = GraphQlQuery._compile_query
+
+    def _compile_query(self, nested_pages):
+        compiled.append(self)
+        return compile_query(self, nested_pages)
+
+    monkeypatch.setattr(GraphQlQuery, "_compile_query", _compile_query)
+
+    # Query string is compiled once for all pages
+    con = _PagesCon(5)
+    query = _users_query()
+    query.query(con)
+    assert len(set(con.queries)) == 1
+    assert [variables["usersCursor"] for variables in con.variables] == [
+        None, "1", "2", "3", "4"
+    ]
+    assert len(compiled) == 1
+
+    # Queries built with the same arguments share compiled query string
+    queries = []
+    for _ in range(3):
+        query = folders_graphql_query({"id", "name", "attrib.cached"})
+        query.set_variable_value("projectName", "test")
+        queries.append(query.calculate_query())
+    assert len(set(queries)) == 1
+    assert len(compiled) == 2
+
+    # Different variables with value change the query string
+    query = folders_graphql_query({"id", "name", "attrib.cached"})
+    query.set_variable_value("projectName", "test")
+    query.set_variable_value("folderIds", ["1"])
+    assert "ids: $folderIds" in query.calculate_query()
+    assert len(compiled) == 3
+
+    # Changed structure is not shared
+    query = folders_graphql_query({"id", "name", "attrib.cached"})
+    query.set_variable_value("projectName", "test")
+    query.get_field_by_path("project/folders").add_field("label")
+    assert "label" in query.calculate_query()
+    assert len(compiled) == 4
+
+
+class _ChunksCon:
+    """Connection returning folders matching 'folderIds' filter."""
+    def __init__(self, chunk_size):
+        self.chunk_size = chunk_size
+        self.requested_ids = []
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def get_graphql_chunk_size(self):
+        return self.chunk_size
+
+    def query_graphql(self, query, variables):
+        folder_ids = variables["folderIds"]
+        with self._lock:
+            self.requested_ids.append(folder_ids)
+            self.threads.add(threading.current_thread().name)
+        # Later chunks are answered sooner
+        time.sleep(0.05 if folder_ids[0] == "00" else 0.0)
+        return _PagesResponse({"data": {"project": {
+            "folders": {
+                "edges": [
+                    {"node": {"id": folder_id}}
+                    for folder_id in folder_ids
+                ],
+                "pageInfo": {"endCursor": "1", "hasNextPage": False},
+            },
+        }}})
+
+
+def _folders_ids_query(folder_ids):
+    query = folders_graphql_query({"id"})
+    query.set_variable_value("projectName", "test")
+    query.set_variable_value("folderIds", folder_ids)
+    return query
+
+
+def test_id_filter_chunks():
+    folder_ids = [f"{idx:02}" for idx in reversed(range(25))]
+    con = _ChunksCon(10)
+    outputs = list(_folders_ids_query(folder_ids).continuous_query(con))
+    assert len(con.requested_ids) == 3
+    assert all(len(ids) <= 10 for ids in con.requested_ids)
+    # First chunk is slow, so other chunks were queried in other threads
+    assert len(con.threads) > 1
+    assert all(
+        thread.startswith("GraphQlChunks-FoldersQuery")
+        for thread in con.threads
+    )
+    # Outputs are in stable order of chunks
+    assert [
+        folder["id"]
+        for output in outputs
+        for folder in output["project"]["folders"]
+    ] == sorted(folder_ids)
+
+    output = _folders_ids_query(folder_ids).query(con)
+    assert [
+        folder["id"] for folder in output["project"]["folders"]
+    ] == sorted(folder_ids)
+
+    # Small filters and disabled chunking don't split the query
+    con = _ChunksCon(0)
+    _folders_ids_query(folder_ids).query(con)
+    assert len(con.requested_ids) == 1
+
+
+class _OverlapCon:
+    """Connection returning tasks linked to any folder in 'folderIds'."""
+    def __init__(self, chunk_size, tasks):
+        self.chunk_size = chunk_size
+        self.tasks = tasks
+        self.requested_ids = []
+
+    def get_graphql_chunk_size(self):
+        return self.chunk_size
+
+    def query_graphql(self, query, variables):
+        folder_ids = set(variables["folderIds"])
+        self.requested_ids.append(variables["folderIds"])
+        return _PagesResponse({"data": {"project": {
+            "tasks": {
+                "edges": [
+                    {"node": {"id": task_id}}
+                    for task_id, task_folder_ids in self.tasks.items()
+                    if folder_ids & task_folder_ids
+                ],
+                "pageInfo": {"endCursor": "1", "hasNextPage": False},
+            },
+        }}})
+
+
+def test_overlapping_id_filter_chunks():
+    folder_ids = [f"{idx:02}" for idx in range(25)]
+    # Task 'shared' matches folders in first and last chunk
+    tasks = {"shared": {"00", "24"}}
+    tasks.update({f"t{folder_id}": {folder_id} for folder_id in folder_ids})
+    con = _OverlapCon(10, tasks)
+
+    # Filter by parent ids is not split to chunks
+    query = tasks_graphql_query({"id"})
+    query.set_variable_value("projectName", "test")
+    query.set_variable_value("folderIds", folder_ids)
+    output = query.query(con)
+    assert len(con.requested_ids) == 1
+    assert len(output["project"]["tasks"]) == 26
+
+    # Entity received from multiple chunks is in output only once
+    con = _OverlapCon(10, tasks)
+    query = GraphQlQuery("TasksQuery")
+    project_name_var = query.add_variable("projectName", "String!", "test")
+    folder_ids_var = query.add_variable(
+        "folderIds", "[String!]", folder_ids + ["00"], chunkable=True
+    )
+    project_field = query.add_field("project")
+    project_field.set_filter("name", project_name_var)
+    tasks_field = project_field.add_field_with_edges("tasks")
+    tasks_field.set_filter("folderIds", folder_ids_var)
+    tasks_field.add_field("id")
+    output = query.query(con)
+    assert len(con.requested_ids) == 3
+    task_ids = [task["id"] for task in output["project"]["tasks"]]
+    assert sorted(task_ids) == sorted(tasks)
+
+
+def test_graphql_batch():
+    class _BatchCon:
+        def __init__(self):
+            self.requests = []
+
+        def query_graphql(self, query, variables):
+            self.requests.append((query, variables))
+            if query.startswith("query Batch"):
+                return _PagesResponse({"data": {
+                    "q0_users": {
+                        "edges": [{"node": {"name": "a"}}],
+                        "pageInfo": {"endCursor": "1", "hasNextPage": True},
+                    },
+                    "q1_project": {"folders": {
+                        "edges": [{"node": {"id": "f"}}],
+                        "pageInfo": {"endCursor": "1", "hasNextPage": False},
+                    }},
+                }})
+            return _PagesResponse({"data": {"users": {
+                "edges": [{"node": {"name": "b"}}],
+                "pageInfo": {"endCursor": "2", "hasNextPage": False},
+            }}})
+
+    con = _BatchCon()
+    users_query = _users_query()
+    folders_query = folders_graphql_query({"id"})
+    folders_query.set_variable_value("projectName", "test")
+    with GraphQlBatch(con) as batch:
+        batch.add_query(users_query)
+        batch.add_query(folders_query)
+
+    query_str, variables = con.requests[0]
+    assert "q0_users: users(first: $q0_usersLimit" in query_str
+    assert "q1_project: project(name: $q1_projectName)" in query_str
+    assert "$q1_projectName: String!" in query_str
+    assert variables["q1_projectName"] == "test"
+    assert variables["q0_usersLimit"] == 300
+
+    # Next pages are queried separately
+    assert len(con.requests) == 2
+    assert con.requests[1][1]["usersCursor"] == "1"
+    assert batch.get_output(users_query) == {
+        "users": [{"name": "a"}, {"name": "b"}]
+    }
+    assert batch.get_output(folders_query) == {
+        "project": {"folders": [{"id": "f"}]}
+    }
+
+
+class _StreamCon(_PagesCon):
+    """Connection streaming pages of users in small chunks."""
+    page_size = 50
+
+    def __init__(self, count, error_on=None):
+        super().__init__(count)
+        self.error_on = error_on
+        self.received = 0
+
+    def query_graphql_stream(self, query, variables):
+        self.requested += 1
+        idx = self.requested
+        limit = min(self.page_size, variables["usersLimit"])
+        data = {"data": {"users": {
+            "edges": [
+                {"node": {"name": f"{idx}-{edge_idx}"}}
+                for edge_idx in range(limit)
+            ],
+            "pageInfo": {
+                "endCursor": str(idx),
+                "hasNextPage": idx < self.count,
+            },
+        }}}
+        if idx == self.error_on:
+            data["errors"] = [{"message": "failed"}]
+        content = json.dumps(data).encode()
+        for start in range(0, len(content), 100):
+            self.received += 1
+            yield content[start:start + 100]
+
+
+def test_iter_edges_stream():
+    pytest.importorskip("ijson")
+    con = _StreamCon(3)
+    edges = _users_query().iter_edges(con)
+    assert next(edges) == {"name": "1-0"}
+    # First value is yielded before whole page is received
+    assert con.received < 5
+    names = ["1-0"] + [user["name"] for user in edges]
+    assert names == [
+        f"{idx}-{edge_idx}"
+        for idx in range(1, 4)
+        for edge_idx in range(_StreamCon.page_size)
+    ]
+    assert con.requested == 3
+
+    query = _users_query()
+    query.get_field_by_path("users").set_limit(70)
+    assert len(list(query.iter_edges(_StreamCon(3)))) == 70
+
+    with pytest.raises(GraphQlQueryFailed):
+        list(_users_query().iter_edges(_StreamCon(3, error_on=2)))
+
+    # Pages are parsed at once without streaming
+    query = _users_query()
+    query.stream_edges = False
+    con = _StreamCon(3)
+    assert [user["name"] for user in query.iter_edges(con)] == [
+        "1", "2", "3"
+    ]
+
+
+class _PrefetchFoldersCon(ServerAPI):
+    """Connection returning pages of folders from 'query_graphql'."""
+    def __init__(self, count):
+        super().__init__(
+            "http://127.0.0.1:1",
+            create_session=False,
+            graphql_prefetch=2,
+        )
+        self.count = count
+        self.requested = 0
+        self.threads = set()
+
+    def get_default_fields_for_type(self, entity_type):
+        return {"id", "active"}
+
+    def query_graphql(self, query, variables=None):
+        self.threads.add(threading.current_thread().name)
+        self.requested += 1
+        idx = self.requested
+        return _PagesResponse({"data": {"project": {"folders": {
+            "edges": [{"node": {"id": str(idx), "active": True}}],
+            "pageInfo": {
+                "endCursor": str(idx),
+                "hasNextPage": idx < self.count,
+            },
+        }}}})
+
+    def query_graphql_stream(self, query, variables=None, chunk_size=65536):
+        raise AssertionError("Pages with prefetch should not be streamed")
+
+
+def test_getter_prefetch_with_stream():
+    pytest.importorskip("ijson")
+    con = _PrefetchFoldersCon(4)
+    folders = con.get_folders("test", fields={"id"})
+    assert [folder["id"] for folder in folders] == ["1", "2", "3", "4"]
+    assert con.threads == {"GraphQlPrefetch-FoldersQuery"}
+
+
+def test_query_profiler():
+    class _ProfiledCon(_NestedLinksCon):
+        def __init__(self, folders_count):
+            super().__init__(folders_count)
+            self.metrics = ClientMetrics()
+
+        def get_metrics(self):
+            return self.metrics
+
+    con = _ProfiledCon(100)
+    profiler = QueryProfiler()
+    con.metrics.add_query_profiler(profiler)
+    _folders_links_query().query(con)
+    con.metrics.remove_query_profiler(profiler)
+    # Queries are not recorded after profiler is removed
+    _folders_links_query().query(con)
+
+    profile, = profiler.queries
+    assert profile.name == "FoldersQuery"
+    assert profile.entry_point == "query"
+    assert profile.caller.startswith(__file__)
+    assert len(profile.pages) == con.requested / 2
+    # Folders and links of folders
+    assert profile.edges == 100 + 90 * 2 + 10 * 700
+    assert profile.nested_paths == ["project/folders/links"]
+    assert profile.compiled_size > 0
+
+    data = json.loads(profiler.to_json())
+    summary, = data["summary"]
+    assert summary["pages"] == len(profile.pages)
+    assert summary["edges"] == profile.edges
+    assert data["queries"][0]["nested_paths"] == ["project/folders/links"]
@@ -0,0 +1,309 @@
+import json
+import threading
+
+from ayon_api import ServerAPI, HierarchyStore
+from ayon_api.server_api import GraphQlResponse
+from ayon_api.utils import RestApiResponse
+
+FOLDER_FIELDS = {"id", "name", "path", "parentId", "folderType", "active"}
+TASK_FIELDS = {"id", "name", "folderId", "taskType", "active"}
+
+
+class _HierarchyConnection(ServerAPI):
+    """Connection with folders and tasks of single project in memory."""
+    def __init__(self):
+        super().__init__("http://127.0.0.1:1", create_session=False)
+        self.time = 0
+        self.folders = {}
+        self.tasks = {}
+        self.queries = []
+        self.project_updated_at = "0"
+
+    def _get_updated_at(self):
+        self.time += 1
+        return f"{self.time:04}"
+
+    def add_folder(self, folder_id, name, parent_id=None):
+        path = f"/{name}"
+        if parent_id:
+            path = self.folders[parent_id]["path"] + path
+        self.folders[folder_id] = {
+            "id": folder_id,
+            "name": name,
+            "path": path,
+            "parentId": parent_id,
+            "folderType": "Folder",
+            "active": True,
+            "updatedAt": self._get_updated_at(),
+        }
+
+    def add_task(self, task_id, name, folder_id):
+        self.tasks[task_id] = {
+            "id": task_id,
+            "name": name,
+            "folderId": folder_id,
+            "taskType": "Generic",
+            "active": True,
+            "updatedAt": self._get_updated_at(),
+        }
+
+    def rename_folder(self, folder_id, name):
+        # Server changes paths of children without changing 'updatedAt'
+        folder = self.folders[folder_id]
+        old_path = folder["path"]
+        folder["name"] = name
+        folder["path"] = old_path.rsplit("/", 1)[0] + f"/{name}"
+        folder["updatedAt"] = self._get_updated_at()
+        for child in self.folders.values():
+            if child["path"].startswith(old_path + "/"):
+                child["path"] = folder["path"] + child["path"][len(old_path):]
+
+    def move_folder(self, folder_id, parent_id):
+        # Server changes paths of children without changing 'updatedAt'
+        folder = self.folders[folder_id]
+        old_path = folder["path"]
+        folder["parentId"] = parent_id
+        folder["path"] = self.folders[parent_id]["path"] + f"/{folder['name']}"
+        folder["updatedAt"] = self._get_updated_at()
+        for child in self.folders.values():
+            if child["path"].startswith(old_path + "/"):
+                child["path"] = folder["path"] + child["path"][len(old_path):]
+
+    def get_project(self, project_name, fields=None, own_attributes=False):
+        return {"name": project_name, "updatedAt": self.project_updated_at}
+
+    def get_default_fields_for_type(self, entity_type):
+        if entity_type == "folder":
+            return set(FOLDER_FIELDS)
+        return set(TASK_FIELDS)
+
+    def _get_data(self, query, variables):
+        is_folders = "FoldersQuery" in query
+        self.queries.append(
+            ("folders" if is_folders else "tasks", dict(variables))
+        )
+        entities = self.folders if is_folders else self.tasks
+        filters = {
+            "id": variables.get("folderIds" if is_folders else "taskIds"),
+            "path": variables.get("folderPaths"),
+        }
+        if not is_folders:
+            filters["folderId"] = variables.get("folderIds")
+        updated_at = None
+        if variables.get("filter"):
+            condition = json.loads(variables["filter"])["conditions"][0]
+            updated_at = condition["value"]
+
+        edges = []
+        for entity in entities.values():
+            if any(
+                values is not None and entity[key] not in values
+                for key, values in filters.items()
+            ):
+                continue
+            if updated_at and entity["updatedAt"] < updated_at:
+                continue
+            edges.append({"node": dict(entity)})
+
+        key = "folders" if is_folders else "tasks"
+        return {"data": {"project": {key: {
+            "edges": edges,
+            "pageInfo": {"endCursor": None, "hasNextPage": False},
+        }}}}
+
+    def _send_rest_request(self, function, url, method, *args):
+        return RestApiResponse(None, {})
+
+    def query_graphql(self, query, variables=None):
+        return GraphQlResponse(self._get_data(query, variables))
+
+    def query_graphql_stream(self, query, variables=None, chunk_size=65536):
+        yield json.dumps(self._get_data(query, variables)).encode()
+
+
+def _create_connection():
+    con = _HierarchyConnection()
+    con.add_folder("1", "shots")
+    con.add_folder("2", "sh010", "1")
+    con.add_folder("3", "sh020", "1")
+    con.add_folder("4", "assets")
+    con.add_task("t1", "comp", "2")
+    con.add_task("t2", "anim", "2")
+    con.add_task("t3", "comp", "3")
+    return con
+
+
+def test_hierarchy_store(tmp_path):
+    con = _create_connection()
+    db_path = str(tmp_path / "hierarchy.db")
+    store = HierarchyStore(db_path, max_age=1000.0)
+    con.set_hierarchy_store(store)
+
+    folder = con.get_folder_by_path("project", "/shots/sh010")
+    assert folder["id"] == "2"
+    # Whole project was synchronized, nothing else is queried
+    assert len(con.queries) == 2
+    tasks = con.get_tasks_by_folder_paths(
+        "project", ["/shots/sh010", "/shots/sh020"]
+    )
+    assert {
+        path: sorted(task["name"] for task in path_tasks)
+        for path, path_tasks in tasks.items()
+    } == {"/shots/sh010": ["anim", "comp"], "/shots/sh020": ["comp"]}
+    roots = con.get_folders("project", parent_ids=[None])
+    assert {folder["name"] for folder in roots} == {"shots", "assets"}
+    assert len(con.queries) == 2
+
+    # Not supported filters are queried from server
+    list(con.get_folders("project", folder_path_regex="sh"))
+    assert len(con.queries) == 3
+
+    # Only updated folders, their children and tasks are received
+    con.rename_folder("1", "seq")
+    con.add_task("t4", "fx", "4")
+    con.queries.clear()
+    assert store.sync(con, "project", reconcile=False) == {
+        "updated": 7, "removed": 0
+    }
+    assert {
+        variables.get("folderIds") and tuple(sorted(variables["folderIds"]))
+        for _, variables in con.queries
+    } == {None, ("2", "3"), ("1", "2", "3")}
+    assert con.get_folder_by_path("project", "/seq/sh020")["id"] == "3"
+    assert con.get_folder_by_path("project", "/shots/sh020") is None
+
+    # Deleted entities are removed by reconciliation
+    con.folders.pop("4")
+    con.tasks.pop("t4")
+    assert store.sync(con, "project", reconcile=True) == {
+        "updated": 0, "removed": 2
+    }
+    assert con.get_folder_by_id("project", "4") is None
+
+    # Project is stored on disk
+    store.close()
+    store = HierarchyStore(db_path, auto_sync=False)
+    assert store.is_project_stored(con.get_base_url(), "project")
+    assert not store.is_project_stored(con.get_base_url(), "other")
+
+
+def test_hierarchy_store_invalidation():
+    con = _create_connection()
+    store = HierarchyStore(":memory:", max_age=1000.0)
+    con.set_hierarchy_store(store)
+    assert con.get_folder_by_id("project", "4")["name"] == "assets"
+
+    con.folders.pop("4")
+    assert con.get_folder_by_id("project", "4") is not None
+    # Deletion using the connection invalidates the project
+    con.delete("projects/project/folders/4")
+    assert con.get_folder_by_id("project", "4") is None
+
+    # Change of project causes full synchronization
+    con.project_updated_at = "1"
+    con.queries.clear()
+    store.sync(con, "project")
+    assert [entity_type for entity_type, _ in con.queries] == [
+        "folders", "tasks"
+    ]
+    for _, variables in con.queries:
+        assert "filter" not in variables
+
+
+def test_hierarchy_store_moved_folder():
+    con = _create_connection()
+    con.add_folder("5", "fx", "3")
+    con.add_task("t5", "fx", "5")
+    store = HierarchyStore(":memory:", max_age=1000.0)
+    store.sync(con, "project")
+
+    # Folder below moved folder and tasks of both are received too
+    con.move_folder("3", "4")
+    assert store.sync(con, "project", reconcile=False) == {
+        "updated": 4, "removed": 0
+    }
+    con.queries.clear()
+    folders = store.get_entities(
+        con, "project", "folder", {"id", "path"}, {"folderIds": ["3", "5"]}
+    )
+    assert sorted(folder["path"] for folder in folders) == [
+        "/assets/sh020", "/assets/sh020/fx"
+    ]
+    children = store.get_entities(
+        con, "project", "folder", {"id"}, {"parentFolderIds": ["4"]}
+    )
+    assert [folder["id"] for folder in children] == ["3"]
+    assert con.queries == []
+
+
+def test_hierarchy_store_reconcile():
+    con = _create_connection()
+    store = HierarchyStore(":memory:", max_age=1000.0)
+    store.sync(con, "project")
+
+    # Removed entities are kept until reconciliation
+    con.folders.pop("3")
+    con.tasks.pop("t3")
+    assert store.sync(con, "project", reconcile=False)["removed"] == 0
+    assert store.sync(con, "project", reconcile=True) == {
+        "updated": 0, "removed": 2
+    }
+    assert store.get_entities(
+        con, "project", "folder", {"id"}, {"folderIds": ["3"]}
+    ) == []
+    tasks = store.get_entities(con, "project", "task", {"id"}, {})
+    assert sorted(task["id"] for task in tasks) == ["t1", "t2"]
+
+
+def test_hierarchy_store_unsupported_requests():
+    con = _create_connection()
+    store = HierarchyStore(":memory:", max_age=1000.0)
+    for entity_type, fields, filters in (
+        ("folder", {"id"}, {"folderPathRegex": "sh"}),
+        ("folder", {"id", "attrib.fps"}, {}),
+        ("task", {"id"}, {"taskAssigneesAny": ["user"]}),
+        ("product", {"id"}, {}),
+    ):
+        assert store.get_entities(
+            con, "project", entity_type, fields, filters
+        ) is None
+    # Project is not synchronized for unsupported requests
+    assert con.queries == []
+    assert not store.is_project_stored(con.get_base_url(), "project")
+
+
+def test_hierarchy_store_sync_does_not_block():
+    con = _create_connection()
+    store = HierarchyStore(":memory:", max_age=1000.0)
+    store.sync(con, "project")
+    server_url = con.get_base_url()
+
+    started = threading.Event()
+    release = threading.Event()
+    get_data = con._get_data
+
+    def _get_data(query, variables):
+        started.set()
+        release.wait(5.0)
+        return get_data(query, variables)
+
+    con._get_data = _get_data
+    thread = threading.Thread(
+        target=store.sync, args=(con, "project", True)
+    )
+    thread.start()
+    try:
+        assert started.wait(5.0)
+        # Store can be used while other thread waits for server
+        done = threading.Event()
+
+        def _use_store():
+            store.invalidate(server_url, "other")
+            store.is_project_stored(server_url, "project")
+            done.set()
+
+        threading.Thread(target=_use_store).start()
+        assert done.wait(1.0)
+    finally:
+        release.set()
+        thread.join()
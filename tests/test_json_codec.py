@@ -0,0 +1,60 @@
+import datetime
+
+import pytest
+
+from ayon_api import json_codec
+from ayon_api.utils import entity_data_json_default
+
+
+@pytest.fixture(params=["json", "orjson", "msgspec", "ujson"])
+def backend(request):
+    try:
+        backend = json_codec.set_json_backend(request.param)
+    except ImportError:
+        pytest.skip(f"'{request.param}' is not installed")
+    yield backend
+    json_codec.set_json_backend()
+
+
+def test_json_backend_roundtrip(backend):
+    data = {"name": "á", "values": [1, 2.5, None, True], "nested": {}}
+    assert json_codec.json_loads(json_codec.json_dumps(data)) == data
+    assert json_codec.json_loads(json_codec.json_dumps_bytes(data)) == data
+
+
+def test_json_backend_default(backend):
+    date = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    output = json_codec.json_loads(json_codec.json_dumps_bytes(
+        {"createdAt": date}, default=entity_data_json_default
+    ))
+    assert output == {"createdAt": int(date.timestamp())}
+
+    with pytest.raises((TypeError, ValueError)):
+        json_codec.json_dumps({"value": object()})
+
+    # Datetime is not serialized without 'default' by any backend
+    with pytest.raises((TypeError, ValueError)):
+        json_codec.json_dumps_bytes({"createdAt": date})
+
+
+def test_json_backend_rejects_nan(backend):
+    for value in (float("nan"), float("inf")):
+        with pytest.raises(ValueError):
+            json_codec.json_dumps_bytes({"values": [value]})
+
+
+def test_json_backend_decode_error(backend):
+    with pytest.raises(ValueError):
+        json_codec.json_loads(b"{invalid")
+
+
+def test_unknown_json_backend():
+    with pytest.raises(ValueError):
+        json_codec.set_json_backend("unknown")
+    assert json_codec.get_json_backend() is not None
+
+
+def test_json_backend_env_fallback(monkeypatch):
+    monkeypatch.setenv("AYON_JSON_BACKEND", "unknown")
+    monkeypatch.setattr(json_codec, "_backend", None)
+    assert json_codec.json_loads(b'{"a": 1}') == {"a": 1}
@@ -0,0 +1,225 @@
+import gzip
+import json
+from http.server import BaseHTTPRequestHandler
+
+from ayon_api import ServerAPI
+from ayon_api.graphql import GraphQlQuery
+from ayon_api.metrics import ClientMetrics, normalize_endpoint
+from ayon_api.utils import RequestTypes
+
+
+_RESPONSE_BODY = (
+    b'{"data": {"users": {"edges": [],'
+    b' "pageInfo": {"endCursor": null, "hasNextPage": false}}}}'
+)
+
+
+class _JsonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        body = _RESPONSE_BODY
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _GzipHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        _GzipHandler.requests.append((dict(self.headers), json.loads(body)))
+        self.do_GET()
+
+    def do_GET(self):
+        body = json.dumps({"operations": [
+            {"id": str(idx), "success": True} for idx in range(1000)
+        ], "success": True}).encode()
+        # Response is compressed only if client negotiated gzip
+        compress = "gzip" in (self.headers.get("Accept-Encoding") or "")
+        if compress:
+            body = gzip.compress(body)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if compress:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_normalize_endpoint():
+    assert normalize_endpoint(
+        "http://localhost:5000/api/projects/MyProject/folders"
+        "/0123456789abcdef0123456789abcdef"
+    ) == "api/projects/{project}/folders/{id}"
+    assert normalize_endpoint("api/events/15") == "api/events/{id}"
+
+
+def test_metrics_registry_export():
+    metrics = ClientMetrics()
+    metrics.inc("graphql_pages_total", labels={"query": "Folders"})
+    metrics.inc("graphql_pages_total", labels={"query": "Folders"})
+    metrics.observe("request_duration_seconds", 0.02, {"endpoint": "api"})
+    metrics.observe("request_duration_seconds", 3.0, {"endpoint": "api"})
+
+    snapshot = metrics.get_snapshot()
+    assert snapshot["graphql_pages_total"][0]["value"] == 2
+    histogram = snapshot["request_duration_seconds"][0]
+    assert histogram["count"] == 2
+    assert histogram["buckets"]["0.025"] == 1
+    assert histogram["buckets"]["+Inf"] == 2
+
+    text = metrics.to_prometheus()
+    assert "# TYPE ayon_api_graphql_pages_total counter" in text
+    assert 'ayon_api_graphql_pages_total{query="Folders"} 2' in text
+    assert (
+        'ayon_api_request_duration_seconds_bucket{endpoint="api",le="+Inf"} 2'
+        in text
+    )
+    samples = {name for name, _, _ in metrics.iter_samples()}
+    assert "ayon_api_request_duration_seconds_sum" in samples
+
+
+def test_request_hooks_and_metrics(local_server):
+    url = local_server(_JsonHandler)
+    con = ServerAPI(url, create_session=False)
+    # Pretend token was validated
+    con._token_info.token = "token"
+    con._token_info.is_valid = True
+    metrics = con.get_metrics()
+    started = []
+    finished = []
+    metrics.add_request_hook(started.append)
+    metrics.add_response_hook(finished.append)
+
+    query = GraphQlQuery("Users")
+    query.add_field_with_edges("users").add_field("name")
+    query.query(con)
+
+    assert len(started) == len(finished) == 1
+    info = finished[0]
+    assert info.endpoint == "graphql"
+    assert info.status_code == 200
+    assert info.bytes_sent > 0
+    assert info.bytes_received == len(_RESPONSE_BODY)
+
+    con._token_info.is_valid = False
+    con._do_rest_request(RequestTypes.get, f"{url}/api/info")
+
+    snapshot = metrics.get_snapshot()
+    assert snapshot["graphql_pages_total"][0]["labels"] == {
+        "query": "Users"
+    }
+    assert snapshot["graphql_queries_total"][0]["value"] == 1
+    assert snapshot["invalid_token_short_circuits_total"][0]["value"] == 1
+    assert finished[-1].short_circuit
+
+
+def test_profile_queries(local_server):
+    url = local_server(_JsonHandler)
+    con = ServerAPI(url, create_session=False)
+    con._token_info.token = "token"
+    con._token_info.is_valid = True
+
+    with con.profile_queries() as profiler:
+        query = GraphQlQuery("Users")
+        query.add_field_with_edges("users").add_field("name")
+        query.query(con)
+    assert con.get_metrics().get_query_profilers() == []
+
+    profile, = profiler.queries
+    page, = profile.pages
+    assert profile.name == "Users"
+    assert page.response_size == len(_RESPONSE_BODY)
+    assert page.query_size == len(query.calculate_query())
+    assert page.latency > 0
+    assert json.loads(profiler.to_json())["summary"][0]["pages"] == 1
+
+
+def test_graphql_query_recorded_on_early_stop():
+    class _Response:
+        errors = None
+        data = {"data": {"users": {
+            "edges": [{"node": {"name": "a"}}],
+            "pageInfo": {"endCursor": "1", "hasNextPage": True},
+        }}}
+
+    class _Con:
+        def __init__(self):
+            self.metrics = ClientMetrics()
+
+        def get_metrics(self):
+            return self.metrics
+
+        def query_graphql(self, query, variables):
+            return _Response()
+
+    con = _Con()
+    query = GraphQlQuery("Users")
+    query.add_field_with_edges("users").add_field("name")
+    for _ in query.continuous_query(con):
+        break
+
+    snapshot = con.metrics.get_snapshot()
+    assert snapshot["graphql_queries_total"][0]["value"] == 1
+
+
+def test_compression_ratio(local_server):
+    _GzipHandler.requests = []
+    url = local_server(_GzipHandler)
+    con = ServerAPI(
+        url, create_session=False, request_compression_min_size=1024
+    )
+    con._token_info.token = "token"
+    con._token_info.is_valid = True
+    finished = []
+    metrics = con.get_metrics()
+    metrics.add_response_hook(finished.append)
+
+    response = con.get("info")
+    assert len(response.data["operations"]) == 1000
+    info = finished[-1]
+    assert info.wire_bytes_received < info.bytes_received
+
+    operations = [
+        {
+            "type": "update",
+            "entityType": "folder",
+            "entityId": f"{idx:032x}",
+            "data": {"attrib": {"frameStart": 1001}},
+        }
+        for idx in range(100)
+    ]
+    con.send_batch_operations("Project", operations)
+    headers, body = _GzipHandler.requests[-1]
+    assert headers["Content-Encoding"] == "gzip"
+    assert len(body["operations"]) == 100
+    info = finished[-1]
+    assert info.wire_bytes_sent < info.bytes_sent
+
+    # Small bodies are not compressed
+    con.post("info", value=1)
+    headers, body = _GzipHandler.requests[-1]
+    assert "Content-Encoding" not in headers
+    assert body == {"value": 1}
+
+    stats = metrics.get_compression_stats()
+    assert stats["request"]["ratio"] > 1
+    assert stats["response"]["ratio"] > 5
+    assert "ayon_api_response_compression_ratio" in metrics.to_prometheus()
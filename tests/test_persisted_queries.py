@@ -0,0 +1,192 @@
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ayon_api import ServerAPI
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        size = int(self.headers["Content-Length"])
+        body = json.loads(self.rfile.read(size))
+        self.server.requests.append(body)
+        self._send(*self.server.handle_graphql(body))
+
+    def _send(self, status, data):
+        content = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class _PersistedQueriesServer(ThreadingHTTPServer):
+    """Stand-in GraphQl server with automatic persisted queries."""
+    daemon_threads = True
+
+    def __init__(self, supported=True, ignore_extensions=False):
+        super().__init__(("127.0.0.1", 0), _StandInHandler)
+        self.supported = supported
+        self.ignore_extensions = ignore_extensions
+        self.queries = {}
+        self.requests = []
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def handle_graphql(self, body):
+        if body["variables"].get("forbidden"):
+            return 200, {"errors": [{"message": "Forbidden"}]}
+        query = body.get("query")
+        persisted = (body.get("extensions") or {}).get("persistedQuery")
+        if self.ignore_extensions:
+            if query is None:
+                return 400, {"errors": [{
+                    "message": "No GraphQL query found in the request"
+                }]}
+        elif persisted is not None:
+            if not self.supported:
+                return 200, {"errors": [{
+                    "message": "PersistedQueryNotSupported",
+                    "extensions": {"code": "PERSISTED_QUERY_NOT_SUPPORTED"},
+                }]}
+            query_hash = persisted["sha256Hash"]
+            if query is None:
+                query = self.queries.get(query_hash)
+                if query is None:
+                    return 200, {"errors": [{
+                        "message": "PersistedQueryNotFound",
+                        "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"},
+                    }]}
+            elif (
+                hashlib.sha256(query.encode()).hexdigest() != query_hash
+            ):
+                return 200, {"errors": [{"message": "Invalid hash"}]}
+            self.queries[query_hash] = query
+        return 200, {"data": {"query": query, "variables": body["variables"]}}
+
+
+@pytest.fixture
+def server():
+    server = _PersistedQueriesServer()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _create_connection(url, **kwargs):
+    con = ServerAPI(url, create_session=False, **kwargs)
+    con._token_info.token = "token"
+    con._token_info.is_valid = True
+    return con
+
+
+QUERY = "query Folders($projectName: String!) { project { name } }"
+
+
+def test_persisted_queries(server):
+    con = _create_connection(server.url, graphql_persisted_queries=True)
+    assert con.is_graphql_persisted_queries_enabled()
+
+    for _ in range(3):
+        response = con.query_graphql(QUERY, {"projectName": "test"})
+        assert response.data["data"]["query"] == QUERY
+
+    query_hash = hashlib.sha256(QUERY.encode()).hexdigest()
+    # Full query is sent only with first request
+    assert server.requests[0]["query"] == QUERY
+    for body in server.requests:
+        assert body["extensions"]["persistedQuery"]["sha256Hash"] == (
+            query_hash
+        )
+    assert all("query" not in body for body in server.requests[1:])
+
+    # Server forgot the query, full query is sent again
+    server.queries.clear()
+    server.requests.clear()
+    response = con.query_graphql(QUERY, {"projectName": "test"})
+    assert response.data["data"]["query"] == QUERY
+    assert ["query" in body for body in server.requests] == [False, True]
+
+    server.requests.clear()
+    content = b"".join(con.query_graphql_stream(QUERY))
+    assert json.loads(content)["data"]["query"] == QUERY
+    assert "query" not in server.requests[0]
+
+    # Mutations are always sent with full text
+    server.requests.clear()
+    con.query_graphql("mutation { deleteFolder }")
+    assert "extensions" not in server.requests[0]
+
+    con.set_graphql_persisted_queries_enabled(False)
+    server.requests.clear()
+    con.query_graphql(QUERY)
+    assert "extensions" not in server.requests[0]
+
+
+def test_persisted_queries_not_supported():
+    server = _PersistedQueriesServer(supported=False)
+    try:
+        con = _create_connection(server.url, graphql_persisted_queries=True)
+        response = con.query_graphql(QUERY)
+        assert response.data["data"]["query"] == QUERY
+        response = con.query_graphql(QUERY)
+        assert response.data["data"]["query"] == QUERY
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # Persisted queries are not used after server refused them
+    assert ["extensions" in body for body in server.requests] == [
+        True, False, False
+    ]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_persisted_queries_ignored_by_server(stream):
+    server = _PersistedQueriesServer(ignore_extensions=True)
+    try:
+        con = _create_connection(server.url, graphql_persisted_queries=True)
+        for _ in range(3):
+            if stream:
+                data = json.loads(b"".join(con.query_graphql_stream(QUERY)))
+            else:
+                data = con.query_graphql(QUERY).data
+            assert data["data"]["query"] == QUERY
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # Query sent without text failed and full text did not, full text
+    #   is always sent since
+    assert ["query" in body for body in server.requests] == [
+        True, False, True, True
+    ]
+    assert ["extensions" in body for body in server.requests] == [
+        True, True, True, False
+    ]
+    assert not con._persisted_queries.supported
+
+
+def test_persisted_queries_query_error(server):
+    con = _create_connection(server.url, graphql_persisted_queries=True)
+    con.query_graphql(QUERY)
+
+    # Failed query is sent again with full text
+    server.requests.clear()
+    response = con.query_graphql(QUERY, {"forbidden": True})
+    assert response.data["errors"] == [{"message": "Forbidden"}]
+    assert ["query" in body for body in server.requests] == [False, True]
+
+    # Persisted queries are still used
+    server.requests.clear()
+    con.query_graphql(QUERY)
+    con.query_graphql(QUERY)
+    assert con._persisted_queries.supported
+    assert ["query" in body for body in server.requests] == [True, False]
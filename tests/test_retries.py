@@ -0,0 +1,159 @@
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+import requests
+
+from ayon_api import ServerAPI, RetryPolicy
+from ayon_api.retries import parse_retry_after
+from ayon_api.utils import RequestTypes
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    statuses = []
+    requests_count = 0
+
+    def _respond(self):
+        _FlakyHandler.requests_count += 1
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+        status = 200
+        if _FlakyHandler.statuses:
+            status = _FlakyHandler.statuses.pop(0)
+        body = b"{}"
+        self.send_response(status)
+        if status in (429, 503):
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url(local_server):
+    _FlakyHandler.requests_count = 0
+    return local_server(_FlakyHandler)
+
+
+def _create_connection(url):
+    return ServerAPI(
+        url,
+        create_session=False,
+        max_retries=3,
+        retry_policy=RetryPolicy(backoff_base=0.01),
+    )
+
+
+def test_retry_after_and_too_many_requests(server_url):
+    con = _create_connection(server_url)
+    _FlakyHandler.statuses = [429, 503]
+    response = con._do_rest_request(
+        RequestTypes.get, f"{server_url}/api/info",
+        handle_invalid_token=False,
+    )
+    assert response.status_code == 200
+    assert _FlakyHandler.requests_count == 3
+
+
+def test_post_is_not_retried_on_bad_gateway(server_url):
+    con = _create_connection(server_url)
+    _FlakyHandler.statuses = [502]
+    response = con._do_rest_request(
+        RequestTypes.post, f"{server_url}/api/info",
+        handle_invalid_token=False,
+        json={},
+    )
+    assert response.status_code == 502
+    assert _FlakyHandler.requests_count == 1
+
+    # Idempotent requests are retried
+    _FlakyHandler.statuses = [502]
+    response = con._do_rest_request(
+        RequestTypes.get, f"{server_url}/api/info",
+        handle_invalid_token=False,
+    )
+    assert response.status_code == 200
+    assert _FlakyHandler.requests_count == 3
+
+
+def test_retry_policy_rules():
+    policy = RetryPolicy(backoff_base=1.0, backoff_max=4.0)
+    for attempt in range(10):
+        assert 0.0 <= policy.get_backoff(attempt) <= 4.0
+
+    connect_error = requests.exceptions.ConnectTimeout()
+    read_error = requests.exceptions.ReadTimeout()
+    assert policy.is_retry_exception(connect_error, idempotent=False)
+    assert not policy.is_retry_exception(read_error, idempotent=False)
+    assert policy.is_retry_exception(read_error, idempotent=True)
+
+    state = policy.start(RequestTypes.post, max_attempts=3)
+    assert not state.idempotent
+    state = policy.start("get", max_attempts=2)
+    assert state.idempotent
+    assert state.next_delay(exc=read_error) is not None
+    # Attempts are exhausted
+    assert state.next_delay(exc=read_error) is None
+
+    state = RetryPolicy(total_timeout=0.0).start("get", max_attempts=5)
+    assert state.next_delay(exc=read_error) is None
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("invalid") is None
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("nan") is None
+    assert parse_retry_after("inf") is None
+
+
+def test_retry_after_capped_without_budget():
+    policy = RetryPolicy(backoff_max=2.0, total_timeout=None)
+    state = policy.start("get", max_attempts=3)
+    response = requests.Response()
+    response.status_code = 503
+    response.headers["Retry-After"] = "3600"
+    assert state.next_delay(response=response) <= 2.0
+
+
+class _DroppingHandler(BaseHTTPRequestHandler):
+    """Handler closing connection without response."""
+    requests_count = 0
+
+    def do_PUT(self):
+        _DroppingHandler.requests_count += 1
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+def test_upload_idempotent_argument(local_server, tmp_path):
+    url = local_server(_DroppingHandler)
+    con = _create_connection(url)
+    filepath = tmp_path / "file.txt"
+    filepath.write_bytes(b"content")
+
+    _DroppingHandler.requests_count = 0
+    with pytest.raises(requests.exceptions.ConnectionError):
+        con.upload_file("upload", str(filepath), idempotent=False)
+    assert _DroppingHandler.requests_count == 1
+
+    # PUT upload is retried by default
+    _DroppingHandler.requests_count = 0
+    with pytest.raises(requests.exceptions.ConnectionError):
+        con.upload_file("upload", str(filepath))
+    assert _DroppingHandler.requests_count == 3
@@ -0,0 +1,202 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler
+
+from ayon_api import ServerAPI
+from ayon_api.server_api import _SessionPool
+from ayon_api.utils import get_socket_options
+
+
+def _create_service_connection():
+    con = ServerAPI("http://localhost:5000", create_session=False)
+    con._token_info.token = "service-key"
+    con._token_info.is_valid = True
+    con._token_info.is_service = True
+    return con
+
+
+def test_as_username_is_thread_local():
+    con = _create_service_connection()
+    entered = threading.Event()
+    checked = threading.Event()
+
+    def _impersonate():
+        with con.as_username("other"):
+            entered.set()
+            checked.wait(5)
+            return con.get_headers().get("X-as-user")
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(_impersonate)
+        assert entered.wait(5)
+        assert "X-as-user" not in con.get_headers()
+        checked.set()
+        assert future.result() == "other"
+
+
+def test_as_sender_is_thread_local():
+    con = _create_service_connection()
+    con.set_sender("main")
+    with con.as_sender("worker", sender_type="test"):
+        headers = con.get_headers()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            other_headers = executor.submit(con.get_headers).result()
+
+    assert headers["x-sender"] == "worker"
+    assert headers["x-sender-type"] == "test"
+    assert other_headers["x-sender"] == "main"
+    assert "x-sender-type" not in other_headers
+    assert con.get_headers()["x-sender"] == "main"
+
+
+def test_session_pool_per_thread_sessions():
+    pool = _SessionPool({"x-test": "1"}, cert=None, verify=True)
+    session = pool.get_session()
+    assert pool.get_session() is session
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        other_session = executor.submit(pool.get_session).result()
+
+    assert other_session is not session
+    assert (
+        other_session.get_adapter("http://localhost")
+        is session.get_adapter("http://localhost")
+    )
+
+    pool.update_headers({"x-test": None, "x-other": "2"})
+    pool.set_verify(False)
+    session = pool.get_session()
+    assert "x-test" not in session.headers
+    assert session.headers["x-other"] == "2"
+    assert session.verify is False
+    pool.close()
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def test_session_pool_info(local_server):
+    url = local_server(_OkHandler)
+    pool = _SessionPool(
+        {},
+        cert=None,
+        verify=True,
+        pool_size=2,
+        pool_block=True,
+        socket_options=get_socket_options(30),
+    )
+    try:
+        for _ in range(3):
+            assert pool.get_session().get(url).status_code == 200
+
+        info = pool.get_info()
+        assert info["pool_size"] == 2
+        assert info["pool_block"] is True
+        host_info = info["hosts"][0]
+        assert host_info["max_size"] == 2
+        assert host_info["in_use"] == 0
+        assert host_info["idle"] == 1
+        # Keep-alive connection was reused
+        assert host_info["connections_created"] == 1
+        assert host_info["requests"] == 3
+    finally:
+        pool.close()
+
+
+def test_session_pool_keeps_default_headers():
+    pool = _SessionPool({"x-test": "1"}, cert=None, verify=True)
+    session = pool.get_session()
+    assert "gzip" in session.headers["Accept-Encoding"]
+    assert "User-Agent" in session.headers
+    assert session.headers["x-test"] == "1"
+    pool.close()
+
+
+def test_reset_token_replaces_token_info():
+    con = _create_service_connection()
+    token_info = con._token_info
+    con.reset_token()
+    assert con._token_info is not token_info
+    assert con._token_info.token is None
+    assert con._token_info.is_valid is None
+    # Previous state was not mutated by reset
+    assert token_info.token == "service-key"
+
+
+class _SlowJsonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests_count = 0
+
+    def _respond(self):
+        _SlowJsonHandler.requests_count += 1
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        time.sleep(0.2)
+        body = b'{"name": "TestProject", "data": {}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+def test_single_flight_shares_identical_requests(local_server):
+    url = local_server(_SlowJsonHandler)
+    _SlowJsonHandler.requests_count = 0
+    con = ServerAPI(url, create_session=False, single_flight=True)
+    con._token_info.token = "token"
+    con._token_info.is_valid = True
+
+    def _get(_):
+        response = con.get("projects/TestProject")
+        response.data["name"] = None
+        return response
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        responses = list(executor.map(_get, range(5)))
+
+    assert _SlowJsonHandler.requests_count == 1
+    # Each caller has own copy of data
+    assert len({id(response.data) for response in responses}) == 5
+    assert con.get_metrics().get_snapshot()[
+        "single_flight_shared_total"
+    ][0]["value"] == 4
+
+    # Mutations are never shared
+    def _mutate(_):
+        return con.query_graphql("mutation { test }")
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        list(executor.map(_mutate, range(3)))
+    assert _SlowJsonHandler.requests_count == 4
+
+    con.set_single_flight_enabled(False)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(_get, range(2)))
+    assert _SlowJsonHandler.requests_count == 6
+
+
+def test_rest_request_keeps_caller_headers(local_server):
+    url = local_server(_SlowJsonHandler)
+    con = ServerAPI(url, create_session=False)
+    headers = {"x-test": "1"}
+    response = con.raw_post("test", json={"value": 1}, headers=headers)
+    assert response.status_code == 200
+    assert headers == {"x-test": "1"}
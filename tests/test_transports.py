@@ -0,0 +1,190 @@
+import io
+import json
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ayon_api import ServerAPI, HttpxTransport, TransferProgress
+
+h2_connection = pytest.importorskip("h2.connection")
+h2_config = pytest.importorskip("h2.config")
+h2_events = pytest.importorskip("h2.events")
+pytest.importorskip("httpx")
+
+# Delay of each response of stand-in server
+RESPONSE_DELAY = 0.1
+
+
+class _H2StandInServer:
+    """Minimal HTTP/2 server without TLS (prior knowledge).
+
+    Responses are sent with delay from timer threads, so requests on single
+    connection are answered concurrently like on real server.
+
+    """
+    def __init__(self):
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.bind(("127.0.0.1", 0))
+        self._socket.listen()
+        self.connections = 0
+        self.requests = []
+        self.url = f"http://127.0.0.1:{self._socket.getsockname()[1]}"
+        self._thread = threading.Thread(target=self._accept, daemon=True)
+        self._thread.start()
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _ = self._socket.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(
+                target=self._handle, args=(sock, ), daemon=True
+            ).start()
+
+    def _handle(self, sock):
+        conn = h2_connection.H2Connection(
+            config=h2_config.H2Configuration(client_side=False)
+        )
+        lock = threading.Lock()
+        conn.initiate_connection()
+        sock.sendall(conn.data_to_send())
+        headers_by_stream = {}
+        bodies = {}
+        while True:
+            try:
+                data = sock.recv(65535)
+            except OSError:
+                return
+            if not data:
+                return
+            with lock:
+                events = conn.receive_data(data)
+                sock.sendall(conn.data_to_send())
+            for event in events:
+                if isinstance(event, h2_events.RequestReceived):
+                    headers_by_stream[event.stream_id] = dict(event.headers)
+                    bodies[event.stream_id] = b""
+                elif isinstance(event, h2_events.DataReceived):
+                    bodies[event.stream_id] += event.data
+                    with lock:
+                        conn.acknowledge_received_data(
+                            event.flow_controlled_length, event.stream_id
+                        )
+                elif isinstance(event, h2_events.StreamEnded):
+                    headers = headers_by_stream.pop(event.stream_id)
+                    self.requests.append(
+                        (headers, bodies.pop(event.stream_id))
+                    )
+                    threading.Timer(
+                        RESPONSE_DELAY,
+                        self._respond,
+                        args=(sock, conn, lock, event.stream_id, headers),
+                    ).start()
+
+    def _respond(self, sock, conn, lock, stream_id, headers):
+        body = json.dumps({"path": headers[b":path"].decode()}).encode()
+        with lock:
+            conn.send_headers(stream_id, [
+                (":status", "200"),
+                ("content-type", "application/json"),
+                ("content-length", str(len(body))),
+            ])
+            conn.send_data(stream_id, body, end_stream=True)
+            try:
+                sock.sendall(conn.data_to_send())
+            except OSError:
+                pass
+
+    def close(self):
+        self._socket.close()
+
+
+@pytest.fixture
+def h2_server():
+    server = _H2StandInServer()
+    yield server
+    server.close()
+
+
+def _create_connection(url):
+    con = ServerAPI(
+        url,
+        create_session=False,
+        transport=HttpxTransport(http1=False),
+    )
+    con._token_info.token = "token"
+    con._token_info.is_valid = True
+    return con
+
+
+def test_http2_transport_requests(h2_server):
+    con = _create_connection(h2_server.url)
+    with con.as_sender("tests"):
+        response = con.get("info")
+    assert response.status_code == 200
+    assert response.data == {"path": "/api/info"}
+
+    response = con.post("projects/test/operations", operations=[])
+    assert response.data == {"path": "/api/projects/test/operations"}
+
+    headers, body = h2_server.requests[0]
+    assert headers[b"authorization"] == b"Bearer token"
+    assert headers[b"x-sender"] == b"tests"
+    headers, body = h2_server.requests[1]
+    assert headers[b":method"] == b"POST"
+    assert json.loads(body) == {"operations": []}
+    con.get_transport().close()
+
+
+def test_http2_transport_transfers(h2_server):
+    con = _create_connection(h2_server.url)
+    stream = io.BytesIO()
+    con.download_file_to_stream("api/files/file.json", stream)
+    assert json.loads(stream.getvalue()) == {"path": "/api/files/file.json"}
+
+    progress = TransferProgress()
+    con._upload_file(
+        "api/files/file.bin", io.BytesIO(b"x" * 1000), progress,
+        chunk_size=100,
+    )
+    headers, body = h2_server.requests[-1]
+    assert headers[b":method"] == b"PUT"
+    assert body == b"x" * 1000
+    con.get_transport().close()
+
+
+def test_http2_multiplexing_benchmark(h2_server):
+    """Concurrent requests are multiplexed over single connection.
+
+    Stand-in server answers each request after 'RESPONSE_DELAY', so
+        requests sent one after another on single HTTP/1.1 connection
+        would take 'count * RESPONSE_DELAY'.
+
+    """
+    count = 50
+    con = _create_connection(h2_server.url)
+    # Warm up connection
+    con.get("info")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        responses = list(executor.map(
+            lambda idx: con.get(f"projects/{idx}"), range(count)
+        ))
+    duration = time.perf_counter() - start
+
+    print(
+        f"{count} requests over HTTP/2 took {duration:.3f}s"
+        f" (serialized would take {count * RESPONSE_DELAY:.3f}s)"
+    )
+    assert [response.data["path"] for response in responses] == [
+        f"/api/projects/{idx}" for idx in range(count)
+    ]
+    assert h2_server.connections == 1
+    assert duration < count * RESPONSE_DELAY / 4
+    con.get_transport().close()